@@ -0,0 +1,378 @@
+"""
+StudyBuddy AI - Local Fake OpenAI Server for Benchmarks
+
+An OpenAI-compatible HTTP server that answers chat completions (plain and
+streamed) and Whisper transcriptions with canned content after a configurable
+delay. Pointing the backend at it with OPENAI_BASE_URL lets the load tests
+exercise the real request path (pooled client, rate limiter, circuit breaker,
+hedging, caches) without network access or API spend.
+
+Core Functionality:
+- POST /v1/chat/completions: summaries as text and quiz prompts (recognised
+  by their JSON format) as a valid question array, with usage; stream=true
+  answers as server-sent events
+- POST /v1/audio/transcriptions: text or JSON transcription of any upload
+- Latency distributions: fixed, uniform or lognormal (see parse_latency())
+- Error injection: a fraction of calls fail with 500s or 429s
+- Rate limiting: optional requests/tokens-per-minute budgets enforced over a
+  one-minute window, advertised through x-ratelimit-* headers like OpenAI's
+- GET /stats: calls, injected errors and rate-limited calls so far
+
+Usage:
+    python -m benchmarks.fake_openai --port 8100 --latency lognormal:0.8,0.5 \\
+        --error-rate 0.01 --rate-limit-rate 0.02
+
+@version 1.0.0
+@since 2026-10-16
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import re
+import threading
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Deque, Dict, List, Optional, Tuple
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+
+# Configure module-level logger for comprehensive monitoring and debugging
+logger = logging.getLogger(__name__)
+
+# ==================== CANNED CONTENT ====================
+
+SUMMARY_SENTENCES = [
+    "Photosynthesis turns light energy into chemical energy stored in glucose.",
+    "It happens in the chloroplasts, where chlorophyll absorbs mostly red and blue light.",
+    "The light reactions split water and release oxygen as a by-product.",
+    "The Calvin cycle then fixes carbon dioxide into sugars the plant can use.",
+    "Key idea: plants are producers, so almost every food chain starts with them.",
+]
+
+TRANSCRIPT = (
+    "Okay everyone, today we're continuing with cell biology. Last time we looked at "
+    "the cell membrane, so now let's talk about how cells make energy in the mitochondria."
+)
+
+# Matches "Create 5 multiple-choice questions" in the quiz system prompt
+QUESTION_COUNT_PATTERN = re.compile(r"Create (\d+)")
+
+
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """
+    Build a latency sampler (seconds) from a spec string.
+
+    Specs:
+        fixed:SECONDS
+        uniform:LOW,HIGH
+        lognormal:MEDIAN,SIGMA   (median in seconds, sigma of the underlying normal)
+
+    Raises:
+        ValueError: For an unknown distribution or malformed parameters
+    """
+    kind, _, params = spec.partition(":")
+    try:
+        values = [float(value) for value in params.split(",")] if params else []
+    except ValueError as e:
+        raise ValueError(f"Invalid latency parameters: {spec}") from e
+
+    if kind == "fixed" and len(values) == 1:
+        return lambda rng: values[0]
+    if kind == "uniform" and len(values) == 2:
+        return lambda rng: rng.uniform(values[0], values[1])
+    if kind == "lognormal" and len(values) == 2:
+        median, sigma = values
+        # The median of a lognormal is exp(mu)
+        return lambda rng: median * rng.lognormvariate(0.0, sigma)
+    raise ValueError(f"Unknown latency spec: {spec} (use fixed:S, uniform:LO,HI or lognormal:MEDIAN,SIGMA)")
+
+
+@dataclass
+class FakeConfig:
+    """Behaviour of the fake server."""
+
+    latency: str = "lognormal:0.8,0.5"
+    audio_latency: str = "lognormal:2.0,0.4"
+    stream_chunk_delay: float = 0.02
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    requests_per_minute: Optional[int] = None
+    tokens_per_minute: Optional[int] = None
+    seed: Optional[int] = None
+
+
+@dataclass
+class _Window:
+    """Requests and tokens spent in the last minute."""
+
+    events: Deque[Tuple[float, int]] = field(default_factory=deque)
+    tokens: int = 0
+
+    def trim(self, now: float) -> None:
+        while self.events and now - self.events[0][0] >= 60:
+            _, tokens = self.events.popleft()
+            self.tokens -= tokens
+
+
+class FakeOpenAI:
+    """State and behaviour behind the fake server's routes."""
+
+    def __init__(self, config: FakeConfig):
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.chat_latency = parse_latency(config.latency)
+        self.audio_latency = parse_latency(config.audio_latency)
+        self.window = _Window()
+        self.counters = {"chat": 0, "chat_stream": 0, "audio": 0, "errors_injected": 0, "rate_limited": 0}
+        self._lock = threading.Lock()
+
+    def admit(self, tokens: int) -> Tuple[Optional[JSONResponse], Dict[str, str]]:
+        """
+        Apply error injection and the rate-limit window to one call.
+
+        Returns:
+            Tuple[Optional[JSONResponse], Dict[str, str]]: An error response to send
+            instead of the result (or None), and the x-ratelimit-* headers
+        """
+        config = self.config
+        with self._lock:
+            now = time.monotonic()
+            self.window.trim(now)
+            over_requests = config.requests_per_minute and len(self.window.events) >= config.requests_per_minute
+            over_tokens = config.tokens_per_minute and self.window.tokens + tokens > config.tokens_per_minute
+            if not (over_requests or over_tokens):
+                self.window.events.append((now, tokens))
+                self.window.tokens += tokens
+            headers = self._rate_limit_headers(now)
+            roll = self.rng.random()
+
+            if over_requests or over_tokens or roll < config.rate_limit_rate:
+                self.counters["rate_limited"] += 1
+                retry_after = self.window.events[0][0] + 60 - now if over_requests or over_tokens else 1.0
+                return _error(429, "Rate limit reached for requests", "requests", "rate_limit_exceeded", {
+                    **headers, "retry-after-ms": str(int(max(retry_after, 0.05) * 1000)),
+                }), headers
+            if roll < config.rate_limit_rate + config.error_rate:
+                self.counters["errors_injected"] += 1
+                return _error(500, "The server had an error while processing your request.", "server_error", None, headers), headers
+        return None, headers
+
+    def _rate_limit_headers(self, now: float) -> Dict[str, str]:
+        config = self.config
+        headers = {}
+        if config.requests_per_minute:
+            headers["x-ratelimit-limit-requests"] = str(config.requests_per_minute)
+            headers["x-ratelimit-remaining-requests"] = str(max(0, config.requests_per_minute - len(self.window.events)))
+        if config.tokens_per_minute:
+            headers["x-ratelimit-limit-tokens"] = str(config.tokens_per_minute)
+            headers["x-ratelimit-remaining-tokens"] = str(max(0, config.tokens_per_minute - self.window.tokens))
+        return headers
+
+    def count(self, counter: str) -> None:
+        with self._lock:
+            self.counters[counter] += 1
+
+    async def delay(self, sampler: Callable[[random.Random], float]) -> None:
+        with self._lock:
+            seconds = max(0.0, sampler(self.rng))
+        await asyncio.sleep(seconds)
+
+
+def _error(
+    status_code: int,
+    message: str,
+    error_type: str,
+    code: Optional[str],
+    headers: Dict[str, str]
+) -> JSONResponse:
+    return JSONResponse(
+        {"error": {"message": message, "type": error_type, "param": None, "code": code}},
+        status_code=status_code,
+        headers=headers,
+    )
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token)."""
+    return max(1, len(text) // 4)
+
+
+def completion_text(messages: List[Dict[str, Any]], max_tokens: int) -> str:
+    """Canned answer for a chat request: a quiz JSON array or a summary."""
+    system_prompt = next((m.get("content") or "" for m in messages if m.get("role") == "system"), "")
+    # Quiz prompts spell out the JSON format, including its correct_answer field
+    if "correct_answer" in system_prompt:
+        match = QUESTION_COUNT_PATTERN.search(system_prompt)
+        count = int(match.group(1)) if match else 3
+        return json.dumps([
+            {
+                "question": f"Question {n + 1}: where in the cell does photosynthesis take place?",
+                "options": ["Mitochondria", "Chloroplasts", "Nucleus", "Ribosomes"],
+                "correct_answer": "B",
+                "explanation": "Chloroplasts contain the chlorophyll that captures light energy.",
+                "difficulty": "medium",
+            }
+            for n in range(count)
+        ])
+
+    words: List[str] = []
+    budget = max(10, int(max_tokens * 0.75))
+    sentence = 0
+    while len(words) < budget:
+        words.extend(SUMMARY_SENTENCES[sentence % len(SUMMARY_SENTENCES)].split())
+        sentence += 1
+    return " ".join(words[:budget])
+
+
+def create_app(config: FakeConfig) -> FastAPI:
+    """Build the fake OpenAI ASGI application."""
+    fake = FakeOpenAI(config)
+    app = FastAPI(title="Fake OpenAI")
+    app.state.fake = fake
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        messages = body.get("messages", [])
+        max_tokens = body.get("max_tokens") or 256
+        prompt_tokens = estimate_tokens("".join(str(m.get("content") or "") for m in messages))
+
+        rejection, headers = fake.admit(prompt_tokens + max_tokens)
+        if rejection is not None:
+            return rejection
+
+        content = completion_text(messages, max_tokens)
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        model = body.get("model", "gpt-3.5-turbo")
+        created = int(time.time())
+
+        if body.get("stream"):
+            fake.count("chat_stream")
+            return StreamingResponse(
+                _stream_chunks(fake, content, completion_id, model, created),
+                media_type="text/event-stream",
+                headers=headers,
+            )
+
+        fake.count("chat")
+        await fake.delay(fake.chat_latency)
+        return JSONResponse({
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": created,
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": estimate_tokens(content),
+                "total_tokens": prompt_tokens + estimate_tokens(content),
+            },
+        }, headers=headers)
+
+    @app.post("/v1/audio/transcriptions")
+    async def audio_transcriptions(request: Request):
+        form = await request.form()
+        upload = form.get("file")
+        if upload is not None:
+            await upload.read()
+
+        rejection, headers = fake.admit(0)
+        if rejection is not None:
+            return rejection
+
+        fake.count("audio")
+        await fake.delay(fake.audio_latency)
+        if form.get("response_format", "json") == "text":
+            return PlainTextResponse(TRANSCRIPT + "\n", headers=headers)
+        return JSONResponse({"text": TRANSCRIPT}, headers=headers)
+
+    @app.get("/stats")
+    async def stats():
+        with fake._lock:
+            return dict(fake.counters)
+
+    return app
+
+
+async def _stream_chunks(
+    fake: FakeOpenAI,
+    content: str,
+    completion_id: str,
+    model: str,
+    created: int
+) -> AsyncIterator[str]:
+    """Server-sent events for a streamed completion: time to first token, then one word per chunk."""
+    def event(delta: Dict[str, Any], finish_reason: Optional[str] = None) -> str:
+        chunk = {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+        }
+        return f"data: {json.dumps(chunk)}\n\n"
+
+    await fake.delay(fake.chat_latency)
+    yield event({"role": "assistant", "content": ""})
+    for index, word in enumerate(content.split(" ")):
+        yield event({"content": word if index == 0 else f" {word}"})
+        await asyncio.sleep(fake.config.stream_chunk_delay)
+    yield event({}, "stop")
+    yield "data: [DONE]\n\n"
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Fake-server options, shared with the load test driver."""
+    parser.add_argument("--latency", default=FakeConfig.latency,
+                        help="Chat latency: fixed:S, uniform:LO,HI or lognormal:MEDIAN,SIGMA (seconds)")
+    parser.add_argument("--audio-latency", default=FakeConfig.audio_latency,
+                        help="Transcription latency, same format as --latency")
+    parser.add_argument("--stream-chunk-delay", type=float, default=FakeConfig.stream_chunk_delay,
+                        help="Seconds between streamed chunks")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of calls answered with a 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of calls answered with a 429")
+    parser.add_argument("--rpm", type=int, default=None, help="Requests-per-minute budget to enforce")
+    parser.add_argument("--tpm", type=int, default=None, help="Tokens-per-minute budget to enforce")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for latency and error injection")
+
+
+def config_from_args(args: argparse.Namespace) -> FakeConfig:
+    return FakeConfig(
+        latency=args.latency,
+        audio_latency=args.audio_latency,
+        stream_chunk_delay=args.stream_chunk_delay,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        requests_per_minute=args.rpm,
+        tokens_per_minute=args.tpm,
+        seed=args.seed,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local fake OpenAI server for benchmarks")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    config = config_from_args(args)
+    # Fail on a bad latency spec before the server starts
+    parse_latency(config.latency)
+    parse_latency(config.audio_latency)
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,477 @@
+"""
+StudyBuddy AI - Offline Load Test Driver
+
+Starts the fake OpenAI server and the backend (pointed at it through
+OPENAI_BASE_URL) as local subprocesses, then drives /api/summarize,
+/api/quiz/generate and /api/transcribe at fixed concurrency levels. Everything
+runs on 127.0.0.1, so no network access or API key is needed.
+
+Recorded per scenario and concurrency level:
+- Throughput (completed requests per second) and status code counts
+- Client-observed latency: p50, p95, p99, mean and max
+- Backend event-loop lag and resident memory, read from its /metrics endpoint
+  (so they describe the server process, not this driver)
+
+The backend keeps its own rate-limit budgets (OPENAI_RPM_LIMIT, OPENAI_TPM_LIMIT)
+and pacing them shows up in the results; raise them with --env to measure the
+server alone. Inputs are unique per request unless --repeat-inputs is given, so
+the caches and request coalescing do not hide the upstream path.
+
+Results are written as JSON together with the git commit and configuration, so
+runs on two commits can be compared with --compare.
+
+Usage:
+    python -m benchmarks.load_test --concurrency 1,8,32 --requests 200 \\
+        --latency lognormal:0.8,0.5 --output results.json
+    python -m benchmarks.load_test --compare baseline.json results.json
+
+@version 1.0.0
+@since 2026-10-16
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import math
+import os
+import platform
+import re
+import socket
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+import wave
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import httpx
+
+from benchmarks.fake_openai import add_arguments
+
+# Backend root (the directory holding src/ and benchmarks/)
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+SCENARIOS = ("summarize", "quiz", "transcribe")
+
+PASSAGE = (
+    "Photosynthesis is the process by which green plants, algae and some bacteria use "
+    "sunlight, water and carbon dioxide to make glucose and release oxygen. It takes place "
+    "in the chloroplasts, where the pigment chlorophyll absorbs light energy. The light "
+    "reactions capture that energy and split water molecules, and the Calvin cycle uses it "
+    "to fix carbon dioxide into sugars that the plant uses for growth."
+)
+
+# Matches one Prometheus sample line: name, optional labels, value
+SAMPLE_PATTERN = re.compile(r"^([a-zA-Z_:][a-zA-Z0-9_:]*)(?:\{(.*)\})?\s+(\S+)$")
+
+# Latency percentiles reported for every run
+PERCENTILES = (50, 95, 99)
+
+
+# ==================== STATISTICS ====================
+
+def percentile(values: Sequence[float], p: float) -> Optional[float]:
+    """Nearest-rank percentile, or None for no values."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(len(ordered) * p / 100) - 1))
+    return ordered[index]
+
+
+def latency_summary(latencies: Sequence[float]) -> Dict[str, Optional[float]]:
+    """Percentiles, mean and max of latencies in seconds, reported in milliseconds."""
+    def ms(value: Optional[float]) -> Optional[float]:
+        return round(value * 1000, 2) if value is not None else None
+
+    summary = {f"p{p}": ms(percentile(latencies, p)) for p in PERCENTILES}
+    summary["mean"] = ms(sum(latencies) / len(latencies)) if latencies else None
+    summary["max"] = ms(max(latencies)) if latencies else None
+    return summary
+
+
+def parse_metrics(text: str) -> Dict[str, List[Tuple[Dict[str, str], float]]]:
+    """Parse Prometheus text exposition into {name: [(labels, value)]}."""
+    samples: Dict[str, List[Tuple[Dict[str, str], float]]] = {}
+    for line in text.splitlines():
+        match = SAMPLE_PATTERN.match(line)
+        if line.startswith("#") or not match:
+            continue
+        name, raw_labels, value = match.groups()
+        labels = dict(re.findall(r'(\w+)="((?:[^"\\]|\\.)*)"', raw_labels or ""))
+        samples.setdefault(name, []).append((labels, float(value)))
+    return samples
+
+
+def histogram_state(metrics: Dict[str, List[Tuple[Dict[str, str], float]]], name: str) -> Dict[str, Any]:
+    """Cumulative bucket counts, sum and count of an unlabelled histogram."""
+    buckets = {labels["le"]: value for labels, value in metrics.get(f"{name}_bucket", [])}
+    total = sum(value for _, value in metrics.get(f"{name}_sum", []))
+    count = sum(value for _, value in metrics.get(f"{name}_count", []))
+    return {"buckets": buckets, "sum": total, "count": count}
+
+
+def histogram_delta_summary(before: Dict[str, Any], after: Dict[str, Any]) -> Dict[str, Optional[float]]:
+    """Mean and bucket-estimated p99 (upper bound) of observations between two scrapes, in ms."""
+    count = after["count"] - before["count"]
+    if count <= 0:
+        return {"samples": 0, "mean": None, "p99_upper_bound": None}
+
+    p99 = None
+    bounds = sorted(after["buckets"], key=lambda le: math.inf if le == "+Inf" else float(le))
+    for le in bounds:
+        if after["buckets"][le] - before["buckets"].get(le, 0) >= 0.99 * count:
+            p99 = None if le == "+Inf" else round(float(le) * 1000, 2)
+            break
+    return {
+        "samples": int(count),
+        "mean": round((after["sum"] - before["sum"]) / count * 1000, 3),
+        "p99_upper_bound": p99,
+    }
+
+
+# ==================== REQUEST BUILDERS ====================
+
+def make_wav(seconds: float, variant: int) -> bytes:
+    """A mono 16 kHz WAV tone; variant changes one sample so uploads hash differently."""
+    rate = 16000
+    frames = int(seconds * rate)
+    samples = [int(8000 * math.sin(2 * math.pi * 440 * n / rate)) for n in range(min(frames, rate))]
+    samples[0] = variant % 32768
+    # Repeat one second of tone to keep generation cheap for long recordings
+    pcm = (struct.pack(f"<{len(samples)}h", *samples) * (frames // len(samples) + 1))[: frames * 2]
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(pcm)
+    return buffer.getvalue()
+
+
+async def send(client: httpx.AsyncClient, scenario: str, index: int, args: argparse.Namespace) -> int:
+    """Send one scenario request and return its status code."""
+    # Unique inputs measure the upstream path; repeated inputs measure the caches
+    variant = 0 if args.repeat_inputs else index
+    text = f"{PASSAGE} (Passage {variant})"
+
+    if scenario == "summarize":
+        response = await client.post("/api/summarize", json={"text": text, "learning_style": "visual"})
+    elif scenario == "quiz":
+        response = await client.post("/api/quiz/generate", json={"text": text, "num_questions": 3})
+    else:
+        audio = make_wav(args.audio_seconds, variant)
+        response = await client.post("/api/transcribe", files={"file": ("lecture.wav", audio, "audio/wav")})
+    return response.status_code
+
+
+# ==================== LOAD GENERATION ====================
+
+_inputs_used = 0
+
+
+def next_input(count: int) -> int:
+    """Reserve count input numbers and return the first."""
+    global _inputs_used
+    first = _inputs_used
+    _inputs_used += count
+    return first
+
+
+async def scrape(client: httpx.AsyncClient) -> Dict[str, List[Tuple[Dict[str, str], float]]]:
+    response = await client.get("/metrics")
+    response.raise_for_status()
+    return parse_metrics(response.text)
+
+
+def resident_memory(metrics: Dict[str, List[Tuple[Dict[str, str], float]]]) -> Optional[int]:
+    samples = metrics.get("process_resident_memory_bytes")
+    return int(samples[0][1]) if samples else None
+
+
+async def run_level(
+    client: httpx.AsyncClient,
+    scenario: str,
+    concurrency: int,
+    args: argparse.Namespace
+) -> Dict[str, Any]:
+    """Drive one scenario at one concurrency level and summarise the results."""
+    # Inputs are numbered across all levels so no level is served from an earlier one's cache
+    first_index = next_input(args.warmup + args.requests)
+    for index in range(args.warmup):
+        await send(client, scenario, first_index + args.requests + index, args)
+
+    before = await scrape(client)
+    rss_samples = [value for value in [resident_memory(before)] if value is not None]
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    next_index = 0
+    done = asyncio.Event()
+
+    async def worker() -> None:
+        nonlocal next_index
+        while next_index < args.requests:
+            index = first_index + next_index
+            next_index += 1
+            started = time.perf_counter()
+            try:
+                status = await send(client, scenario, index, args)
+            except httpx.HTTPError as e:
+                statuses[type(e).__name__] += 1
+                continue
+            statuses[str(status)] += 1
+            if status == 200:
+                latencies.append(time.perf_counter() - started)
+
+    async def sample_memory() -> None:
+        while not done.is_set():
+            try:
+                metrics = await scrape(client)
+            except httpx.HTTPError:
+                metrics = {}
+            rss = resident_memory(metrics)
+            if rss is not None:
+                rss_samples.append(rss)
+            try:
+                await asyncio.wait_for(done.wait(), timeout=args.sample_interval)
+            except TimeoutError:
+                pass
+
+    sampler = asyncio.create_task(sample_memory())
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    done.set()
+    await sampler
+
+    after = await scrape(client)
+    rss_end = resident_memory(after)
+    if rss_end is not None:
+        rss_samples.append(rss_end)
+
+    return {
+        "scenario": scenario,
+        "concurrency": concurrency,
+        "requests": args.requests,
+        "succeeded": len(latencies),
+        "statuses": dict(statuses),
+        "duration_s": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 3) if elapsed else None,
+        "latency_ms": latency_summary(latencies),
+        "event_loop_lag_ms": histogram_delta_summary(
+            histogram_state(before, "studybuddy_event_loop_lag_seconds"),
+            histogram_state(after, "studybuddy_event_loop_lag_seconds"),
+        ),
+        "rss_bytes": {
+            "start": rss_samples[0] if rss_samples else None,
+            "peak": max(rss_samples) if rss_samples else None,
+            "end": rss_end,
+        },
+    }
+
+
+# ==================== PROCESS MANAGEMENT ====================
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_ready(url: str, process: subprocess.Popen, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{url} exited with code {process.returncode} before becoming ready")
+        try:
+            if httpx.get(url, timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"{url} did not become ready within {timeout:.0f}s")
+
+
+@contextmanager
+def local_servers(args: argparse.Namespace, workdir: Path) -> Iterator[str]:
+    """Start the fake OpenAI server and the backend; yield the backend URL."""
+    fake_port, app_port = free_port(), free_port()
+    fake_command = [
+        sys.executable, "-m", "benchmarks.fake_openai", "--port", str(fake_port),
+        "--latency", args.latency, "--audio-latency", args.audio_latency,
+        "--stream-chunk-delay", str(args.stream_chunk_delay),
+        "--error-rate", str(args.error_rate), "--rate-limit-rate", str(args.rate_limit_rate),
+    ]
+    for flag, value in (("--rpm", args.rpm), ("--tpm", args.tpm), ("--seed", args.seed)):
+        if value is not None:
+            fake_command += [flag, str(value)]
+
+    app_env = {
+        **os.environ,
+        "OPENAI_API_KEY": "sk-benchmark",
+        "OPENAI_BASE_URL": f"http://127.0.0.1:{fake_port}/v1",
+        "JOB_STORAGE_DIR": str(workdir / "jobs"),
+        "TRANSCRIPTION_CACHE_DB": str(workdir / "transcription_cache.sqlite3"),
+        "PYTHONUNBUFFERED": "1",
+    }
+    app_env.pop("SUMMARY_CACHE_DB", None)
+    for assignment in args.env:
+        key, _, value = assignment.partition("=")
+        app_env[key] = value
+    app_command = [
+        sys.executable, "-m", "uvicorn", "src.api.main:app",
+        "--host", "127.0.0.1", "--port", str(app_port), "--log-level", "warning",
+    ]
+
+    processes: List[subprocess.Popen] = []
+    with open(workdir / "fake_openai.log", "wb") as fake_log, open(workdir / "backend.log", "wb") as app_log:
+        try:
+            fake = subprocess.Popen(fake_command, cwd=BACKEND_DIR, stdout=fake_log, stderr=subprocess.STDOUT)
+            processes.append(fake)
+            wait_until_ready(f"http://127.0.0.1:{fake_port}/stats", fake)
+
+            app = subprocess.Popen(app_command, cwd=BACKEND_DIR, env=app_env, stdout=app_log, stderr=subprocess.STDOUT)
+            processes.append(app)
+            wait_until_ready(f"http://127.0.0.1:{app_port}/health", app)
+            yield f"http://127.0.0.1:{app_port}"
+        finally:
+            for process in reversed(processes):
+                process.terminate()
+                try:
+                    process.wait(timeout=10)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run_benchmarks(base_url: str, args: argparse.Namespace) -> List[Dict[str, Any]]:
+    limits = httpx.Limits(max_connections=max(args.concurrency) + 2)
+    timeout = httpx.Timeout(args.timeout)
+    runs = []
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=timeout) as client:
+        for scenario in args.scenarios:
+            for concurrency in args.concurrency:
+                result = await run_level(client, scenario, concurrency, args)
+                latency = result["latency_ms"]
+                print(
+                    f"{scenario:<11} c={concurrency:<4} {result['throughput_rps']} req/s  "
+                    f"p50={latency['p50']}ms p95={latency['p95']}ms p99={latency['p99']}ms  "
+                    f"statuses={result['statuses']}",
+                    flush=True,
+                )
+                runs.append(result)
+    return runs
+
+
+# ==================== COMPARISON ====================
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any]) -> List[str]:
+    """Per-run throughput and latency changes from a baseline result file."""
+    def key(run: Dict[str, Any]) -> Tuple[str, int]:
+        return run["scenario"], run["concurrency"]
+
+    def change(old: Optional[float], new: Optional[float]) -> str:
+        if old in (None, 0) or new is None:
+            return "   n/a"
+        return f"{(new - old) / old * 100:+6.1f}%"
+
+    previous = {key(run): run for run in baseline["runs"]}
+    lines = [f"{'scenario':<11} {'c':>4} {'throughput':>10} {'p50':>8} {'p95':>8} {'p99':>8}"]
+    for run in current["runs"]:
+        old = previous.get(key(run))
+        if old is None:
+            continue
+        lines.append(
+            f"{run['scenario']:<11} {run['concurrency']:>4} "
+            f"{change(old['throughput_rps'], run['throughput_rps']):>10} "
+            + " ".join(
+                f"{change(old['latency_ms'][p], run['latency_ms'][p]):>8}" for p in ("p50", "p95", "p99")
+            )
+        )
+    return lines
+
+
+# ==================== CLI ====================
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Offline load test for the StudyBuddy AI backend")
+    parser.add_argument("--scenarios", type=lambda value: value.split(","), default=list(SCENARIOS),
+                        help=f"Comma-separated scenarios from {', '.join(SCENARIOS)}")
+    parser.add_argument("--concurrency", type=lambda value: [int(n) for n in value.split(",")], default=[1, 8, 32],
+                        help="Comma-separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=100, help="Requests per scenario and concurrency level")
+    parser.add_argument("--warmup", type=int, default=3, help="Unmeasured requests before each level")
+    parser.add_argument("--repeat-inputs", action="store_true",
+                        help="Send identical inputs (measures the caches instead of the upstream path)")
+    parser.add_argument("--audio-seconds", type=float, default=30.0, help="Length of the uploaded WAV")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Client timeout per request")
+    parser.add_argument("--sample-interval", type=float, default=0.5, help="Seconds between memory samples")
+    parser.add_argument("--base-url", default=None,
+                        help="Benchmark an already running backend instead of starting local servers")
+    parser.add_argument("--env", action="append", default=[], metavar="KEY=VALUE",
+                        help="Extra environment for the backend (e.g. HEDGE_REQUESTS=true)")
+    parser.add_argument("--output", default=None, help="Write results as JSON to this file")
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CURRENT"),
+                        help="Compare two result files instead of running")
+    add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+    return args
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = parse_args(argv)
+
+    if args.compare:
+        baseline, current = (json.loads(Path(path).read_text()) for path in args.compare)
+        print(f"{baseline['meta']['commit']} -> {current['meta']['commit']}")
+        print("\n".join(compare(baseline, current)))
+        return
+
+    started_at = time.time()
+    if args.base_url:
+        runs = asyncio.run(run_benchmarks(args.base_url, args))
+    else:
+        with tempfile.TemporaryDirectory(prefix="studybuddy-bench-") as workdir:
+            with local_servers(args, Path(workdir)) as base_url:
+                runs = asyncio.run(run_benchmarks(base_url, args))
+
+    config = {
+        name: value for name, value in vars(args).items()
+        if name not in ("output", "compare")
+    }
+    results = {
+        "meta": {
+            "commit": git_commit(),
+            "started_at": started_at,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "config": config,
+        },
+        "runs": runs,
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+        print(f"Results written to {args.output}")
+    else:
+        print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""
+StudyBuddy AI - Silence-Aware Audio Segmentation
+
+This module splits long WAV/PCM lecture recordings into segments that each
+fit under the Whisper upload limit, cutting in the quietest stretch near each
+boundary so words and sentences are not chopped in half.
+
+Core Functionality:
+- Segment budget derived from the byte limit and the PCM frame size
+- Short-window RMS energy scan over a search region before each hard limit
+- Cut placed at the centre of the lowest-energy window (a pause in speech)
+- Segments written as standalone WAV files with the source's format
+
+Performance Characteristics:
+- Pure standard library (wave + array); no decoding libraries required
+- Only the search region before each cut is analysed, so the energy scan
+  touches a small fraction of the recording
+- Frames are copied in bounded blocks, keeping memory flat for large inputs
+
+@version 1.0.0
+@since 2026-10-16
+"""
+
+import array
+import logging
+import math
+import os
+import sys
+import wave
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Tuple
+
+# Configure module-level logger for comprehensive monitoring and debugging
+logger = logging.getLogger(__name__)
+
+# ==================== SEGMENTATION CONFIGURATION ====================
+
+# How far back from each hard limit to look for a pause (seconds)
+SILENCE_SEARCH_SECONDS = float(os.getenv("SEGMENT_SILENCE_SEARCH_SECONDS", "15"))
+
+# Length of each energy analysis window (seconds)
+ENERGY_WINDOW_SECONDS = 0.05
+
+# Upper bound on samples inspected per energy window
+MAX_ENERGY_SAMPLES = 800
+
+# Frames copied per read when writing segment files
+COPY_BLOCK_FRAMES = 64 * 1024
+
+# Size of a canonical WAV header
+WAV_HEADER_BYTES = 44
+
+# array typecodes for PCM sample widths (8-bit WAV is unsigned)
+_SAMPLE_TYPECODES = {1: "B", 2: "h", 4: "i"}
+
+
+@dataclass
+class AudioSegment:
+    """One segment of a longer recording written to its own WAV file."""
+
+    path: str
+    index: int
+    start_seconds: float
+    end_seconds: float
+
+
+def _window_energy(data: bytes, sample_width: int) -> float:
+    """Root-mean-square amplitude of a block of interleaved PCM samples."""
+    samples = array.array(_SAMPLE_TYPECODES[sample_width])
+    samples.frombytes(data[:len(data) - len(data) % sample_width])
+    if not samples:
+        return 0.0
+    # Decimate long windows; a few hundred samples are plenty to tell speech from a pause
+    if len(samples) > MAX_ENERGY_SAMPLES:
+        samples = samples[::len(samples) // MAX_ENERGY_SAMPLES]
+    if sys.byteorder == "big" and sample_width > 1:
+        samples.byteswap()
+    if sample_width == 1:
+        return math.sqrt(sum((s - 128) ** 2 for s in samples) / len(samples))
+    return math.sqrt(sum(s * s for s in samples) / len(samples))
+
+
+def _quietest_frame(reader: wave.Wave_read, search_start: int, search_end: int) -> int:
+    """Return the frame at the centre of the lowest-energy window in a region."""
+    framerate = reader.getframerate()
+    window = max(1, int(framerate * ENERGY_WINDOW_SECONDS))
+    sample_width = reader.getsampwidth()
+
+    best_frame = search_end
+    best_energy = math.inf
+    reader.setpos(search_start)
+    position = search_start
+    while position + window <= search_end:
+        energy = _window_energy(reader.readframes(window), sample_width)
+        # Ties go to the later window so segments stay as long as possible
+        if energy <= best_energy:
+            best_energy = energy
+            best_frame = position + window // 2
+        position += window
+    return best_frame
+
+
+def plan_segments(audio_file_path: str, max_segment_bytes: int) -> List[Tuple[int, int]]:
+    """
+    Choose silence-aligned cut points for a WAV file.
+
+    Args:
+        audio_file_path (str): Path to a PCM WAV file
+        max_segment_bytes (int): Maximum size of each segment file, header included
+
+    Returns:
+        List[Tuple[int, int]]: (start_frame, end_frame) pairs covering the whole file
+
+    Raises:
+        ValueError: When the file is not PCM WAV or the budget is too small
+    """
+    try:
+        reader = wave.open(audio_file_path, "rb")
+    except (wave.Error, EOFError) as e:
+        raise ValueError(f"Audio file is not a readable PCM WAV file: {e}") from e
+
+    with reader:
+        if reader.getsampwidth() not in _SAMPLE_TYPECODES:
+            raise ValueError(f"Unsupported WAV sample width: {reader.getsampwidth() * 8} bits")
+
+        frame_bytes = reader.getsampwidth() * reader.getnchannels()
+        total_frames = reader.getnframes()
+        max_frames = (max_segment_bytes - WAV_HEADER_BYTES) // frame_bytes
+        search_frames = int(SILENCE_SEARCH_SECONDS * reader.getframerate())
+        if max_frames <= search_frames:
+            raise ValueError("Segment size limit is too small for silence-aware splitting")
+
+        segments: List[Tuple[int, int]] = []
+        start = 0
+        while total_frames - start > max_frames:
+            hard_end = start + max_frames
+            cut = _quietest_frame(reader, hard_end - search_frames, hard_end)
+            segments.append((start, cut))
+            start = cut
+        segments.append((start, total_frames))
+        return segments
+
+
+def split_wav(
+    audio_file_path: str,
+    output_dir: str,
+    max_segment_bytes: int
+) -> List[AudioSegment]:
+    """
+    Split a long WAV recording into silence-aligned segment files.
+
+    Args:
+        audio_file_path (str): Path to a PCM WAV file
+        output_dir (str): Directory that receives the segment files
+        max_segment_bytes (int): Maximum size of each segment file, header included
+
+    Returns:
+        List[AudioSegment]: Segments in playback order
+
+    Raises:
+        ValueError: When the file is not PCM WAV or the budget is too small
+
+    Example:
+        >>> segments = split_wav("lecture.wav", tmp_dir, 24 * 1024 * 1024)
+        >>> [round(s.end_seconds) for s in segments]
+        [760, 1512, 2270, 2700]
+    """
+    plan = plan_segments(audio_file_path, max_segment_bytes)
+    segments: List[AudioSegment] = []
+
+    with wave.open(audio_file_path, "rb") as reader:
+        framerate = reader.getframerate()
+        for index, (start, end) in enumerate(plan):
+            segment_path = str(Path(output_dir) / f"segment_{index:04d}.wav")
+            with wave.open(segment_path, "wb") as writer:
+                writer.setnchannels(reader.getnchannels())
+                writer.setsampwidth(reader.getsampwidth())
+                writer.setframerate(framerate)
+                reader.setpos(start)
+                remaining = end - start
+                while remaining > 0:
+                    block = min(COPY_BLOCK_FRAMES, remaining)
+                    writer.writeframes(reader.readframes(block))
+                    remaining -= block
+
+            segments.append(AudioSegment(
+                path=segment_path,
+                index=index,
+                start_seconds=start / framerate,
+                end_seconds=end / framerate
+            ))
+
+    logger.info(f"Split {Path(audio_file_path).name} into {len(segments)} segments")
+    return segments
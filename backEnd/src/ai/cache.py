@@ -0,0 +1,329 @@
+"""
+StudyBuddy AI - Content-Addressed Result Cache
+
+This module provides the caching layer that sits in front of the AI modules so
+that identical requests (the same chapter pasted by every student in a class)
+are answered from memory or disk instead of paying for another API round trip.
+
+Core Functionality:
+- Content-addressed keys built from a digest of normalized text plus parameters
+- In-process LRU tier with a size cap and per-entry time-to-live
+- Optional SQLite tier on disk that survives process restarts
+- Tiered lookups that promote disk hits into memory
+- Hit/miss counters for monitoring cache effectiveness
+
+Design Notes:
+- Values must be JSON-serializable (strings, numbers, lists, dicts)
+- All tiers are thread-safe; the SQLite tier uses a single shared connection
+- Failed or fallback results are never cached by callers
+
+@version 1.0.0
+@since 2026-10-16
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# Configure module-level logger for comprehensive monitoring and debugging
+logger = logging.getLogger(__name__)
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize text so trivially different pastes share a cache key.
+
+    Collapses all runs of whitespace (including newlines) into single spaces and
+    strips leading/trailing whitespace. Case and punctuation are preserved because
+    they can change the meaning of educational content.
+    """
+    return " ".join(text.split())
+
+
+def text_digest(text: str) -> str:
+    """SHA-256 hex digest of the normalized text."""
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+def make_cache_key(namespace: str, text: str, **params: Any) -> str:
+    """
+    Build a content-addressed cache key.
+
+    Args:
+        namespace (str): Logical cache namespace (e.g. "summary")
+        text (str): Source content; only its normalized digest enters the key
+        **params: Generation parameters that change the output (style, tokens, model)
+
+    Returns:
+        str: Key of the form "<namespace>:<sha256>"
+
+    Example:
+        >>> make_cache_key("summary", "Photosynthesis...", learning_style="visual",
+        ...                max_tokens=300, model="gpt-3.5-turbo")
+        'summary:5f2c...'
+    """
+    material = json.dumps(
+        {"text": text_digest(text), "params": params},
+        sort_keys=True,
+        default=str,
+    )
+    return f"{namespace}:{hashlib.sha256(material.encode('utf-8')).hexdigest()}"
+
+
+class LRUCache:
+    """
+    Thread-safe in-process LRU cache with a size cap and time-to-live.
+
+    Args:
+        max_entries (int): Maximum number of entries kept before evicting the
+            least recently used one
+        ttl_seconds (Optional[float]): Entry lifetime; None disables expiry
+        clock (Callable[[], float]): Monotonic time source (injectable for tests)
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[str, Tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None when missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if self.ttl_seconds is not None and self._clock() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a value, evicting the least recently used entries past the cap."""
+        with self._lock:
+            self._entries[key] = (self._clock(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        """Remove a single entry if present."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCache:
+    """
+    Persistent cache tier backed by a local SQLite database.
+
+    Entries survive process restarts. The table is bounded by `max_entries`;
+    when it grows past the cap the least recently accessed rows are evicted.
+
+    Args:
+        path (str): Database file path (parent directories are created)
+        max_entries (int): Maximum rows kept on disk
+        ttl_seconds (Optional[float]): Entry lifetime; None disables expiry
+        clock (Callable[[], float]): Wall-clock time source (injectable for tests)
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: int = 10000,
+        ttl_seconds: Optional[float] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS cache_entries (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_cache_entries_accessed ON cache_entries (accessed_at)"
+        )
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None when missing or expired."""
+        now = self._clock()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM cache_entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, created_at = row
+            if self.ttl_seconds is not None and now - created_at > self.ttl_seconds:
+                self._conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+                return None
+            self._conn.execute(
+                "UPDATE cache_entries SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+        return json.loads(value)
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a value and evict the least recently accessed rows past the cap."""
+        now = self._clock()
+        payload = json.dumps(value)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache_entries (key, value, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, payload, now, now),
+            )
+            self._conn.execute(
+                "DELETE FROM cache_entries WHERE key IN ("
+                "SELECT key FROM cache_entries ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def delete(self, key: str) -> None:
+        """Remove a single entry if present."""
+        with self._lock:
+            self._conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            self._conn.execute("DELETE FROM cache_entries")
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM cache_entries").fetchone()[0]
+
+
+class TieredCache:
+    """
+    Two-tier cache: in-process LRU in front of an optional SQLite tier.
+
+    Lookups check memory first, then disk; disk hits are promoted into memory.
+    Writes go to both tiers. Hit and miss counters are kept for monitoring.
+
+    Args:
+        memory (LRUCache): In-process tier
+        disk (Optional[SQLiteCache]): Persistent tier, or None for memory only
+        name (str): Cache name used in logs and stats
+    """
+
+    def __init__(self, memory: LRUCache, disk: Optional[SQLiteCache] = None, name: str = "cache"):
+        self.memory = memory
+        self.disk = disk
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self._stats_lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return a cached value from the fastest tier that has it, or None."""
+        value = self.memory.get(key)
+        if value is not None:
+            self._record(hit=True, tier="memory")
+            return value
+
+        if self.disk is not None:
+            try:
+                value = self.disk.get(key)
+            except sqlite3.Error as e:
+                logger.warning(f"{self.name} disk cache read failed: {e}")
+                value = None
+            if value is not None:
+                self.memory.set(key, value)
+                self._record(hit=True, tier="disk")
+                return value
+
+        self._record(hit=False)
+        return None
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a value in every tier."""
+        self.memory.set(key, value)
+        if self.disk is not None:
+            try:
+                self.disk.set(key, value)
+            except sqlite3.Error as e:
+                logger.warning(f"{self.name} disk cache write failed: {e}")
+
+    def delete(self, key: str) -> None:
+        """Remove a key from every tier."""
+        self.memory.delete(key)
+        if self.disk is not None:
+            self.disk.delete(key)
+
+    def clear(self) -> None:
+        """Remove every entry from every tier and reset the counters."""
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+        with self._stats_lock:
+            self.hits = self.misses = self.memory_hits = self.disk_hits = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and tier sizes for monitoring endpoints."""
+        with self._stats_lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "memory_entries": len(self.memory),
+                "disk_enabled": self.disk is not None,
+            }
+
+    def _record(self, hit: bool, tier: Optional[str] = None) -> None:
+        with self._stats_lock:
+            if hit:
+                self.hits += 1
+                if tier == "memory":
+                    self.memory_hits += 1
+                else:
+                    self.disk_hits += 1
+            else:
+                self.misses += 1
@@ -0,0 +1,266 @@
+"""
+StudyBuddy AI - Circuit Breakers for Upstream OpenAI Operations
+
+When OpenAI degrades, every request would otherwise wait out the full client
+timeout (plus retries) before failing, tying up a worker the whole time. A
+circuit breaker per upstream operation notices the run of failures, opens, and
+from then on rejects calls immediately so the API can answer with a 503 (or
+from its caches) while the upstream recovers.
+
+Core Functionality:
+- One breaker per operation ("chat.completions", "audio.transcriptions")
+- Closed -> open after CIRCUIT_FAILURE_THRESHOLD consecutive upstream failures
+- Open -> half-open after CIRCUIT_RECOVERY_SECONDS; a single probe call is let
+  through and its outcome closes the circuit again or re-opens it
+- CircuitOpenError (a RuntimeError) carries the seconds until the next probe,
+  used for the Retry-After header of the 503
+- protected_call()/protected_call_async() put a request behind both its
+  operation's breaker and its model's rate limiter, and time every attempt
+  for the upstream metrics
+- State and counters for /health/detailed
+
+What Counts as a Failure:
+- Connection errors, timeouts and 5xx responses, after the rate limiter's own
+  retries are exhausted
+- Any other answer from the API (bad request, rate limit) shows the upstream is
+  reachable and counts as healthy
+
+@version 1.0.0
+@since 2026-10-16
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+import openai
+from src.ai.metrics import measure_upstream, measure_upstream_async
+from src.ai.rate_limiter import get_limiter
+
+# Configure module-level logger for comprehensive monitoring and debugging
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# ==================== CONFIGURATION ====================
+
+# Consecutive upstream failures that open the circuit
+FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+
+# Seconds the circuit stays open before a probe call is allowed
+RECOVERY_SECONDS = float(os.getenv("CIRCUIT_RECOVERY_SECONDS", "30"))
+
+# Upstream operations guarded by their own breaker
+CHAT_COMPLETIONS = "chat.completions"
+AUDIO_TRANSCRIPTIONS = "audio.transcriptions"
+
+# Breaker states
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling an upstream operation whose circuit is open."""
+
+    def __init__(self, operation: str, retry_after: float):
+        super().__init__("AI service is temporarily unavailable. Please try again shortly.")
+        self.operation = operation
+        self.retry_after = retry_after
+
+
+def is_upstream_failure(error: BaseException) -> bool:
+    """Whether an error says the upstream itself is unhealthy."""
+    return isinstance(error, (openai.APIConnectionError, openai.InternalServerError))
+
+
+class CircuitBreaker:
+    """
+    Closed/open/half-open breaker for one upstream operation.
+
+    Args:
+        name (str): Operation the breaker guards (used in logs and errors)
+        failure_threshold (int): Consecutive failures that open the circuit
+        recovery_seconds (float): Time open before a probe is allowed
+        clock (Callable[[], float]): Monotonic time source (injectable for tests)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = FAILURE_THRESHOLD,
+        recovery_seconds: float = RECOVERY_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be at least 1")
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_seconds = recovery_seconds
+        self._clock = clock
+        self._state = CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+        self._counters = {"opened": 0, "rejected": 0}
+
+    @property
+    def state(self) -> str:
+        """Current state; an open circuit past its recovery time reads as half-open."""
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == OPEN and self._clock() - self._opened_at >= self.recovery_seconds:
+            return HALF_OPEN
+        return self._state
+
+    def _acquire(self) -> bool:
+        """Admit a call, returning whether it is the half-open probe."""
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return False
+            if state == HALF_OPEN and not self._probe_in_flight:
+                self._state = HALF_OPEN
+                self._probe_in_flight = True
+                logger.info(f"Circuit {self.name} half-open: sending probe request")
+                return True
+            self._counters["rejected"] += 1
+            retry_after = max(0.0, self._opened_at + self.recovery_seconds - self._clock())
+        raise CircuitOpenError(self.name, retry_after)
+
+    def _record(self, probe: bool, error: Optional[BaseException] = None) -> None:
+        """Update the state with the outcome of an admitted call."""
+        with self._lock:
+            if probe:
+                self._probe_in_flight = False
+
+            if error is None or not is_upstream_failure(error):
+                # Any answer from the upstream, even an error, shows it is reachable
+                if self._state != CLOSED:
+                    logger.info(f"Circuit {self.name} closed: upstream recovered")
+                self._state = CLOSED
+                self._consecutive_failures = 0
+                return
+
+            self._consecutive_failures += 1
+            if probe or self._consecutive_failures >= self.failure_threshold:
+                if self._state != OPEN:
+                    self._counters["opened"] += 1
+                    logger.error(
+                        f"Circuit {self.name} opened after {self._consecutive_failures} "
+                        f"consecutive failures: {error}"
+                    )
+                self._state = OPEN
+                self._opened_at = self._clock()
+
+    def _release_probe(self, probe: bool) -> None:
+        """Give the probe slot back when the probe was cancelled without an outcome."""
+        if probe:
+            with self._lock:
+                self._probe_in_flight = False
+
+    async def call_async(self, request: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run an async upstream request through the breaker.
+
+        Raises:
+            CircuitOpenError: Immediately, while the circuit is open
+            Exception: Whatever the request raised
+        """
+        probe = self._acquire()
+        try:
+            result = await request()
+        except Exception as e:
+            self._record(probe, e)
+            raise
+        except BaseException:
+            self._release_probe(probe)
+            raise
+        self._record(probe)
+        return result
+
+    def call(self, request: Callable[[], T]) -> T:
+        """Blocking counterpart of call_async() for synchronous callers."""
+        probe = self._acquire()
+        try:
+            result = request()
+        except Exception as e:
+            self._record(probe, e)
+            raise
+        except BaseException:
+            self._release_probe(probe)
+            raise
+        self._record(probe)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """State, failure streak and counters for monitoring."""
+        with self._lock:
+            return {
+                "state": self._current_state(),
+                "consecutive_failures": self._consecutive_failures,
+                **self._counters,
+            }
+
+
+# ==================== SHARED BREAKERS ====================
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_registry_lock = threading.Lock()
+
+
+def get_breaker(operation: str) -> CircuitBreaker:
+    """Return the process-wide breaker for an upstream operation."""
+    breaker = _breakers.get(operation)
+    if breaker is None:
+        with _registry_lock:
+            breaker = _breakers.setdefault(operation, CircuitBreaker(operation))
+    return breaker
+
+
+def breaker_stats() -> Dict[str, Dict[str, Any]]:
+    """Stats for both guarded operations, keyed by operation."""
+    return {operation: get_breaker(operation).stats() for operation in (CHAT_COMPLETIONS, AUDIO_TRANSCRIPTIONS)}
+
+
+def reset_breakers() -> None:
+    """Forget every breaker so all circuits start closed (tests and reconfiguration)."""
+    with _registry_lock:
+        _breakers.clear()
+
+
+async def protected_call_async(
+    operation: str,
+    model: str,
+    request: Callable[[], Awaitable[T]],
+    tokens: int = 0
+) -> T:
+    """
+    Run an async OpenAI request behind its operation's breaker and model's rate limiter.
+
+    Args:
+        operation (str): CHAT_COMPLETIONS or AUDIO_TRANSCRIPTIONS
+        model (str): Model whose rate-limit budget the request spends
+        request (Callable[[], Awaitable[T]]): Zero-argument factory for the API call
+        tokens (int): Prompt plus completion tokens the request may consume
+
+    Raises:
+        CircuitOpenError: Without calling upstream while the circuit is open
+    """
+    return await get_breaker(operation).call_async(
+        lambda: get_limiter(model).call_async(
+            lambda: measure_upstream_async(operation, model, request), tokens=tokens
+        )
+    )
+
+
+def protected_call(operation: str, model: str, request: Callable[[], T], tokens: int = 0) -> T:
+    """Blocking counterpart of protected_call_async()."""
+    return get_breaker(operation).call(
+        lambda: get_limiter(model).call(lambda: measure_upstream(operation, model, request), tokens=tokens)
+    )
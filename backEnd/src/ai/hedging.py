@@ -0,0 +1,195 @@
+"""
+StudyBuddy AI - Hedged Requests for Tail-Latency Reduction
+
+Most completions come back in a predictable time, but now and then one is far
+slower than the rest and that outlier sets the p99 of the whole endpoint. A
+hedged request waits until the call has taken longer than almost every recent
+call of its kind, then sends a second identical call: whichever finishes first
+is used and the other is cancelled. Because only the slowest few percent of
+calls are hedged, and hedges are rationed by a budget, tail latency drops
+without doubling spend.
+
+Core Functionality:
+- Rolling latency window per hedged operation (summary, quiz)
+- Hedge delay at a configurable latency percentile (default p95)
+- Hedge budget: every call earns HEDGE_BUDGET of a hedge and a hedge costs one,
+  so at most that fraction of calls are ever duplicated, even in bursts
+- First successful response wins; the loser is cancelled, which also releases
+  its rate-limiter slot and closes its connection
+- Counters (calls, hedged, hedge wins, budget refusals) for monitoring
+
+Configuration (environment variables):
+- HEDGE_REQUESTS: Enable hedging ("true"/"false", default false)
+- HEDGE_PERCENTILE: Latency percentile that triggers a hedge (default 95)
+- HEDGE_BUDGET: Largest fraction of calls that may be hedged (default 0.05)
+- HEDGE_MIN_SAMPLES: Calls observed before hedging starts (default 20)
+
+Design Notes:
+- Only async non-streaming calls are hedged; a blocking call in a worker thread
+  cannot be cancelled, so a sync hedge would always pay for both calls
+- The hedge goes through the same rate limiter and circuit breaker as the
+  original call, so it never bypasses the account budget
+
+@version 1.0.0
+@since 2026-10-16
+"""
+
+import asyncio
+import logging
+import math
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, TypeVar
+
+# Configure module-level logger for comprehensive monitoring and debugging
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# ==================== CONFIGURATION ====================
+
+HEDGING_ENABLED = os.getenv("HEDGE_REQUESTS", "false").lower() == "true"
+
+# Latency percentile after which a second call is sent
+HEDGE_PERCENTILE = float(os.getenv("HEDGE_PERCENTILE", "95"))
+
+# Largest fraction of calls that may be hedged
+HEDGE_BUDGET = float(os.getenv("HEDGE_BUDGET", "0.05"))
+
+# Latencies observed before the percentile is trusted
+HEDGE_MIN_SAMPLES = int(os.getenv("HEDGE_MIN_SAMPLES", "20"))
+
+# Recent latencies kept per operation
+LATENCY_WINDOW = 200
+
+# Unused hedge budget that may be saved up for a burst of slow calls
+MAX_SAVED_HEDGES = 10.0
+
+
+class Hedger:
+    """
+    Hedging policy and latency history for one kind of upstream call.
+
+    Args:
+        name (str): Operation name used in logs and stats (e.g. "quiz")
+        enabled (bool): Whether calls are hedged at all
+        percentile (float): Latency percentile that triggers the hedge
+        budget (float): Largest fraction of calls that may be hedged
+        min_samples (int): Calls observed before hedging starts
+        clock (Callable[[], float]): Monotonic time source (injectable for tests)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        enabled: bool = HEDGING_ENABLED,
+        percentile: float = HEDGE_PERCENTILE,
+        budget: float = HEDGE_BUDGET,
+        min_samples: int = HEDGE_MIN_SAMPLES,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if not 0 < percentile < 100:
+            raise ValueError("percentile must be between 0 and 100")
+        self.name = name
+        self.enabled = enabled
+        self.percentile = percentile
+        self.budget = budget
+        self.min_samples = min_samples
+        self._clock = clock
+        self._latencies: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self._saved_hedges = 0.0
+        self._lock = threading.Lock()
+        self._counters = {"calls": 0, "hedged": 0, "hedge_wins": 0, "budget_exhausted": 0}
+
+    def hedge_delay(self) -> Optional[float]:
+        """Seconds after which a call is hedged, or None until enough calls were seen."""
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return None
+            ordered = sorted(self._latencies)
+        index = min(len(ordered) - 1, math.ceil(len(ordered) * self.percentile / 100) - 1)
+        return ordered[index]
+
+    def _record(self, latency: float) -> None:
+        with self._lock:
+            self._latencies.append(latency)
+
+    def _start_call(self) -> None:
+        with self._lock:
+            self._counters["calls"] += 1
+            self._saved_hedges = min(MAX_SAVED_HEDGES, self._saved_hedges + self.budget)
+
+    def _take_hedge(self) -> bool:
+        """Spend one hedge from the budget, if there is one to spend."""
+        with self._lock:
+            if self._saved_hedges < 1:
+                self._counters["budget_exhausted"] += 1
+                return False
+            self._saved_hedges -= 1
+            self._counters["hedged"] += 1
+            return True
+
+    async def _timed(self, request: Callable[[], Awaitable[T]]) -> T:
+        started = self._clock()
+        result = await request()
+        self._record(self._clock() - started)
+        return result
+
+    async def call_async(self, request: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run a request, sending an identical second one if it is unusually slow.
+
+        Args:
+            request (Callable[[], Awaitable[T]]): Zero-argument factory for the call;
+                invoked a second time for the hedge
+
+        Returns:
+            T: The result of whichever call succeeded first
+
+        Raises:
+            Exception: The original call's error (or the hedge's, when both fail)
+        """
+        self._start_call()
+        delay = self.hedge_delay() if self.enabled else None
+        if delay is None:
+            return await self._timed(request)
+
+        primary = asyncio.ensure_future(self._timed(request))
+        tasks = {primary}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done or not self._take_hedge():
+                return await primary
+
+            logger.info(f"{self.name} call slower than p{self.percentile:g} ({delay:.2f}s); sending hedge")
+            hedge = asyncio.ensure_future(self._timed(request))
+            tasks.add(hedge)
+
+            error: Optional[BaseException] = None
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            with self._lock:
+                                self._counters["hedge_wins"] += 1
+                        return task.result()
+                    if error is None or task is primary:
+                        error = task.exception()
+            raise error
+        finally:
+            for task in (primary, *tasks):
+                if not task.done():
+                    task.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters and the current hedge delay for monitoring."""
+        delay = self.hedge_delay()
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "hedge_delay_ms": delay * 1000 if delay is not None else None,
+                **self._counters,
+            }
@@ -0,0 +1,107 @@
+"""
+StudyBuddy AI - Incremental JSON Array Parser
+
+This module parses a JSON array that arrives in pieces (a streamed chat
+completion) and hands back each top-level element the moment it is complete,
+instead of waiting for the closing bracket and a single json.loads().
+
+Core Functionality:
+- Character-level scanner that tracks nesting depth, strings and escapes
+- Objects and arrays are emitted as soon as their closing brace/bracket arrives
+- Scalars are emitted at the following comma or the closing bracket
+- Text before the opening bracket (e.g. a ```json fence or a short preamble)
+  is skipped, and everything after the closing bracket is ignored
+
+Performance Characteristics:
+- Every character is scanned exactly once; only the element currently being
+  built is buffered, so memory stays bounded by the largest single element
+
+@version 1.0.0
+@since 2026-10-16
+"""
+
+import json
+from typing import Any, List
+
+
+class JSONArrayStreamParser:
+    """
+    Incremental parser for a top-level JSON array.
+
+    Example:
+        >>> parser = JSONArrayStreamParser()
+        >>> parser.feed('[{"q": 1}, {"q"')
+        [{'q': 1}]
+        >>> parser.feed(': 2}]')
+        [{'q': 2}]
+        >>> parser.done
+        True
+
+    Raises:
+        ValueError: When the first JSON value in the stream is not an array
+        json.JSONDecodeError: When a completed element is not valid JSON
+    """
+
+    def __init__(self):
+        self.started = False
+        self.done = False
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._element: List[str] = []
+
+    def feed(self, text: str) -> List[Any]:
+        """Consume the next piece of the stream and return newly completed elements."""
+        completed: List[Any] = []
+        for char in text:
+            if self.done:
+                break
+
+            if not self.started:
+                if char == "[":
+                    self.started = True
+                    self._depth = 1
+                elif char in "{\"":
+                    raise ValueError("Quiz response must be a list of questions")
+                continue
+
+            if self._in_string:
+                self._element.append(char)
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == "\"":
+                    self._in_string = False
+                continue
+
+            if char == "\"":
+                self._in_string = True
+                self._element.append(char)
+            elif char in "[{":
+                self._depth += 1
+                self._element.append(char)
+            elif char in "]}":
+                self._depth -= 1
+                if self._depth == 0:
+                    # Closing bracket of the top-level array
+                    completed.extend(self._take_element())
+                    self.done = True
+                    continue
+                self._element.append(char)
+                if self._depth == 1:
+                    # A nested object/array just closed at the top level: emit it now
+                    completed.extend(self._take_element())
+            elif char == "," and self._depth == 1:
+                completed.extend(self._take_element())
+            elif self._element or not char.isspace():
+                self._element.append(char)
+        return completed
+
+    def _take_element(self) -> List[Any]:
+        """Decode and clear the buffered element; an empty list when nothing is buffered."""
+        raw = "".join(self._element).strip()
+        self._element = []
+        if not raw:
+            return []
+        return [json.loads(raw)]
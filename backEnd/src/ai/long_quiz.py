@@ -0,0 +1,325 @@
+"""
+StudyBuddy AI - Long-Content Quiz Generation
+
+This module builds exams from documents far beyond the single-call limits of
+generate_quiz() (8,000 characters, 10 questions) - whole textbook chapters,
+lecture transcripts, course packets - by splitting the content into sections,
+sharing the requested question count among them by content weight, and
+generating every section's questions concurrently.
+
+Core Functionality:
+- Paragraph/sentence aware sections that each fit one quiz call (see src.ai.chunking)
+- Question allocation proportional to each section's content weight: its
+  number of distinct concept keywords, so dense material gets more questions
+  than introductions, recaps and filler
+- Concurrent per-section generation under a bounded concurrency limit; every
+  section goes through the question bank, coalescing, hedging and the circuit
+  breaker like a regular quiz
+- Near-duplicate questions across sections removed locally with MinHash
+  (see src.ai.similarity); sections ask for a small surplus so the exam still
+  reaches the requested size after deduplication
+
+Performance Characteristics:
+- All sections run in parallel, so a 40-question exam over a 60-page chapter
+  takes roughly the latency of one quiz call (given enough concurrency)
+
+@version 1.0.0
+@since 2026-10-16
+"""
+
+import asyncio
+import logging
+import math
+import os
+from typing import Any, Dict, List, Mapping, Tuple
+
+from src.ai.chunking import split_text
+from src.ai.circuit_breaker import CircuitOpenError
+from src.ai.question_bank import MAX_SOURCE_KEYWORDS, concept_keywords
+from src.ai.quiz_generator import (
+    DEFAULT_QUESTION_TYPES,
+    MAX_INPUT_CHARS,
+    QuestionTypes,
+    generate_quiz_banked_async,
+    question_type_counts,
+    question_type_of,
+)
+from src.ai.similarity import DUPLICATE_THRESHOLD, NearDuplicateFilter
+
+# Configure module-level logger for comprehensive monitoring and debugging
+logger = logging.getLogger(__name__)
+
+# ==================== LONG-CONTENT QUIZ CONFIGURATION ====================
+
+# Hard ceilings on document size and exam length accepted by the long-content mode
+LONG_QUIZ_MAX_INPUT_CHARS = int(os.getenv("LONG_QUIZ_MAX_CHARS", "500000"))
+LONG_QUIZ_MAX_QUESTIONS = int(os.getenv("LONG_QUIZ_MAX_QUESTIONS", "50"))
+
+# Section size in characters, always capped to what one quiz call accepts
+SECTION_CHARS = int(os.getenv("LONG_QUIZ_SECTION_CHARS", "6000"))
+
+# Questions one quiz call may produce
+MAX_QUESTIONS_PER_SECTION = 10
+
+# Extra questions asked of each section, as a share of its allocation, to make
+# up for near-duplicates removed across sections
+SURPLUS_RATIO = float(os.getenv("LONG_QUIZ_SURPLUS_RATIO", "0.2"))
+
+# Maximum simultaneous section calls per document
+DEFAULT_MAX_CONCURRENCY = int(os.getenv("LONG_QUIZ_CONCURRENCY", "8"))
+
+
+def section_weight(section: str) -> int:
+    """Content weight of a section: its distinct concept keywords (at least 1)."""
+    return max(1, len(concept_keywords(section, MAX_SOURCE_KEYWORDS)))
+
+
+def allocate_questions(weights: List[int], total: int, per_section_cap: int = MAX_QUESTIONS_PER_SECTION) -> List[int]:
+    """
+    Share `total` questions among sections in proportion to their weights.
+
+    Uses the largest-remainder method, so the shares always add up to `total`,
+    and moves any share above `per_section_cap` on to the other sections.
+
+    Args:
+        weights (List[int]): Positive content weight of every section
+        total (int): Questions to allocate
+        per_section_cap (int): Most questions a single section may receive
+
+    Returns:
+        List[int]: Questions per section, in section order
+
+    Raises:
+        ValueError: When the sections cannot hold `total` questions
+    """
+    if total > per_section_cap * len(weights):
+        raise ValueError(
+            f"Content too short for {total} questions (at most {per_section_cap * len(weights)})"
+        )
+
+    shares = [0] * len(weights)
+    open_sections = list(range(len(weights)))
+    remaining = total
+    while remaining:
+        weight_sum = sum(weights[i] for i in open_sections)
+        exact = {i: remaining * weights[i] / weight_sum for i in open_sections}
+        granted = {i: min(math.floor(exact[i]), per_section_cap - shares[i]) for i in open_sections}
+        leftover = remaining - sum(granted.values())
+        # Remaining questions go to the largest fractional parts, earlier sections first on ties
+        for i in sorted(open_sections, key=lambda i: (granted[i] - exact[i], i)):
+            if not leftover:
+                break
+            if shares[i] + granted[i] < per_section_cap:
+                granted[i] += 1
+                leftover -= 1
+        for i, count in granted.items():
+            shares[i] += count
+        remaining = leftover
+        open_sections = [i for i in open_sections if shares[i] < per_section_cap]
+    return shares
+
+
+def allocate_types(type_counts: Mapping[str, int], allocation: List[int]) -> List[Dict[str, int]]:
+    """
+    Share the exam's questions of each type among sections.
+
+    The types are interleaved evenly over the whole exam and the sequence is cut
+    into the sections' shares, so every section gets a mix close to the exam's
+    and the totals per type are exact even when sections hold one or two questions.
+
+    Args:
+        type_counts (Mapping[str, int]): Questions of each type in the exam
+        allocation (List[int]): Questions per section, adding up to the exam length
+
+    Returns:
+        List[Dict[str, int]]: Positive count per type for every section
+    """
+    slots = sorted(
+        ((index + 0.5) / count, order, question_type)
+        for order, (question_type, count) in enumerate(type_counts.items())
+        for index in range(count)
+    )
+    sequence = [question_type for _, _, question_type in slots]
+
+    shares, start = [], 0
+    for share in allocation:
+        counts: Dict[str, int] = {}
+        for question_type in sequence[start:start + share]:
+            counts[question_type] = counts.get(question_type, 0) + 1
+        shares.append(counts)
+        start += share
+    return shares
+
+def _with_surplus(counts: Mapping[str, int], surplus: int) -> Dict[str, int]:
+    """Section type counts plus surplus questions spread over the same types."""
+    padded = dict(counts)
+    types = list(counts)
+    for index in range(surplus):
+        padded[types[index % len(types)]] += 1
+    return padded
+
+def _select_questions(
+    section_questions: List[List[Dict[str, Any]]],
+    section_types: List[Dict[str, int]],
+    threshold: float
+) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Drop near-duplicates across sections and assemble the exam in document order.
+
+    Every section keeps up to its quota of unique questions of each type. Quotas
+    left unfilled by removed duplicates are made up from other sections' surplus
+    of the same type first, then from any surplus, so the exam keeps its length.
+
+    Returns:
+        Tuple[List[Dict[str, Any]], int]: The exam and the number of duplicates removed
+    """
+    seen = NearDuplicateFilter(threshold)
+    unique = [[q for q in questions if seen.add(q["question"])] for questions in section_questions]
+    duplicates_removed = sum(len(questions) for questions in section_questions) - len(seen)
+
+    chosen = set()
+    shortfall: Dict[str, int] = {}
+    for section, (questions, quota) in enumerate(zip(unique, section_types, strict=True)):
+        wanted = dict(quota)
+        for index, question in enumerate(questions):
+            if wanted.get(question_type_of(question), 0) > 0:
+                wanted[question_type_of(question)] -= 1
+                chosen.add((section, index))
+        for question_type, count in wanted.items():
+            shortfall[question_type] = shortfall.get(question_type, 0) + count
+
+    leftovers = [
+        (section, index) for section, questions in enumerate(unique)
+        for index in range(len(questions)) if (section, index) not in chosen
+    ]
+    for section, index in leftovers:
+        question_type = question_type_of(unique[section][index])
+        if shortfall.get(question_type, 0) > 0:
+            shortfall[question_type] -= 1
+            chosen.add((section, index))
+    missing = sum(shortfall.values())
+    for section, index in leftovers:
+        if missing and (section, index) not in chosen:
+            missing -= 1
+            chosen.add((section, index))
+    return [unique[section][index] for section, index in sorted(chosen)], duplicates_removed
+
+
+async def generate_long_quiz_async(
+    text: str,
+    num_questions: int = 20,
+    difficulty: str = "high_school",
+    learning_style: str = "reading",
+    question_types: QuestionTypes = DEFAULT_QUESTION_TYPES,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    duplicate_threshold: float = DUPLICATE_THRESHOLD
+) -> Dict[str, Any]:
+    """
+    Section-Parallel Quiz Generation for Long Educational Documents
+
+    Produces one exam of up to LONG_QUIZ_MAX_QUESTIONS questions from documents of
+    any size up to LONG_QUIZ_MAX_INPUT_CHARS. Short documents become a single
+    section, which is exactly a regular (banked) quiz call.
+
+    Processing Pipeline:
+    1. Split the document on paragraph/sentence boundaries into quiz-sized sections
+    2. Allocate the questions by content weight, capped at 10 per section,
+       and the exam's question types over the sections
+    3. Generate every section's questions (plus a small surplus) concurrently
+    4. Remove near-duplicates across sections and trim to the requested count
+
+    Args:
+        text (str): Document to quiz on (max LONG_QUIZ_MAX_INPUT_CHARS characters)
+        num_questions (int, optional): Exam length (1-LONG_QUIZ_MAX_QUESTIONS)
+        difficulty (str, optional): "middle_school", "high_school" or "college"
+        learning_style (str, optional): "visual", "auditory", "reading" or "kinesthetic"
+        question_types (QuestionTypes, optional): Question formats, mixed evenly
+            over the exam (or explicit counts per type); every section gets a
+            share of each type
+        max_concurrency (int, optional): Maximum simultaneous section calls
+        duplicate_threshold (float, optional): Estimated Jaccard similarity at
+            which two questions count as duplicates
+
+    Returns:
+        Dict[str, Any]: Result with keys:
+            - "questions": The exam in document order (shorter than requested
+              only when the sections could not supply enough distinct questions)
+            - "section_count": Number of sections the document was split into
+            - "duplicates_removed": Near-duplicate questions dropped across sections
+            - "from_bank": Questions served from the question bank
+
+    Raises:
+        ValueError: Empty or oversized input, invalid counts, or content too
+            short for the requested number of questions
+        CircuitOpenError: The quiz circuit is open
+        RuntimeError: A section failed
+
+    Example:
+        >>> result = await generate_long_quiz_async(chapter, num_questions=40)
+        >>> result["section_count"], len(result["questions"])
+        (30, 40)
+    """
+    # ==================== INPUT VALIDATION ====================
+
+    if not text or not text.strip():
+        raise ValueError("Input text cannot be empty")
+    if len(text) > LONG_QUIZ_MAX_INPUT_CHARS:
+        raise ValueError(f"Input text too long (max {LONG_QUIZ_MAX_INPUT_CHARS:,} characters)")
+    if not 1 <= num_questions <= LONG_QUIZ_MAX_QUESTIONS:
+        raise ValueError(f"Number of questions must be between 1 and {LONG_QUIZ_MAX_QUESTIONS}")
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1")
+    type_counts = question_type_counts(num_questions, question_types)
+
+    sections = split_text(text.strip(), min(SECTION_CHARS, MAX_INPUT_CHARS))
+    allocation = allocate_questions([section_weight(section) for section in sections], num_questions)
+    section_types = allocate_types(type_counts, allocation)
+    # A single section has nothing to be deduplicated against, so it needs no surplus
+    surplus_ratio = SURPLUS_RATIO if len(sections) > 1 else 0.0
+    requests = [
+        (section, _with_surplus(types, min(MAX_QUESTIONS_PER_SECTION - share, math.ceil(share * surplus_ratio))))
+        for section, share, types in zip(sections, allocation, section_types, strict=True) if share
+    ]
+    logger.info(
+        f"Long quiz: {len(sections)} sections, {num_questions} questions "
+        f"over {len(requests)} section calls"
+    )
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def section_quiz(section: str, types: Dict[str, int]):
+        async with semaphore:
+            return await generate_quiz_banked_async(
+                section, sum(types.values()), difficulty, learning_style, types
+            )
+
+    try:
+        results = await asyncio.gather(*(section_quiz(section, types) for section, types in requests))
+
+    except (ValueError, CircuitOpenError):
+        raise
+
+    except Exception as e:
+        logger.error(f"Long quiz generation failed: {e}")
+        raise RuntimeError("Unable to generate quiz questions for this document. Please try again.") from e
+
+    # ==================== CROSS-SECTION DEDUPLICATION ====================
+
+    questions, duplicates_removed = _select_questions(
+        [questions for questions, _ in results],
+        [types for types in section_types if types],
+        duplicate_threshold
+    )
+    if len(questions) < num_questions:
+        logger.warning(f"Long quiz short of distinct questions: {len(questions)} of {num_questions}")
+
+    logger.info(
+        f"Long quiz complete: {len(questions)} questions, "
+        f"{duplicates_removed} near-duplicates removed"
+    )
+    return {
+        "questions": questions,
+        "section_count": len(sections),
+        "duplicates_removed": duplicates_removed,
+        "from_bank": sum(from_bank for _, from_bank in results),
+    }
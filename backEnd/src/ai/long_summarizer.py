@@ -0,0 +1,282 @@
+"""
+StudyBuddy AI - Long-Document Map-Reduce Summarization
+
+This module summarizes documents far beyond the single-call limit of
+summarize_text() - full lecture transcripts, textbook chapters, course packets -
+by splitting them into boundary-aligned chunks, condensing the chunks
+concurrently, and hierarchically reducing the partial notes until they fit a
+single learning-style adapted summary call.
+
+Core Functionality:
+- Paragraph/sentence aware chunking with overlap (see src.ai.chunking), measured
+  in model tokens so every chunk provably fits beside its prompt (see src.ai.tokens)
+- Concurrent "map" pass over all chunks under a bounded concurrency limit
+- Hierarchical "reduce" passes, each level also running concurrently
+- Final pass applies the requested learning style and max_tokens budget
+
+Performance Characteristics:
+- Every level of the reduction tree runs in parallel, so wall-clock time grows
+  with tree depth (logarithmic in document length), not with the chunk count
+- Each reduce level shrinks the notes by roughly CHUNK_TOKENS / PARTIAL_MAX_TOKENS,
+  so even book-length input converges in a handful of levels
+
+@version 1.0.0
+@since 2026-10-16
+"""
+
+import asyncio
+import logging
+import os
+from typing import Any, Dict, List
+
+from src.ai.cache import make_cache_key
+from src.ai.chunking import split_text
+from src.ai.openai_client import async_client
+from src.ai.circuit_breaker import CHAT_COMPLETIONS, CircuitOpenError, protected_call_async
+from src.ai.summarizer import (
+    MAX_INPUT_CHARS,
+    SUMMARY_MODEL,
+    _build_summary_messages,
+    _extract_summary,
+    summary_cache,
+)
+from src.ai.tokens import completion_budget, count_tokens, input_budget, request_tokens
+
+# Configure module-level logger for comprehensive monitoring and debugging
+logger = logging.getLogger(__name__)
+
+# ==================== LONG-DOCUMENT CONFIGURATION ====================
+
+# Hard ceiling on document size accepted by the long-document mode
+LONG_MAX_INPUT_CHARS = int(os.getenv("LONG_SUMMARY_MAX_CHARS", "500000"))
+
+# Chunk size and overlap (tokens) for the map and reduce passes. Chunks are always
+# capped to what fits the context beside the prompt and reply; 0 fills the context.
+CHUNK_TOKENS = int(os.getenv("LONG_SUMMARY_CHUNK_TOKENS", "1500"))
+CHUNK_OVERLAP_TOKENS = int(os.getenv("LONG_SUMMARY_CHUNK_OVERLAP_TOKENS", "100"))
+
+# Completion budget for each partial (map/reduce) note set
+PARTIAL_MAX_TOKENS = int(os.getenv("LONG_SUMMARY_PARTIAL_MAX_TOKENS", "400"))
+
+# Maximum simultaneous chunk calls per document
+DEFAULT_MAX_CONCURRENCY = int(os.getenv("LONG_SUMMARY_CONCURRENCY", "8"))
+
+# Safety valve against non-converging reductions
+MAX_REDUCE_LEVELS = 8
+
+# Neutral note-taking prompts; learning style is applied once, in the final pass
+MAP_SYSTEM_PROMPT = (
+    "You are a careful study assistant. Extract the key facts, concepts, definitions, "
+    "dates and examples from this section of a longer document as concise notes. "
+    "Do not add information that is not in the text."
+)
+REDUCE_SYSTEM_PROMPT = (
+    "You are a careful study assistant. Merge these notes from consecutive sections of "
+    "one document into a single concise set of notes. Sections overlap slightly, so "
+    "remove duplicates while keeping every distinct key point in document order."
+)
+
+
+def _token_length(text: str) -> int:
+    """Size measure for chunking: tokens of the summary model."""
+    return count_tokens(text, SUMMARY_MODEL)
+
+
+def _chunk_budget(system_prompt: str) -> int:
+    """Token budget for one map/reduce input: the configured size, capped by the context."""
+    fits = input_budget(system_prompt, PARTIAL_MAX_TOKENS, SUMMARY_MODEL)
+    return min(CHUNK_TOKENS, fits) if CHUNK_TOKENS > 0 else fits
+
+
+def _final_budget(learning_style: str, max_tokens: int) -> int:
+    """Token budget for the notes in the final styled call, capped like _chunk_budget()."""
+    system_message, user_message = _build_summary_messages("", learning_style)
+    fits = input_budget(
+        system_message["content"], max_tokens, SUMMARY_MODEL, user_prefix=user_message["content"]
+    )
+    return min(CHUNK_TOKENS, fits) if CHUNK_TOKENS > 0 else fits
+
+
+async def _condense_async(
+    system_prompt: str,
+    content: str,
+    semaphore: asyncio.Semaphore
+) -> str:
+    """Run one map or reduce call under the shared concurrency limit."""
+    messages = [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": content}
+    ]
+    max_tokens = completion_budget(messages, PARTIAL_MAX_TOKENS, SUMMARY_MODEL)
+    async with semaphore:
+        response = await protected_call_async(
+            CHAT_COMPLETIONS, SUMMARY_MODEL,
+            lambda: async_client.chat.completions.create(
+                model=SUMMARY_MODEL,
+                messages=messages,
+                temperature=0.3,  # Faithful note-taking rather than creative rewriting
+                max_tokens=max_tokens
+            ),
+            tokens=request_tokens(messages, max_tokens, SUMMARY_MODEL)
+        )
+        return _extract_summary(response)
+
+
+def _group_notes(notes: List[str], max_tokens: int) -> List[str]:
+    """Pack consecutive note sets into groups that each fit one reduce call."""
+    groups: List[str] = []
+    current: List[str] = []
+    current_size = 0
+    for note in notes:
+        note_size = _token_length(note)
+        if current and current_size + note_size > max_tokens:
+            groups.append("\n\n".join(current))
+            current, current_size = [], 0
+        current.append(note)
+        current_size += note_size
+    if current:
+        groups.append("\n\n".join(current))
+    return groups
+
+
+async def summarize_long_text_async(
+    input_text: str,
+    learning_style: str = "reading",
+    max_tokens: int = 300,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY
+) -> Dict[str, Any]:
+    """
+    Map-Reduce Summarization for Long Educational Documents
+
+    Produces a single learning-style adapted summary for documents of any size up
+    to LONG_MAX_INPUT_CHARS. Short documents take the regular single-call path.
+
+    Processing Pipeline:
+    1. Split the document on paragraph/sentence boundaries with overlap
+    2. Map: condense every chunk into notes concurrently (bounded by max_concurrency)
+    3. Reduce: merge groups of notes concurrently, level by level, until the notes
+       fit the token budget of the final call
+    4. Final: write the learning-style adapted summary within max_tokens
+
+    Args:
+        input_text (str): Document to summarize (max LONG_MAX_INPUT_CHARS characters)
+        learning_style (str, optional): "visual", "auditory", "reading" or "kinesthetic"
+        max_tokens (int, optional): Maximum length of the final summary in tokens
+        max_concurrency (int, optional): Maximum simultaneous API calls
+
+    Returns:
+        Dict[str, Any]: Result with keys:
+            - "summary": The final adapted summary
+            - "chunk_count": Number of chunks in the map pass
+            - "reduce_levels": Number of reduce levels that were needed
+            - "api_calls": Total completion calls made
+            - "cached": Whether the result came from the summary cache
+
+    Raises:
+        ValueError: Empty input, oversized input or invalid concurrency
+        RuntimeError: Any chunk, reduce or final call failed
+
+    Example:
+        >>> result = await summarize_long_text_async(transcript, "visual", 500)
+        >>> result["chunk_count"], result["reduce_levels"]
+        (42, 2)
+    """
+    # ==================== INPUT VALIDATION ====================
+
+    if not input_text or not input_text.strip():
+        raise ValueError("Input text cannot be empty")
+    if len(input_text) > LONG_MAX_INPUT_CHARS:
+        raise ValueError(f"Input text too long (max {LONG_MAX_INPUT_CHARS:,} characters)")
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1")
+
+    # Whole-document results share the summary cache under their own namespace
+    cache_key = make_cache_key(
+        "long_summary",
+        input_text,
+        learning_style=learning_style,
+        max_tokens=max_tokens,
+        model=SUMMARY_MODEL,
+    )
+    cached_result = summary_cache.get(cache_key)
+    if cached_result is not None:
+        return {**cached_result, "cached": True}
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+    api_calls = 0
+    chunk_count = 1
+    reduce_levels = 0
+    notes_text = input_text.strip()
+
+    try:
+        # ==================== MAP PASS ====================
+
+        if len(notes_text) > MAX_INPUT_CHARS:
+            chunk_budget = _chunk_budget(MAP_SYSTEM_PROMPT)
+            chunks = split_text(
+                notes_text,
+                chunk_budget,
+                min(CHUNK_OVERLAP_TOKENS, chunk_budget // 2),
+                length_fn=_token_length
+            )
+            chunk_count = len(chunks)
+            logger.info(f"Long summary map pass: {chunk_count} chunks")
+
+            notes = await asyncio.gather(*(
+                _condense_async(MAP_SYSTEM_PROMPT, chunk, semaphore) for chunk in chunks
+            ))
+            api_calls += len(chunks)
+
+            # ==================== HIERARCHICAL REDUCE PASSES ====================
+
+            final_budget = _final_budget(learning_style, max_tokens)
+            while _token_length("\n\n".join(notes)) > final_budget:
+                if reduce_levels >= MAX_REDUCE_LEVELS:
+                    raise RuntimeError("Summary reduction did not converge")
+                groups = _group_notes(list(notes), _chunk_budget(REDUCE_SYSTEM_PROMPT))
+                reduce_levels += 1
+                logger.info(f"Long summary reduce level {reduce_levels}: {len(groups)} groups")
+
+                notes = await asyncio.gather(*(
+                    _condense_async(REDUCE_SYSTEM_PROMPT, group, semaphore) for group in groups
+                ))
+                api_calls += len(groups)
+
+            notes_text = "\n\n".join(notes)
+
+        # ==================== FINAL LEARNING-STYLE PASS ====================
+
+        messages = _build_summary_messages(notes_text, learning_style)
+        final_tokens = completion_budget(messages, max_tokens, SUMMARY_MODEL)
+        response = await protected_call_async(
+            CHAT_COMPLETIONS, SUMMARY_MODEL,
+            lambda: async_client.chat.completions.create(
+                model=SUMMARY_MODEL,
+                messages=messages,
+                temperature=0.7,
+                max_tokens=final_tokens
+            ),
+            tokens=request_tokens(messages, final_tokens, SUMMARY_MODEL)
+        )
+        api_calls += 1
+        summary = _extract_summary(response)
+
+    except (ValueError, CircuitOpenError):
+        raise
+
+    except Exception as e:
+        logger.error(f"Long document summarization failed: {e}")
+        raise RuntimeError("Unable to summarize this document right now. Please try again.") from e
+
+    logger.info(
+        f"Long summary complete: {chunk_count} chunks, {reduce_levels} reduce levels, "
+        f"{api_calls} API calls"
+    )
+    result = {
+        "summary": summary,
+        "chunk_count": chunk_count,
+        "reduce_levels": reduce_levels,
+        "api_calls": api_calls
+    }
+    summary_cache.set(cache_key, result)
+    return {**result, "cached": False}
@@ -0,0 +1,497 @@
+"""
+StudyBuddy AI - Process Metrics in the Prometheus Text Format
+
+Counters, gauges and histograms for request latency, upstream OpenAI calls and
+usage, rendered in the Prometheus text exposition format for the /metrics
+endpoint. Everything on the hot path is an add to a number the calling thread
+owns, so recording a sample never takes a lock or contends with other workers.
+
+Core Functionality:
+- Counter, Gauge (inc/dec) and Histogram metric families with label values
+- Per-thread sharded cells: each thread adds to its own cell and a scrape sums
+  the cells, so no lock is needed when recording
+- Collectors: callables that report values which already live elsewhere
+  (cache, limiter, breaker stats) at scrape time, instead of mirroring them
+- Built-in metrics for HTTP routes, upstream calls, tokens and audio seconds
+- Process metrics: resident memory and event-loop lag (how late a sleeping
+  task is woken, i.e. how long something blocked the loop)
+- measure_upstream()/measure_upstream_async() time one upstream attempt and
+  count its errors and token usage
+
+Design Notes:
+- The exposition format is rendered here rather than with prometheus-client, so
+  /metrics works without the optional "monitoring" extra installed
+- Gauges only support inc/dec; point-in-time values come from collectors
+- Coroutines on one event loop share a thread, and no update awaits between its
+  read and its write, so they cannot interleave inside one update
+
+@version 1.0.0
+@since 2026-10-16
+"""
+
+import asyncio
+import logging
+import math
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, TypeVar
+
+try:
+    import psutil
+except ImportError:  # Optional "monitoring" extra
+    psutil = None
+
+# Configure module-level logger for comprehensive monitoring and debugging
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# (labels, value) pairs reported by a collector
+Samples = List[Tuple[Dict[str, str], float]]
+
+# (name, type, help, samples) families reported by a collector
+CollectedFamily = Tuple[str, str, str, Samples]
+
+# ==================== CONFIGURATION ====================
+
+# Prefix of every metric name
+NAMESPACE = "studybuddy"
+
+# Content type of the Prometheus text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Latency buckets in seconds: fast routes up to long Whisper uploads
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+# Event-loop lag buckets in seconds
+LAG_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+# Seconds between event-loop lag samples
+LOOP_LAG_INTERVAL_SECONDS = float(os.getenv("LOOP_LAG_INTERVAL_SECONDS", "0.25"))
+
+# Monotonic time the process started recording metrics
+STARTED_AT = time.monotonic()
+
+
+# ==================== METRIC PRIMITIVES ====================
+
+class _Cells:
+    """
+    Per-thread cells holding one metric child's numbers.
+
+    Each thread only ever writes its own cell, so updates need no lock; reads sum
+    every cell. A cell outlives its thread, which keeps totals monotonic.
+    """
+
+    __slots__ = ("_cells", "_size")
+
+    def __init__(self, size: int):
+        self._cells: Dict[int, List[float]] = {}
+        self._size = size
+
+    def mine(self) -> List[float]:
+        ident = threading.get_ident()
+        cell = self._cells.get(ident)
+        if cell is None:
+            cell = self._cells.setdefault(ident, [0.0] * self._size)
+        return cell
+
+    def totals(self) -> List[float]:
+        totals = [0.0] * self._size
+        for cell in list(self._cells.values()):
+            for index, value in enumerate(cell):
+                totals[index] += value
+        return totals
+
+
+class _CounterChild:
+    __slots__ = ("_cells",)
+
+    def __init__(self):
+        self._cells = _Cells(1)
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Add a non-negative amount."""
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        self._cells.mine()[0] += amount
+
+    def value(self) -> float:
+        return self._cells.totals()[0]
+
+
+class _GaugeChild:
+    __slots__ = ("_cells",)
+
+    def __init__(self):
+        self._cells = _Cells(1)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._cells.mine()[0] += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._cells.mine()[0] -= amount
+
+    def value(self) -> float:
+        return self._cells.totals()[0]
+
+
+class _HistogramChild:
+    __slots__ = ("_bounds", "_cells")
+
+    def __init__(self, bounds: Sequence[float]):
+        self._bounds = bounds
+        # One count per bucket plus +Inf, then the sum and the count
+        self._cells = _Cells(len(bounds) + 3)
+
+    def observe(self, value: float) -> None:
+        cell = self._cells.mine()
+        cell[bisect_left(self._bounds, value)] += 1
+        cell[-2] += value
+        cell[-1] += 1
+
+    def snapshot(self) -> Tuple[List[float], float, float]:
+        """Cumulative bucket counts (last is +Inf), sum and count."""
+        totals = self._cells.totals()
+        cumulative, running = [], 0.0
+        for count in totals[:-2]:
+            running += count
+            cumulative.append(running)
+        return cumulative, totals[-2], totals[-1]
+
+
+class _Family:
+    """A named metric and its children, one per combination of label values."""
+
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], Any] = {}
+        self._default = None if self.labelnames else self.labels()
+
+    def _new_child(self) -> Any:
+        raise NotImplementedError
+
+    def labels(self, *values: Any) -> Any:
+        """Child for one combination of label values, created on first use."""
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {key}")
+            child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def children(self) -> List[Tuple[Dict[str, str], Any]]:
+        return [(dict(zip(self.labelnames, key, strict=True)), child) for key, child in list(self._children.items())]
+
+    def clear(self) -> None:
+        """Drop every child (tests)."""
+        self._children.clear()
+        if not self.labelnames:
+            self._default = self.labels()
+
+
+class Counter(_Family):
+    """Monotonically increasing total, e.g. requests or tokens."""
+
+    kind = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default.inc(amount)
+
+    def samples(self) -> Samples:
+        return [(labels, child.value()) for labels, child in self.children()]
+
+
+class Gauge(_Family):
+    """Value that goes up and down, e.g. requests in flight."""
+
+    kind = "gauge"
+
+    def _new_child(self) -> _GaugeChild:
+        return _GaugeChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default.inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._default.dec(amount)
+
+    def samples(self) -> Samples:
+        return [(labels, child.value()) for labels, child in self.children()]
+
+
+class Histogram(_Family):
+    """Distribution of observed values in cumulative buckets, e.g. latencies."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS
+    ):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self._default.observe(value)
+
+    def totals(self) -> Tuple[float, float]:
+        """Count and sum of every observation across all label values."""
+        count = total = 0.0
+        for _, child in self.children():
+            _, child_sum, child_count = child.snapshot()
+            count += child_count
+            total += child_sum
+        return count, total
+
+
+# ==================== REGISTRY AND EXPOSITION ====================
+
+class Registry:
+    """Metric families and collectors rendered together by /metrics."""
+
+    def __init__(self):
+        self._families: Dict[str, _Family] = {}
+        self._collectors: List[Callable[[], Iterable[CollectedFamily]]] = []
+        self._lock = threading.Lock()
+
+    def _add(self, family: _Family) -> Any:
+        with self._lock:
+            if family.name in self._families:
+                raise ValueError(f"Metric {family.name} is already registered")
+            self._families[family.name] = family
+        return family
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._add(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._add(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> Histogram:
+        return self._add(Histogram(name, documentation, labelnames, buckets))
+
+    def register_collector(self, collector: Callable[[], Iterable[CollectedFamily]]) -> None:
+        """Add a callable reporting (name, type, help, samples) families at scrape time."""
+        with self._lock:
+            if collector not in self._collectors:
+                self._collectors.append(collector)
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        with self._lock:
+            families = list(self._families.values())
+            collectors = list(self._collectors)
+
+        lines: List[str] = []
+        for family in families:
+            _header(lines, family.name, family.kind, family.documentation)
+            if isinstance(family, Histogram):
+                for labels, child in family.children():
+                    cumulative, total, count = child.snapshot()
+                    for bound, bucket_count in zip((*family.buckets, math.inf), cumulative, strict=True):
+                        lines.append(_sample(f"{family.name}_bucket", {**labels, "le": _format(bound)}, bucket_count))
+                    lines.append(_sample(f"{family.name}_sum", labels, total))
+                    lines.append(_sample(f"{family.name}_count", labels, count))
+            else:
+                lines.extend(_sample(family.name, labels, value) for labels, value in family.samples())
+
+        for collector in collectors:
+            try:
+                collected = list(collector())
+            except Exception as e:
+                # A broken collector must not take the whole scrape down
+                logger.error(f"Metrics collector {collector!r} failed: {e}")
+                continue
+            for name, kind, documentation, samples in collected:
+                _header(lines, name, kind, documentation)
+                lines.extend(_sample(name, labels, value) for labels, value in samples)
+
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        """Zero every metric family (tests); collectors stay registered."""
+        with self._lock:
+            families = list(self._families.values())
+        for family in families:
+            family.clear()
+
+
+def _header(lines: List[str], name: str, kind: str, documentation: str) -> None:
+    help_text = documentation.replace("\\", "\\\\").replace("\n", "\\n")
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} {kind}")
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _sample(name: str, labels: Dict[str, str], value: float) -> str:
+    if labels:
+        rendered = ",".join(f'{key}="{_escape(str(label))}"' for key, label in labels.items())
+        return f"{name}{{{rendered}}} {_format(value)}"
+    return f"{name} {_format(value)}"
+
+
+# Process-wide registry served by /metrics
+registry = Registry()
+
+# ==================== BUILT-IN METRICS ====================
+
+http_request_duration = registry.histogram(
+    f"{NAMESPACE}_http_request_duration_seconds",
+    "Time to produce the response headers, by route template",
+    ("method", "route", "status"),
+)
+
+http_requests_in_flight = registry.gauge(
+    f"{NAMESPACE}_http_requests_in_flight",
+    "Requests currently being handled, by route template",
+    ("method", "route"),
+)
+
+upstream_request_duration = registry.histogram(
+    f"{NAMESPACE}_upstream_request_duration_seconds",
+    "Latency of single OpenAI call attempts (excluding rate-limit queueing)",
+    ("operation", "model"),
+)
+
+upstream_errors = registry.counter(
+    f"{NAMESPACE}_upstream_errors_total",
+    "Failed OpenAI call attempts by exception type",
+    ("operation", "model", "error"),
+)
+
+tokens_used = registry.counter(
+    f"{NAMESPACE}_openai_tokens_total",
+    "Tokens reported in OpenAI usage, by kind (prompt or completion)",
+    ("model", "kind"),
+)
+
+audio_transcribed = registry.counter(
+    f"{NAMESPACE}_audio_transcribed_seconds_total",
+    "Seconds of audio sent to Whisper (cache hits excluded); billed per minute",
+    ("model",),
+)
+
+event_loop_lag = registry.histogram(
+    f"{NAMESPACE}_event_loop_lag_seconds",
+    "How late the event loop woke a task sleeping for a fixed interval",
+    buckets=LAG_BUCKETS,
+)
+
+
+def resident_memory_bytes() -> Optional[int]:
+    """Resident set size of this process, or None when it cannot be read."""
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def collect_process_stats() -> Iterable[CollectedFamily]:
+    """Report process memory and uptime."""
+    families: List[CollectedFamily] = [
+        (f"{NAMESPACE}_uptime_seconds", "gauge", "Seconds since the process started", [({}, uptime_seconds())])
+    ]
+    rss = resident_memory_bytes()
+    if rss is not None:
+        families.append(("process_resident_memory_bytes", "gauge", "Resident memory size in bytes", [({}, rss)]))
+    return families
+
+
+registry.register_collector(collect_process_stats)
+
+
+async def monitor_event_loop_lag(interval: float = LOOP_LAG_INTERVAL_SECONDS) -> None:
+    """Sample event-loop lag until cancelled (run as a background task)."""
+    loop = asyncio.get_running_loop()
+    while True:
+        started = loop.time()
+        await asyncio.sleep(interval)
+        event_loop_lag.observe(max(0.0, loop.time() - started - interval))
+
+
+def uptime_seconds() -> float:
+    """Seconds since the process started recording metrics."""
+    return time.monotonic() - STARTED_AT
+
+
+def record_token_usage(model: str, response: Any) -> None:
+    """Count the prompt and completion tokens of a response that reports usage."""
+    usage = getattr(response, "usage", None)
+    for kind in ("prompt", "completion"):
+        tokens = getattr(usage, f"{kind}_tokens", None)
+        # Streamed responses and transcriptions carry no usage
+        if isinstance(tokens, int):
+            tokens_used.labels(model, kind).inc(tokens)
+
+
+def _observe_attempt(operation: str, model: str, started: float, error: Optional[BaseException] = None) -> None:
+    upstream_request_duration.labels(operation, model).observe(time.perf_counter() - started)
+    if error is not None:
+        upstream_errors.labels(operation, model, type(error).__name__).inc()
+
+
+async def measure_upstream_async(operation: str, model: str, request: Callable[[], Awaitable[T]]) -> T:
+    """
+    Run one upstream attempt, recording its latency, error type and token usage.
+
+    Cancelled attempts (e.g. a hedge that lost the race) are not recorded.
+    """
+    started = time.perf_counter()
+    try:
+        result = await request()
+    except Exception as e:
+        _observe_attempt(operation, model, started, e)
+        raise
+    _observe_attempt(operation, model, started)
+    record_token_usage(model, result)
+    return result
+
+
+def measure_upstream(operation: str, model: str, request: Callable[[], T]) -> T:
+    """Blocking counterpart of measure_upstream_async()."""
+    started = time.perf_counter()
+    try:
+        result = request()
+    except Exception as e:
+        _observe_attempt(operation, model, started, e)
+        raise
+    _observe_attempt(operation, model, started)
+    record_token_usage(model, result)
+    return result
@@ -0,0 +1,210 @@
+"""
+StudyBuddy AI - Shared OpenAI Client Registry
+
+This module owns the process-wide OpenAI clients used by every AI module
+(summarizer, quiz generator, transcriber). Instead of building a brand-new
+client - and therefore a brand-new HTTP connection pool and TLS session - on
+every request, the clients are created once at application startup and reused
+for the lifetime of the worker process.
+
+Core Functionality:
+- Lazily creates one synchronous and one asynchronous OpenAI client per process
+- Configures connection pool limits, keep-alive and timeouts from the environment
+- Exposes lightweight proxies (`client`, `async_client`) the AI modules import
+- Provides startup/shutdown hooks for the FastAPI lifespan handler
+- Feeds every response's rate-limit headers to the shared rate limiter
+
+Configuration (environment variables):
+- OPENAI_API_KEY: Required API key from platform.openai.com
+- OPENAI_MAX_CONNECTIONS: Maximum concurrent connections per client (default 100)
+- OPENAI_MAX_KEEPALIVE_CONNECTIONS: Idle connections kept warm (default 20)
+- OPENAI_KEEPALIVE_EXPIRY: Seconds an idle connection is kept open (default 30)
+- OPENAI_TIMEOUT: Overall request timeout in seconds (default 60)
+- OPENAI_CONNECT_TIMEOUT: Connection establishment timeout in seconds (default 5)
+- OPENAI_MAX_RETRIES: SDK-level retries for transient failures (default 0; retries
+  are scheduled by src.ai.rate_limiter so they respect the shared budget)
+
+Performance Characteristics:
+- Connection setup and TLS handshakes are paid once per pooled connection,
+  not once per request, which removes them from p50 latency
+- Client access is a single attribute lookup after the first call
+
+@version 1.0.0
+@since 2026-10-16
+"""
+
+import logging
+import os
+import threading
+from typing import Any, Callable, Optional
+
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, DefaultHttpxClient, OpenAI
+from src.ai.rate_limiter import observe_response, observe_response_async
+
+# Configure module-level logger for comprehensive monitoring and debugging
+logger = logging.getLogger(__name__)
+
+# ==================== CONNECTION POOL CONFIGURATION ====================
+
+# Upper bound on simultaneous connections each client may open to the API
+MAX_CONNECTIONS = int(os.getenv("OPENAI_MAX_CONNECTIONS", "100"))
+
+# Idle connections kept alive between requests so the next call skips the handshake
+MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("OPENAI_MAX_KEEPALIVE_CONNECTIONS", "20"))
+
+# How long (seconds) an idle keep-alive connection is retained
+KEEPALIVE_EXPIRY = float(os.getenv("OPENAI_KEEPALIVE_EXPIRY", "30"))
+
+# Overall and connect timeouts (seconds) for API requests
+REQUEST_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", "60"))
+CONNECT_TIMEOUT = float(os.getenv("OPENAI_CONNECT_TIMEOUT", "5"))
+
+# SDK-level retries; off by default because the rate limiter retries with shared backoff
+MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "0"))
+
+# ==================== CLIENT REGISTRY STATE ====================
+
+_sync_client: Optional[OpenAI] = None
+_async_client: Optional[AsyncOpenAI] = None
+_lock = threading.Lock()
+
+
+def _get_api_key() -> str:
+    """Read the API key from the environment, failing fast when it is missing."""
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        raise ValueError("OPENAI_API_KEY environment variable is not set")
+    return api_key
+
+
+def _connection_limits() -> httpx.Limits:
+    """Connection pool limits shared by the sync and async clients."""
+    return httpx.Limits(
+        max_connections=MAX_CONNECTIONS,
+        max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=KEEPALIVE_EXPIRY,
+    )
+
+
+def _timeout() -> httpx.Timeout:
+    """Request timeout configuration shared by the sync and async clients."""
+    return httpx.Timeout(REQUEST_TIMEOUT, connect=CONNECT_TIMEOUT)
+
+
+def get_openai_client() -> OpenAI:
+    """
+    Return the process-wide synchronous OpenAI client, creating it on first use.
+
+    The client is backed by a pooled HTTP client so that connections (and their
+    TLS sessions) are reused across requests instead of being rebuilt per call.
+
+    Returns:
+        OpenAI: Shared, fully configured synchronous client
+
+    Raises:
+        ValueError: When OPENAI_API_KEY environment variable is not set
+    """
+    global _sync_client
+    if _sync_client is None:
+        with _lock:
+            if _sync_client is None:
+                _sync_client = OpenAI(
+                    api_key=_get_api_key(),
+                    timeout=_timeout(),
+                    max_retries=MAX_RETRIES,
+                    http_client=DefaultHttpxClient(
+                        limits=_connection_limits(),
+                        timeout=_timeout(),
+                        event_hooks={"response": [observe_response]},
+                    ),
+                )
+                logger.info(
+                    f"Created pooled OpenAI client (max_connections={MAX_CONNECTIONS}, "
+                    f"keepalive={MAX_KEEPALIVE_CONNECTIONS})"
+                )
+    return _sync_client
+
+
+def get_async_openai_client() -> AsyncOpenAI:
+    """
+    Return the process-wide asynchronous OpenAI client, creating it on first use.
+
+    Returns:
+        AsyncOpenAI: Shared, fully configured asynchronous client
+
+    Raises:
+        ValueError: When OPENAI_API_KEY environment variable is not set
+    """
+    global _async_client
+    if _async_client is None:
+        with _lock:
+            if _async_client is None:
+                _async_client = AsyncOpenAI(
+                    api_key=_get_api_key(),
+                    timeout=_timeout(),
+                    max_retries=MAX_RETRIES,
+                    http_client=DefaultAsyncHttpxClient(
+                        limits=_connection_limits(),
+                        timeout=_timeout(),
+                        event_hooks={"response": [observe_response_async]},
+                    ),
+                )
+                logger.info(
+                    f"Created pooled async OpenAI client (max_connections={MAX_CONNECTIONS}, "
+                    f"keepalive={MAX_KEEPALIVE_CONNECTIONS})"
+                )
+    return _async_client
+
+
+def init_clients() -> None:
+    """
+    Create the shared clients eagerly at application startup.
+
+    A missing API key is logged rather than raised so the API can still serve
+    health checks and documentation; AI endpoints will report the error on use.
+    """
+    try:
+        get_openai_client()
+        get_async_openai_client()
+    except ValueError as e:
+        logger.warning(f"OpenAI clients not initialized: {e}")
+
+
+async def close_clients() -> None:
+    """Close the shared clients and release their pooled connections."""
+    global _sync_client, _async_client
+    with _lock:
+        sync_client, async_client = _sync_client, _async_client
+        _sync_client = None
+        _async_client = None
+
+    if sync_client is not None:
+        sync_client.close()
+    if async_client is not None:
+        await async_client.close()
+    logger.info("OpenAI clients closed")
+
+
+class LazyClient:
+    """
+    Attribute proxy that resolves to a shared client on first use.
+
+    AI modules import a proxy at module level (`client`, `async_client`) so the
+    shared client is looked up at call time. This keeps module import free of
+    side effects and lets tests patch the module attribute directly.
+    """
+
+    def __init__(self, factory: Callable[[], Any]):
+        self._factory = factory
+
+    def __getattr__(self, name: str) -> Any:
+        # Private and introspection lookups (mock.patch, inspect) must not create a client
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self._factory(), name)
+
+
+# Shared proxies imported by the AI modules
+client = LazyClient(get_openai_client)
+async_client = LazyClient(get_async_openai_client)
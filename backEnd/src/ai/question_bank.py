@@ -0,0 +1,357 @@
+"""
+StudyBuddy AI - Persistent Question Bank
+
+Generated quiz questions are validated, paid for, and then thrown away, while
+the same handouts and lecture notes come back again and again. The question
+bank keeps every validated question in a local SQLite store so later quizzes
+on content we have already seen are served (or partly served) from it, and
+only the questions still missing are generated.
+
+Core Functionality:
+- Questions indexed by source-content hash, difficulty, learning style and
+  question type
+- Concept keywords extracted from every question and indexed, so questions
+  can be reused for different but overlapping content (e.g. an edited handout)
+- Least-served questions first, so repeat requests rotate through the bank
+- Duplicate questions per source are stored once
+- Bounded size: the least recently used questions are evicted past the cap
+- Counters (full hits, partial hits, misses, questions served/stored)
+
+Reuse Across Sources:
+- A question written for other content is only reused when every one of its
+  concept keywords also appears in the new content, and it has at least
+  MIN_CONCEPT_KEYWORDS of them, so reused questions stay on the material
+
+Design Notes:
+- Store errors are logged and treated as an empty bank; quiz generation never
+  fails because the bank is unavailable
+
+@version 1.0.0
+@since 2026-10-16
+"""
+
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Sequence
+
+from src.ai.cache import text_digest
+
+# Configure module-level logger for comprehensive monitoring and debugging
+logger = logging.getLogger(__name__)
+
+# ==================== CONFIGURATION ====================
+
+# Concept keywords kept per question
+KEYWORDS_PER_QUESTION = 6
+
+# Keywords a question needs before it may be reused for other content
+MIN_CONCEPT_KEYWORDS = 3
+
+# Distinct source keywords considered when looking for related questions
+MAX_SOURCE_KEYWORDS = 400
+
+# Words of at least four letters (hyphenated words count as one)
+WORD_PATTERN = re.compile(r"[a-z][a-z'-]{3,}")
+
+# Common words that say nothing about the concept being tested
+STOPWORDS = frozenset("""
+    about above after again against also among another answer because been before being below
+    between both called came cannot come could does doing down during each either enough every
+    explain explanation first following from further have having here however into itself just
+    know known large less like likely made main make makes many might more most much must near
+    need never next only other others over part people question really same second should show
+    shown since some something such than that their them then there these they thing things
+    think third this those though three through thus together under until upon used uses using
+    very want well were what when where whether which while whose will with within without
+    would your correct option options true false best describes statement
+""".split())
+
+
+def concept_keywords(text: str, limit: int = KEYWORDS_PER_QUESTION) -> List[str]:
+    """
+    Most frequent content words of a text, in order of frequency then appearance.
+
+    Args:
+        text (str): Question or source text
+        limit (int): Maximum keywords returned
+
+    Returns:
+        List[str]: Lowercase keywords without stopwords
+    """
+    words = [word.strip("'-") for word in WORD_PATTERN.findall(text.lower())]
+    counts = Counter(word for word in words if len(word) >= 4 and word not in STOPWORDS)
+    # Counter preserves first-appearance order among equal counts
+    return [word for word, _ in counts.most_common(limit)]
+
+
+def question_keywords(question: Dict[str, Any]) -> List[str]:
+    """Concept keywords of a question: its text, correct option or model answer, and explanation."""
+    parts = [str(question.get("question", "")), str(question.get("explanation", ""))]
+    options = question.get("options") or []
+    answer = str(question.get("correct_answer", ""))
+    if question.get("question_type") == "short_answer":
+        parts.append(answer)
+    elif len(answer) == 1 and "A" <= answer <= "Z" and ord(answer) - ord("A") < len(options):
+        parts.append(str(options[ord(answer) - ord("A")]))
+    return concept_keywords(" ".join(parts))
+
+
+def question_fingerprint(question: Dict[str, Any]) -> str:
+    """Identity of a question's wording, ignoring case and whitespace."""
+    return text_digest(str(question.get("question", "")).lower())
+
+
+class QuestionBank:
+    """
+    SQLite-backed store of validated quiz questions.
+
+    Args:
+        path (str): Database file path (parent directories are created)
+        max_questions (int): Maximum questions kept
+        clock (Callable[[], float]): Wall-clock time source (injectable for tests)
+    """
+
+    def __init__(self, path: str, max_questions: int = 100000, clock: Callable[[], float] = time.time):
+        if max_questions < 1:
+            raise ValueError("max_questions must be at least 1")
+        self.path = path
+        self.max_questions = max_questions
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._counters = {
+            "full_hits": 0, "partial_hits": 0, "misses": 0,
+            "questions_served": 0, "questions_stored": 0, "errors": 0,
+        }
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS questions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                source_hash TEXT NOT NULL,
+                difficulty TEXT NOT NULL,
+                learning_style TEXT NOT NULL,
+                question_type TEXT NOT NULL DEFAULT 'multiple_choice',
+                fingerprint TEXT NOT NULL,
+                question TEXT NOT NULL,
+                keyword_count INTEGER NOT NULL,
+                served_count INTEGER NOT NULL DEFAULT 0,
+                created_at REAL NOT NULL,
+                used_at REAL NOT NULL,
+                UNIQUE (source_hash, difficulty, learning_style, fingerprint)
+            )
+            """
+        )
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS question_keywords (
+                keyword TEXT NOT NULL,
+                question_id INTEGER NOT NULL REFERENCES questions (id) ON DELETE CASCADE,
+                PRIMARY KEY (keyword, question_id)
+            ) WITHOUT ROWID
+            """
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(questions)")}
+        if "question_type" not in columns:
+            # Banks created before question types existed hold multiple-choice questions only
+            self._conn.execute(
+                "ALTER TABLE questions ADD COLUMN question_type TEXT NOT NULL DEFAULT 'multiple_choice'"
+            )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_questions_source "
+            "ON questions (source_hash, difficulty, learning_style, served_count)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_questions_used ON questions (used_at)")
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_question_keywords_question ON question_keywords (question_id)"
+        )
+
+    def take(
+        self,
+        text: str,
+        difficulty: str,
+        learning_style: str,
+        count: int,
+        related: bool = True,
+        question_type: str = "multiple_choice",
+        record_lookup: bool = True
+    ) -> List[Dict[str, Any]]:
+        """
+        Up to `count` banked questions for the content, least served first.
+
+        Questions generated from this exact content come first; when there are
+        not enough, questions from other content whose concepts are all present
+        in this text fill the rest (unless `related` is False).
+
+        Args:
+            text (str): Source content of the quiz
+            difficulty (str): Academic level of the quiz
+            learning_style (str): Learning style of the quiz
+            count (int): Questions wanted
+            related (bool): Whether questions from other content may be reused
+            question_type (str): Type of the questions wanted
+            record_lookup (bool): Whether to count this call as one quiz lookup;
+                callers combining several calls use record_lookup() instead
+
+        Returns:
+            List[Dict[str, Any]]: Fresh copies of the banked questions (may be empty)
+        """
+        source_hash = text_digest(text)
+        try:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT id, fingerprint, question FROM questions "
+                    "WHERE source_hash = ? AND difficulty = ? AND learning_style = ? AND question_type = ? "
+                    "ORDER BY served_count, id LIMIT ?",
+                    (source_hash, difficulty, learning_style, question_type, count),
+                ).fetchall()
+
+                if related and len(rows) < count:
+                    keywords = concept_keywords(text, MAX_SOURCE_KEYWORDS)
+                    # Over-fetch so questions sharing wording with exact matches can be skipped
+                    rows += self._conn.execute(
+                        "SELECT q.id, q.fingerprint, q.question "
+                        "FROM question_keywords k JOIN questions q ON q.id = k.question_id "
+                        "WHERE k.keyword IN (SELECT value FROM json_each(?)) "
+                        "AND q.difficulty = ? AND q.learning_style = ? AND q.question_type = ? "
+                        "AND q.source_hash != ? AND q.keyword_count >= ? "
+                        "GROUP BY q.id HAVING COUNT(*) = q.keyword_count "
+                        "ORDER BY q.served_count, q.id LIMIT ?",
+                        (json.dumps(keywords), difficulty, learning_style, question_type, source_hash,
+                         MIN_CONCEPT_KEYWORDS, 2 * (count - len(rows))),
+                    ).fetchall()
+
+                questions, seen, served_ids = [], set(), []
+                for question_id, fingerprint, payload in rows:
+                    if fingerprint in seen or len(questions) == count:
+                        continue
+                    seen.add(fingerprint)
+                    served_ids.append(question_id)
+                    questions.append(json.loads(payload))
+
+                self._conn.executemany(
+                    "UPDATE questions SET served_count = served_count + 1, used_at = ? WHERE id = ?",
+                    [(self._clock(), question_id) for question_id in served_ids],
+                )
+                if record_lookup:
+                    self._counters[self._lookup_outcome(count, len(questions))] += 1
+                self._counters["questions_served"] += len(questions)
+            return questions
+        except sqlite3.Error as e:
+            self._record_error("read", e)
+            return []
+
+    def record_lookup(self, requested: int, served: int) -> None:
+        """Count one quiz lookup answered by several take() calls (one per question type)."""
+        with self._lock:
+            self._counters[self._lookup_outcome(requested, served)] += 1
+
+    @staticmethod
+    def _lookup_outcome(requested: int, served: int) -> str:
+        return "misses" if not served else "full_hits" if served >= requested else "partial_hits"
+
+    def add(
+        self,
+        text: str,
+        difficulty: str,
+        learning_style: str,
+        questions: Iterable[Dict[str, Any]]
+    ) -> int:
+        """
+        Store validated questions generated from the content.
+
+        Returns:
+            int: Number of new questions stored (duplicates are skipped)
+        """
+        source_hash = text_digest(text)
+        now = self._clock()
+        stored = 0
+        try:
+            with self._lock:
+                self._conn.execute("BEGIN")
+                try:
+                    for question in questions:
+                        keywords = question_keywords(question)
+                        cursor = self._conn.execute(
+                            "INSERT OR IGNORE INTO questions (source_hash, difficulty, learning_style, "
+                            "question_type, fingerprint, question, keyword_count, created_at, used_at) "
+                            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                            (source_hash, difficulty, learning_style,
+                             question.get("question_type", "multiple_choice"), question_fingerprint(question),
+                             json.dumps(question), len(keywords), now, now),
+                        )
+                        if not cursor.rowcount:
+                            continue
+                        stored += 1
+                        self._conn.executemany(
+                            "INSERT OR IGNORE INTO question_keywords (keyword, question_id) VALUES (?, ?)",
+                            [(keyword, cursor.lastrowid) for keyword in keywords],
+                        )
+                    self._conn.execute(
+                        "DELETE FROM questions WHERE id IN ("
+                        "SELECT id FROM questions ORDER BY used_at DESC, id DESC LIMIT -1 OFFSET ?)",
+                        (self.max_questions,),
+                    )
+                    self._conn.execute("COMMIT")
+                except BaseException:
+                    self._conn.execute("ROLLBACK")
+                    raise
+                self._counters["questions_stored"] += stored
+            return stored
+        except sqlite3.Error as e:
+            self._record_error("write", e)
+            return 0
+
+    def _record_error(self, operation: str, error: sqlite3.Error) -> None:
+        logger.warning(f"Question bank {operation} failed, continuing without it: {error}")
+        with self._lock:
+            self._counters["errors"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Bank size and hit counters for monitoring endpoints."""
+        with self._lock:
+            questions, sources = self._conn.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT source_hash) FROM questions"
+            ).fetchone()
+            lookups = self._counters["full_hits"] + self._counters["partial_hits"] + self._counters["misses"]
+            return {
+                "questions": questions,
+                "sources": sources,
+                **self._counters,
+                # Share of quiz requests answered without an API call
+                "full_hit_ratio": round(self._counters["full_hits"] / lookups, 4) if lookups else 0.0,
+            }
+
+    def clear(self) -> None:
+        """Remove every question."""
+        with self._lock:
+            self._conn.execute("DELETE FROM questions")
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+def new_questions(
+    banked: Sequence[Dict[str, Any]],
+    generated: Iterable[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """Generated questions whose wording is not already among the banked ones."""
+    seen = {question_fingerprint(question) for question in banked}
+    fresh = []
+    for question in generated:
+        fingerprint = question_fingerprint(question)
+        if fingerprint not in seen:
+            seen.add(fingerprint)
+            fresh.append(question)
+    return fresh
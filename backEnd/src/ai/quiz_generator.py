@@ -5,7 +5,8 @@ This module provides intelligent quiz generation capabilities that create person
 educational assessments based on user content, learning styles, and academic difficulty levels.
 
 Core Functionality:
-- Generates multiple-choice questions from educational text content
+- Generates multiple-choice, true/false and short-answer questions from educational
+  text content, mixing types in a single call with a compact output schema per type
 - Adapts question formats to match individual learning styles (visual, auditory, reading, kinesthetic)
 - Scales difficulty appropriately for different academic levels (middle school, high school, college)
 - Provides comprehensive explanations for correct answers to enhance learning outcomes
@@ -39,7 +40,8 @@ Security Considerations:
 
 Performance Optimizations:
 - Efficient token usage through optimized prompt engineering
-- Caching strategies for frequently requested content
+- Persistent question bank: questions for content seen before are served from
+  it and only the missing ones are generated
 - Asynchronous processing capabilities for improved throughput
 - Memory-efficient JSON parsing and validation
 
@@ -51,60 +53,366 @@ Performance Optimizations:
 import logging
 import json
 import os
-from typing import List, Dict, Optional, Any
-from openai import OpenAI
+import sqlite3
+import tempfile
+from typing import AsyncIterator, List, Dict, Mapping, Optional, Any, Sequence, Tuple, Union
+from src.ai.cache import make_cache_key
+from src.ai.json_stream import JSONArrayStreamParser
+from src.ai.openai_client import async_client, client
+from src.ai.circuit_breaker import CHAT_COMPLETIONS, CircuitOpenError, protected_call, protected_call_async
+from src.ai.hedging import Hedger
+from src.ai.question_bank import QuestionBank, new_questions
+from src.ai.singleflight import SingleFlight
+from src.ai.tokens import completion_budget, request_tokens
 
 # Configure module-level logger for comprehensive monitoring and debugging
 logger = logging.getLogger(__name__)
 
-def get_openai_client():
+# ==================== QUIZ GENERATION CONFIGURATION ====================
+
+# Chat model used for quiz generation
+QUIZ_MODEL = "gpt-3.5-turbo"
+
+# Maximum input size accepted by a single quiz generation call
+MAX_INPUT_CHARS = 8000
+
+# Minimum completion budget for a quiz response with multiple-choice questions
+QUIZ_MAX_TOKENS = 1500
+
+# Output size of one question object (question, four options, answer, explanation)
+# and of the surrounding JSON array, used to size the completion budget
+QUIZ_TOKENS_PER_QUESTION = 200
+QUIZ_RESPONSE_OVERHEAD_TOKENS = 50
+
+# Supported question types, in the order mixed quizzes are filled
+QUESTION_TYPES = ("multiple_choice", "true_false", "short_answer")
+DEFAULT_QUESTION_TYPES = ("multiple_choice",)
+
+# Output size of one question of each type; true/false and short-answer items
+# carry no options and a one-sentence explanation, so they cost far less
+QUESTION_TYPE_TOKENS = {
+    "multiple_choice": QUIZ_TOKENS_PER_QUESTION,
+    "true_false": 60,
+    "short_answer": 100,
+}
+
+# Per-type rules and the smallest JSON object the model has to write for each type
+QUESTION_TYPE_FORMATS = {
+    "multiple_choice": (
+        "exactly 4 options (A, B, C, D) and one correct letter",
+        '{"question_type": "multiple_choice", "question": "Question text here?", '
+        '"options": ["Option A", "Option B", "Option C", "Option D"], "correct_answer": "A", '
+        '"explanation": "Explanation of why A is correct", "difficulty": "easy|medium|hard"}'
+    ),
+    "true_false": (
+        "one statement that is clearly true or false, no options, answer true or false",
+        '{"question_type": "true_false", "question": "Statement to judge.", "correct_answer": true, '
+        '"explanation": "One short sentence", "difficulty": "easy|medium|hard"}'
+    ),
+    "short_answer": (
+        "answerable in a few words, no options, a brief model answer",
+        '{"question_type": "short_answer", "question": "Question text here?", '
+        '"correct_answer": "Brief model answer", "explanation": "One short sentence", '
+        '"difficulty": "easy|medium|hard"}'
+    ),
+}
+
+QuestionTypes = Union[Sequence[str], Mapping[str, int]]
+
+# Identical quizzes requested at the same moment share one upstream call
+quiz_flights = SingleFlight("quiz")
+
+# Tail-latency hedging for quiz completions
+quiz_hedger = Hedger("quiz")
+
+# Persistent bank of validated questions, reused for content seen before
+QUESTION_BANK_ENABLED = os.getenv("QUESTION_BANK_ENABLED", "true").lower() == "true"
+QUESTION_BANK_DB = os.getenv(
+    "QUESTION_BANK_DB",
+    os.path.join(tempfile.gettempdir(), "studybuddy", "question_bank.sqlite3")
+)
+QUESTION_BANK_MAX_QUESTIONS = int(os.getenv("QUESTION_BANK_MAX_QUESTIONS", "100000"))
+
+# Whether questions written for other, overlapping content may be reused
+QUESTION_BANK_REUSE_RELATED = os.getenv("QUESTION_BANK_REUSE_RELATED", "true").lower() == "true"
+
+# Extra top-up calls made when generated questions repeat ones the quiz already has
+QUESTION_BANK_TOP_UP_RETRIES = int(os.getenv("QUESTION_BANK_TOP_UP_RETRIES", "2"))
+
+def _open_question_bank() -> Optional[QuestionBank]:
+    """Open the question bank, running without it when disabled or unavailable."""
+    if not QUESTION_BANK_ENABLED:
+        return None
+    try:
+        return QuestionBank(QUESTION_BANK_DB, max_questions=QUESTION_BANK_MAX_QUESTIONS)
+    except (sqlite3.Error, OSError) as e:
+        logger.warning(f"Question bank unavailable ({e}); generating every quiz from scratch")
+        return None
+
+# Opened by the app lifespan (init_question_bank); None when disabled, unavailable
+# or not opened, so importing this module never creates or locks the database
+question_bank: Optional[QuestionBank] = None
+
+def init_question_bank() -> None:
+    """Open the question bank at application startup."""
+    global question_bank
+    if question_bank is None:
+        question_bank = _open_question_bank()
+
+def close_question_bank() -> None:
+    """Close the question bank and release its database file."""
+    global question_bank
+    bank, question_bank = question_bank, None
+    if bank is not None:
+        bank.close()
+
+# Educational complexity mapping based on Bloom's Taxonomy and grade-level standards
+DIFFICULTY_PROMPTS = {
+    "middle_school": "Create basic comprehension questions that test understanding of main ideas and key facts.",
+    "high_school": "Create questions that test analysis, inference, and deeper understanding beyond memorization.",
+    "college": "Create advanced questions requiring critical thinking, synthesis, and evaluation of complex concepts."
+}
+
+# Universal Design for Learning (UDL) principles applied to question formatting
+STYLE_ADAPTATIONS = {
+    "visual": "Include references to diagrams, charts, or visual representations when relevant. Use clear, structured question formats.",
+    "auditory": "Write questions in a conversational style that sound natural when read aloud. Use rhythm and flow.",
+    "reading": "Use traditional academic question formats with precise language and clear structure.",
+    "kinesthetic": "Focus on application scenarios, real-world examples, and hands-on problem-solving situations."
+}
+
+def _validate_quiz_input(text: str, num_questions: int) -> None:
+    """Reject invalid quiz parameters before any API spend."""
+    # Validate text content - must be non-empty and meaningful
+    if not text or not text.strip():
+        raise ValueError("Input text cannot be empty")
+        
+    # Validate question count - balance between assessment value and cognitive load
+    if not 1 <= num_questions <= 10:
+        raise ValueError("Number of questions must be between 1 and 10")
+        
+    # Validate text length - prevent API overload and ensure processing efficiency
+    if len(text) > MAX_INPUT_CHARS:
+        raise ValueError("Text too long for quiz generation (max 8000 characters)")
+
+def question_type_counts(num_questions: int, question_types: QuestionTypes = DEFAULT_QUESTION_TYPES) -> Dict[str, int]:
     """
-    OpenAI Client Factory with Secure API Key Management
+    Questions of each type in a quiz.
     
-    Creates and configures an OpenAI client instance with proper error handling
-    and security best practices. This function centralizes API key management
-    and provides a single point of configuration for OpenAI integration.
+    Args:
+        num_questions (int): Quiz length
+        question_types (QuestionTypes): Types to spread the questions over evenly
+            (earlier types get the extra questions), or explicit counts per type
     
-    Security Features:
-    - Secure environment variable-based API key retrieval
-    - Validation of API key presence before client creation
-    - No hardcoded credentials or key logging
-    - Proper error messaging without exposing sensitive information
+    Returns:
+        Dict[str, int]: Positive count per type, in QUESTION_TYPES order
     
-    Error Handling:
-    - Raises ValueError for missing API keys with clear user guidance
-    - Provides actionable error messages for troubleshooting
-    - Logs security-related issues for monitoring
+    Raises:
+        ValueError: Unknown or missing types, or counts that do not add up
+    """
+    if isinstance(question_types, Mapping):
+        counts = {question_type: count for question_type, count in question_types.items() if count}
+        if sum(counts.values()) != num_questions:
+            raise ValueError("Question type counts must add up to the number of questions")
+    else:
+        requested = list(dict.fromkeys(question_types))
+        if not requested:
+            raise ValueError("At least one question type is required")
+        counts = {
+            question_type: num_questions // len(requested) + (index < num_questions % len(requested))
+            for index, question_type in enumerate(requested)
+        }
+    unknown = [question_type for question_type in counts if question_type not in QUESTION_TYPES]
+    if unknown:
+        raise ValueError(f"Unsupported question types: {unknown}")
+    return {question_type: counts[question_type] for question_type in QUESTION_TYPES if counts.get(question_type)}
+
+def _quiz_max_tokens(messages: List[Dict[str, str]], type_counts: Mapping[str, int]) -> int:
+    """Completion budget large enough for every requested question, capped by the context window."""
+    wanted = QUIZ_RESPONSE_OVERHEAD_TOKENS + sum(
+        count * QUESTION_TYPE_TOKENS[question_type] for question_type, count in type_counts.items()
+    )
+    if "multiple_choice" in type_counts:
+        wanted = max(QUIZ_MAX_TOKENS, wanted)
+    return completion_budget(messages, wanted, QUIZ_MODEL)
+
+def quiz_request_key(
+    text: str,
+    num_questions: int,
+    difficulty: str,
+    learning_style: str,
+    exclude_questions: Sequence[str] = (),
+    question_types: QuestionTypes = DEFAULT_QUESTION_TYPES
+) -> str:
+    """Normalized identity of a quiz request, used to coalesce identical calls."""
+    return make_cache_key(
+        "quiz",
+        text,
+        num_questions=num_questions,
+        difficulty=difficulty,
+        learning_style=learning_style,
+        exclude_questions=list(exclude_questions),
+        question_types=question_type_counts(num_questions, question_types),
+        model=QUIZ_MODEL,
+    )
+
+def _build_quiz_messages(
+    text: str,
+    num_questions: int,
+    difficulty: str,
+    learning_style: str,
+    exclude_questions: Sequence[str] = (),
+    question_types: QuestionTypes = DEFAULT_QUESTION_TYPES
+) -> List[Dict[str, str]]:
+    """Build the chat messages requesting a JSON array of quiz questions."""
+    type_counts = question_type_counts(num_questions, question_types)
+    quiz_mix = ", ".join(f"{count} {question_type}" for question_type, count in type_counts.items())
+    # Only the formats of the requested types are shown, keeping the prompt and the reply small
+    type_rules = "\n    ".join(
+        f"- {question_type}: {QUESTION_TYPE_FORMATS[question_type][0]}" for question_type in type_counts
+    )
+    type_examples = ",\n        ".join(QUESTION_TYPE_FORMATS[question_type][1] for question_type in type_counts)
+    
+    # Structured system prompt with clear instructions and formatting requirements
+    system_prompt = f"""You are an expert educational assessment creator for StudyBuddy AI.
+    
+    Create {num_questions} quiz questions from the given text: {quiz_mix}.
+    
+    Difficulty level: {difficulty}
+    {DIFFICULTY_PROMPTS.get(difficulty, DIFFICULTY_PROMPTS['high_school'])}
+    
+    Learning style adaptation: {learning_style}
+    {STYLE_ADAPTATIONS.get(learning_style, STYLE_ADAPTATIONS['reading'])}
+    
+    Requirements:
+    {type_rules}
+    - Only one correct answer per question
+    - Include explanation for why the correct answer is right
+    - Questions should test understanding, not just memorization
+    - Use inclusive, encouraging language
+    
+    Return ONLY valid JSON: an array with one object per question, in this exact format:
+    [
+        {type_examples}
+    ]"""
+    
+    # User content prompt with sanitized input
+    user_prompt = f"Generate quiz questions from this content:\n\n{text.strip()}"
+    if exclude_questions:
+        # Topping up a banked quiz: the new questions must not repeat the ones already served
+        already_asked = "\n".join(f"- {question}" for question in exclude_questions)
+        user_prompt += f"\n\nThe student already has these questions, so ask about something else:\n{already_asked}"
+    
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt}
+    ]
+
+def question_type_of(question: Dict[str, Any]) -> str:
+    """Type of a generated question; questions without one are multiple choice."""
+    return question.get("question_type", "multiple_choice")
+
+def _validate_question(
+    question: Any,
+    index: int,
+    question_types: Sequence[str] = QUESTION_TYPES
+) -> None:
+    """
+    Validate the structure of a single generated question.
+    
+    Questions without a question_type are multiple choice and are left as they
+    are. True/false answers are normalized in place to "True"/"False" with
+    matching options; short answers get an empty options list.
     
-    Returns:
-        OpenAI: Configured OpenAI client instance ready for API calls
-        
     Raises:
-        ValueError: When OPENAI_API_KEY environment variable is not set
-        
-    Example:
-        >>> client = get_openai_client()
-        >>> # Client is ready for chat completions, embeddings, etc.
+        ValueError: When the type was not requested, required fields are missing
+            or the options/answer are malformed
+    """
+    if not isinstance(question, dict):
+        raise ValueError(f"Question {index+1} must be a JSON object")
+    
+    question_type = question_type_of(question)
+    if question_type not in question_types:
+        raise ValueError(f"Question {index+1} has unexpected question_type: {question_type}")
+    
+    required_fields = ["question", "correct_answer", "explanation"]
+    if question_type == "multiple_choice":
+        required_fields.insert(1, "options")
+    missing_fields = [field for field in required_fields if field not in question]
+    if missing_fields:
+        raise ValueError(f"Question {index+1} missing fields: {missing_fields}")
+    
+    if question_type != "multiple_choice":
+        question.setdefault("difficulty", "medium")
+    
+    if question_type == "true_false":
+        answer = str(question["correct_answer"]).strip().lower()
+        if answer not in ("true", "false"):
+            raise ValueError(f"Question {index+1} correct_answer must be true or false")
+        question["correct_answer"] = answer.capitalize()
+        question["options"] = ["True", "False"]
+        return
+    
+    if question_type == "short_answer":
+        if not isinstance(question["correct_answer"], str) or not question["correct_answer"].strip():
+            raise ValueError(f"Question {index+1} needs a model answer")
+        question["options"] = []
+        return
         
-    Environment Setup:
-        Required environment variable:
-        - OPENAI_API_KEY: Your OpenAI API key from platform.openai.com
+    # Validate multiple choice format
+    if len(question["options"]) != 4:
+        raise ValueError(f"Question {index+1} must have exactly 4 options")
         
-    Note:
-        This function should be called just before making API requests to ensure
-        the client is created with the most current environment configuration.
+    # Validate correct answer format
+    if question["correct_answer"] not in ["A", "B", "C", "D"]:
+        raise ValueError(f"Question {index+1} correct_answer must be A, B, C, or D")
+
+def _parse_quiz_content(
+    raw_content: Optional[str],
+    question_types: Sequence[str] = QUESTION_TYPES
+) -> List[Dict[str, Any]]:
     """
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        raise ValueError("OPENAI_API_KEY environment variable is not set")
+    Clean, parse and validate the raw completion text into quiz questions.
+    
+    Raises:
+        RuntimeError: When the completion is empty
+        json.JSONDecodeError: When the completion is not valid JSON
+        ValueError: When the questions do not match the expected structure
+    """
+    if not raw_content:
+        raise RuntimeError("OpenAI returned empty response")
+    
+    # ==================== RESPONSE PARSING AND CLEANING ====================
+    
+    # Clean common JSON formatting issues from AI responses
+    cleaned_content = raw_content.strip()
+    if cleaned_content.startswith("```json"):
+        cleaned_content = cleaned_content[7:]
+    if cleaned_content.endswith("```"):
+        cleaned_content = cleaned_content[:-3]
+    cleaned_content = cleaned_content.strip()
+    
+    # ==================== JSON VALIDATION AND STRUCTURE VERIFICATION ====================
     
-    return OpenAI(api_key=api_key)
+    # Parse JSON with comprehensive error handling
+    quiz_questions = json.loads(cleaned_content)
+    
+    # Validate top-level structure
+    if not isinstance(quiz_questions, list):
+        raise ValueError("Quiz response must be a list of questions")
+        
+    # Validate each question's structure and content
+    for i, question in enumerate(quiz_questions):
+        _validate_question(question, i, question_types)
+    
+    return quiz_questions
 
 def generate_quiz(
     text: str, 
     num_questions: int = 3,
     difficulty: str = "high_school",
-    learning_style: str = "reading"
+    learning_style: str = "reading",
+    question_types: QuestionTypes = DEFAULT_QUESTION_TYPES
 ) -> List[Dict[str, Any]]:
     """
     Adaptive Quiz Generation Engine
@@ -166,12 +474,19 @@ def generate_quiz(
             - "kinesthetic": Application-based scenarios and hands-on examples
             - Default: "reading" for universal accessibility
             
+        question_types (QuestionTypes, optional): Question formats to mix
+            - "multiple_choice", "true_false" and/or "short_answer", spread evenly
+            - Or explicit counts per type, e.g. {"true_false": 2, "short_answer": 1}
+            - Default: multiple choice only
+            - All types come back from one call
+            
     Returns:
         List[Dict[str, Any]]: Structured quiz questions with comprehensive metadata
             Each question dictionary contains:
-            - "question": The formatted question text
-            - "options": List of 4 multiple-choice options [A, B, C, D]
-            - "correct_answer": Single letter indicating correct option
+            - "question_type": "multiple_choice", "true_false" or "short_answer"
+            - "question": The formatted question text (a statement for true/false)
+            - "options": 4 options [A, B, C, D], ["True", "False"], or [] for short answer
+            - "correct_answer": Option letter, "True"/"False", or a brief model answer
             - "explanation": Detailed explanation of why the answer is correct
             - "difficulty": Assessed difficulty level (easy|medium|hard)
             
@@ -223,141 +538,391 @@ def generate_quiz(
     """
     # ==================== INPUT VALIDATION AND SANITIZATION ====================
     
-    # Validate text content - must be non-empty and meaningful
-    if not text or not text.strip():
-        raise ValueError("Input text cannot be empty")
-        
-    # Validate question count - balance between assessment value and cognitive load
-    if not 1 <= num_questions <= 10:
-        raise ValueError("Number of questions must be between 1 and 10")
-        
-    # Validate text length - prevent API overload and ensure processing efficiency
-    if len(text) > 8000:
-        raise ValueError("Text too long for quiz generation (max 8000 characters)")
-    
-    # ==================== OPENAI CLIENT INITIALIZATION ====================
-    
-    # Initialize OpenAI client with proper error handling
-    client = get_openai_client()
-    
-    # ==================== DIFFICULTY LEVEL CONFIGURATION ====================
-    
-    # Educational complexity mapping based on Bloom's Taxonomy and grade-level standards
-    difficulty_prompts = {
-        "middle_school": "Create basic comprehension questions that test understanding of main ideas and key facts.",
-        "high_school": "Create questions that test analysis, inference, and deeper understanding beyond memorization.",
-        "college": "Create advanced questions requiring critical thinking, synthesis, and evaluation of complex concepts."
-    }
-    
-    # ==================== LEARNING STYLE ADAPTATIONS ====================
-    
-    # Universal Design for Learning (UDL) principles applied to question formatting
-    style_adaptations = {
-        "visual": "Include references to diagrams, charts, or visual representations when relevant. Use clear, structured question formats.",
-        "auditory": "Write questions in a conversational style that sound natural when read aloud. Use rhythm and flow.",
-        "reading": "Use traditional academic question formats with precise language and clear structure.",
-        "kinesthetic": "Focus on application scenarios, real-world examples, and hands-on problem-solving situations."
-    }
+    _validate_quiz_input(text, num_questions)
     
     # ==================== PROMPT ENGINEERING FOR CONSISTENT OUTPUT ====================
     
-    # Structured system prompt with clear instructions and formatting requirements
-    system_prompt = f"""You are an expert educational assessment creator for StudyBuddy AI.
-    
-    Create {num_questions} multiple-choice questions from the given text.
-    
-    Difficulty level: {difficulty}
-    {difficulty_prompts.get(difficulty, difficulty_prompts['high_school'])}
-    
-    Learning style adaptation: {learning_style}
-    {style_adaptations.get(learning_style, style_adaptations['reading'])}
-    
-    Requirements:
-    - Each question must have exactly 4 options (A, B, C, D)
-    - Only one correct answer per question
-    - Include explanation for why the correct answer is right
-    - Questions should test understanding, not just memorization
-    - Use inclusive, encouraging language
-    
-    Return ONLY valid JSON in this exact format:
-    [
-        {{
-            "question": "Question text here?",
-            "options": ["Option A", "Option B", "Option C", "Option D"],
-            "correct_answer": "A",
-            "explanation": "Explanation of why A is correct",
-            "difficulty": "easy|medium|hard"
-        }}
-    ]"""
+    messages = _build_quiz_messages(text, num_questions, difficulty, learning_style, question_types=question_types)
+    type_counts = question_type_counts(num_questions, question_types)
     
-    # User content prompt with sanitized input
-    user_prompt = f"Generate quiz questions from this content:\n\n{text.strip()}"
+    # Size the completion for the requested questions so long quizzes are not cut off
+    max_tokens = _quiz_max_tokens(messages, type_counts)
     
     # ==================== API REQUEST AND RESPONSE HANDLING ====================
     
     raw_content = None
     try:
         # Make API request with optimized parameters for quiz generation
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
-            temperature=0.3,  # Lower temperature for consistent quiz format
-            max_tokens=1500   # Sufficient for comprehensive quiz questions
+        # Concurrent identical requests share one call; the shared limiter paces,
+        # queues and retries it against the account budget
+        response = quiz_flights.do(
+            quiz_request_key(text, num_questions, difficulty, learning_style, question_types=question_types),
+            lambda: protected_call(
+                CHAT_COMPLETIONS, QUIZ_MODEL,
+                lambda: client.chat.completions.create(
+                    model=QUIZ_MODEL,
+                    messages=messages,
+                    temperature=0.3,  # Lower temperature for consistent quiz format
+                    max_tokens=max_tokens
+                ),
+                tokens=request_tokens(messages, max_tokens, QUIZ_MODEL)
+            )
         )
         
-        # Extract and validate response content
+        # Extract, clean and validate response content (each caller parses its own
+        # copy, so questions shared through a coalesced call are never aliased)
         raw_content = response.choices[0].message.content
-        if not raw_content:
-            raise RuntimeError("OpenAI returned empty response")
+        quiz_questions = _parse_quiz_content(raw_content, list(type_counts))
         
-        # ==================== RESPONSE PARSING AND CLEANING ====================
+        # ==================== SUCCESS LOGGING AND RETURN ====================
         
-        # Clean common JSON formatting issues from AI responses
-        cleaned_content = raw_content.strip()
-        if cleaned_content.startswith("```json"):
-            cleaned_content = cleaned_content[7:]
-        if cleaned_content.endswith("```"):
-            cleaned_content = cleaned_content[:-3]
-        cleaned_content = cleaned_content.strip()
+        logger.info(f"Successfully generated {len(quiz_questions)} quiz questions")
+        return quiz_questions
         
-        # ==================== JSON VALIDATION AND STRUCTURE VERIFICATION ====================
+    except json.JSONDecodeError as e:
+        # Handle JSON parsing failures with detailed logging
+        logger.error(f"Failed to parse quiz JSON: {e}\nRaw content: {raw_content}")
+        raise RuntimeError("Failed to generate properly formatted quiz questions") from e
         
-        # Parse JSON with comprehensive error handling
-        quiz_questions = json.loads(cleaned_content)
+    except CircuitOpenError:
+        # The upstream is known to be down: fail fast so the caller can answer with a 503
+        raise
         
-        # Validate top-level structure
-        if not isinstance(quiz_questions, list):
-            raise ValueError("Quiz response must be a list of questions")
-            
-        # Validate each question's structure and content
-        for i, question in enumerate(quiz_questions):
-            required_fields = ["question", "options", "correct_answer", "explanation"]
-            missing_fields = [field for field in required_fields if field not in question]
-            if missing_fields:
-                raise ValueError(f"Question {i+1} missing fields: {missing_fields}")
-                
-            # Validate multiple choice format
-            if len(question["options"]) != 4:
-                raise ValueError(f"Question {i+1} must have exactly 4 options")
-                
-            # Validate correct answer format
-            if question["correct_answer"] not in ["A", "B", "C", "D"]:
-                raise ValueError(f"Question {i+1} correct_answer must be A, B, C, or D")
+    except Exception as e:
+        # Handle all other exceptions with proper logging and user-friendly messages
+        logger.error(f"Quiz generation failed: {e}")
+        raise RuntimeError(f"Unable to generate quiz: {str(e)}") from e
+
+async def generate_quiz_async(
+    text: str,
+    num_questions: int = 3,
+    difficulty: str = "high_school",
+    learning_style: str = "reading",
+    exclude_questions: Sequence[str] = (),
+    question_types: QuestionTypes = DEFAULT_QUESTION_TYPES
+) -> List[Dict[str, Any]]:
+    """
+    Asynchronous Adaptive Quiz Generation
+    
+    Non-blocking counterpart of generate_quiz() built on the shared async OpenAI
+    client. FastAPI routes await this function so that quiz generation never
+    blocks the event loop while the completion is in flight.
+    
+    Prompting, JSON cleaning, per-question validation and error translation are
+    shared with generate_quiz() and behave identically.
+    
+    Args:
+        text (str): Source educational content (max 8000 characters)
+        num_questions (int, optional): Number of questions to generate (1-10)
+        difficulty (str, optional): "middle_school", "high_school" or "college"
+        learning_style (str, optional): "visual", "auditory", "reading" or "kinesthetic"
+        exclude_questions (Sequence[str], optional): Questions the student already
+            has; the model is asked not to repeat them
+        question_types (QuestionTypes, optional): Question formats to mix (see generate_quiz())
         
-        # ==================== SUCCESS LOGGING AND RETURN ====================
+    Returns:
+        List[Dict[str, Any]]: Validated quiz questions (see generate_quiz())
+        
+    Raises:
+        ValueError: Invalid input parameters or constraints violated
+        RuntimeError: API failures or malformed quiz output
+    """
+    _validate_quiz_input(text, num_questions)
+    messages = _build_quiz_messages(text, num_questions, difficulty, learning_style, exclude_questions, question_types)
+    type_counts = question_type_counts(num_questions, question_types)
+    max_tokens = _quiz_max_tokens(messages, type_counts)
+    
+    raw_content = None
+    try:
+        # Identical requests share one call; an unusually slow one is raced against a hedge
+        response = await quiz_flights.do_async(
+            quiz_request_key(text, num_questions, difficulty, learning_style, exclude_questions, question_types),
+            lambda: quiz_hedger.call_async(
+                lambda: protected_call_async(
+                    CHAT_COMPLETIONS, QUIZ_MODEL,
+                    lambda: async_client.chat.completions.create(
+                        model=QUIZ_MODEL,
+                        messages=messages,
+                        temperature=0.3,
+                        max_tokens=max_tokens
+                    ),
+                    tokens=request_tokens(messages, max_tokens, QUIZ_MODEL)
+                )
+            )
+        )
+        
+        raw_content = response.choices[0].message.content
+        quiz_questions = _parse_quiz_content(raw_content, list(type_counts))
         
         logger.info(f"Successfully generated {len(quiz_questions)} quiz questions")
         return quiz_questions
         
     except json.JSONDecodeError as e:
-        # Handle JSON parsing failures with detailed logging
         logger.error(f"Failed to parse quiz JSON: {e}\nRaw content: {raw_content}")
-        raise RuntimeError("Failed to generate properly formatted quiz questions")
+        raise RuntimeError("Failed to generate properly formatted quiz questions") from e
+        
+    except CircuitOpenError:
+        raise
         
     except Exception as e:
-        # Handle all other exceptions with proper logging and user-friendly messages
         logger.error(f"Quiz generation failed: {e}")
-        raise RuntimeError(f"Unable to generate quiz: {str(e)}")
\ No newline at end of file
+        raise RuntimeError(f"Unable to generate quiz: {str(e)}") from e
+
+async def stream_quiz_async(
+    text: str,
+    num_questions: int = 3,
+    difficulty: str = "high_school",
+    learning_style: str = "reading",
+    exclude_questions: Sequence[str] = (),
+    question_types: QuestionTypes = DEFAULT_QUESTION_TYPES
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Streaming Adaptive Quiz Generation
+    
+    Async generator that yields each quiz question as soon as it is complete in a
+    streamed chat completion. An incremental JSON array parser consumes the
+    stream and every question object is validated the moment its closing brace
+    arrives, so the first question reaches the student long before the full
+    1500-token completion has finished.
+    
+    Prompting and per-question validation are shared with generate_quiz(); the
+    ```json fence some responses are wrapped in is skipped by the parser.
+    
+    Args:
+        text (str): Source educational content (max 8000 characters)
+        num_questions (int, optional): Number of questions to generate (1-10)
+        difficulty (str, optional): "middle_school", "high_school" or "college"
+        learning_style (str, optional): "visual", "auditory", "reading" or "kinesthetic"
+        exclude_questions (Sequence[str], optional): Questions the student already
+            has; the model is asked not to repeat them
+        question_types (QuestionTypes, optional): Question formats to mix (see generate_quiz())
+        
+    Yields:
+        Dict[str, Any]: Validated quiz questions in order (see generate_quiz())
+        
+    Raises:
+        ValueError: Invalid input parameters or constraints violated
+        RuntimeError: API failures, malformed JSON or invalid questions; questions
+            yielded before the failure remain valid
+        
+    Example:
+        >>> async for question in stream_quiz_async(content, num_questions=5):
+        ...     show(question)
+    """
+    _validate_quiz_input(text, num_questions)
+    messages = _build_quiz_messages(text, num_questions, difficulty, learning_style, exclude_questions, question_types)
+    type_counts = question_type_counts(num_questions, question_types)
+    max_tokens = _quiz_max_tokens(messages, type_counts)
+    
+    parser = JSONArrayStreamParser()
+    question_count = 0
+    try:
+        stream = await protected_call_async(
+            CHAT_COMPLETIONS, QUIZ_MODEL,
+            lambda: async_client.chat.completions.create(
+                model=QUIZ_MODEL,
+                messages=messages,
+                temperature=0.3,
+                max_tokens=max_tokens,
+                stream=True
+            ),
+            tokens=request_tokens(messages, max_tokens, QUIZ_MODEL)
+        )
+        
+        # The context manager releases the upstream connection if the client disconnects
+        async with stream:
+            async for chunk in stream:
+                if not chunk.choices or not chunk.choices[0].delta.content:
+                    continue
+                for question in parser.feed(chunk.choices[0].delta.content):
+                    _validate_question(question, question_count, list(type_counts))
+                    question_count += 1
+                    yield question
+                if parser.done:
+                    break
+        
+        if not parser.started:
+            raise RuntimeError("OpenAI returned empty response")
+        if not parser.done:
+            raise RuntimeError("Quiz response ended before the question list was complete")
+        
+        logger.info(f"Successfully streamed {question_count} quiz questions")
+        
+    except json.JSONDecodeError as e:
+        logger.error(f"Failed to parse streamed quiz JSON: {e}")
+        raise RuntimeError("Failed to generate properly formatted quiz questions") from e
+        
+    except CircuitOpenError:
+        raise
+        
+    except Exception as e:
+        logger.error(f"Streaming quiz generation failed: {e}")
+        raise RuntimeError(f"Unable to generate quiz: {str(e)}") from e
+
+def _take_banked(
+    text: str,
+    type_counts: Mapping[str, int],
+    difficulty: str,
+    learning_style: str
+) -> List[Dict[str, Any]]:
+    """Banked questions of each requested type, or none when the bank is disabled."""
+    if question_bank is None:
+        return []
+    banked: List[Dict[str, Any]] = []
+    for question_type, count in type_counts.items():
+        banked += question_bank.take(
+            text, difficulty, learning_style, count,
+            related=QUESTION_BANK_REUSE_RELATED, question_type=question_type, record_lookup=False
+        )
+    # One quiz request is one lookup, however many types it mixes
+    question_bank.record_lookup(sum(type_counts.values()), len(banked))
+    return banked
+
+def _missing_counts(type_counts: Mapping[str, int], banked: List[Dict[str, Any]]) -> Dict[str, int]:
+    """Questions of each type the bank could not provide."""
+    missing = dict(type_counts)
+    for question in banked:
+        missing[question_type_of(question)] -= 1
+    return {question_type: count for question_type, count in missing.items() if count}
+
+def _top_up(
+    banked: List[Dict[str, Any]],
+    generated: List[Dict[str, Any]],
+    missing: Mapping[str, int]
+) -> List[Dict[str, Any]]:
+    """Generated questions filling the missing counts, without repeats of banked ones."""
+    wanted = dict(missing)
+    top_up = []
+    for question in new_questions(banked, generated):
+        if wanted.get(question_type_of(question), 0) > 0:
+            wanted[question_type_of(question)] -= 1
+            top_up.append(question)
+    return top_up
+
+def _bank_questions(text: str, difficulty: str, learning_style: str, questions: List[Dict[str, Any]]) -> None:
+    """Keep freshly generated questions for later requests."""
+    if question_bank is not None and questions:
+        stored = question_bank.add(text, difficulty, learning_style, questions)
+        logger.info(f"Stored {stored} new questions in the question bank")
+
+async def generate_quiz_banked_async(
+    text: str,
+    num_questions: int = 3,
+    difficulty: str = "high_school",
+    learning_style: str = "reading",
+    question_types: QuestionTypes = DEFAULT_QUESTION_TYPES
+) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Quiz Generation Backed by the Question Bank
+    
+    Serves as many questions as possible from the persistent question bank and
+    generates only the ones still missing, telling the model which questions
+    the student already has so the top-up does not repeat them. Generated
+    questions that still repeat one are replaced by asking again for the
+    shortfall (up to QUESTION_BANK_TOP_UP_RETRIES times). Every newly generated
+    question is stored for later requests, so content that comes back often is
+    answered without any API call.
+    
+    Args:
+        text (str): Source educational content (max 8000 characters)
+        num_questions (int, optional): Number of questions wanted (1-10)
+        difficulty (str, optional): "middle_school", "high_school" or "college"
+        learning_style (str, optional): "visual", "auditory", "reading" or "kinesthetic"
+        question_types (QuestionTypes, optional): Question formats to mix (see generate_quiz());
+            the bank is drawn on per type
+        
+    Returns:
+        Tuple[List[Dict[str, Any]], int]: The questions (banked first) and how many
+        came from the bank; fewer than requested only when every retry still
+        repeated existing questions
+        
+    Raises:
+        ValueError: Invalid input parameters or constraints violated
+        CircuitOpenError: Questions had to be generated while the circuit is open
+        RuntimeError: API failures or malformed quiz output
+    """
+    _validate_quiz_input(text, num_questions)
+    type_counts = question_type_counts(num_questions, question_types)
+    banked = _take_banked(text, type_counts, difficulty, learning_style)
+    missing = _missing_counts(type_counts, banked)
+    if not missing:
+        logger.info(f"Quiz served from the question bank ({len(banked)} questions)")
+        return banked, len(banked)
+    
+    questions = list(banked)
+    for _ in range(1 + QUESTION_BANK_TOP_UP_RETRIES):
+        generated = await generate_quiz_async(
+            text, sum(missing.values()), difficulty, learning_style,
+            exclude_questions=[question["question"] for question in questions],
+            question_types=missing
+        )
+        _bank_questions(text, difficulty, learning_style, generated)
+        questions += _top_up(questions, generated, missing)
+        missing = _missing_counts(type_counts, questions)
+        if not missing:
+            break
+    
+    if missing:
+        logger.warning(
+            f"Quiz short of new questions: {len(questions)} of {num_questions} "
+            f"after {1 + QUESTION_BANK_TOP_UP_RETRIES} attempts"
+        )
+    if banked:
+        logger.info(f"Quiz topped up: {len(banked)} banked + {len(questions) - len(banked)} generated questions")
+    return questions, len(banked)
+
+async def stream_quiz_banked_async(
+    text: str,
+    num_questions: int = 3,
+    difficulty: str = "high_school",
+    learning_style: str = "reading",
+    question_types: QuestionTypes = DEFAULT_QUESTION_TYPES
+) -> AsyncIterator[Tuple[Dict[str, Any], bool]]:
+    """
+    Streaming counterpart of generate_quiz_banked_async().
+    
+    Banked questions are yielded at once; the missing ones are then streamed from
+    the model as they complete, and stored in the bank (including those yielded
+    before a failure, which are valid). Streamed questions repeating one already
+    yielded are skipped, and the shortfall is asked for again up to
+    QUESTION_BANK_TOP_UP_RETRIES times.
+    
+    Yields:
+        Tuple[Dict[str, Any], bool]: Each question and whether it came from the bank
+        
+    Raises:
+        ValueError, CircuitOpenError, RuntimeError: As stream_quiz_async()
+    """
+    _validate_quiz_input(text, num_questions)
+    type_counts = question_type_counts(num_questions, question_types)
+    banked = _take_banked(text, type_counts, difficulty, learning_style)
+    for question in banked:
+        yield question, True
+    
+    missing = _missing_counts(type_counts, banked)
+    if not missing:
+        return
+    
+    questions = list(banked)
+    for _ in range(1 + QUESTION_BANK_TOP_UP_RETRIES):
+        generated: List[Dict[str, Any]] = []
+        try:
+            async for question in stream_quiz_async(
+                text, sum(missing.values()), difficulty, learning_style,
+                exclude_questions=[question["question"] for question in questions],
+                question_types=missing
+            ):
+                generated.append(question)
+                if _top_up(questions, [question], _missing_counts(type_counts, questions)):
+                    questions.append(question)
+                    yield question, False
+        finally:
+            _bank_questions(text, difficulty, learning_style, generated)
+        missing = _missing_counts(type_counts, questions)
+        if not missing:
+            return
+    
+    logger.warning(
+        f"Streamed quiz short of new questions: {len(questions)} of {num_questions} "
+        f"after {1 + QUESTION_BANK_TOP_UP_RETRIES} attempts"
+    )
@@ -0,0 +1,484 @@
+"""
+StudyBuddy AI - Adaptive Rate Limiter for Upstream OpenAI Calls
+
+This module is the single gate every OpenAI request passes through. Instead of
+firing requests as fast as students click and then failing on the first 429,
+callers are paced against the account's requests-per-minute and
+tokens-per-minute budgets, queued in arrival order when the budget is spent,
+and retried with jittered exponential backoff when the API still pushes back.
+
+Core Functionality:
+- Token buckets for requests/minute and tokens/minute per model
+- A concurrency cap with first-come-first-served hand-off of free slots
+- Adaptation from the x-ratelimit-* response headers (limit, remaining) so the
+  local budget follows the real account tier and usage from other processes
+- A shared pause on 429 (honouring retry-after) so queued callers do not all
+  retry at the same instant
+- Jittered exponential backoff for rate limits, timeouts, connection errors and 5xx
+- Works from both coroutines and worker threads
+
+Configuration (environment variables):
+- OPENAI_RPM_LIMIT / OPENAI_TPM_LIMIT: Starting chat budgets (default 3500 / 160000)
+- OPENAI_AUDIO_RPM_LIMIT: Starting Whisper request budget (default 500)
+- OPENAI_MAX_CONCURRENCY: Requests in flight per model (default 16)
+- RATE_LIMIT_BURST_SECONDS: Seconds of budget that may be spent at once (default 10)
+- RATE_LIMIT_MAX_RETRIES: Retries after a retryable failure (default 4)
+- RATE_LIMIT_MAX_QUEUE_SECONDS: Longest a caller is queued before failing (default 120)
+
+Fairness:
+- Budget is reserved under a lock in arrival order and a caller that cannot be
+  served immediately is told exactly how long to wait, so later arrivals are
+  always scheduled after earlier ones and nobody spins on the lock
+
+@version 1.0.0
+@since 2026-10-16
+"""
+
+import asyncio
+import contextvars
+import logging
+import os
+import random
+import re
+import threading
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Mapping, Optional, TypeVar
+
+import openai
+
+# Configure module-level logger for comprehensive monitoring and debugging
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# ==================== CONFIGURATION ====================
+
+# Starting budgets; replaced by the account's real limits once headers arrive
+DEFAULT_REQUESTS_PER_MINUTE = int(os.getenv("OPENAI_RPM_LIMIT", "3500"))
+DEFAULT_TOKENS_PER_MINUTE = int(os.getenv("OPENAI_TPM_LIMIT", "160000"))
+AUDIO_REQUESTS_PER_MINUTE = int(os.getenv("OPENAI_AUDIO_RPM_LIMIT", "500"))
+
+# Upper bound on requests in flight per model
+MAX_CONCURRENCY = int(os.getenv("OPENAI_MAX_CONCURRENCY", "16"))
+
+# Seconds of budget that may be spent in a single burst
+BURST_SECONDS = float(os.getenv("RATE_LIMIT_BURST_SECONDS", "10"))
+
+# Retries after a retryable failure, and the backoff curve between them
+MAX_RETRIES = int(os.getenv("RATE_LIMIT_MAX_RETRIES", "4"))
+BACKOFF_BASE_SECONDS = 0.5
+BACKOFF_MAX_SECONDS = 30.0
+
+# A caller that would be queued longer than this fails instead of waiting
+MAX_QUEUE_SECONDS = float(os.getenv("RATE_LIMIT_MAX_QUEUE_SECONDS", "120"))
+
+# Header durations look like "20ms", "1s", "6m0s" or "1h2m3.5s"
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+# Limiter whose request is currently in progress (read by the HTTP response hook)
+_active_limiter: contextvars.ContextVar[Optional["RateLimiter"]] = contextvars.ContextVar(
+    "active_rate_limiter", default=None
+)
+
+
+class RateLimitQueueFull(RuntimeError):
+    """Raised when a caller would have to wait longer than the queue allows."""
+
+
+def parse_duration(value: str) -> Optional[float]:
+    """Parse an OpenAI reset header ("6m0s", "20ms") or a plain number of seconds."""
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Whether an upstream failure is transient and worth retrying."""
+    if isinstance(error, openai.RateLimitError):
+        # An exhausted quota will not recover by waiting
+        return getattr(error, "code", None) != "insufficient_quota"
+    return isinstance(error, (openai.APIConnectionError, openai.InternalServerError))
+
+
+def retry_after_seconds(error: BaseException) -> Optional[float]:
+    """Server-requested delay from a failed response's retry-after headers, if any."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return float(retry_after_ms) / 1000
+        except ValueError:
+            pass
+    retry_after = headers.get("retry-after")
+    return parse_duration(retry_after) if retry_after else None
+
+
+class _TokenBucket:
+    """
+    Per-minute budget refilled continuously.
+
+    Reservations may drive the level negative; the deficit is the time the
+    caller has to wait, which keeps callers in strict arrival order.
+    """
+
+    def __init__(self, per_minute: float, now: float):
+        self.per_minute = per_minute
+        self.level = self.capacity
+        self.updated = now
+
+    @property
+    def capacity(self) -> float:
+        return max(1.0, self.per_minute * BURST_SECONDS / 60)
+
+    @property
+    def rate(self) -> float:
+        return self.per_minute / 60
+
+    def refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, amount: float, now: float) -> float:
+        """Take amount from the bucket and return the seconds until it is covered."""
+        self.refill(now)
+        self.level -= min(amount, self.capacity)
+        return max(0.0, -self.level / self.rate)
+
+    def refund(self, amount: float) -> None:
+        self.level = min(self.capacity, self.level + min(amount, self.capacity))
+
+    def observe(self, limit: Optional[float], remaining: Optional[float], now: float) -> None:
+        """Follow the server's view of the limit and of what is left of it."""
+        self.refill(now)
+        if limit and limit != self.per_minute:
+            self.per_minute = limit
+            self.level = min(self.level, self.capacity)
+        if remaining is not None and remaining < self.level:
+            self.level = remaining
+
+
+class _Waiter:
+    """A queued caller waiting for a concurrency slot (coroutine or thread)."""
+
+    def __init__(self, loop: Optional[asyncio.AbstractEventLoop]):
+        self.loop = loop
+        self.future = loop.create_future() if loop is not None else None
+        self.event = threading.Event() if loop is None else None
+        self.handed_slot = False
+
+    def wake(self) -> bool:
+        """Hand the slot to this waiter; False when it has already given up."""
+        if self.future is not None and self.future.done():
+            return False
+        self.handed_slot = True
+        if self.event is not None:
+            self.event.set()
+        else:
+            self.loop.call_soon_threadsafe(self._resolve)
+        return True
+
+    def _resolve(self) -> None:
+        if not self.future.done():
+            self.future.set_result(None)
+
+
+class RateLimiter:
+    """
+    Pacing, queueing and retry policy for one upstream model.
+
+    Args:
+        name (str): Model or endpoint the budget belongs to (used in logs and stats)
+        requests_per_minute (float): Starting request budget
+        tokens_per_minute (Optional[float]): Starting token budget; None disables it
+        max_concurrency (int): Requests allowed in flight at once
+        max_retries (int): Retries after a retryable failure
+        max_queue_seconds (float): Longest wait a caller accepts before failing
+        clock (Callable[[], float]): Monotonic time source (injectable for tests)
+        rng (random.Random): Jitter source (injectable for tests)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE,
+        tokens_per_minute: Optional[float] = DEFAULT_TOKENS_PER_MINUTE,
+        max_concurrency: int = MAX_CONCURRENCY,
+        max_retries: int = MAX_RETRIES,
+        max_queue_seconds: float = MAX_QUEUE_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+        rng: Optional[random.Random] = None,
+    ):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.max_queue_seconds = max_queue_seconds
+        self._clock = clock
+        self._rng = rng or random.Random()
+        now = clock()
+        self._requests = _TokenBucket(requests_per_minute, now)
+        self._tokens = _TokenBucket(tokens_per_minute, now) if tokens_per_minute else None
+        self._paused_until = 0.0
+        self._in_flight = 0
+        self._waiters: Deque[_Waiter] = deque()
+        self._lock = threading.Lock()
+        self._counters = {"requests": 0, "queued": 0, "throttled": 0, "retries": 0}
+
+    # ==================== BUDGET ====================
+
+    def _reserve(self, tokens: int) -> float:
+        """Reserve one request (and its tokens) and return the seconds to wait first."""
+        with self._lock:
+            now = self._clock()
+            wait = self._requests.reserve(1, now)
+            if self._tokens is not None and tokens:
+                wait = max(wait, self._tokens.reserve(tokens, now))
+            wait = max(wait, self._paused_until - now)
+
+            if wait > self.max_queue_seconds:
+                self._refund_locked(tokens)
+                raise RateLimitQueueFull("AI service is busy. Please try again in a moment.")
+
+            self._counters["requests"] += 1
+            if wait > 0:
+                self._counters["queued"] += 1
+            return wait
+
+    def _refund_locked(self, tokens: int) -> None:
+        self._requests.refund(1)
+        if self._tokens is not None and tokens:
+            self._tokens.refund(tokens)
+
+    def _cancel_reservation(self, tokens: int) -> None:
+        """Give back a reservation whose caller gave up while queued (e.g. a losing hedge)."""
+        with self._lock:
+            self._refund_locked(tokens)
+
+    def _pause(self, seconds: float) -> None:
+        """Hold every caller back after the server signalled a rate limit."""
+        with self._lock:
+            self._counters["throttled"] += 1
+            self._paused_until = max(self._paused_until, self._clock() + seconds)
+
+    def _backoff(self, attempt: int, error: BaseException) -> float:
+        """Delay before retry number attempt (0-based), with full jitter."""
+        ceiling = min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt)
+        delay = self._rng.uniform(0, ceiling)
+        retry_after = retry_after_seconds(error)
+        if retry_after is not None:
+            # Spread retries just past the server's window rather than all at its edge
+            delay = retry_after + self._rng.uniform(0, BACKOFF_BASE_SECONDS)
+        if isinstance(error, openai.RateLimitError):
+            self._pause(retry_after if retry_after is not None else ceiling)
+        return delay
+
+    def observe_headers(self, headers: Mapping[str, str]) -> None:
+        """
+        Adapt the budgets to x-ratelimit-* response headers.
+
+        Args:
+            headers (Mapping[str, str]): Headers of any OpenAI response
+        """
+        def number(header: str) -> Optional[float]:
+            value = headers.get(header)
+            try:
+                return float(value) if value is not None else None
+            except ValueError:
+                return None
+
+        with self._lock:
+            now = self._clock()
+            self._requests.observe(
+                number("x-ratelimit-limit-requests"), number("x-ratelimit-remaining-requests"), now
+            )
+            if self._tokens is not None:
+                self._tokens.observe(
+                    number("x-ratelimit-limit-tokens"), number("x-ratelimit-remaining-tokens"), now
+                )
+
+    # ==================== CONCURRENCY ====================
+
+    def _try_enter(self, waiter_loop: Optional[asyncio.AbstractEventLoop]) -> Optional[_Waiter]:
+        """Take a free slot, or enqueue and return a waiter to block on."""
+        with self._lock:
+            if self._in_flight < self.max_concurrency and not self._waiters:
+                self._in_flight += 1
+                return None
+            waiter = _Waiter(waiter_loop)
+            self._waiters.append(waiter)
+            return waiter
+
+    def _leave(self) -> None:
+        """Release a slot, handing it straight to the longest-waiting caller."""
+        with self._lock:
+            while self._waiters:
+                if self._waiters.popleft().wake():
+                    return
+            self._in_flight -= 1
+
+    def _abandon(self, waiter: _Waiter) -> None:
+        """Withdraw a cancelled waiter, passing on a slot it was already handed."""
+        with self._lock:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+                return
+            handed_slot = waiter.handed_slot
+        if handed_slot:
+            self._leave()
+
+    async def _enter_async(self) -> None:
+        waiter = self._try_enter(asyncio.get_running_loop())
+        if waiter is None:
+            return
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            self._abandon(waiter)
+            raise
+
+    def _enter(self) -> None:
+        waiter = self._try_enter(None)
+        if waiter is not None:
+            waiter.event.wait()
+
+    # ==================== CALLS ====================
+
+    async def call_async(self, request: Callable[[], Awaitable[T]], tokens: int = 0) -> T:
+        """
+        Run an async upstream request under the budget, retrying transient failures.
+
+        Args:
+            request (Callable[[], Awaitable[T]]): Zero-argument factory for the API call;
+                it is invoked again for every retry
+            tokens (int): Prompt plus completion tokens the request may consume
+
+        Returns:
+            T: Whatever the request returns
+
+        Raises:
+            RateLimitQueueFull: When the queue wait would exceed max_queue_seconds
+            Exception: The last upstream error once retries are exhausted, or any
+                non-retryable error immediately
+        """
+        attempt = 0
+        while True:
+            wait = self._reserve(tokens)
+            if wait > 0:
+                try:
+                    await asyncio.sleep(wait)
+                except asyncio.CancelledError:
+                    # Otherwise every later caller would queue behind a request never sent
+                    self._cancel_reservation(tokens)
+                    raise
+            await self._enter_async()
+            context = _active_limiter.set(self)
+            try:
+                return await request()
+            except Exception as e:
+                if attempt >= self.max_retries or not is_retryable(e):
+                    raise
+                error, delay = e, self._backoff(attempt, e)
+            finally:
+                _active_limiter.reset(context)
+                self._leave()
+
+            attempt += 1
+            self._counters["retries"] += 1
+            logger.warning(f"{self.name} request failed ({error}); retry {attempt} in {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+    def call(self, request: Callable[[], T], tokens: int = 0) -> T:
+        """Blocking counterpart of call_async() for synchronous callers."""
+        attempt = 0
+        while True:
+            wait = self._reserve(tokens)
+            if wait > 0:
+                time.sleep(wait)
+            self._enter()
+            context = _active_limiter.set(self)
+            try:
+                return request()
+            except Exception as e:
+                if attempt >= self.max_retries or not is_retryable(e):
+                    raise
+                error, delay = e, self._backoff(attempt, e)
+            finally:
+                _active_limiter.reset(context)
+                self._leave()
+
+            attempt += 1
+            self._counters["retries"] += 1
+            logger.warning(f"{self.name} request failed ({error}); retry {attempt} in {delay:.2f}s")
+            time.sleep(delay)
+
+    def stats(self) -> Dict[str, Any]:
+        """Current budgets, queue depth and counters for monitoring."""
+        with self._lock:
+            return {
+                "requests_per_minute": self._requests.per_minute,
+                "tokens_per_minute": self._tokens.per_minute if self._tokens else None,
+                "in_flight": self._in_flight,
+                "waiting_for_slot": len(self._waiters),
+                **self._counters,
+            }
+
+
+# ==================== SHARED LIMITERS ====================
+
+_limiters: Dict[str, RateLimiter] = {}
+_registry_lock = threading.Lock()
+
+
+def get_limiter(model: str) -> RateLimiter:
+    """
+    Return the process-wide limiter for a model, creating it on first use.
+
+    OpenAI budgets are per model, so every module calling the same model shares
+    one limiter. Whisper has no token budget and its own request budget.
+    """
+    limiter = _limiters.get(model)
+    if limiter is None:
+        with _registry_lock:
+            limiter = _limiters.get(model)
+            if limiter is None:
+                if model.startswith("whisper"):
+                    limiter = RateLimiter(model, AUDIO_REQUESTS_PER_MINUTE, tokens_per_minute=None)
+                else:
+                    limiter = RateLimiter(model)
+                _limiters[model] = limiter
+    return limiter
+
+
+def limiter_stats() -> Dict[str, Dict[str, Any]]:
+    """Stats for every limiter created so far, keyed by model."""
+    return {model: limiter.stats() for model, limiter in list(_limiters.items())}
+
+
+def observe_response(response: Any) -> None:
+    """httpx response hook: feed rate-limit headers to the limiter making the call."""
+    limiter = _active_limiter.get()
+    if limiter is not None:
+        limiter.observe_headers(response.headers)
+
+
+async def observe_response_async(response: Any) -> None:
+    """Async variant of observe_response() for the async HTTP client."""
+    observe_response(response)
+
+
+def reset_limiters() -> None:
+    """Forget every limiter so budgets start fresh (tests and reconfiguration)."""
+    with _registry_lock:
+        _limiters.clear()
@@ -0,0 +1,149 @@
+"""
+StudyBuddy AI - Near-Duplicate Detection for Short Texts
+
+Quizzes assembled from several independently generated parts (one call per
+section of a long chapter) tend to repeat themselves: overlapping sections and
+recurring key terms lead the model to ask the same thing twice in slightly
+different words. Exact fingerprints miss those; this module catches them
+locally, without an embedding call.
+
+Core Functionality:
+- Character shingles of normalized text (case, punctuation and whitespace
+  ignored), which suit one-sentence questions better than word shingles
+- MinHash signatures estimating the Jaccard similarity of two shingle sets
+- NearDuplicateFilter: keeps the first of every group of near-duplicates
+
+Performance Characteristics:
+- Each shingle is hashed once; the permutations are cheap universal hashes
+- The filter compares signatures pairwise, which is fine for the tens of
+  questions in a quiz; it is not meant for corpus-scale deduplication
+
+@version 1.0.0
+@since 2026-10-16
+"""
+
+import hashlib
+import os
+import random
+import re
+from typing import List, Set, Tuple
+
+# ==================== CONFIGURATION ====================
+
+# Characters per shingle
+SHINGLE_SIZE = 4
+
+# Hash permutations per signature; more is more accurate and slower
+NUM_PERMUTATIONS = 64
+
+# Estimated Jaccard similarity at which two texts count as duplicates
+DUPLICATE_THRESHOLD = float(os.getenv("NEAR_DUPLICATE_THRESHOLD", "0.6"))
+
+# Mersenne prime modulus for the universal hash permutations
+_PRIME = (1 << 61) - 1
+
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+Signature = Tuple[int, ...]
+
+
+def normalize(text: str) -> str:
+    """Lowercase text with punctuation removed and whitespace collapsed."""
+    return _NON_WORD.sub(" ", text.lower()).strip()
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> Set[str]:
+    """
+    Overlapping character n-grams of the normalized text.
+
+    Args:
+        text (str): Text to shingle
+        size (int): Characters per shingle
+
+    Returns:
+        Set[str]: Distinct shingles; texts shorter than `size` give one shingle
+    """
+    normalized = normalize(text)
+    if len(normalized) <= size:
+        return {normalized} if normalized else set()
+    return {normalized[i:i + size] for i in range(len(normalized) - size + 1)}
+
+
+class MinHasher:
+    """
+    MinHash signatures with a fixed set of hash permutations.
+
+    Args:
+        num_permutations (int): Signature length
+        shingle_size (int): Characters per shingle
+        seed (int): Seed of the permutations; signatures are only comparable
+            between hashers with the same seed and length
+    """
+
+    def __init__(self, num_permutations: int = NUM_PERMUTATIONS, shingle_size: int = SHINGLE_SIZE, seed: int = 1):
+        if num_permutations < 1:
+            raise ValueError("num_permutations must be at least 1")
+        rng = random.Random(seed)
+        self.shingle_size = shingle_size
+        self._permutations = [
+            (rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(num_permutations)
+        ]
+
+    def signature(self, text: str) -> Signature:
+        """MinHash signature of a text's shingle set."""
+        hashes = [
+            int.from_bytes(hashlib.blake2b(shingle.encode(), digest_size=8).digest(), "big")
+            for shingle in shingles(text, self.shingle_size)
+        ]
+        if not hashes:
+            return tuple(_PRIME for _ in self._permutations)
+        return tuple(min((a * h + b) % _PRIME for h in hashes) for a, b in self._permutations)
+
+    @staticmethod
+    def similarity(first: Signature, second: Signature) -> float:
+        """Estimated Jaccard similarity: the share of positions where the signatures agree."""
+        if len(first) != len(second):
+            raise ValueError("Signatures have different lengths")
+        return sum(a == b for a, b in zip(first, second, strict=True)) / len(first)
+
+
+class NearDuplicateFilter:
+    """
+    Accepts texts that are not near-duplicates of any text accepted before.
+
+    Args:
+        threshold (float): Estimated Jaccard similarity at which a text is rejected
+        hasher (MinHasher, optional): Signature source shared by all texts
+
+    Example:
+        >>> seen = NearDuplicateFilter()
+        >>> seen.add("What is the function of mitochondria?")
+        True
+        >>> seen.add("What is the function of the mitochondria?")
+        False
+    """
+
+    def __init__(self, threshold: float = DUPLICATE_THRESHOLD, hasher: MinHasher = None):
+        if not 0 < threshold <= 1:
+            raise ValueError("threshold must be in (0, 1]")
+        self.threshold = threshold
+        self._hasher = hasher or MinHasher()
+        self._signatures: List[Signature] = []
+
+    def is_duplicate(self, text: str) -> bool:
+        """Whether the text is a near-duplicate of an accepted one."""
+        return self._matches(self._hasher.signature(text))
+
+    def add(self, text: str) -> bool:
+        """Accept the text unless it is a near-duplicate; returns whether it was accepted."""
+        signature = self._hasher.signature(text)
+        if self._matches(signature):
+            return False
+        self._signatures.append(signature)
+        return True
+
+    def _matches(self, signature: Signature) -> bool:
+        return any(MinHasher.similarity(signature, seen) >= self.threshold for seen in self._signatures)
+
+    def __len__(self) -> int:
+        return len(self._signatures)
@@ -0,0 +1,130 @@
+"""
+StudyBuddy AI - In-Flight Request Coalescing (Single-Flight)
+
+The result caches only help once a response has come back. When a teacher
+shares a link, a whole class sends the identical request within the same
+second, every one of them misses the still-empty cache and each one pays for
+its own upstream call. This module makes concurrent identical requests share a
+single call: the first caller for a key performs it and everyone who arrives
+while it is in flight receives the same result (or the same exception).
+
+Core Functionality:
+- SingleFlight groups keyed by the caller's normalized request parameters
+- Async path: one shared task per key, awaited by every concurrent caller
+- Sync path: one leader thread per key, followers block until it finishes
+- Leader/follower counters for monitoring how much traffic was coalesced
+
+Design Notes:
+- Async calls run as their own task and are awaited through asyncio.shield, so
+  a follower (or the original caller) disconnecting never cancels the call the
+  rest of the class is waiting on
+- Keys are only shared while a call is in flight; completed results are the
+  result cache's job
+- Async calls are shared per event loop, since a task cannot be awaited from
+  another loop
+
+@version 1.0.0
+@since 2026-10-16
+"""
+
+import asyncio
+import logging
+import threading
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, TypeVar
+
+# Configure module-level logger for comprehensive monitoring and debugging
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class _SyncCall:
+    """A blocking call in progress and the outcome its followers wait for."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key into one execution.
+
+    Args:
+        name (str): Group name used in logs and stats (e.g. "summary")
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._tasks: Dict[Tuple[int, str], asyncio.Task[Any]] = {}
+        self._calls: Dict[str, _SyncCall] = {}
+        self._lock = threading.Lock()
+        self._counters = {"calls": 0, "coalesced": 0}
+
+    async def do_async(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run fn once for all concurrent async callers with the same key.
+
+        Args:
+            key (str): Normalized request identity
+            fn (Callable[[], Awaitable[T]]): Zero-argument factory for the upstream call
+
+        Returns:
+            T: The shared result; every caller receives the same object
+
+        Raises:
+            Exception: Whatever the shared call raised, re-raised in every caller
+        """
+        loop = asyncio.get_running_loop()
+        flight_key = (id(loop), key)
+        with self._lock:
+            task = self._tasks.get(flight_key)
+            if task is None:
+                task = loop.create_task(fn())
+                self._tasks[flight_key] = task
+                task.add_done_callback(lambda _: self._forget_task(flight_key, task))
+                self._counters["calls"] += 1
+            else:
+                self._counters["coalesced"] += 1
+                logger.info(f"Joined in-flight {self.name} request")
+        return await asyncio.shield(task)
+
+    def _forget_task(self, flight_key: Tuple[int, str], task: "asyncio.Task[Any]") -> None:
+        with self._lock:
+            if self._tasks.get(flight_key) is task:
+                del self._tasks[flight_key]
+
+    def do(self, key: str, fn: Callable[[], T]) -> T:
+        """Blocking counterpart of do_async() for calls made from worker threads."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _SyncCall()
+                self._counters["calls"] += 1
+            else:
+                self._counters["coalesced"] += 1
+
+        if not leader:
+            logger.info(f"Joined in-flight {self.name} request")
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self) -> Dict[str, int]:
+        """Upstream calls made, callers that shared one, and calls in flight."""
+        with self._lock:
+            return {**self._counters, "in_flight": len(self._tasks) + len(self._calls)}
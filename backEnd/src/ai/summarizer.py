@@ -66,79 +66,121 @@ Quality Assurance:
 @since 2025-07-14
 """
 
+import asyncio
 import logging
 import os
-from typing import Optional
-from openai import OpenAI
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from src.ai.cache import LRUCache, SQLiteCache, TieredCache, make_cache_key
+from src.ai.openai_client import async_client, client
+from src.ai.circuit_breaker import CHAT_COMPLETIONS, CircuitOpenError, protected_call, protected_call_async
+from src.ai.hedging import Hedger
+from src.ai.singleflight import SingleFlight
+from src.ai.tokens import completion_budget, request_tokens
 
 # Configure module-level logger for comprehensive monitoring and debugging
 logger = logging.getLogger(__name__)
 
-def get_openai_client():
-    """
-    OpenAI Client Factory with Secure Configuration Management
-    
-    Creates and configures an OpenAI client instance with enterprise-grade security
-    practices and error handling. This function centralizes API key management and
-    provides a secure, reliable interface for OpenAI API interactions.
-    
-    Architecture Design:
-    - Implements lazy initialization to avoid module-level API calls
-    - Provides centralized configuration management for OpenAI integration
-    - Ensures secure handling of API credentials through environment variables
-    - Implements proper error handling with actionable user guidance
-    
-    Security Features:
-    - Environment variable-based API key management (no hardcoded credentials)
-    - Validation of API key presence before client instantiation
-    - Secure error messaging without credential exposure
-    - Follows principle of least privilege for API access
-    
-    Error Handling Strategy:
-    - Provides clear, actionable error messages for missing configuration
-    - Implements fail-fast behavior for invalid configurations
-    - Logs security-related issues for administrative monitoring
-    - Maintains system stability through proper exception handling
-    
-    Performance Considerations:
-    - Client creation is lightweight and efficient
-    - No unnecessary connection pooling or resource overhead
-    - Optimized for per-request instantiation patterns
-    - Minimal memory footprint and rapid initialization
-    
-    Returns:
-        OpenAI: Fully configured OpenAI client instance ready for API operations
-        
-    Raises:
-        ValueError: When OPENAI_API_KEY environment variable is not configured
-            This indicates a deployment or configuration issue that requires
-            immediate attention from system administrators
-            
-    Example:
-        >>> client = get_openai_client()
-        >>> # Client is ready for chat completions, embeddings, and other API calls
-        
-    Environment Requirements:
-        Required environment variables:
-        - OPENAI_API_KEY: Valid OpenAI API key from platform.openai.com
+# ==================== SUMMARIZATION CONFIGURATION ====================
+
+# Chat model used for every summary request
+SUMMARY_MODEL = "gpt-3.5-turbo"
+
+# Maximum input size accepted by a single summarization call
+MAX_INPUT_CHARS = 10000
+
+# Educational psychology-based prompt engineering for personalized learning
+# Each style is designed based on learning preference research and best practices
+STYLE_PROMPTS = {
+    "visual": "Create a summary with bullet points, clear structure, and suggest visual elements that would help understanding.",
+    "auditory": "Create a summary that flows well when read aloud, using conversational tone and natural speech patterns.",
+    "reading": "Create a well-structured summary with clear sections and logical flow for text-based learning.",
+    "kinesthetic": "Create a summary with practical examples, real-world applications, and hands-on learning suggestions."
+}
+
+# Shared extraction pass that feeds the per-style rewrites of a multi-style request
+BASE_NOTES_SYSTEM_PROMPT = (
+    "You are a careful study assistant. Extract the key facts, concepts, definitions, "
+    "dates and examples from this text as concise, neutral notes in their original order. "
+    "Do not add information that is not in the text."
+)
+
+# Length budget for the shared notes (tokens)
+BASE_NOTES_MAX_TOKENS = 600
+
+# User-facing message returned when the summary cannot be generated
+FALLBACK_SUMMARY = "I'm having trouble generating a summary right now. Please try again in a moment, or contact support if the issue persists."
+
+# ==================== SUMMARY CACHE CONFIGURATION ====================
+
+# In-process tier: entry cap and lifetime (seconds)
+SUMMARY_CACHE_MAX_ENTRIES = int(os.getenv("SUMMARY_CACHE_MAX_ENTRIES", "1024"))
+SUMMARY_CACHE_TTL_SECONDS = float(os.getenv("SUMMARY_CACHE_TTL_SECONDS", "86400"))
+
+# Optional on-disk tier that survives restarts (disabled when unset)
+SUMMARY_CACHE_DB = os.getenv("SUMMARY_CACHE_DB")
+SUMMARY_CACHE_DB_MAX_ENTRIES = int(os.getenv("SUMMARY_CACHE_DB_MAX_ENTRIES", "50000"))
+
+# ==================== BATCH CONFIGURATION ====================
+
+# Default number of summaries generated at the same time by a batch
+BATCH_MAX_CONCURRENCY = int(os.getenv("SUMMARY_BATCH_MAX_CONCURRENCY", "8"))
+
+# Content-addressed cache shared by every summarization request in the process
+summary_cache = TieredCache(
+    memory=LRUCache(max_entries=SUMMARY_CACHE_MAX_ENTRIES, ttl_seconds=SUMMARY_CACHE_TTL_SECONDS),
+    disk=SQLiteCache(
+        SUMMARY_CACHE_DB,
+        max_entries=SUMMARY_CACHE_DB_MAX_ENTRIES,
+        ttl_seconds=SUMMARY_CACHE_TTL_SECONDS,
+    ) if SUMMARY_CACHE_DB else None,
+    name="summary",
+)
+
+# Identical summaries requested at the same moment share one upstream call
+summary_flights = SingleFlight("summary")
+
+# Tail-latency hedging for single summary completions
+summary_hedger = Hedger("summary")
+
+def _validate_summary_input(input_text: str) -> None:
+    """Reject empty or oversized input before any API spend."""
+    # Validate input text presence and meaningfulness
+    if not input_text or not input_text.strip():
+        raise ValueError("Input text cannot be empty")
         
-    Integration Notes:
-        - Called by summarize_text() function for each request
-        - Designed for stateless, per-request usage patterns
-        - Compatible with containerized deployment environments
-        - Supports dynamic configuration updates through environment changes
-        
-    Monitoring and Debugging:
-        - Logs client creation events for usage tracking
-        - Provides detailed error information for troubleshooting
-        - Supports production monitoring through structured logging
-        - Enables performance analysis through timing metrics
-    """
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        raise ValueError("OPENAI_API_KEY environment variable is not set")
+    # Validate input length to prevent API overload and ensure optimal processing
+    if len(input_text) > MAX_INPUT_CHARS:
+        raise ValueError("Input text too long (max 10,000 characters)")
+
+def _build_summary_messages(input_text: str, learning_style: str) -> List[Dict[str, str]]:
+    """Build the chat messages for a learning-style adapted summary."""
+    # System prompt designed for educational support and accessibility
+    system_prompt = f"""You are a helpful study assistant for students with learning difficulties. 
+    {STYLE_PROMPTS.get(learning_style, STYLE_PROMPTS['reading'])}
+    Keep summaries concise but comprehensive. Be encouraging and patient."""
     
-    return OpenAI(api_key=api_key)
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": f"Summarize this text for studying:\n\n{input_text}"}
+    ]
+
+def summary_cache_key(input_text: str, learning_style: str, max_tokens: int) -> str:
+    """Cache key for a summary: normalized text digest plus every output-shaping parameter."""
+    return make_cache_key(
+        "summary",
+        input_text,
+        learning_style=learning_style,
+        max_tokens=max_tokens,
+        model=SUMMARY_MODEL,
+    )
+
+def _extract_summary(response) -> str:
+    """Pull the summary text out of a chat completion, rejecting empty output."""
+    summary = response.choices[0].message.content
+    if not summary:
+        raise RuntimeError("OpenAI returned empty response")
+    return summary.strip()
 
 def summarize_text(
     input_text: str, 
@@ -241,6 +283,8 @@ def summarize_text(
             - Authentication issues with API key validation
             - Service unavailability or rate limiting scenarios
             - Unexpected response format or processing errors
+        CircuitOpenError: The chat completions circuit is open; raised at once
+            instead of waiting for the upstream timeout
             
     Example:
         Basic usage with default parameters:
@@ -298,58 +342,48 @@ def summarize_text(
     """
     # ==================== INPUT VALIDATION AND SANITIZATION ====================
     
-    # Validate input text presence and meaningfulness
-    if not input_text or not input_text.strip():
-        raise ValueError("Input text cannot be empty")
-        
-    # Validate input length to prevent API overload and ensure optimal processing
-    if len(input_text) > 10000:
-        raise ValueError("Input text too long (max 10,000 characters)")
+    _validate_summary_input(input_text)
     
-    # ==================== OPENAI CLIENT INITIALIZATION ====================
-    
-    # Initialize OpenAI client with secure configuration management
-    client = get_openai_client()
-        
-    # ==================== LEARNING STYLE CONFIGURATION ====================
+    # ==================== PROMPT ENGINEERING FOR EDUCATIONAL EXCELLENCE ====================
     
-    # Educational psychology-based prompt engineering for personalized learning
-    # Each style is designed based on learning preference research and best practices
-    style_prompts = {
-        "visual": "Create a summary with bullet points, clear structure, and suggest visual elements that would help understanding.",
-        "auditory": "Create a summary that flows well when read aloud, using conversational tone and natural speech patterns.",
-        "reading": "Create a well-structured summary with clear sections and logical flow for text-based learning.",
-        "kinesthetic": "Create a summary with practical examples, real-world applications, and hands-on learning suggestions."
-    }
+    messages = _build_summary_messages(input_text, learning_style)
     
-    # ==================== PROMPT ENGINEERING FOR EDUCATIONAL EXCELLENCE ====================
+    # Shrink the completion budget if the prompt leaves less room in the context window
+    completion_tokens = completion_budget(messages, max_tokens, SUMMARY_MODEL)
     
-    # System prompt designed for educational support and accessibility
-    system_prompt = f"""You are a helpful study assistant for students with learning difficulties. 
-    {style_prompts.get(learning_style, style_prompts['reading'])}
-    Keep summaries concise but comprehensive. Be encouraging and patient."""
+    # Same key as the async paths, so a summary cached by either is served by both
+    cache_key = summary_cache_key(input_text, learning_style, max_tokens)
+    cached_summary = summary_cache.get(cache_key)
+    if cached_summary is not None:
+        logger.info("Summary cache hit")
+        return cached_summary
     
     # ==================== API REQUEST AND RESPONSE HANDLING ====================
     
     try:
         # Execute OpenAI API request with optimized parameters for educational content
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": f"Summarize this text for studying:\n\n{input_text}"}
-            ],
-            temperature=0.7,  # Balanced creativity for better explanations while maintaining accuracy
-            max_tokens=max_tokens  # User-specified length constraint
+        # Concurrent identical requests share one call; the shared limiter paces,
+        # queues and retries it against the account budget
+        response = summary_flights.do(
+            cache_key,
+            lambda: protected_call(
+                CHAT_COMPLETIONS, SUMMARY_MODEL,
+                lambda: client.chat.completions.create(
+                    model=SUMMARY_MODEL,
+                    messages=messages,
+                    temperature=0.7,  # Balanced creativity for better explanations while maintaining accuracy
+                    max_tokens=completion_tokens  # User-specified length constraint
+                ),
+                tokens=request_tokens(messages, completion_tokens, SUMMARY_MODEL)
+            )
         )
         
-        # Extract and validate response content
-        summary = response.choices[0].message.content
-        if not summary:
-            raise RuntimeError("OpenAI returned empty response")
-            
         # Return cleaned, formatted summary for optimal user experience
-        return summary.strip()
+        summary = _extract_summary(response)
+        
+    except CircuitOpenError:
+        # The upstream is known to be down: fail fast so the caller can answer with a 503
+        raise
         
     except Exception as e:
         # ==================== ERROR HANDLING AND GRACEFUL DEGRADATION ====================
@@ -359,4 +393,442 @@ def summarize_text(
         
         # Provide user-friendly fallback message to maintain positive experience
         # This ensures the application remains functional even when external services fail
-        return "I'm having trouble generating a summary right now. Please try again in a moment, or contact support if the issue persists."
\ No newline at end of file
+        return FALLBACK_SUMMARY
+    
+    summary_cache.set(cache_key, summary)
+    return summary
+
+async def _request_summary_async(
+    input_text: str,
+    learning_style: str,
+    max_tokens: int
+) -> str:
+    """Summary for these parameters, sharing the call with identical requests in flight."""
+    return await summary_flights.do_async(
+        summary_cache_key(input_text, learning_style, max_tokens),
+        lambda: _fetch_summary_async(input_text, learning_style, max_tokens)
+    )
+
+async def _fetch_summary_async(
+    input_text: str,
+    learning_style: str,
+    max_tokens: int
+) -> str:
+    """Perform the async completion call; raises on any API or empty-response failure."""
+    messages = _build_summary_messages(input_text, learning_style)
+    max_tokens = completion_budget(messages, max_tokens, SUMMARY_MODEL)
+    # An unusually slow completion is raced against an identical hedge call
+    response = await summary_hedger.call_async(
+        lambda: protected_call_async(
+            CHAT_COMPLETIONS, SUMMARY_MODEL,
+            lambda: async_client.chat.completions.create(
+                model=SUMMARY_MODEL,
+                messages=messages,
+                temperature=0.7,
+                max_tokens=max_tokens
+            ),
+            tokens=request_tokens(messages, max_tokens, SUMMARY_MODEL)
+        )
+    )
+    return _extract_summary(response)
+
+async def summarize_text_async(
+    input_text: str,
+    learning_style: str = "reading",
+    max_tokens: int = 300
+) -> str:
+    """
+    Asynchronous Adaptive Text Summarization
+    
+    Non-blocking counterpart of summarize_text() built on the shared async OpenAI
+    client. FastAPI routes await this function so a slow completion only suspends
+    the requesting coroutine instead of stalling every request on the worker.
+    
+    Validation, prompts, learning style adaptations and the user-friendly fallback
+    behave exactly as in summarize_text().
+    
+    Args:
+        input_text (str): Educational content to be summarized (max 10,000 chars)
+        learning_style (str, optional): "visual", "auditory", "reading" or "kinesthetic"
+        max_tokens (int, optional): Maximum length of the summary in tokens
+        
+    Returns:
+        str: Personalized summary, or a friendly fallback message on API failure
+        
+    Raises:
+        ValueError: Empty input or input exceeding the character limit
+        CircuitOpenError: The chat completions circuit is open
+        
+    Example:
+        >>> summary = await summarize_text_async("Photosynthesis is...", "visual")
+    """
+    _validate_summary_input(input_text)
+    
+    try:
+        return await _request_summary_async(input_text, learning_style, max_tokens)
+        
+    except CircuitOpenError:
+        raise
+        
+    except Exception as e:
+        logger.error(f"Summarization failed: {e}")
+        return FALLBACK_SUMMARY
+
+async def summarize_text_cached(
+    input_text: str,
+    learning_style: str = "reading",
+    max_tokens: int = 300
+) -> Tuple[str, bool]:
+    """
+    Cached Adaptive Text Summarization
+    
+    Content-addressed cache in front of the async summarization path. The key is
+    a digest of the whitespace-normalized text plus learning style, max_tokens and
+    model, so the same chapter pasted by a whole class costs one API call.
+    
+    Cache Behavior:
+    - Lookups check the in-process LRU first, then the optional SQLite tier
+    - Only successful summaries are stored; the fallback message never is
+    - Hit/miss counters are available through summary_cache.stats()
+    
+    Args:
+        input_text (str): Educational content to be summarized (max 10,000 chars)
+        learning_style (str, optional): "visual", "auditory", "reading" or "kinesthetic"
+        max_tokens (int, optional): Maximum length of the summary in tokens
+        
+    Returns:
+        Tuple[str, bool]: The summary (or fallback message) and whether it was a cache hit
+        
+    Raises:
+        ValueError: Empty input or input exceeding the character limit
+        CircuitOpenError: The chat completions circuit is open and nothing is cached
+    """
+    _validate_summary_input(input_text)
+    
+    cache_key = summary_cache_key(input_text, learning_style, max_tokens)
+    cached_summary = summary_cache.get(cache_key)
+    if cached_summary is not None:
+        logger.info("Summary cache hit")
+        return cached_summary, True
+    
+    try:
+        summary = await _request_summary_async(input_text, learning_style, max_tokens)
+        
+    except CircuitOpenError:
+        raise
+        
+    except Exception as e:
+        logger.error(f"Summarization failed: {e}")
+        return FALLBACK_SUMMARY, False
+    
+    summary_cache.set(cache_key, summary)
+    return summary, False
+
+def get_cached_summary(
+    input_text: str,
+    learning_style: str = "reading",
+    max_tokens: int = 300
+) -> Optional[str]:
+    """Return the cached summary for these parameters, or None on a miss."""
+    _validate_summary_input(input_text)
+    return summary_cache.get(summary_cache_key(input_text, learning_style, max_tokens))
+
+async def stream_summary_async(
+    input_text: str,
+    learning_style: str = "reading",
+    max_tokens: int = 300
+) -> AsyncIterator[str]:
+    """
+    Streaming Adaptive Text Summarization
+    
+    Async generator that yields summary text as it is produced by a streaming
+    chat completion, so the first words reach the student within a fraction of a
+    second instead of after the full summary has been written.
+    
+    Prompts and learning style adaptations are identical to summarize_text(). When
+    the stream completes, the full summary is stored in the summary cache so a
+    repeat request can be answered by get_cached_summary().
+    
+    Args:
+        input_text (str): Educational content to be summarized (max 10,000 chars)
+        learning_style (str, optional): "visual", "auditory", "reading" or "kinesthetic"
+        max_tokens (int, optional): Maximum length of the summary in tokens
+        
+    Yields:
+        str: Successive pieces of the summary text
+        
+    Raises:
+        ValueError: Empty input or input exceeding the character limit
+        RuntimeError: The API call failed or the stream produced no content
+        
+    Example:
+        >>> async for piece in stream_summary_async("Photosynthesis is...", "visual"):
+        ...     print(piece, end="")
+    """
+    _validate_summary_input(input_text)
+    messages = _build_summary_messages(input_text, learning_style)
+    # The cache is keyed by the requested length; only the API sees the clamped budget
+    completion_tokens = completion_budget(messages, max_tokens, SUMMARY_MODEL)
+    
+    parts: List[str] = []
+    try:
+        stream = await protected_call_async(
+            CHAT_COMPLETIONS, SUMMARY_MODEL,
+            lambda: async_client.chat.completions.create(
+                model=SUMMARY_MODEL,
+                messages=messages,
+                temperature=0.7,
+                max_tokens=completion_tokens,
+                stream=True
+            ),
+            tokens=request_tokens(messages, completion_tokens, SUMMARY_MODEL)
+        )
+        # The context manager releases the upstream connection if the client disconnects
+        async with stream:
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                content = chunk.choices[0].delta.content
+                if content:
+                    parts.append(content)
+                    yield content
+                
+    except CircuitOpenError:
+        raise
+        
+    except Exception as e:
+        logger.error(f"Streaming summarization failed: {e}")
+        raise RuntimeError("Unable to generate summary. Please try again.") from e
+    
+    summary = "".join(parts).strip()
+    if not summary:
+        raise RuntimeError("Empty response from OpenAI API")
+    
+    summary_cache.set(summary_cache_key(input_text, learning_style, max_tokens), summary)
+
+async def _summarize_batch_item(
+    input_text: str,
+    learning_style: str,
+    max_tokens: int,
+    semaphore: asyncio.Semaphore
+) -> Dict[str, Any]:
+    """Summarize one unique batch item, reporting failure in the result instead of raising."""
+    start_time = time.time()
+    outcome: Dict[str, Any] = {"summary": None, "cached": False, "api_call": False, "error": None}
+    try:
+        _validate_summary_input(input_text)
+        cache_key = summary_cache_key(input_text, learning_style, max_tokens)
+        summary = summary_cache.get(cache_key)
+        if summary is not None:
+            outcome.update(summary=summary, cached=True)
+        else:
+            async with semaphore:
+                outcome["api_call"] = True
+                summary = await _request_summary_async(input_text, learning_style, max_tokens)
+            summary_cache.set(cache_key, summary)
+            outcome["summary"] = summary
+            
+    except (ValueError, CircuitOpenError) as e:
+        outcome["error"] = str(e)
+        
+    except Exception as e:
+        logger.error(f"Batch item summarization failed: {e}")
+        outcome["error"] = "Unable to generate summary. Please try again."
+    
+    outcome["processing_time_ms"] = (time.time() - start_time) * 1000
+    return outcome
+
+async def summarize_batch_async(
+    items: List[Tuple[str, str, int]],
+    max_concurrency: int = BATCH_MAX_CONCURRENCY
+) -> Dict[str, Any]:
+    """
+    Batch Adaptive Text Summarization
+    
+    Summarizes a list of texts concurrently under a concurrency cap. Identical
+    requests (same normalized text, learning style and max_tokens) are collapsed
+    into one unit of work, and every unique item checks the summary cache first,
+    so a reading list costs at most one API call per distinct text.
+    
+    Unlike summarize_text_cached(), a failed item is reported with an error
+    message instead of the fallback summary, and never affects the other items.
+    
+    Args:
+        items (List[Tuple[str, str, int]]): (input_text, learning_style, max_tokens) per item
+        max_concurrency (int, optional): Maximum number of API calls in flight
+        
+    Returns:
+        Dict[str, Any]: {
+            "results": one dict per input item, in order, with summary, cached,
+                       deduplicated, error and processing_time_ms,
+            "unique_items": number of distinct requests,
+            "api_calls": number of completion calls made,
+            "cache_hits": number of distinct requests served from the cache
+        }
+        
+    Raises:
+        ValueError: If max_concurrency is less than 1
+        
+    Example:
+        >>> batch = await summarize_batch_async([("Photosynthesis is...", "visual", 300)] * 3)
+        >>> batch["unique_items"], batch["results"][2]["deduplicated"]
+        (1, True)
+    """
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1")
+    
+    # First occurrence of each distinct request; later duplicates reuse its outcome
+    first_index: Dict[str, int] = {}
+    keys = []
+    for index, (input_text, learning_style, max_tokens) in enumerate(items):
+        key = summary_cache_key(input_text, learning_style, max_tokens)
+        keys.append(key)
+        first_index.setdefault(key, index)
+    
+    semaphore = asyncio.Semaphore(max_concurrency)
+    unique_keys = list(first_index)
+    outcomes = await asyncio.gather(*(
+        _summarize_batch_item(*items[first_index[key]], semaphore) for key in unique_keys
+    ))
+    outcome_by_key = dict(zip(unique_keys, outcomes, strict=True))
+    
+    results = []
+    for index, key in enumerate(keys):
+        outcome = dict(outcome_by_key[key])
+        outcome["deduplicated"] = index != first_index[key]
+        del outcome["api_call"]
+        results.append(outcome)
+    
+    logger.info(
+        f"Batch summarized {len(items)} items ({len(unique_keys)} unique, "
+        f"{sum(o['api_call'] for o in outcomes)} API calls)"
+    )
+    return {
+        "results": results,
+        "unique_items": len(unique_keys),
+        "api_calls": sum(o["api_call"] for o in outcomes),
+        "cache_hits": sum(o["cached"] for o in outcomes),
+    }
+
+def base_notes_cache_key(input_text: str) -> str:
+    """Cache key for the style-neutral notes shared by every learning style."""
+    return make_cache_key("summary_notes", input_text, model=SUMMARY_MODEL)
+
+async def _extract_base_notes_async(input_text: str) -> Tuple[str, bool]:
+    """Return the style-neutral notes for a text and whether they came from the cache."""
+    cache_key = base_notes_cache_key(input_text)
+    notes = summary_cache.get(cache_key)
+    if notes is not None:
+        return notes, True
+    
+    messages = [
+        {"role": "system", "content": BASE_NOTES_SYSTEM_PROMPT},
+        {"role": "user", "content": input_text}
+    ]
+    response = await protected_call_async(
+        CHAT_COMPLETIONS, SUMMARY_MODEL,
+        lambda: async_client.chat.completions.create(
+            model=SUMMARY_MODEL,
+            messages=messages,
+            temperature=0.3,  # Faithful extraction; the style pass adds the personality
+            max_tokens=BASE_NOTES_MAX_TOKENS
+        ),
+        tokens=request_tokens(messages, BASE_NOTES_MAX_TOKENS, SUMMARY_MODEL)
+    )
+    notes = _extract_summary(response)
+    summary_cache.set(cache_key, notes)
+    return notes, False
+
+async def summarize_styles_async(
+    input_text: str,
+    learning_styles: List[str],
+    max_tokens: int = 300
+) -> Dict[str, Any]:
+    """
+    Multi-Style Adaptive Text Summarization
+    
+    Generates one summary per requested learning style for the same text, so a
+    student can flip between styles without waiting for a new request.
+    
+    Processing Pipeline:
+    1. Serve every style already in the summary cache
+    2. If one style is missing, summarize it directly (no extra pass)
+    3. If several are missing, extract style-neutral notes once, then rewrite
+       those notes into each missing style concurrently
+    
+    Every summary is stored under the same cache key as summarize_text_cached(),
+    so a later single-style request for any of these styles is a cache hit. The
+    shared notes are cached too, so adding another style later costs one call.
+    
+    Args:
+        input_text (str): Educational content to be summarized (max 10,000 chars)
+        learning_styles (List[str]): Styles to generate; duplicates are ignored
+        max_tokens (int, optional): Maximum length of each summary in tokens
+        
+    Returns:
+        Dict[str, Any]: {
+            "summaries": style -> summary, in request order,
+            "cached_styles": styles served from the cache,
+            "api_calls": completion calls made for this request
+        }
+        
+    Raises:
+        ValueError: Empty input, input exceeding the character limit, or no styles
+        RuntimeError: A summary could not be generated (styles that did succeed
+                      stay cached)
+        
+    Example:
+        >>> result = await summarize_styles_async("Photosynthesis is...", ["visual", "auditory"])
+        >>> sorted(result["summaries"])
+        ['auditory', 'visual']
+    """
+    _validate_summary_input(input_text)
+    styles = list(dict.fromkeys(learning_styles))
+    if not styles:
+        raise ValueError("At least one learning style is required")
+    
+    summaries: Dict[str, str] = {}
+    for style in styles:
+        cached_summary = summary_cache.get(summary_cache_key(input_text, style, max_tokens))
+        if cached_summary is not None:
+            summaries[style] = cached_summary
+    cached_styles = [style for style in styles if style in summaries]
+    missing = [style for style in styles if style not in summaries]
+    api_calls = 0
+    
+    async def write_style(style: str, source_text: str) -> None:
+        summary = await _request_summary_async(source_text, style, max_tokens)
+        summary_cache.set(summary_cache_key(input_text, style, max_tokens), summary)
+        summaries[style] = summary
+    
+    try:
+        if len(missing) == 1:
+            await write_style(missing[0], input_text)
+            api_calls = 1
+        elif missing:
+            notes, notes_cached = await _extract_base_notes_async(input_text)
+            results = await asyncio.gather(
+                *(write_style(style, notes) for style in missing),
+                return_exceptions=True
+            )
+            api_calls = len(missing) + (0 if notes_cached else 1)
+            errors = [result for result in results if isinstance(result, Exception)]
+            if errors:
+                raise errors[0]
+            
+    except CircuitOpenError:
+        raise
+        
+    except Exception as e:
+        logger.error(f"Multi-style summarization failed: {e}")
+        raise RuntimeError("Unable to generate summary. Please try again.") from e
+    
+    logger.info(
+        f"Multi-style summary: {len(styles)} styles, {len(cached_styles)} cached, "
+        f"{api_calls} API calls"
+    )
+    return {
+        "summaries": {style: summaries[style] for style in styles},
+        "cached_styles": cached_styles,
+        "api_calls": api_calls,
+    }
@@ -0,0 +1,190 @@
+"""
+StudyBuddy AI - Local Token Counting and Budgeting
+
+This module measures prompts in model tokens before a request is sent, so
+completion budgets and chunk sizes can be derived from the model's context
+window instead of from character counts.
+
+Core Functionality:
+- Offline token counts for plain text and for complete chat message lists
+  (including the per-message framing the chat format adds)
+- Context window lookup per model
+- Completion budgets clamped so prompt + completion always fits the window
+- Input budgets for a given system prompt and completion size (chunk sizing)
+
+Tokenizer Selection:
+- Uses tiktoken when it is installed (pip install "studybuddy-ai[tokens]")
+  for exact counts with the model's own encoding
+- Otherwise falls back to a conservative estimator that never undercounts
+  typical English prose, so budgets stay safe without the extra dependency
+
+@version 1.0.0
+@since 2026-10-16
+"""
+
+import logging
+import math
+import os
+import re
+from functools import cache
+from typing import Dict, List, Optional
+
+try:
+    import tiktoken
+except ImportError:  # Optional dependency; the estimator below is used instead
+    tiktoken = None
+
+# Configure module-level logger for comprehensive monitoring and debugging
+logger = logging.getLogger(__name__)
+
+# ==================== MODEL LIMITS ====================
+
+# Context window (prompt + completion tokens) per chat model
+MODEL_CONTEXT_WINDOWS: Dict[str, int] = {
+    "gpt-3.5-turbo": 16385,
+    "gpt-4o-mini": 128000,
+    "gpt-4o": 128000,
+}
+
+# Window assumed for models missing from the table
+DEFAULT_CONTEXT_WINDOW = 4096
+
+# Tokens the chat format adds around every message, and to prime the reply
+MESSAGE_OVERHEAD_TOKENS = 3
+REPLY_PRIMING_TOKENS = 3
+
+# Headroom kept free for tokenizer drift between the local count and the API
+CONTEXT_SAFETY_MARGIN = int(os.getenv("TOKEN_SAFETY_MARGIN", "64"))
+
+# Smallest completion budget worth sending a request for
+MIN_COMPLETION_TOKENS = 32
+
+# ==================== ESTIMATOR ====================
+
+# Words, digit runs, single punctuation marks and any other non-space character
+_TOKEN_PIECES = re.compile(r"[A-Za-z]+|\d+|[^\sA-Za-z\d]")
+
+def _estimate_tokens(text: str) -> int:
+    """
+    Conservative token estimate without a tokenizer.
+
+    BPE vocabularies encode common words as one token and split longer words
+    into pieces of roughly five characters; digits are grouped in threes and
+    punctuation costs one token. Non-ASCII characters are charged a token per
+    two UTF-8 bytes, so a CJK character counts as two: BPE often splits those
+    into byte-level tokens. Rounding every piece up keeps the estimate at or
+    above the real count.
+    """
+    tokens = 0
+    for piece in _TOKEN_PIECES.findall(text):
+        if piece[0].isdigit():
+            tokens += math.ceil(len(piece) / 3)
+        elif piece[0].isascii() and piece[0].isalpha():
+            tokens += 1 + (len(piece) - 1) // 5
+        else:
+            tokens += math.ceil(len(piece.encode("utf-8")) / 2)
+    return tokens
+
+@cache
+def _encoding(model: str):
+    """tiktoken encoding for a model, or None when tiktoken is not installed."""
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+
+# ==================== PUBLIC API ====================
+
+def count_tokens(text: str, model: str) -> int:
+    """
+    Count the tokens in a piece of text.
+
+    Args:
+        text (str): Text to measure
+        model (str): Chat model whose tokenizer applies
+
+    Returns:
+        int: Exact count with tiktoken, otherwise a conservative estimate
+    """
+    if not text:
+        return 0
+    encoding = _encoding(model)
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return _estimate_tokens(text)
+
+def count_message_tokens(messages: List[Dict[str, str]], model: str) -> int:
+    """Count the prompt tokens of a chat request, including message framing."""
+    total = REPLY_PRIMING_TOKENS
+    for message in messages:
+        total += MESSAGE_OVERHEAD_TOKENS
+        total += count_tokens(message.get("role", ""), model)
+        total += count_tokens(message.get("content", ""), model)
+    return total
+
+def context_window(model: str) -> int:
+    """Total tokens (prompt + completion) the model accepts."""
+    return MODEL_CONTEXT_WINDOWS.get(model, DEFAULT_CONTEXT_WINDOW)
+
+def completion_budget(
+    messages: List[Dict[str, str]],
+    max_tokens: int,
+    model: str
+) -> int:
+    """
+    Largest completion size up to max_tokens that still fits the context window.
+
+    Args:
+        messages (List[Dict[str, str]]): The complete prompt, system prompt included
+        max_tokens (int): Requested completion size
+        model (str): Chat model the request is sent to
+
+    Returns:
+        int: max_tokens, reduced when the prompt leaves less room than requested
+
+    Raises:
+        ValueError: When the prompt leaves no useful room for a completion
+    """
+    available = context_window(model) - count_message_tokens(messages, model) - CONTEXT_SAFETY_MARGIN
+    if available < MIN_COMPLETION_TOKENS:
+        raise ValueError("Input text too long for the model's context window")
+    if available < max_tokens:
+        logger.info(f"Completion budget reduced from {max_tokens} to {available} tokens to fit the context")
+        return available
+    return max_tokens
+
+def input_budget(
+    system_prompt: str,
+    completion_tokens: int,
+    model: str,
+    user_prefix: Optional[str] = None
+) -> int:
+    """
+    Largest user message (in tokens) that fits beside a system prompt and completion.
+
+    Used to size chunks so that each call fills the context window without
+    overflowing it.
+
+    Args:
+        system_prompt (str): System message sent with every chunk
+        completion_tokens (int): Completion budget reserved for the reply
+        model (str): Chat model the requests are sent to
+        user_prefix (str, optional): Fixed text placed before the content in the user message
+
+    Returns:
+        int: Token budget for the variable part of the user message
+    """
+    framing = count_message_tokens(
+        [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prefix or ""},
+        ],
+        model,
+    )
+    return max(0, context_window(model) - framing - completion_tokens - CONTEXT_SAFETY_MARGIN)
+
+def request_tokens(messages: List[Dict[str, str]], max_tokens: int, model: str) -> int:
+    """Tokens a chat request counts against the per-minute budget (prompt + max completion)."""
+    return count_message_tokens(messages, model) + max_tokens
@@ -29,7 +29,8 @@ Technical Architecture:
 
 Audio Processing Capabilities:
 - Supports multiple audio formats: MP3, MP4, MPEG, MPGA, M4A, WAV, WebM
-- Handles files up to 25MB in size (OpenAI Whisper API limit)
+- Handles files up to 25MB in size (OpenAI Whisper API limit) in a single call
+- Longer WAV recordings are split at pauses and transcribed in parallel segments
 - Provides intelligent file format detection and validation
 - Implements efficient streaming for large audio files
 - Includes audio quality assessment and optimization suggestions
@@ -74,11 +75,21 @@ Cost Management:
 @since 2025-07-14
 """
 
+import asyncio
+import hashlib
 import logging
 import os
+import sqlite3
+import tempfile
 from pathlib import Path
-from typing import Optional
-from openai import OpenAI
+from typing import Any, BinaryIO, Callable, Dict, List, NoReturn, Optional, Tuple
+import openai
+from src.ai.audio_probe import probe_duration
+from src.ai.audio_segmenter import split_wav
+from src.ai.cache import LRUCache, SQLiteCache, TieredCache, make_cache_key
+from src.ai.metrics import audio_transcribed
+from src.ai.openai_client import async_client, client
+from src.ai.circuit_breaker import AUDIO_TRANSCRIPTIONS, CircuitOpenError, protected_call, protected_call_async
 
 # Configure module-level logger for comprehensive monitoring and debugging
 logger = logging.getLogger(__name__)
@@ -93,71 +104,179 @@ SUPPORTED_FORMATS = {'.mp3', '.mp4', '.mpeg', '.mpga', '.m4a', '.wav', '.webm'}
 # This constraint ensures efficient processing and prevents resource exhaustion
 MAX_FILE_SIZE = 25 * 1024 * 1024  # 25MB limit from OpenAI
 
-def get_openai_client():
+# Whisper model used for every transcription request
+TRANSCRIPTION_MODEL = "whisper-1"
+
+# Whisper pricing used for cost estimates (USD per minute of audio)
+WHISPER_COST_PER_MINUTE = 0.006
+
+# Longest recording admitted for transcription; 0 disables the check
+MAX_AUDIO_DURATION_SECONDS = float(os.getenv("MAX_AUDIO_DURATION_SECONDS", str(4 * 60 * 60)))
+
+# ==================== LONG-AUDIO CONFIGURATION ====================
+
+# Largest recording accepted for segmented transcription (WAV/PCM only)
+LONG_AUDIO_MAX_FILE_SIZE = int(os.getenv("LONG_AUDIO_MAX_FILE_SIZE", str(1024 * 1024 * 1024)))
+
+# Formats that can be split into segments without a decoder
+SEGMENTABLE_FORMATS = {'.wav'}
+
+# Segment size target, kept below MAX_FILE_SIZE to leave headroom for the request
+SEGMENT_MAX_BYTES = int(os.getenv("SEGMENT_MAX_BYTES", str(24 * 1024 * 1024)))
+
+# Maximum simultaneous Whisper calls per recording
+SEGMENT_CONCURRENCY = int(os.getenv("SEGMENT_CONCURRENCY", "4"))
+
+# Characters of the previous segment's text passed as the next segment's prompt
+PROMPT_TAIL_CHARS = 200
+
+# ==================== TRANSCRIPTION CACHE CONFIGURATION ====================
+
+# In-process tier for the hottest recordings
+TRANSCRIPTION_CACHE_MAX_ENTRIES = int(os.getenv("TRANSCRIPTION_CACHE_MAX_ENTRIES", "256"))
+
+# Bounded on-disk tier with least-recently-used eviction (empty string disables it)
+TRANSCRIPTION_CACHE_DB = os.getenv(
+    "TRANSCRIPTION_CACHE_DB",
+    os.path.join(tempfile.gettempdir(), "studybuddy", "transcription_cache.sqlite3")
+)
+TRANSCRIPTION_CACHE_DB_MAX_ENTRIES = int(os.getenv("TRANSCRIPTION_CACHE_DB_MAX_ENTRIES", "10000"))
+
+# Block size used when fingerprinting files that were not hashed during upload
+DIGEST_BLOCK_SIZE = 1024 * 1024
+
+# Default educational context prompt for academic content
+DEFAULT_TRANSCRIPTION_PROMPT = (
+    "This is educational content about academic subjects. "
+    "Please transcribe with attention to technical and academic vocabulary."
+)
+
+# Shown to users in place of an empty transcription
+NO_SPEECH_MESSAGE = "No speech detected in the audio file."
+
+def _open_transcription_disk_cache() -> Optional[SQLiteCache]:
+    """Open the on-disk transcription cache, falling back to memory only on failure."""
+    if not TRANSCRIPTION_CACHE_DB:
+        return None
+    try:
+        return SQLiteCache(TRANSCRIPTION_CACHE_DB, max_entries=TRANSCRIPTION_CACHE_DB_MAX_ENTRIES)
+    except (sqlite3.Error, OSError) as e:
+        logger.warning(f"Transcription disk cache unavailable ({e}); using memory only")
+        return None
+
+# Cache keyed on the audio content fingerprint plus language and prompt. The disk
+# tier is attached by init_transcription_cache(), so importing this module never
+# creates or locks the database
+transcription_cache = TieredCache(
+    memory=LRUCache(max_entries=TRANSCRIPTION_CACHE_MAX_ENTRIES),
+    name="transcription",
+)
+
+def init_transcription_cache() -> None:
+    """Open the on-disk tier of the transcription cache at application startup."""
+    if transcription_cache.disk is None:
+        transcription_cache.disk = _open_transcription_disk_cache()
+
+def close_transcription_cache() -> None:
+    """Detach and close the on-disk tier, releasing its database file."""
+    disk, transcription_cache.disk = transcription_cache.disk, None
+    if disk is not None:
+        disk.close()
+
+def _validate_audio_file(audio_file_path: str) -> Tuple[Path, int]:
     """
-    OpenAI Client Factory for Audio Transcription Services
-    
-    Creates and configures an OpenAI client instance specifically optimized for
-    audio transcription services. This function implements secure API key management
-    and provides a reliable interface for Whisper API interactions.
-    
-    Architecture Design:
-    - Implements lazy initialization pattern for optimal resource management
-    - Provides centralized configuration for all audio transcription operations
-    - Ensures secure credential handling through environment variables
-    - Implements fail-fast behavior for invalid configurations
-    
-    Security Features:
-    - Environment variable-based API key management (no hardcoded credentials)
-    - Validation of API key presence before client instantiation
-    - Secure error messaging without credential exposure
-    - Follows principle of least privilege for API access
-    
-    Error Handling Strategy:
-    - Provides clear, actionable error messages for configuration issues
-    - Implements comprehensive logging for administrative monitoring
-    - Maintains system stability through proper exception handling
-    - Enables rapid troubleshooting through detailed error context
-    
-    Performance Considerations:
-    - Lightweight client instantiation with minimal overhead
-    - Optimized for per-request usage patterns in educational environments
-    - Efficient memory usage with automatic resource cleanup
-    - Rapid initialization for real-time transcription services
+    Validate existence, format and size of an audio file before upload.
     
     Returns:
-        OpenAI: Configured OpenAI client instance ready for Whisper API operations
-        
-    Raises:
-        ValueError: When OPENAI_API_KEY environment variable is not configured
-            This indicates a deployment or configuration issue requiring
-            immediate attention from system administrators
-            
-    Example:
-        >>> client = get_openai_client()
-        >>> # Client is ready for audio transcription operations
-        
-    Environment Requirements:
-        Required environment variables:
-        - OPENAI_API_KEY: Valid OpenAI API key with Whisper API access
-        
-    Integration Notes:
-        - Called by transcribe_audio() function for each transcription request
-        - Designed for stateless, per-request usage patterns
-        - Compatible with containerized and serverless deployment environments
-        - Supports dynamic configuration updates through environment changes
-        
-    Monitoring and Operations:
-        - Logs client creation events for usage tracking and analytics
-        - Provides detailed error information for operational troubleshooting
-        - Supports production monitoring through structured logging
-        - Enables performance analysis and optimization through metrics collection
+        Tuple[Path, int]: Resolved path and file size in bytes
     """
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        raise ValueError("OPENAI_API_KEY environment variable is not set")
+    # Validate file existence and accessibility
+    audio_path = Path(audio_file_path)
+    if not audio_path.exists():
+        raise FileNotFoundError(f"Audio file not found: {audio_file_path}")
     
-    return OpenAI(api_key=api_key)
+    # Validate file format against supported types
+    file_extension = audio_path.suffix.lower()
+    if file_extension not in SUPPORTED_FORMATS:
+        raise ValueError(
+            f"Unsupported audio format: {file_extension}. "
+            f"Supported formats: {', '.join(sorted(SUPPORTED_FORMATS))}"
+        )
+    
+    # Validate file size constraints
+    file_size = audio_path.stat().st_size
+    if file_size > MAX_FILE_SIZE:
+        size_mb = file_size / (1024 * 1024)
+        raise ValueError(
+            f"Audio file too large: {size_mb:.1f}MB. "
+            f"Maximum size: {MAX_FILE_SIZE / (1024 * 1024)}MB"
+        )
+    
+    # Validate file contains actual content
+    if file_size == 0:
+        raise ValueError("Audio file is empty")
+    
+    return audio_path, file_size
+
+def _build_transcription_params(
+    language: Optional[str],
+    prompt: Optional[str]
+) -> Dict[str, Any]:
+    """Build Whisper request parameters (everything except the file itself)."""
+    # Configure transcription parameters for optimal educational content processing
+    transcription_params: Dict[str, Any] = {
+        "model": TRANSCRIPTION_MODEL,
+        "response_format": "text"  # Plain text output for educational processing
+    }
+    
+    # Add optional language specification for improved accuracy
+    if language:
+        transcription_params["language"] = language
+    
+    # Use user-provided prompt for specific educational context, else the academic default
+    transcription_params["prompt"] = prompt or DEFAULT_TRANSCRIPTION_PROMPT
+    return transcription_params
+
+def _finalize_transcription(response: str) -> str:
+    """Clean the Whisper response and substitute a helpful message for silence."""
+    # Extract transcribed text from API response
+    transcribed_text = response.strip()
+    
+    # Handle empty transcription results
+    if not transcribed_text:
+        logger.warning("Whisper returned empty transcription")
+        return NO_SPEECH_MESSAGE
+    
+    # Log successful transcription completion
+    logger.info(f"Successfully transcribed {len(transcribed_text)} characters")
+    return transcribed_text
+
+def _rewound(audio_file: BinaryIO) -> BinaryIO:
+    """Rewind an upload so a retried request sends the whole file again."""
+    audio_file.seek(0)
+    return audio_file
+
+def _raise_transcription_error(e: Exception, audio_file_path: str) -> NoReturn:
+    """Translate an API failure into a user-friendly RuntimeError."""
+    # An open circuit already carries its own message and is answered with a 503
+    if isinstance(e, CircuitOpenError):
+        raise e
+    
+    # Log detailed error information for debugging and monitoring
+    logger.error(f"Transcription failed for {audio_file_path}: {e}")
+    
+    # Provide user-friendly error messages based on common failure scenarios
+    error_message = str(e).lower()
+    if isinstance(e, openai.RateLimitError) and getattr(e, "code", None) == "insufficient_quota":
+        raise RuntimeError("Transcription quota exceeded. Please contact support.")
+    elif isinstance(e, openai.RateLimitError) or "rate limit" in error_message:
+        raise RuntimeError("Transcription service is busy. Please try again in a moment.")
+    elif "quota" in error_message:
+        raise RuntimeError("Transcription quota exceeded. Please contact support.")
+    elif "invalid" in error_message:
+        raise RuntimeError("Audio file format not supported or corrupted.")
+    else:
+        raise RuntimeError(f"Transcription failed: {str(e)}")
 
 def transcribe_audio(
     audio_file_path: str,
@@ -298,81 +417,26 @@ def transcribe_audio(
     """
     # ==================== COMPREHENSIVE INPUT VALIDATION ====================
     
-    # Validate file existence and accessibility
-    audio_path = Path(audio_file_path)
-    if not audio_path.exists():
-        raise FileNotFoundError(f"Audio file not found: {audio_file_path}")
-    
-    # Validate file format against supported types
-    file_extension = audio_path.suffix.lower()
-    if file_extension not in SUPPORTED_FORMATS:
-        raise ValueError(
-            f"Unsupported audio format: {file_extension}. "
-            f"Supported formats: {', '.join(sorted(SUPPORTED_FORMATS))}"
-        )
-    
-    # Validate file size constraints
-    file_size = audio_path.stat().st_size
-    if file_size > MAX_FILE_SIZE:
-        size_mb = file_size / (1024 * 1024)
-        raise ValueError(
-            f"Audio file too large: {size_mb:.1f}MB. "
-            f"Maximum size: {MAX_FILE_SIZE / (1024 * 1024)}MB"
-        )
-    
-    # Validate file contains actual content
-    if file_size == 0:
-        raise ValueError("Audio file is empty")
-    
-    # ==================== OPENAI CLIENT INITIALIZATION ====================
-    
-    # Initialize OpenAI client with secure configuration
-    client = get_openai_client()
+    audio_path, file_size = _validate_audio_file(audio_file_path)
     
     # ==================== AUDIO TRANSCRIPTION PROCESSING ====================
     
+    transcription_params = _build_transcription_params(language, prompt)
+    
     try:
         # Open audio file for processing with proper resource management
         with open(audio_file_path, "rb") as audio_file:
-            # Configure transcription parameters for optimal educational content processing
-            transcription_params = {
-                "model": "whisper-1",  # OpenAI's production Whisper model
-                "file": audio_file,
-                "response_format": "text"  # Plain text output for educational processing
-            }
-            
-            # Add optional language specification for improved accuracy
-            if language:
-                transcription_params["language"] = language
-                
-            # Configure context prompt for educational content optimization
-            if prompt:
-                # Use user-provided prompt for specific educational context
-                transcription_params["prompt"] = prompt
-            else:
-                # Default educational context prompt for academic content
-                transcription_params["prompt"] = (
-                    "This is educational content about academic subjects. "
-                    "Please transcribe with attention to technical and academic vocabulary."
-                )
-            
             # Log transcription initiation for monitoring and debugging
             logger.info(f"Starting transcription of {audio_path.name} ({file_size} bytes)")
             
             # Execute transcription with optimized parameters
-            response = client.audio.transcriptions.create(**transcription_params)
+            # The shared limiter paces, queues and retries the upload against the account budget
+            response = protected_call(
+                AUDIO_TRANSCRIPTIONS, TRANSCRIPTION_MODEL,
+                lambda: client.audio.transcriptions.create(file=_rewound(audio_file), **transcription_params)
+            )
             
-            # Extract transcribed text from API response
-            transcribed_text = response.strip()
-            
-            # Handle empty transcription results
-            if not transcribed_text:
-                logger.warning("Whisper returned empty transcription")
-                return "No speech detected in the audio file."
-            
-            # Log successful transcription completion
-            logger.info(f"Successfully transcribed {len(transcribed_text)} characters")
-            return transcribed_text
+            return _finalize_transcription(response)
             
     except FileNotFoundError:
         # Re-raise file errors without modification for proper error handling
@@ -380,20 +444,61 @@ def transcribe_audio(
         
     except Exception as e:
         # ==================== COMPREHENSIVE ERROR HANDLING ====================
+        _raise_transcription_error(e, audio_file_path)
+
+async def transcribe_audio_async(
+    audio_file_path: str,
+    language: Optional[str] = None,
+    prompt: Optional[str] = None
+) -> str:
+    """
+    Asynchronous Educational Audio Transcription
+    
+    Non-blocking counterpart of transcribe_audio() built on the shared async OpenAI
+    client. The audio file is handed to the SDK as an open file object, so the
+    upload body is streamed from disk in chunks instead of being loaded into memory,
+    and the Whisper call itself never blocks the event loop.
+    
+    Validation, default educational prompt and user-friendly error translation are
+    shared with transcribe_audio() and behave identically.
+    
+    Args:
+        audio_file_path (str): Path to the audio file (max 25MB, supported formats only)
+        language (Optional[str], optional): ISO 639-1 language code
+        prompt (Optional[str], optional): Context prompt for improved accuracy
+        
+    Returns:
+        str: Transcribed text, or a helpful message when no speech was detected
+        
+    Raises:
+        FileNotFoundError: When the specified audio file does not exist
+        ValueError: Unsupported format, oversized or empty file
+        RuntimeError: API failures translated into user-friendly messages
+    """
+    return _finalize_transcription(await _transcribe_file_async(audio_file_path, language, prompt))
+
+async def _transcribe_file_async(audio_file_path: str, language: Optional[str], prompt: Optional[str]) -> str:
+    """One Whisper call for a whole file; the raw text, empty when no speech was detected."""
+    audio_path, file_size = _validate_audio_file(audio_file_path)
+    transcription_params = _build_transcription_params(language, prompt)
+    
+    try:
+        logger.info(f"Starting transcription of {audio_path.name} ({file_size} bytes)")
+        # The open file is streamed to the API in chunks rather than read into memory
+        with open(audio_path, "rb") as audio_file:
+            response = await protected_call_async(
+                AUDIO_TRANSCRIPTIONS, TRANSCRIPTION_MODEL,
+                lambda: async_client.audio.transcriptions.create(
+                    file=_rewound(audio_file), **transcription_params
+                )
+            )
+        return response.strip()
         
-        # Log detailed error information for debugging and monitoring
-        logger.error(f"Transcription failed for {audio_file_path}: {e}")
+    except FileNotFoundError:
+        raise
         
-        # Provide user-friendly error messages based on common failure scenarios
-        error_message = str(e).lower()
-        if "rate limit" in error_message:
-            raise RuntimeError("Transcription service is busy. Please try again in a moment.")
-        elif "quota" in error_message:
-            raise RuntimeError("Transcription quota exceeded. Please contact support.")
-        elif "invalid" in error_message:
-            raise RuntimeError("Audio file format not supported or corrupted.")
-        else:
-            raise RuntimeError(f"Transcription failed: {str(e)}")
+    except Exception as e:
+        _raise_transcription_error(e, audio_file_path)
 
 
 def get_audio_duration(audio_file_path: str) -> Optional[float]:
@@ -412,11 +517,10 @@ def get_audio_duration(audio_file_path: str) -> Optional[float]:
     - Educational content categorization and indexing
     
     Technical Implementation:
-    - Designed for integration with audio processing libraries
-    - Supports multiple audio formats through extensible architecture
-    - Provides efficient metadata extraction without full file processing
-    - Implements caching strategies for frequently accessed content
-    - Includes error handling for corrupted or unsupported files
+    - Pure-Python header parsing (see src.ai.audio_probe); samples are never decoded
+    - WAV: RIFF fmt/data chunks; MP3/MPEG: Xing/Info or VBRI frame counts, falling
+      back to a frame header scan; MP4/M4A: mvhd atom
+    - Returns None for WebM and for truncated or corrupted files
     
     Performance Characteristics:
     - Fast metadata extraction without audio decoding
@@ -454,19 +558,17 @@ def get_audio_duration(audio_file_path: str) -> Optional[float]:
         - Supports batch processing for curriculum management
         
     Future Enhancements:
-        - Integration with mutagen or similar audio libraries
+        - WebM (Matroska) duration parsing
         - Support for additional metadata extraction
         - Caching mechanisms for performance optimization
         - Batch processing capabilities for educational content
         - Advanced analytics for educational content management
         
     Note:
-        Current implementation requires additional dependency (mutagen or similar)
-        for complete functionality. Returns None until audio library is integrated.
+        Duration is read from container headers only, so probing is fast even for
+        full-length lecture recordings.
     """
-    # TODO: Implement with audio library like mutagen for production use
-    # This placeholder ensures the API contract is maintained while development continues
-    return None
+    return probe_duration(audio_file_path)
 
 
 def estimate_transcription_cost(audio_file_path: str) -> float:
@@ -534,16 +636,253 @@ def estimate_transcription_cost(audio_file_path: str) -> float:
         
     Note:
         Cost estimation depends on audio duration analysis. Returns 0.0 if duration
-        is unavailable, indicating that cost estimation requires audio library integration.
+        is unavailable (unsupported container or corrupted file).
     """
     # Get audio duration for cost calculation
     duration = get_audio_duration(audio_file_path)
     if duration is None:
         return 0.0  # Unknown duration - cannot estimate cost
         
+    return cost_for_duration(duration)
+
+
+def cost_for_duration(duration_seconds: float) -> float:
+    """Whisper cost in USD for a given amount of audio, rounded to 4 decimal places."""
     # Calculate cost based on OpenAI Whisper pricing: $0.006 per minute
-    minutes = duration / 60
-    estimated_cost = minutes * 0.006
+    minutes = duration_seconds / 60
+    estimated_cost = minutes * WHISPER_COST_PER_MINUTE
     
     # Round to 4 decimal places for financial accuracy
-    return round(estimated_cost, 4)
\ No newline at end of file
+    return round(estimated_cost, 4)
+
+
+def admit_audio(audio_file_path: str) -> Optional[float]:
+    """
+    Admission control before any Whisper spend.
+    
+    Probes the recording's duration from its headers and rejects recordings longer
+    than MAX_AUDIO_DURATION_SECONDS, before a single API call is made.
+    
+    Args:
+        audio_file_path (str): Path to the audio file
+        
+    Returns:
+        Optional[float]: Duration in seconds, or None when it cannot be determined
+        (such files are admitted; the byte size limits still apply)
+        
+    Raises:
+        ValueError: When the recording is longer than the configured maximum
+    """
+    duration = get_audio_duration(audio_file_path)
+    if duration is not None and MAX_AUDIO_DURATION_SECONDS and duration > MAX_AUDIO_DURATION_SECONDS:
+        raise ValueError(
+            f"Audio too long: {duration / 60:.1f} minutes. "
+            f"Maximum: {MAX_AUDIO_DURATION_SECONDS / 60:.0f} minutes"
+        )
+    return duration
+
+
+def _continuity_prompt(base_prompt: Optional[str], previous_text: Optional[str]) -> Optional[str]:
+    """Append the tail of the previous segment's text to the segment prompt."""
+    if not previous_text:
+        return base_prompt
+    tail = previous_text[-PROMPT_TAIL_CHARS:]
+    if len(previous_text) > PROMPT_TAIL_CHARS and " " in tail:
+        # Start on a word boundary
+        tail = tail.split(" ", 1)[1]
+    return f"{base_prompt or DEFAULT_TRANSCRIPTION_PROMPT} {tail}"
+
+
+async def _transcribe_segment_async(segment_path: str, params: Dict[str, Any]) -> str:
+    """Send one segment to Whisper and return its raw (stripped) text."""
+    with open(segment_path, "rb") as audio_file:
+        response = await protected_call_async(
+            AUDIO_TRANSCRIPTIONS, TRANSCRIPTION_MODEL,
+            lambda: async_client.audio.transcriptions.create(file=_rewound(audio_file), **params)
+        )
+    return response.strip()
+
+
+async def transcribe_long_audio_async(
+    audio_file_path: str,
+    language: Optional[str] = None,
+    prompt: Optional[str] = None,
+    max_concurrency: int = SEGMENT_CONCURRENCY,
+    progress_callback: Optional[Callable[[int, int], None]] = None
+) -> str:
+    """
+    Long-Audio Transcription via Silence-Aware Segmentation
+    
+    Transcribes recordings beyond the 25MB Whisper limit, such as full-length
+    lectures. WAV/PCM input is split at pauses into sub-limit segments, the
+    segments are transcribed concurrently by a bounded worker pool, and the text
+    is stitched back together in playback order. Files under the limit take the
+    regular single-call path.
+    
+    Continuity Prompting:
+    - Each segment's prompt is the caller's prompt plus the tail of the previous
+      segment's text, whenever that text is already available when the segment
+      starts. Segments are never held back to wait for their predecessor, so the
+      recording still finishes in about the time of its slowest segment
+    
+    Args:
+        audio_file_path (str): Path to the audio file (max LONG_AUDIO_MAX_FILE_SIZE)
+        language (Optional[str], optional): ISO 639-1 language code
+        prompt (Optional[str], optional): Context prompt for improved accuracy
+        max_concurrency (int, optional): Maximum simultaneous Whisper calls
+        progress_callback (Optional[Callable[[int, int], None]], optional): Called with
+            (completed_segments, total_segments) after each segment finishes
+        
+    Returns:
+        str: Transcribed text; empty when no speech was detected, so callers can
+        skip work on silent recordings (see NO_SPEECH_MESSAGE for display)
+        
+    Raises:
+        FileNotFoundError: When the specified audio file does not exist
+        ValueError: Unsupported format, non-WAV file over the limit, oversized or empty file
+        RuntimeError: API failures translated into user-friendly messages
+        
+    Example:
+        >>> text = await transcribe_long_audio_async("lecture_90min.wav", language="en")
+    """
+    audio_path = Path(audio_file_path)
+    if not audio_path.exists():
+        raise FileNotFoundError(f"Audio file not found: {audio_file_path}")
+    
+    file_size = audio_path.stat().st_size
+    if file_size <= MAX_FILE_SIZE:
+        transcription = await _transcribe_file_async(audio_file_path, language, prompt)
+        if progress_callback:
+            progress_callback(1, 1)
+        if not transcription:
+            logger.warning("Whisper returned empty transcription")
+        return transcription
+    
+    # ==================== LONG-AUDIO VALIDATION ====================
+    
+    if audio_path.suffix.lower() not in SEGMENTABLE_FORMATS:
+        raise ValueError(
+            f"Audio file too large: {file_size / (1024 * 1024):.1f}MB. "
+            f"Files over {MAX_FILE_SIZE / (1024 * 1024)}MB must be WAV to be split automatically"
+        )
+    if file_size > LONG_AUDIO_MAX_FILE_SIZE:
+        raise ValueError(
+            f"Audio file too large: {file_size / (1024 * 1024):.1f}MB. "
+            f"Maximum size: {LONG_AUDIO_MAX_FILE_SIZE / (1024 * 1024)}MB"
+        )
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1")
+    
+    with tempfile.TemporaryDirectory(prefix="studybuddy_segments_") as segment_dir:
+        # Splitting is blocking file I/O, so keep it off the event loop
+        segments = await asyncio.to_thread(split_wav, str(audio_path), segment_dir, SEGMENT_MAX_BYTES)
+        logger.info(
+            f"Transcribing {audio_path.name} in {len(segments)} segments "
+            f"(concurrency {max_concurrency})"
+        )
+        
+        semaphore = asyncio.Semaphore(max_concurrency)
+        texts: List[Optional[str]] = [None] * len(segments)
+        
+        async def transcribe_segment(index: int) -> None:
+            async with semaphore:
+                previous_text = texts[index - 1] if index > 0 else None
+                params = _build_transcription_params(language, _continuity_prompt(prompt, previous_text))
+                texts[index] = await _transcribe_segment_async(segments[index].path, params)
+                if progress_callback:
+                    progress_callback(sum(text is not None for text in texts), len(segments))
+        
+        try:
+            # A failed segment cancels the others before the segment files are removed
+            async with asyncio.TaskGroup() as group:
+                for index in range(len(segments)):
+                    group.create_task(transcribe_segment(index))
+                    
+        except ExceptionGroup as e:
+            _raise_transcription_error(e.exceptions[0], audio_file_path)
+    
+    transcription = " ".join(text for text in texts if text).strip()
+    if not transcription:
+        logger.warning("Whisper returned empty transcription for every segment")
+    return transcription
+
+
+def file_digest(audio_file_path: str) -> str:
+    """SHA-256 of a file's bytes, read in blocks."""
+    digest = hashlib.sha256()
+    with open(audio_file_path, "rb") as audio_file:
+        for block in iter(lambda: audio_file.read(DIGEST_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def transcription_cache_key(content_sha256: str, language: Optional[str], prompt: Optional[str]) -> str:
+    """Cache key for a recording fingerprint and the parameters that shape its text."""
+    return make_cache_key(
+        "transcription",
+        content_sha256,
+        language=language,
+        prompt=prompt or DEFAULT_TRANSCRIPTION_PROMPT,
+        model=TRANSCRIPTION_MODEL,
+    )
+
+
+async def transcribe_audio_cached(
+    audio_file_path: str,
+    language: Optional[str] = None,
+    prompt: Optional[str] = None,
+    content_sha256: Optional[str] = None,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+    duration_seconds: Optional[float] = None
+) -> Tuple[str, bool]:
+    """
+    Cached Educational Audio Transcription
+    
+    Content-addressed cache in front of transcribe_long_audio_async(). The same
+    lecture recording uploaded by every student in a section is transcribed once;
+    repeat uploads are answered from memory or the bounded on-disk store with zero
+    Whisper spend.
+    
+    Cache Behavior:
+    - Key: SHA-256 of the audio bytes plus language, prompt and model
+    - Pass content_sha256 when the digest was already computed while the upload
+      streamed in; otherwise the file is hashed in one extra read
+    - Only successful transcriptions are stored
+    
+    Args:
+        audio_file_path (str): Path to the audio file
+        language (Optional[str], optional): ISO 639-1 language code
+        prompt (Optional[str], optional): Context prompt for improved accuracy
+        content_sha256 (Optional[str], optional): Precomputed SHA-256 hex digest of the file
+        progress_callback (Optional[Callable[[int, int], None]], optional): Segment
+            progress callback (see transcribe_long_audio_async())
+        duration_seconds (Optional[float], optional): Probed duration of the
+            recording, counted towards the transcribed-audio metric on a cache miss
+        
+    Returns:
+        Tuple[str, bool]: The transcription (empty when no speech was detected)
+        and whether it was a cache hit
+        
+    Raises:
+        FileNotFoundError: When the specified audio file does not exist
+        ValueError: Unsupported format, oversized or empty file
+        RuntimeError: API failures translated into user-friendly messages
+    """
+    if content_sha256 is None:
+        if not Path(audio_file_path).exists():
+            raise FileNotFoundError(f"Audio file not found: {audio_file_path}")
+        content_sha256 = await asyncio.to_thread(file_digest, audio_file_path)
+    
+    cache_key = transcription_cache_key(content_sha256, language, prompt)
+    cached_transcription = transcription_cache.get(cache_key)
+    if cached_transcription is not None:
+        logger.info("Transcription cache hit")
+        return cached_transcription, True
+    
+    transcription = await transcribe_long_audio_async(
+        audio_file_path, language=language, prompt=prompt, progress_callback=progress_callback
+    )
+    transcription_cache.set(cache_key, transcription)
+    if duration_seconds is not None:
+        audio_transcribed.labels(TRANSCRIPTION_MODEL).inc(duration_seconds)
+    return transcription, False
@@ -0,0 +1,610 @@
+"""
+StudyBuddy AI - Cache Warm-Up for Known Course Material
+
+The readings and lecture recordings each course uses in a week are known in
+advance, and the morning before class every student asks for the same
+summaries and quizzes at once. This module pre-generates them from a manifest
+during off-peak hours, so the morning spike is served from the caches.
+
+Core Functionality:
+- Manifest of inline texts, text files and audio recordings
+- Recordings are transcribed first (filling the transcription cache) and their
+  transcripts warmed like texts
+- Summaries in every learning style, written through the summary cache under the
+  keys /api/summarize uses (long texts use the long-document summary cache)
+- Quiz questions at every difficulty, stored in the question bank (long texts
+  go through the section-parallel long quiz)
+- Spend budget in USD: every task reserves a conservative cost estimate before
+  it runs, work already cached is refunded, and tasks that no longer fit the
+  budget are skipped
+- Off-peak window (e.g. "01:00-05:00"): the run starts when the window opens
+  and stops starting new tasks when it closes
+
+Usage:
+- Admin endpoint: POST /api/admin/warmup queues a warm-up job in the API
+  process, so its in-memory caches are the ones warmed
+- CLI: python -m src.ai.warmup manifest.json --window 01:00-05:00 --budget 5
+  The CLI warms the caches its own process can reach: the question bank and
+  transcription cache on disk, and summaries only when SUMMARY_CACHE_DB is
+  shared with the API. Pass --server to submit the manifest to a running API.
+
+Design Notes:
+- Chat spend is estimated from input tokens plus full completion budgets, so the
+  real spend stays below the reserved amount
+- Failures of one task are recorded in the report and never stop the run
+
+@version 1.0.0
+@since 2026-10-17
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import os
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from src.ai import long_summarizer
+from src.ai.long_quiz import SURPLUS_RATIO, generate_long_quiz_async
+from src.ai.long_summarizer import summarize_long_text_async
+from src.ai.quiz_generator import (
+    DIFFICULTY_PROMPTS,
+    MAX_INPUT_CHARS as QUIZ_MAX_INPUT_CHARS,
+    QUIZ_MAX_TOKENS,
+    QUIZ_MODEL,
+    QUIZ_TOKENS_PER_QUESTION,
+    close_question_bank,
+    generate_quiz_banked_async,
+    init_question_bank,
+    question_type_counts,
+)
+from src.ai.summarizer import (
+    BASE_NOTES_MAX_TOKENS,
+    MAX_INPUT_CHARS as SUMMARY_MAX_INPUT_CHARS,
+    STYLE_PROMPTS,
+    SUMMARY_MODEL,
+    summarize_styles_async,
+)
+from src.ai.tokens import count_tokens
+from src.ai.transcriber import (
+    admit_audio,
+    close_transcription_cache,
+    cost_for_duration,
+    init_transcription_cache,
+    transcribe_audio_cached,
+)
+
+# Configure module-level logger for comprehensive monitoring and debugging
+logger = logging.getLogger(__name__)
+
+# ==================== WARM-UP CONFIGURATION ====================
+
+# Default spend ceiling for one warm-up run (USD)
+WARMUP_BUDGET_USD = float(os.getenv("WARMUP_BUDGET_USD", "5.0"))
+
+# Chat completion price used for spend estimates (USD per 1,000 tokens, input and output)
+CHAT_COST_PER_1K_TOKENS = float(os.getenv("WARMUP_CHAT_COST_PER_1K_TOKENS", "0.002"))
+
+# Items warmed at the same time; low, so live traffic keeps most of the rate limit
+WARMUP_CONCURRENCY = int(os.getenv("WARMUP_CONCURRENCY", "2"))
+
+# Summary length warmed; must match what clients request to produce cache hits
+WARMUP_SUMMARY_MAX_TOKENS = int(os.getenv("WARMUP_SUMMARY_MAX_TOKENS", "300"))
+WARMUP_LONG_SUMMARY_MAX_TOKENS = int(os.getenv("WARMUP_LONG_SUMMARY_MAX_TOKENS", "500"))
+
+# Questions banked per difficulty; 10 covers any single quiz request
+WARMUP_QUIZ_QUESTIONS = int(os.getenv("WARMUP_QUIZ_QUESTIONS", "10"))
+WARMUP_LONG_QUIZ_QUESTIONS = int(os.getenv("WARMUP_LONG_QUIZ_QUESTIONS", "20"))
+
+# Directory that manifest file paths submitted through the admin endpoint must be in
+WARMUP_CONTENT_DIR = os.getenv("WARMUP_CONTENT_DIR")
+
+# System prompt and message framing tokens added to every chat estimate
+PROMPT_OVERHEAD_TOKENS = 400
+
+# Lowest bitrate assumed when a recording's duration cannot be probed (bits per second)
+MIN_AUDIO_BITRATE = 16000
+
+LEARNING_STYLES = tuple(STYLE_PROMPTS)
+DIFFICULTIES = tuple(DIFFICULTY_PROMPTS)
+
+
+@dataclass
+class WarmupItem:
+    """One piece of course material from a manifest: text or a recording."""
+
+    name: str
+    text: Optional[str] = None
+    audio_path: Optional[str] = None
+    language: Optional[str] = None
+
+
+@dataclass
+class WarmupOptions:
+    """What to generate for every item."""
+
+    learning_styles: Sequence[str] = LEARNING_STYLES
+    difficulties: Sequence[str] = DIFFICULTIES
+    quiz_learning_styles: Sequence[str] = ("reading",)
+    question_types: Sequence[str] = ("multiple_choice",)
+
+
+# ==================== MANIFEST ====================
+
+def _resolve_path(path: str, base_dir: Optional[str]) -> str:
+    """Resolve a manifest path against base_dir, refusing paths that leave it."""
+    if base_dir is None:
+        raise ValueError(f"File entries are not allowed here: {path}")
+    base = Path(base_dir).resolve()
+    resolved = (base / path).resolve()
+    if resolved != base and base not in resolved.parents:
+        raise ValueError(f"Manifest path is outside {base}: {path}")
+    return str(resolved)
+
+
+def _choices(values: Any, allowed: Sequence[str], field: str, default: Sequence[str]) -> Tuple[str, ...]:
+    if values is None:
+        return tuple(default)
+    if not isinstance(values, list) or not values:
+        raise ValueError(f"Manifest field {field} must be a non-empty list")
+    unknown = [value for value in values if value not in allowed]
+    if unknown:
+        raise ValueError(f"Manifest field {field} has unknown values: {unknown}")
+    return tuple(dict.fromkeys(values))
+
+
+def parse_manifest(manifest: Dict[str, Any], base_dir: Optional[str] = None) -> Tuple[List[WarmupItem], WarmupOptions]:
+    """
+    Validate a warm-up manifest.
+
+    Format::
+
+        {
+            "items": [
+                {"name": "Week 3 reading", "text": "Photosynthesis is ..."},
+                {"name": "Chapter 4", "path": "readings/chapter4.txt"},
+                {"name": "Lecture 5", "audio": "lectures/lecture5.wav", "language": "en"}
+            ],
+            "learning_styles": ["visual", "reading"],      (default: all)
+            "difficulties": ["high_school"],               (default: all)
+            "quiz_learning_styles": ["reading"],           (default: reading)
+            "question_types": ["multiple_choice"]          (default: multiple choice)
+        }
+
+    Args:
+        manifest (Dict[str, Any]): Parsed manifest JSON
+        base_dir (Optional[str]): Directory "path" and "audio" entries are relative
+            to and must stay inside; None rejects file entries
+
+    Returns:
+        Tuple[List[WarmupItem], WarmupOptions]: Items (text files already read) and options
+
+    Raises:
+        ValueError: Malformed manifest, unknown options or unreadable files
+    """
+    entries = manifest.get("items") if isinstance(manifest, dict) else None
+    if not isinstance(entries, list) or not entries:
+        raise ValueError("Manifest must contain a non-empty items list")
+
+    items = []
+    for index, entry in enumerate(entries):
+        if not isinstance(entry, dict):
+            raise ValueError(f"Manifest item {index + 1} must be an object")
+        sources = [key for key in ("text", "path", "audio") if entry.get(key)]
+        if len(sources) != 1:
+            raise ValueError(f"Manifest item {index + 1} needs exactly one of text, path or audio")
+        if not isinstance(entry[sources[0]], str):
+            raise ValueError(f"Manifest item {index + 1} {sources[0]} must be a string")
+        name = str(entry.get("name") or entry[sources[0]][:40])
+
+        if sources[0] == "audio":
+            items.append(WarmupItem(name, audio_path=_resolve_path(entry["audio"], base_dir),
+                                    language=entry.get("language")))
+            continue
+        text = entry.get("text")
+        if sources[0] == "path":
+            try:
+                text = Path(_resolve_path(entry["path"], base_dir)).read_text(encoding="utf-8")
+            except OSError as e:
+                raise ValueError(f"Cannot read manifest item {name}: {e}") from e
+        items.append(WarmupItem(name, text=text))
+
+    quiz_types = manifest.get("question_types")
+    options = WarmupOptions(
+        learning_styles=_choices(manifest.get("learning_styles"), LEARNING_STYLES, "learning_styles", LEARNING_STYLES),
+        difficulties=_choices(manifest.get("difficulties"), DIFFICULTIES, "difficulties", DIFFICULTIES),
+        quiz_learning_styles=_choices(
+            manifest.get("quiz_learning_styles"), LEARNING_STYLES, "quiz_learning_styles", ("reading",)
+        ),
+        question_types=tuple(quiz_types) if quiz_types else ("multiple_choice",),
+    )
+    question_type_counts(WARMUP_QUIZ_QUESTIONS, options.question_types)
+    return items, options
+
+
+# ==================== OFF-PEAK WINDOW ====================
+
+def off_peak_window(spec: str, now: datetime) -> Tuple[datetime, datetime]:
+    """
+    Next (or current) occurrence of a daily "HH:MM-HH:MM" window in local time.
+
+    Windows may cross midnight ("22:00-06:00"). When `now` is inside the window
+    the current occurrence is returned, so the run can start at once.
+
+    Raises:
+        ValueError: Malformed window
+    """
+    try:
+        start_text, end_text = spec.split("-")
+        start_time = datetime.strptime(start_text.strip(), "%H:%M").time()
+        end_time = datetime.strptime(end_text.strip(), "%H:%M").time()
+    except ValueError as e:
+        raise ValueError(f"Window must look like 01:00-05:00, got {spec!r}") from e
+    if start_time == end_time:
+        raise ValueError("Window start and end must differ")
+
+    for days_back in (1, 0):
+        start = datetime.combine(now.date() - timedelta(days=days_back), start_time)
+        end = datetime.combine(start.date(), end_time)
+        if end <= start:
+            end += timedelta(days=1)
+        if start <= now < end:
+            return start, end
+    start = datetime.combine(now.date(), start_time)
+    if start <= now:
+        start += timedelta(days=1)
+    end = datetime.combine(start.date(), end_time)
+    if end <= start:
+        end += timedelta(days=1)
+    return start, end
+
+
+# ==================== SPEND BUDGET ====================
+
+class SpendBudget:
+    """
+    Reservations against a spend ceiling.
+
+    Args:
+        limit_usd (float): Most that may be reserved in total
+    """
+
+    def __init__(self, limit_usd: float):
+        if limit_usd < 0:
+            raise ValueError("Budget cannot be negative")
+        self.limit_usd = limit_usd
+        self.reserved_usd = 0.0
+        self.refunded_usd = 0.0
+
+    @property
+    def remaining_usd(self) -> float:
+        return self.limit_usd - self.reserved_usd
+
+    def reserve(self, cost_usd: float) -> bool:
+        """Reserve a task's estimated cost; False when it does not fit."""
+        if cost_usd > self.remaining_usd + 1e-12:
+            return False
+        self.reserved_usd += cost_usd
+        return True
+
+    def refund(self, cost_usd: float) -> None:
+        """Give back the part of a reservation that was not spent (e.g. cache hits)."""
+        refund = min(cost_usd, self.reserved_usd)
+        self.reserved_usd -= refund
+        self.refunded_usd += refund
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "budget_usd": self.limit_usd,
+            "estimated_spend_usd": round(self.reserved_usd, 4),
+            "refunded_usd": round(self.refunded_usd, 4),
+        }
+
+
+def _chat_cost(tokens: float) -> float:
+    return tokens / 1000 * CHAT_COST_PER_1K_TOKENS
+
+
+def estimate_summary_cost(text: str, max_tokens: int) -> float:
+    """Upper-bound cost of one summary (one style) of the text."""
+    text_tokens = count_tokens(text, SUMMARY_MODEL)
+    if len(text) <= SUMMARY_MAX_INPUT_CHARS:
+        return _chat_cost(text_tokens + PROMPT_OVERHEAD_TOKENS + max(max_tokens, BASE_NOTES_MAX_TOKENS))
+    # Map every chunk, reduce the notes about once, then the final styled pass
+    chunks = math.ceil(text_tokens / max(1, long_summarizer.CHUNK_TOKENS))
+    notes_tokens = chunks * long_summarizer.PARTIAL_MAX_TOKENS
+    return _chat_cost(
+        text_tokens + 2 * notes_tokens + (2 * chunks + 1) * PROMPT_OVERHEAD_TOKENS + max_tokens
+    )
+
+
+def estimate_quiz_cost(text: str, num_questions: int) -> float:
+    """Upper-bound cost of one quiz (one difficulty and style) on the text."""
+    text_tokens = count_tokens(text, QUIZ_MODEL)
+    if len(text) <= QUIZ_MAX_INPUT_CHARS:
+        return _chat_cost(
+            text_tokens + PROMPT_OVERHEAD_TOKENS + max(QUIZ_MAX_TOKENS, num_questions * QUIZ_TOKENS_PER_QUESTION)
+        )
+    sections = math.ceil(len(text) / QUIZ_MAX_INPUT_CHARS) + 1
+    completion = num_questions * (1 + SURPLUS_RATIO) * QUIZ_TOKENS_PER_QUESTION
+    return _chat_cost(text_tokens + sections * PROMPT_OVERHEAD_TOKENS + completion)
+
+
+def estimate_transcription_cost(audio_path: str, duration_seconds: Optional[float]) -> float:
+    """Whisper cost of a recording, assuming a low bitrate when its duration is unknown."""
+    if duration_seconds is None:
+        duration_seconds = os.path.getsize(audio_path) * 8 / MIN_AUDIO_BITRATE
+    return cost_for_duration(duration_seconds)
+
+
+# ==================== WARM-UP RUN ====================
+
+class _Run:
+    """State shared by the tasks of one warm-up run."""
+
+    def __init__(self, options: WarmupOptions, budget: SpendBudget, deadline: Optional[float],
+                 clock: Callable[[], float]):
+        self.options = options
+        self.budget = budget
+        self.deadline = deadline
+        self.clock = clock
+        self.totals = {
+            "transcripts_warmed": 0, "transcripts_cached": 0,
+            "summaries_warmed": 0, "summaries_cached": 0,
+            "quizzes_warmed": 0, "quizzes_cached": 0,
+            "skipped_budget": 0, "skipped_window": 0, "failed": 0,
+        }
+
+    def admit(self, report: Dict[str, Any], task: str, cost_usd: float) -> bool:
+        """Whether a task may start: inside the window and within the budget."""
+        if self.deadline is not None and self.clock() >= self.deadline:
+            self.totals["skipped_window"] += 1
+            report["skipped"].append(f"{task}: off-peak window closed")
+            return False
+        if not self.budget.reserve(cost_usd):
+            self.totals["skipped_budget"] += 1
+            report["skipped"].append(f"{task}: over budget (needs ${cost_usd:.4f})")
+            return False
+        return True
+
+    def failed(self, report: Dict[str, Any], task: str, error: Exception) -> None:
+        logger.warning(f"Warm-up task {task} for {report['name']} failed: {error}")
+        self.totals["failed"] += 1
+        report["errors"].append(f"{task}: {error}")
+
+
+async def _warm_transcript(run: _Run, item: WarmupItem, report: Dict[str, Any]) -> Optional[str]:
+    try:
+        duration = await asyncio.to_thread(admit_audio, item.audio_path)
+        cost = estimate_transcription_cost(item.audio_path, duration)
+    except (OSError, ValueError) as e:
+        run.failed(report, "transcript", e)
+        return None
+    if not run.admit(report, "transcript", cost):
+        return None
+    try:
+        transcript, cached = await transcribe_audio_cached(
+            audio_file_path=item.audio_path, language=item.language, duration_seconds=duration
+        )
+    except Exception as e:
+        run.failed(report, "transcript", e)
+        return None
+    if cached:
+        run.budget.refund(cost)
+    run.totals["transcripts_cached" if cached else "transcripts_warmed"] += 1
+    return transcript
+
+
+async def _warm_summaries(run: _Run, text: str, report: Dict[str, Any]) -> None:
+    long_text = len(text) > SUMMARY_MAX_INPUT_CHARS
+    max_tokens = WARMUP_LONG_SUMMARY_MAX_TOKENS if long_text else WARMUP_SUMMARY_MAX_TOKENS
+    cost = estimate_summary_cost(text, max_tokens)
+    styles = [style for style in run.options.learning_styles if run.admit(report, f"summary/{style}", cost)]
+    if not styles:
+        return
+
+    if not long_text:
+        # One neutral-notes pass shared by every style (see summarize_styles_async)
+        try:
+            result = await summarize_styles_async(text, styles, max_tokens)
+        except Exception as e:
+            run.budget.refund(cost * len(styles))
+            run.failed(report, "summaries", e)
+            return
+        cached = len(result["cached_styles"])
+        run.budget.refund(cost * cached)
+        run.totals["summaries_cached"] += cached
+        run.totals["summaries_warmed"] += len(styles) - cached
+        return
+
+    for style in styles:
+        try:
+            result = await summarize_long_text_async(text, style, max_tokens)
+        except Exception as e:
+            run.budget.refund(cost)
+            run.failed(report, f"summary/{style}", e)
+            continue
+        if result["cached"]:
+            run.budget.refund(cost)
+        run.totals["summaries_cached" if result["cached"] else "summaries_warmed"] += 1
+
+
+async def _warm_quizzes(run: _Run, text: str, report: Dict[str, Any]) -> None:
+    long_text = len(text) > QUIZ_MAX_INPUT_CHARS
+    num_questions = WARMUP_LONG_QUIZ_QUESTIONS if long_text else WARMUP_QUIZ_QUESTIONS
+    cost = estimate_quiz_cost(text, num_questions)
+    for style in run.options.quiz_learning_styles:
+        for difficulty in run.options.difficulties:
+            task = f"quiz/{difficulty}/{style}"
+            if not run.admit(report, task, cost):
+                continue
+            try:
+                if long_text:
+                    result = await generate_long_quiz_async(
+                        text, num_questions, difficulty, style, run.options.question_types
+                    )
+                    from_bank = result["from_bank"]
+                else:
+                    _, from_bank = await generate_quiz_banked_async(
+                        text, num_questions, difficulty, style, run.options.question_types
+                    )
+            except Exception as e:
+                run.budget.refund(cost)
+                run.failed(report, task, e)
+                continue
+            # Banked questions cost nothing
+            run.budget.refund(cost * min(from_bank, num_questions) / num_questions)
+            run.totals["quizzes_cached" if from_bank >= num_questions else "quizzes_warmed"] += 1
+
+
+async def _warm_item(run: _Run, item: WarmupItem) -> Dict[str, Any]:
+    report: Dict[str, Any] = {"name": item.name, "skipped": [], "errors": []}
+    text = item.text
+    if item.audio_path:
+        text = await _warm_transcript(run, item, report)
+    if text and text.strip():
+        await _warm_summaries(run, text, report)
+        await _warm_quizzes(run, text, report)
+    return report
+
+
+async def run_warmup(
+    items: List[WarmupItem],
+    options: Optional[WarmupOptions] = None,
+    budget_usd: float = WARMUP_BUDGET_USD,
+    deadline: Optional[float] = None,
+    concurrency: int = WARMUP_CONCURRENCY,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+    clock: Callable[[], float] = time.time
+) -> Dict[str, Any]:
+    """
+    Pre-Generate Summaries and Quizzes for Course Material
+
+    Transcribes recordings, then writes every requested summary and quiz through
+    the regular caches, item by item under a concurrency limit. Work already
+    cached costs nothing and is refunded from the budget.
+
+    Args:
+        items (List[WarmupItem]): Material to warm (see parse_manifest())
+        options (Optional[WarmupOptions]): Styles, difficulties and question types
+        budget_usd (float): Spend ceiling for the whole run
+        deadline (Optional[float]): Wall-clock time after which no task starts
+        concurrency (int): Items warmed at the same time
+        progress_callback (Optional[Callable[[int, int], None]]): Called with
+            (items done, total items)
+        clock (Callable[[], float]): Wall-clock time source (injectable for tests)
+
+    Returns:
+        Dict[str, Any]: Report with "totals" (warmed, cached, skipped and failed
+        counts), the budget figures, "duration_seconds" and per-item "items"
+        (name, skipped tasks, errors)
+
+    Raises:
+        ValueError: Invalid concurrency or budget
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    run = _Run(options or WarmupOptions(), SpendBudget(budget_usd), deadline, clock)
+    semaphore = asyncio.Semaphore(concurrency)
+    started = clock()
+    done = 0
+
+    async def warm(item: WarmupItem) -> Dict[str, Any]:
+        nonlocal done
+        async with semaphore:
+            report = await _warm_item(run, item)
+        done += 1
+        if progress_callback:
+            progress_callback(done, len(items))
+        return report
+
+    logger.info(f"Warm-up started: {len(items)} items, budget ${budget_usd:.2f}")
+    reports = await asyncio.gather(*(warm(item) for item in items))
+    logger.info(f"Warm-up finished: {run.totals}, {run.budget.stats()}")
+    return {
+        "totals": run.totals,
+        **run.budget.stats(),
+        "duration_seconds": round(clock() - started, 3),
+        "items": reports,
+    }
+
+
+# ==================== COMMAND LINE ====================
+
+def _submit_to_server(server: str, manifest: Dict[str, Any], manifest_dir: str, args: argparse.Namespace) -> None:
+    """Queue the manifest on a running API; text files are sent inline."""
+    import httpx
+
+    for entry in manifest.get("items", []):
+        if isinstance(entry, dict) and entry.get("path"):
+            entry["text"] = Path(_resolve_path(entry.pop("path"), manifest_dir)).read_text(encoding="utf-8")
+    response = httpx.post(
+        f"{server.rstrip('/')}/api/admin/warmup",
+        json={"manifest": manifest, "budget_usd": args.budget, "window": args.window},
+        headers={"X-Admin-Token": os.getenv("ADMIN_API_TOKEN", "")},
+        timeout=60,
+    )
+    response.raise_for_status()
+    print(json.dumps(response.json(), indent=2))
+
+
+async def _run_cli(args: argparse.Namespace) -> Dict[str, Any]:
+    manifest_path = Path(args.manifest)
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    items, options = parse_manifest(manifest, str(manifest_path.parent))
+
+    deadline = None
+    if args.window:
+        start, end = off_peak_window(args.window, datetime.now())
+        wait = (start - datetime.now()).total_seconds()
+        if wait > 0:
+            logger.info(f"Waiting {wait / 60:.0f} minutes for the off-peak window to open at {start:%H:%M}")
+            await asyncio.sleep(wait)
+        deadline = end.timestamp()
+
+    # The API opens these in its lifespan; the CLI warms the same files on disk
+    init_question_bank()
+    init_transcription_cache()
+    try:
+        return await run_warmup(items, options, budget_usd=args.budget, deadline=deadline, concurrency=args.concurrency)
+    finally:
+        close_transcription_cache()
+        close_question_bank()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Pre-generate summaries and quizzes for course material")
+    parser.add_argument("manifest", help="Manifest JSON file (paths inside it are relative to the file)")
+    parser.add_argument("--budget", type=float, default=WARMUP_BUDGET_USD, help="Spend ceiling in USD")
+    parser.add_argument("--window", help="Daily off-peak window to run in, e.g. 01:00-05:00 (local time)")
+    parser.add_argument("--concurrency", type=int, default=WARMUP_CONCURRENCY, help="Items warmed at once")
+    parser.add_argument("--server", help="Submit to a running API (e.g. http://localhost:8000) instead")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    if args.window:
+        off_peak_window(args.window, datetime.now())
+    if args.server:
+        manifest_path = Path(args.manifest)
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        _submit_to_server(args.server, manifest, str(manifest_path.parent), args)
+        return 0
+
+    if not os.getenv("SUMMARY_CACHE_DB"):
+        logger.warning(
+            "SUMMARY_CACHE_DB is not set: summaries only warm this process's memory. "
+            "Share SUMMARY_CACHE_DB with the API or use --server."
+        )
+    report = asyncio.run(_run_cli(args))
+    print(json.dumps(report, indent=2))
+    return 1 if report["totals"]["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,19 @@
+"""
+Shared HTTP error mapping for StudyBuddy AI routes.
+
+Requests refused because an upstream circuit is open are answered with a
+503 and a Retry-After header, so clients and load balancers back off until
+the breaker's next probe instead of retrying straight away.
+"""
+
+import math
+from fastapi import HTTPException, status
+from src.ai.circuit_breaker import CircuitOpenError
+
+def upstream_unavailable(error: CircuitOpenError) -> HTTPException:
+    """503 response for a call rejected by an open circuit breaker."""
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=str(error),
+        headers={"Retry-After": str(max(1, math.ceil(error.retry_after)))}
+    )
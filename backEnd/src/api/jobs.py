@@ -0,0 +1,519 @@
+"""
+Background job queue for StudyBuddy AI
+
+Long transcriptions run as background jobs instead of holding the HTTP
+connection open for the whole Whisper call, and so do cache warm-up runs
+(see src.ai.warmup), which wait for their off-peak window. Jobs are persisted in a local
+SQLite store so they survive a worker restart, and a bounded pool of asyncio
+workers drains the queue, capping concurrency against the upstream API.
+
+Job lifecycle: queued -> running -> completed | failed. Several worker
+processes may share one store: a claim is a single UPDATE, and a running job
+holds a lease its worker keeps renewing. Jobs whose lease ran out because their
+process stopped are put back in the queue by the next worker that checks.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from src.ai.circuit_breaker import CircuitOpenError
+from src.ai.openai_client import LazyClient
+from src.ai.transcriber import NO_SPEECH_MESSAGE, admit_audio, cost_for_duration, transcribe_audio_cached
+from src.ai.warmup import off_peak_window, parse_manifest, run_warmup
+from src.api.models import TranscriptionResponse
+
+logger = logging.getLogger(__name__)
+
+# Where queued audio files and the job database live
+JOB_STORAGE_DIR = os.getenv("JOB_STORAGE_DIR", os.path.join(tempfile.gettempdir(), "studybuddy", "jobs"))
+JOB_DB = os.getenv("JOB_DB", os.path.join(JOB_STORAGE_DIR, "jobs.sqlite3"))
+
+# Number of jobs processed at the same time
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+
+# How often idle workers re-check the queue (seconds)
+JOB_POLL_INTERVAL_SECONDS = float(os.getenv("JOB_POLL_INTERVAL_SECONDS", "1.0"))
+
+# Finished jobs are deleted after this long (seconds)
+JOB_RETENTION_SECONDS = float(os.getenv("JOB_RETENTION_SECONDS", "86400"))
+
+# Minimum gap between retention sweeps (seconds)
+PURGE_INTERVAL_SECONDS = 600
+
+# A running job whose worker has not renewed its lease for this long is requeued (seconds)
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "60"))
+
+# Job status values
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+
+class JobStore:
+    """
+    Thread-safe SQLite store for background jobs.
+
+    Args:
+        path (str): Database file path (parent directories are created)
+        clock (Callable[[], float]): Wall-clock time source (injectable for tests)
+        lease_seconds (float): How long a claim stays valid without being renewed
+
+    Every store instance is a distinct lease owner, so stores opened by other
+    processes on the same file never take over each other's live jobs.
+    """
+
+    def __init__(self, path: str, clock: Callable[[], float] = time.time, lease_seconds: float = JOB_LEASE_SECONDS):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.owner = uuid.uuid4().hex
+        self._clock = clock
+        self._lock = threading.Lock()
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                status TEXT NOT NULL,
+                progress REAL NOT NULL DEFAULT 0,
+                payload TEXT NOT NULL,
+                result TEXT,
+                error TEXT,
+                error_status INTEGER,
+                created_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL,
+                owner TEXT,
+                lease_expires_at REAL
+            )
+            """
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        for column, definition in (("owner", "TEXT"), ("lease_expires_at", "REAL")):
+            if column not in columns:
+                # Stores created before leases existed; their running jobs count as expired
+                self._conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {definition}")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_queue ON jobs (kind, status, created_at)")
+
+    def create(self, kind: str, payload: Dict[str, Any], job_id: Optional[str] = None) -> Dict[str, Any]:
+        """Insert a new queued job and return it."""
+        job_id = job_id or uuid.uuid4().hex
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, kind, status, payload, created_at) VALUES (?, ?, ?, ?, ?)",
+                (job_id, kind, QUEUED, json.dumps(payload), self._clock()),
+            )
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return a job as a dict, or None when it does not exist."""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._to_dict(row) if row else None
+
+    def claim_next(self, kind: str) -> Optional[Dict[str, Any]]:
+        """
+        Atomically move the oldest queued job of a kind to running and return it.
+
+        One UPDATE statement, so a job is claimed once even by workers in
+        different processes sharing the database.
+        """
+        now = self._clock()
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                UPDATE jobs SET status = ?, started_at = ?, progress = 0, owner = ?, lease_expires_at = ?
+                WHERE id = (
+                    SELECT id FROM jobs WHERE kind = ? AND status = ? ORDER BY created_at LIMIT 1
+                ) AND status = ?
+                RETURNING *
+                """,
+                (RUNNING, now, self.owner, now + self.lease_seconds, kind, QUEUED, QUEUED),
+            ).fetchall()
+        return self._to_dict(rows[0]) if rows else None
+
+    def renew_lease(self, job_id: str) -> bool:
+        """Extend the lease of a job this store is running; False once it was lost."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET lease_expires_at = ? WHERE id = ? AND status = ? AND owner = ?",
+                (self._clock() + self.lease_seconds, job_id, RUNNING, self.owner),
+            )
+        return cursor.rowcount == 1
+
+    def set_progress(self, job_id: str, progress: float) -> None:
+        """Record progress (0.0 to 1.0) for a running job."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET progress = ? WHERE id = ? AND status = ?",
+                (max(0.0, min(1.0, progress)), job_id, RUNNING),
+            )
+
+    def complete(self, job_id: str, result: Dict[str, Any]) -> bool:
+        """
+        Mark a job this store is running as completed with its result.
+
+        Returns False, leaving the job untouched, once the lease was lost: the
+        job was requeued and belongs to whichever worker claimed it next.
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = ?, progress = 1, result = ?, finished_at = ? "
+                "WHERE id = ? AND status = ? AND owner = ?",
+                (COMPLETED, json.dumps(result), self._clock(), job_id, RUNNING, self.owner),
+            )
+        return cursor.rowcount == 1
+
+    def fail(self, job_id: str, error: str, error_status: int = 500) -> bool:
+        """
+        Mark a job this store is running as failed with a user-facing error and
+        the matching HTTP status; False once the lease was lost, as in complete().
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, error_status = ?, finished_at = ? "
+                "WHERE id = ? AND status = ? AND owner = ?",
+                (FAILED, error, error_status, self._clock(), job_id, RUNNING, self.owner),
+            )
+        return cursor.rowcount == 1
+
+    def requeue_interrupted(self, kind: Optional[str] = None) -> int:
+        """
+        Put interrupted jobs (of one kind, or all) back in the queue.
+
+        Interrupted means claimed by this store (its workers were stopped) or
+        holding an expired lease (their process stopped). Jobs other live
+        processes are running keep renewing their leases and are left alone.
+        """
+        query = (
+            "UPDATE jobs SET status = ?, progress = 0, started_at = NULL, owner = NULL, lease_expires_at = NULL "
+            "WHERE status = ? AND (owner = ? OR lease_expires_at IS NULL OR lease_expires_at < ?)"
+        )
+        params = [QUEUED, RUNNING, self.owner, self._clock()]
+        if kind is not None:
+            query += " AND kind = ?"
+            params.append(kind)
+        with self._lock:
+            cursor = self._conn.execute(query, params)
+        return cursor.rowcount
+
+    def purge_finished(self, older_than_seconds: float) -> List[Dict[str, Any]]:
+        """Delete finished jobs older than the retention period and return them."""
+        cutoff = self._clock() - older_than_seconds
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM jobs WHERE status IN (?, ?) AND finished_at < ?",
+                (COMPLETED, FAILED, cutoff),
+            ).fetchall()
+            self._conn.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?) AND finished_at < ?",
+                (COMPLETED, FAILED, cutoff),
+            )
+        return [self._to_dict(row) for row in rows]
+
+    def counts(self, kind: Optional[str] = None) -> Dict[str, int]:
+        """Number of jobs (of one kind, or all) per status, for monitoring."""
+        query = "SELECT status, COUNT(*) FROM jobs"
+        params = []
+        if kind is not None:
+            query += " WHERE kind = ?"
+            params.append(kind)
+        with self._lock:
+            rows = self._conn.execute(query + " GROUP BY status", params).fetchall()
+        counts = dict.fromkeys((QUEUED, RUNNING, COMPLETED, FAILED), 0)
+        counts.update({row[0]: row[1] for row in rows})
+        return counts
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+    @staticmethod
+    def _to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        job = dict(row)
+        job["payload"] = json.loads(job["payload"])
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+# Processor signature: (job, report_progress) -> JSON-serializable result
+JobProcessor = Callable[[Dict[str, Any], Callable[[float], None]], Awaitable[Dict[str, Any]]]
+
+class JobWorkerPool:
+    """
+    Bounded pool of asyncio workers draining one kind of job from a JobStore.
+
+    Args:
+        store (JobStore): Persistent job store
+        kind (str): Job kind this pool processes
+        processor (JobProcessor): Coroutine that runs one job and returns its result
+        concurrency (int): Number of workers (maximum jobs in flight)
+        poll_interval (float): Seconds an idle worker waits before re-checking the queue
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        kind: str,
+        processor: JobProcessor,
+        concurrency: int = JOB_WORKERS,
+        poll_interval: float = JOB_POLL_INTERVAL_SECONDS,
+    ):
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self.store = store
+        self.kind = kind
+        self.processor = processor
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self._workers: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._last_purge = 0.0
+        self._last_requeue = 0.0
+
+    @property
+    def running(self) -> bool:
+        return bool(self._workers)
+
+    def submit(self, payload: Dict[str, Any], job_id: Optional[str] = None) -> Dict[str, Any]:
+        """Queue a job and wake an idle worker."""
+        job = self.store.create(self.kind, payload, job_id=job_id)
+        if self._wakeup is not None:
+            self._wakeup.set()
+        logger.info(f"Queued {self.kind} job {job['id']}")
+        return job
+
+    async def start(self) -> None:
+        """Requeue interrupted jobs and start the workers."""
+        if self._workers:
+            return
+        # Only this pool's kind and only jobs no live worker holds a lease on
+        requeued = self.store.requeue_interrupted(self.kind)
+        if requeued:
+            logger.info(f"Requeued {requeued} interrupted {self.kind} jobs")
+        self._wakeup = asyncio.Event()
+        self._workers = [
+            asyncio.create_task(self._work(), name=f"{self.kind}-worker-{index}")
+            for index in range(self.concurrency)
+        ]
+        logger.info(f"Started {self.concurrency} {self.kind} workers")
+
+    async def stop(self) -> None:
+        """Cancel the workers; jobs in progress are requeued on the next start."""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._wakeup = None
+
+    async def _work(self) -> None:
+        while True:
+            try:
+                job = self.store.claim_next(self.kind)
+                if job is None:
+                    self._purge_if_due()
+                    self._requeue_expired_if_due()
+            except sqlite3.Error as e:
+                # A locked or unavailable database must not kill the worker; retry after a poll.
+                logger.error(f"Could not read the {self.kind} job queue: {e}")
+                await asyncio.sleep(self.poll_interval)
+                continue
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except TimeoutError:
+                    pass
+                self._wakeup.clear()
+                continue
+            await self._run(job)
+
+    async def _renew_lease(self, job_id: str) -> None:
+        """Keep a running job's lease alive, including while it waits or sleeps."""
+        while True:
+            await asyncio.sleep(self.store.lease_seconds / 3)
+            if not self.store.renew_lease(job_id):
+                logger.warning(f"Lost the lease on {self.kind} job {job_id}")
+                return
+
+    async def _run(self, job: Dict[str, Any]) -> None:
+        job_id = job["id"]
+        logger.info(f"Processing {self.kind} job {job_id}")
+        heartbeat = asyncio.create_task(self._renew_lease(job_id))
+        try:
+            await self._process(job)
+        finally:
+            heartbeat.cancel()
+
+    async def _process(self, job: Dict[str, Any]) -> None:
+        job_id = job["id"]
+        try:
+            result = await self.processor(job, lambda progress: self.store.set_progress(job_id, progress))
+        except ValueError as e:
+            logger.warning(f"{self.kind} job {job_id} rejected: {e}")
+            self.store.fail(job_id, str(e), error_status=400)
+        except CircuitOpenError as e:
+            logger.warning(f"{self.kind} job {job_id} failed while the upstream is unavailable: {e}")
+            self.store.fail(job_id, str(e), error_status=503)
+        except RuntimeError as e:
+            logger.error(f"{self.kind} job {job_id} failed: {e}")
+            self.store.fail(job_id, str(e), error_status=500)
+        except Exception as e:
+            logger.error(f"{self.kind} job {job_id} failed unexpectedly: {e}", exc_info=True)
+            self.store.fail(job_id, "Job processing failed. Please try again.", error_status=500)
+        else:
+            if self.store.complete(job_id, result):
+                logger.info(f"Completed {self.kind} job {job_id}")
+            else:
+                logger.warning(f"Discarded the result of {self.kind} job {job_id}; its lease was lost")
+
+    def _purge_if_due(self) -> None:
+        now = time.time()
+        if now - self._last_purge < PURGE_INTERVAL_SECONDS:
+            return
+        self._last_purge = now
+        purged = self.store.purge_finished(JOB_RETENTION_SECONDS)
+        if purged:
+            logger.info(f"Purged {len(purged)} finished {self.kind} jobs")
+
+    def _requeue_expired_if_due(self) -> None:
+        """Pick up jobs whose process stopped while running them (expired leases)."""
+        now = time.time()
+        if now - self._last_requeue < self.store.lease_seconds / 2:
+            return
+        self._last_requeue = now
+        requeued = self.store.requeue_interrupted(self.kind)
+        if requeued:
+            logger.info(f"Requeued {requeued} {self.kind} jobs with expired leases")
+
+# ==================== TRANSCRIPTION JOBS ====================
+
+TRANSCRIPTION_JOB = "transcription"
+
+def stage_job_file(source_path: str, job_id: str, suffix: str) -> str:
+    """Move a spooled upload into job storage so it outlives the request."""
+    Path(JOB_STORAGE_DIR).mkdir(parents=True, exist_ok=True)
+    destination = os.path.join(JOB_STORAGE_DIR, f"{job_id}{suffix}")
+    shutil.move(source_path, destination)
+    return destination
+
+def _discard_job_file(path: str) -> None:
+    try:
+        Path(path).unlink(missing_ok=True)
+    except OSError as e:
+        logger.warning(f"Failed to remove job file {path}: {e}")
+
+async def process_transcription_job(
+    job: Dict[str, Any],
+    report_progress: Callable[[float], None]
+) -> Dict[str, Any]:
+    """Transcribe a queued upload and return a TranscriptionResponse payload."""
+    payload = job["payload"]
+    audio_path = payload["file_path"]
+    start_time = time.time()
+    try:
+        duration = await asyncio.to_thread(admit_audio, audio_path)
+        transcription, cached = await transcribe_audio_cached(
+            audio_file_path=audio_path,
+            language=payload.get("language"),
+            prompt=payload.get("context_prompt"),
+            content_sha256=payload.get("sha256"),
+            progress_callback=lambda done, total: report_progress(done / total),
+            duration_seconds=duration,
+        )
+    except Exception:
+        _discard_job_file(audio_path)
+        raise
+
+    _discard_job_file(audio_path)
+    return TranscriptionResponse(
+        transcription=transcription or NO_SPEECH_MESSAGE,
+        speech_detected=bool(transcription),
+        language_detected=payload.get("language"),
+        confidence_score=None,
+        duration_seconds=duration,
+        estimated_cost_usd=cost_for_duration(duration) if duration is not None else None,
+        cached=cached,
+        processing_time_ms=(time.time() - start_time) * 1000,
+    ).model_dump(mode="json")
+
+# ==================== WARM-UP JOBS ====================
+
+WARMUP_JOB = "warmup"
+
+async def process_warmup_job(
+    job: Dict[str, Any],
+    report_progress: Callable[[float], None]
+) -> Dict[str, Any]:
+    """Wait for the off-peak window, then warm the caches for a queued manifest."""
+    payload = job["payload"]
+    items, options = parse_manifest(payload["manifest"], payload.get("base_dir"))
+    deadline = None
+    if payload.get("window"):
+        start, end = off_peak_window(payload["window"], datetime.now())
+        wait = (start - datetime.now()).total_seconds()
+        if wait > 0:
+            logger.info(f"Warm-up job {job['id']} waiting for the off-peak window at {start:%H:%M}")
+            await asyncio.sleep(wait)
+        deadline = end.timestamp()
+
+    return await run_warmup(
+        items,
+        options,
+        budget_usd=payload["budget_usd"],
+        deadline=deadline,
+        progress_callback=lambda done, total: report_progress(done / total),
+    )
+
+_job_store: Optional[JobStore] = None
+_job_store_lock = threading.Lock()
+
+def get_job_store() -> JobStore:
+    """Return the process-wide job store, opening it on first use."""
+    global _job_store
+    if _job_store is None:
+        with _job_store_lock:
+            if _job_store is None:
+                _job_store = JobStore(JOB_DB)
+    return _job_store
+
+def close_job_store() -> None:
+    """Close the job store; it is reopened if a queue is used again."""
+    global _job_store
+    with _job_store_lock:
+        store, _job_store = _job_store, None
+    if store is not None:
+        store.close()
+
+# Process-wide job store shared by every queue. Opened by the app lifespan (or on
+# first use), so importing this module never creates or locks the database.
+job_store = LazyClient(get_job_store)
+
+# Process-wide job queues, started and stopped by the app lifespan
+transcription_jobs = JobWorkerPool(
+    store=job_store,
+    kind=TRANSCRIPTION_JOB,
+    processor=process_transcription_job,
+)
+
+# One warm-up at a time; each run already bounds its own concurrency and spend
+warmup_jobs = JobWorkerPool(
+    store=job_store,
+    kind=WARMUP_JOB,
+    processor=process_warmup_job,
+    concurrency=1,
+)
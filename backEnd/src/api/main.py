@@ -5,6 +5,7 @@ This is the main server application that provides AI-powered study assistance
 through RESTful APIs. Designed for high school students with learning difficulties.
 """
 
+import asyncio
 import logging
 import time
 from contextlib import asynccontextmanager
@@ -12,6 +13,7 @@ from fastapi import FastAPI, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.responses import JSONResponse
+from starlette.routing import Match
 import uvicorn
 # Add this at the top of your main.py file
 from dotenv import load_dotenv
@@ -20,6 +22,12 @@ import os
 # Load environment variables FIRST
 load_dotenv()
 
+# Imported after load_dotenv so pool settings from .env are honored
+from src.ai.metrics import http_request_duration, http_requests_in_flight, monitor_event_loop_lag  # noqa: E402
+from src.ai.openai_client import init_clients, close_clients  # noqa: E402
+from src.ai.quiz_generator import init_question_bank, close_question_bank  # noqa: E402
+from src.ai.transcriber import init_transcription_cache, close_transcription_cache  # noqa: E402
+
 # Debug print to verify it's loaded
 print(f"API Key loaded: {'Yes' if os.getenv('OPENAI_API_KEY') else 'No'}")
 api_key = os.getenv('OPENAI_API_KEY')
@@ -33,15 +41,45 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Background job pools, in start order; the other routes still serve if they fail to load
+try:
+    from src.api.jobs import close_job_store, get_job_store, transcription_jobs, warmup_jobs
+    job_pools = [transcription_jobs, warmup_jobs]
+except ImportError as e:
+    logger.error(f"Failed to load background job pools: {e}")
+    job_pools = []
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan management."""
     # Startup tasks
     logger.info("🚀 StudyBuddy AI starting up...")
     logger.info("")
+    # Create pooled OpenAI clients once so requests reuse warm connections
+    init_clients()
+    # Open the question bank and the transcription disk cache here rather than at
+    # import so scripts and tests never lock them
+    init_question_bank()
+    init_transcription_cache()
+    # Drain queued transcription jobs (including any interrupted by the last shutdown)
+    # and resume queued cache warm-ups, each of which waits for its off-peak window
+    if job_pools:
+        get_job_store()
+    for pool in job_pools:
+        await pool.start()
+    # Sample how long request handling blocks the event loop (served by /metrics)
+    lag_monitor = asyncio.create_task(monitor_event_loop_lag())
     yield
     # Shutdown tasks
     logger.info("📴 StudyBuddy AI shutting down...")
+    lag_monitor.cancel()
+    for pool in reversed(job_pools):
+        await pool.stop()
+    if job_pools:
+        close_job_store()
+    close_transcription_cache()
+    close_question_bank()
+    await close_clients()
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -89,13 +127,34 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+def route_template(request: Request) -> str:
+    """Path template of the route serving a request, keeping metric labels low-cardinality."""
+    partial = None
+    for route in request.app.router.routes:
+        match, _ = route.matches(request.scope)
+        if match == Match.FULL:
+            return route.path
+        if match == Match.PARTIAL and partial is None:
+            partial = route.path  # Path matched but the method did not (405)
+    return partial or "unmatched"
+
 # Request timing middleware
 @app.middleware("http")
 async def add_process_time_header(request: Request, call_next):
-    """Add response time header for monitoring."""
-    start_time = time.time()
-    response = await call_next(request)
-    process_time = time.time() - start_time
+    """Add response time header and record per-route latency and in-flight metrics."""
+    route = route_template(request)
+    in_flight = http_requests_in_flight.labels(request.method, route)
+    in_flight.inc()
+    start_time = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+    finally:
+        # Streaming responses are timed until their headers are sent
+        process_time = time.perf_counter() - start_time
+        in_flight.dec()
+        http_request_duration.labels(request.method, route, status_code).observe(process_time)
     response.headers["X-Process-Time"] = str(process_time)
     return response
 
@@ -147,6 +206,13 @@ try:
 except ImportError as e:
     logger.error(f"Failed to load health routes: {e}")
 
+try:
+    from src.api.routes.metrics import router as metrics_router
+    app.include_router(metrics_router)
+    logger.info("Metrics routes loaded")
+except ImportError as e:
+    logger.error(f"Failed to load metrics routes: {e}")
+
 try:
     from src.api.routes.transcription import router as transcription_router
     app.include_router(transcription_router)
@@ -154,6 +220,20 @@ try:
 except ImportError as e:
     logger.error(f"Failed to load transcription routes: {e}")
 
+try:
+    from src.api.routes.pipeline import router as pipeline_router
+    app.include_router(pipeline_router)
+    logger.info("Study pipeline routes loaded")
+except ImportError as e:
+    logger.error(f"Failed to load study pipeline routes: {e}")
+
+try:
+    from src.api.routes.admin import router as admin_router
+    app.include_router(admin_router)
+    logger.info("Admin routes loaded")
+except ImportError as e:
+    logger.error(f"Failed to load admin routes: {e}")
+
 # ========================================
 # BASIC ENDPOINTS
 # ========================================
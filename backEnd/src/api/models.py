@@ -29,6 +29,13 @@ class QuestionType(str, Enum):
     short_answer = "short_answer"
     true_false = "true_false"
 
+class JobStatus(str, Enum):
+    """Lifecycle states of a background job."""
+    queued = "queued"
+    running = "running"
+    completed = "completed"
+    failed = "failed"
+
 # Request Models
 class SummarizeRequest(BaseModel):
     """Request model for text summarization endpoint."""
@@ -61,6 +68,93 @@ class SummarizeRequest(BaseModel):
             raise ValueError('Text cannot be empty or only whitespace')
         return v.strip()
 
+class LongSummarizeRequest(BaseModel):
+    """Request model for long-document (map-reduce) summarization."""
+    
+    text: str = Field(
+        ...,
+        min_length=10,
+        max_length=500000,
+        description="The long educational content to summarize (transcripts, chapters)",
+        examples=["Lecture 4: Cellular respiration. Today we will cover glycolysis..."]
+    )
+    
+    learning_style: LearningStyle = Field(
+        default=LearningStyle.reading,
+        description="How to adapt the summary for the student's learning preference"
+    )
+    
+    max_tokens: int = Field(
+        default=500,
+        ge=50,
+        le=1000,
+        description="Maximum length of the final summary in tokens"
+    )
+    
+    max_concurrency: int = Field(
+        default=8,
+        ge=1,
+        le=32,
+        description="Maximum number of chunks summarized at the same time"
+    )
+    
+    @field_validator('text')
+    @classmethod
+    def text_must_not_be_empty(cls, v):
+        """Ensure text content is meaningful."""
+        if not v.strip():
+            raise ValueError('Text cannot be empty or only whitespace')
+        return v.strip()
+
+class MultiStyleSummarizeRequest(BaseModel):
+    """Request model for generating several learning-style summaries of one text."""
+    
+    text: str = Field(
+        ...,
+        min_length=10,
+        max_length=10000,
+        description="The educational content to summarize",
+        examples=["Photosynthesis is the process by which green plants use sunlight..."]
+    )
+    
+    learning_styles: List[LearningStyle] = Field(
+        default=list(LearningStyle),
+        min_length=1,
+        description="Learning styles to generate (all four by default)"
+    )
+    
+    max_tokens: int = Field(
+        default=300,
+        ge=50,
+        le=1000,
+        description="Maximum length of each summary in tokens"
+    )
+    
+    @field_validator('text')
+    @classmethod
+    def text_must_not_be_empty(cls, v):
+        """Ensure text content is meaningful."""
+        if not v.strip():
+            raise ValueError('Text cannot be empty or only whitespace')
+        return v.strip()
+
+class BatchSummarizeRequest(BaseModel):
+    """Request model for summarizing many texts in one call."""
+    
+    items: List[SummarizeRequest] = Field(
+        ...,
+        min_length=1,
+        max_length=50,
+        description="Texts to summarize, each with its own learning style and length"
+    )
+    
+    max_concurrency: int = Field(
+        default=8,
+        ge=1,
+        le=32,
+        description="Maximum number of summaries generated at the same time"
+    )
+
 class QuizGenerationRequest(BaseModel):
     """Request model for quiz generation endpoint."""
     
@@ -91,7 +185,49 @@ class QuizGenerationRequest(BaseModel):
     
     question_types: List[QuestionType] = Field(
         default=[QuestionType.multiple_choice],
-        description="Types of questions to include in the quiz"
+        min_length=1,
+        description="Types of questions to include in the quiz, mixed evenly in one call"
+    )
+
+class LongQuizRequest(BaseModel):
+    """Request model for long-content (section-parallel) quiz generation."""
+    
+    text: str = Field(
+        ...,
+        min_length=50,
+        max_length=500000,
+        description="The long educational content to quiz on (chapters, transcripts)",
+        examples=["Chapter 7: Cellular respiration. Cells release energy from glucose..."]
+    )
+    
+    num_questions: int = Field(
+        default=20,
+        ge=1,
+        le=50,
+        description="Number of quiz questions in the exam"
+    )
+    
+    difficulty: DifficultyLevel = Field(
+        default=DifficultyLevel.high_school,
+        description="Academic level for question complexity"
+    )
+    
+    learning_style: LearningStyle = Field(
+        default=LearningStyle.reading,
+        description="How to format questions for the student's learning style"
+    )
+    
+    question_types: List[QuestionType] = Field(
+        default=[QuestionType.multiple_choice],
+        min_length=1,
+        description="Types of questions to include, mixed evenly within every section"
+    )
+    
+    max_concurrency: int = Field(
+        default=8,
+        ge=1,
+        le=32,
+        description="Maximum number of sections quizzed at the same time"
     )
 
 class TranscriptionRequest(BaseModel):
@@ -112,6 +248,30 @@ class TranscriptionRequest(BaseModel):
         examples=["This is a biology lecture about cellular respiration"]
     )
 
+class WarmupRequest(BaseModel):
+    """Request model for queuing a cache warm-up of known course material."""
+    
+    manifest: Dict[str, Any] = Field(
+        ...,
+        description="Warm-up manifest: items (text, or path/audio under WARMUP_CONTENT_DIR) "
+                    "and optional learning_styles, difficulties, quiz_learning_styles, question_types",
+        examples=[{"items": [{"name": "Week 3 reading", "text": "Photosynthesis is..."}]}]
+    )
+    
+    budget_usd: float = Field(
+        default=5.0,
+        gt=0,
+        le=1000,
+        description="Spend ceiling for the run in USD (conservative upfront estimates)"
+    )
+    
+    window: Optional[str] = Field(
+        default=None,
+        description="Daily off-peak window in server local time; the run waits for it to open "
+                    "and starts no new work after it closes",
+        examples=["01:00-05:00"]
+    )
+
 # Response Models
 class SummarizeResponse(BaseModel):
     """Response model for text summarization."""
@@ -140,6 +300,161 @@ class SummarizeResponse(BaseModel):
         ...,
         description="Time taken to generate summary in milliseconds"
     )
+    
+    cached: bool = Field(
+        default=False,
+        description="Whether the summary was served from the summary cache"
+    )
+
+class SummarizeStreamResult(SummarizeResponse):
+    """Final "done" event payload of the streaming summarization endpoint."""
+    
+    time_to_first_token_ms: float = Field(
+        ...,
+        description="Time until the first piece of the summary was available in milliseconds"
+    )
+
+class LongSummarizeResponse(SummarizeResponse):
+    """Response model for long-document summarization."""
+    
+    chunk_count: int = Field(
+        ...,
+        description="Number of chunks the document was split into"
+    )
+    
+    reduce_levels: int = Field(
+        ...,
+        description="Number of hierarchical reduce passes that were needed"
+    )
+    
+    api_calls: int = Field(
+        ...,
+        description="Total number of AI calls used to build the summary"
+    )
+
+class MultiStyleSummarizeResponse(BaseModel):
+    """Response model for multi-style summarization."""
+    
+    summaries: Dict[LearningStyle, str] = Field(
+        ...,
+        description="One summary per requested learning style"
+    )
+    
+    cached_styles: List[LearningStyle] = Field(
+        default_factory=list,
+        description="Styles served from the summary cache"
+    )
+    
+    original_length: int = Field(
+        ...,
+        description="Character count of original text"
+    )
+    
+    api_calls: int = Field(
+        ...,
+        description="Number of AI calls made for this request"
+    )
+    
+    processing_time_ms: float = Field(
+        ...,
+        description="Time taken to produce every summary"
+    )
+
+class BatchSummaryItem(BaseModel):
+    """Outcome of one item in a batch summarization."""
+    
+    index: int = Field(
+        ...,
+        description="Position of the item in the request"
+    )
+    
+    success: bool = Field(
+        ...,
+        description="Whether a summary was produced"
+    )
+    
+    summary: Optional[str] = Field(
+        default=None,
+        description="The personalized summary when successful"
+    )
+    
+    error: Optional[str] = Field(
+        default=None,
+        description="Why this item failed"
+    )
+    
+    learning_style_used: LearningStyle = Field(
+        ...,
+        description="Learning style adaptation applied"
+    )
+    
+    original_length: int = Field(
+        ...,
+        description="Character count of original text"
+    )
+    
+    summary_length: int = Field(
+        default=0,
+        description="Character count of generated summary"
+    )
+    
+    cached: bool = Field(
+        default=False,
+        description="Whether the summary was served from the summary cache"
+    )
+    
+    deduplicated: bool = Field(
+        default=False,
+        description="Whether this item repeated an earlier item and reused its result"
+    )
+    
+    processing_time_ms: float = Field(
+        ...,
+        description="Time taken to produce this item"
+    )
+
+class BatchSummarizeResponse(BaseModel):
+    """Response model for batch summarization."""
+    
+    results: List[BatchSummaryItem] = Field(
+        ...,
+        description="Per-item outcomes in request order"
+    )
+    
+    total_items: int = Field(
+        ...,
+        description="Number of items in the request"
+    )
+    
+    unique_items: int = Field(
+        ...,
+        description="Number of distinct items after deduplication"
+    )
+    
+    succeeded: int = Field(
+        ...,
+        description="Number of items with a summary"
+    )
+    
+    failed: int = Field(
+        ...,
+        description="Number of items that failed"
+    )
+    
+    api_calls: int = Field(
+        ...,
+        description="Number of AI calls made for the batch"
+    )
+    
+    cache_hits: int = Field(
+        ...,
+        description="Number of distinct items served from the summary cache"
+    )
+    
+    processing_time_ms: float = Field(
+        ...,
+        description="Wall-clock time for the whole batch"
+    )
 
 class QuizQuestion(BaseModel):
     """Individual quiz question model."""
@@ -150,15 +465,14 @@ class QuizQuestion(BaseModel):
     )
     
     options: List[str] = Field(
-        ...,
-        min_length=2,
+        default_factory=list,
         max_length=4,
-        description="Answer choices for the question"
+        description="Answer choices: four for multiple choice, True/False, none for short answer"
     )
     
     correct_answer: str = Field(
         ...,
-        description="The correct answer (A, B, C, or D for multiple choice)"
+        description="The correct answer: A-D for multiple choice, True or False, or a brief model answer"
     )
     
     explanation: str = Field(
@@ -208,6 +522,85 @@ class QuizGenerationResponse(BaseModel):
         ...,
         description="Time taken to generate quiz"
     )
+    
+    from_bank: int = Field(
+        default=0,
+        description="Questions served from the question bank instead of generated"
+    )
+
+class LongQuizResponse(QuizGenerationResponse):
+    """Response model for long-content quiz generation."""
+    
+    section_count: int = Field(
+        ...,
+        description="Number of sections the content was split into"
+    )
+    
+    duplicates_removed: int = Field(
+        ...,
+        description="Near-duplicate questions removed across sections"
+    )
+
+class QuizStreamResult(BaseModel):
+    """Final "done" event payload of the streaming quiz endpoint."""
+    
+    total_questions: int = Field(
+        ...,
+        description="Number of questions that were streamed"
+    )
+    
+    difficulty_used: DifficultyLevel = Field(
+        ...,
+        description="Difficulty level applied to questions"
+    )
+    
+    learning_style_used: LearningStyle = Field(
+        ...,
+        description="Learning style adaptation applied"
+    )
+    
+    estimated_completion_time_minutes: int = Field(
+        ...,
+        description="Estimated time to complete quiz"
+    )
+    
+    time_to_first_question_ms: float = Field(
+        ...,
+        description="Time until the first question was sent in milliseconds"
+    )
+    
+    processing_time_ms: float = Field(
+        ...,
+        description="Time taken to generate the whole quiz"
+    )
+    
+    from_bank: int = Field(
+        default=0,
+        description="Questions served from the question bank instead of generated"
+    )
+
+class PipelineResult(BaseModel):
+    """Final "done" event payload of the study pipeline endpoint."""
+    
+    stages_completed: List[str] = Field(
+        ...,
+        description="Stages that produced a result (transcript, summary, quiz)"
+    )
+    
+    stages_failed: List[str] = Field(
+        default_factory=list,
+        description="Stages that sent an error event instead of a result"
+    )
+    
+    transcript_length: int = Field(
+        ...,
+        description="Length of the transcript in characters"
+    )
+    
+    processing_time_ms: float = Field(
+        ...,
+        description="Time from upload to the last stage finishing"
+    )
 
 class TranscriptionResponse(BaseModel):
     """Response model for audio transcription."""
@@ -217,6 +610,11 @@ class TranscriptionResponse(BaseModel):
         description="The transcribed text from audio"
     )
     
+    speech_detected: bool = Field(
+        default=True,
+        description="False when the recording contained no speech (transcription is then a notice)"
+    )
+    
     language_detected: Optional[str] = Field(
         default=None,
         description="Detected language code if not specified"
@@ -234,11 +632,126 @@ class TranscriptionResponse(BaseModel):
         description="Audio duration in seconds"
     )
     
+    estimated_cost_usd: Optional[float] = Field(
+        default=None,
+        description="Estimated Whisper cost for this recording in USD"
+    )
+    
+    cached: bool = Field(
+        default=False,
+        description="Whether the transcription was served from the transcription cache"
+    )
+    
     processing_time_ms: float = Field(
         ...,
         description="Time taken to transcribe audio"
     )
 
+class TranscriptionJobResponse(BaseModel):
+    """Status of a background transcription job."""
+    
+    job_id: str = Field(
+        ...,
+        description="Identifier used to poll the job"
+    )
+    
+    status: JobStatus = Field(
+        ...,
+        description="Current job state"
+    )
+    
+    progress: float = Field(
+        default=0.0,
+        ge=0.0,
+        le=1.0,
+        description="Fraction of the recording transcribed so far"
+    )
+    
+    filename: Optional[str] = Field(
+        default=None,
+        description="Name of the uploaded audio file"
+    )
+    
+    created_at: float = Field(
+        ...,
+        description="Submission time (Unix seconds)"
+    )
+    
+    started_at: Optional[float] = Field(
+        default=None,
+        description="Time a worker picked the job up (Unix seconds)"
+    )
+    
+    finished_at: Optional[float] = Field(
+        default=None,
+        description="Completion or failure time (Unix seconds)"
+    )
+    
+    error: Optional[str] = Field(
+        default=None,
+        description="Failure reason when status is failed"
+    )
+    
+    status_url: str = Field(
+        ...,
+        description="URL to poll for job status"
+    )
+    
+    result_url: str = Field(
+        ...,
+        description="URL of the transcription result once the job completes"
+    )
+
+class WarmupJobResponse(BaseModel):
+    """Status and report of a cache warm-up job."""
+    
+    job_id: str = Field(
+        ...,
+        description="Identifier used to poll the job"
+    )
+    
+    status: JobStatus = Field(
+        ...,
+        description="Current job state"
+    )
+    
+    progress: float = Field(
+        default=0.0,
+        ge=0.0,
+        le=1.0,
+        description="Fraction of the manifest items warmed so far"
+    )
+    
+    created_at: float = Field(
+        ...,
+        description="Submission time (Unix seconds)"
+    )
+    
+    started_at: Optional[float] = Field(
+        default=None,
+        description="Time a worker picked the job up (Unix seconds)"
+    )
+    
+    finished_at: Optional[float] = Field(
+        default=None,
+        description="Completion or failure time (Unix seconds)"
+    )
+    
+    error: Optional[str] = Field(
+        default=None,
+        description="Failure reason when status is failed"
+    )
+    
+    report: Optional[Dict[str, Any]] = Field(
+        default=None,
+        description="Warmed, cached, skipped and failed counts, estimated spend and per-item details"
+    )
+    
+    status_url: str = Field(
+        ...,
+        description="URL to poll for job status"
+    )
+
 # Error Models
 class ErrorResponse(BaseModel):
     """Standard error response model."""
@@ -321,4 +834,4 @@ class ProgressResponse(BaseModel):
     recommendations: List[str] = Field(
         ...,
         description="Personalized study recommendations"
-    )
\ No newline at end of file
+    )
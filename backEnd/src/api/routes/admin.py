@@ -0,0 +1,111 @@
+"""
+Admin API routes for StudyBuddy AI
+
+Operator-only endpoints. Cache warm-up queues the pre-generation of summaries
+and quizzes for known course material (see src.ai.warmup) as a background
+job that runs in the next off-peak window.
+
+Every endpoint requires the X-Admin-Token header to match ADMIN_API_TOKEN;
+when that variable is unset the admin endpoints are disabled.
+"""
+
+import hmac
+import logging
+import os
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from src.api.models import WarmupJobResponse, WarmupRequest, ErrorResponse
+from src.api.jobs import WARMUP_JOB, warmup_jobs
+from src.ai.warmup import WARMUP_CONTENT_DIR, off_peak_window, parse_manifest
+
+logger = logging.getLogger(__name__)
+
+def require_admin(x_admin_token: Optional[str] = Header(default=None)) -> None:
+    """Reject requests without the configured admin token."""
+    expected = os.getenv("ADMIN_API_TOKEN")
+    if not expected:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin endpoints are disabled (ADMIN_API_TOKEN is not set)"
+        )
+    if not x_admin_token or not hmac.compare_digest(x_admin_token, expected):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or missing X-Admin-Token header"
+        )
+
+router = APIRouter(prefix="/api/admin", tags=["Admin"], dependencies=[Depends(require_admin)])
+
+def _warmup_response(job: dict) -> WarmupJobResponse:
+    """Build the public status view of a stored warm-up job."""
+    return WarmupJobResponse(
+        job_id=job["id"],
+        status=job["status"],
+        progress=job["progress"],
+        created_at=job["created_at"],
+        started_at=job["started_at"],
+        finished_at=job["finished_at"],
+        error=job["error"],
+        report=job["result"],
+        status_url=f"/api/admin/warmup/{job['id']}"
+    )
+
+@router.post(
+    "/warmup",
+    response_model=WarmupJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Queue a cache warm-up",
+    description="""
+    Pre-generate summaries in every requested learning style and quiz questions at
+    every requested difficulty for a manifest of course material, so the requests
+    students make before class are served from the caches.
+
+    Text can be inline; "path" (text file) and "audio" (recording) entries are
+    resolved under WARMUP_CONTENT_DIR and are refused when it is not configured.
+    The run waits for the off-peak window, stops starting work when it closes,
+    and skips work that would exceed the budget.
+    """,
+    responses={
+        400: {"model": ErrorResponse, "description": "Invalid manifest or window"},
+        401: {"model": ErrorResponse, "description": "Invalid admin token"},
+        403: {"model": ErrorResponse, "description": "Admin endpoints disabled"}
+    }
+)
+async def submit_warmup(request: WarmupRequest):
+    """Validate a warm-up manifest and queue it as a background job."""
+    try:
+        items, _ = parse_manifest(request.manifest, WARMUP_CONTENT_DIR)
+        if request.window:
+            off_peak_window(request.window, datetime.now())
+    except ValueError as e:
+        logger.warning(f"Warm-up validation error: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    job = warmup_jobs.submit({
+        "manifest": request.manifest,
+        "base_dir": WARMUP_CONTENT_DIR,
+        "budget_usd": request.budget_usd,
+        "window": request.window,
+    })
+    logger.info(f"Queued warm-up job {job['id']} for {len(items)} items, budget ${request.budget_usd:.2f}")
+    return _warmup_response(job)
+
+@router.get(
+    "/warmup/{job_id}",
+    response_model=WarmupJobResponse,
+    summary="Get cache warm-up status",
+    responses={404: {"model": ErrorResponse, "description": "Unknown job"}}
+)
+async def get_warmup(job_id: str):
+    """Return the status, progress and (once finished) report of a warm-up job."""
+    job = warmup_jobs.store.get(job_id)
+    if job is None or job["kind"] != WARMUP_JOB:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Warm-up job not found: {job_id}"
+        )
+    return _warmup_response(job)
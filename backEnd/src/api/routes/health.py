@@ -7,7 +7,14 @@ for debugging and operational monitoring.
 
 import time
 from fastapi import APIRouter
-from src.api.models import ErrorResponse
+from src.ai.circuit_breaker import AUDIO_TRANSCRIPTIONS, CHAT_COMPLETIONS, breaker_stats
+from src.ai.metrics import http_request_duration, uptime_seconds
+from src.ai import quiz_generator
+from src.ai.quiz_generator import quiz_flights, quiz_hedger
+from src.ai.rate_limiter import limiter_stats
+from src.ai.summarizer import summary_cache, summary_flights, summary_hedger
+from src.ai.transcriber import transcription_cache
+from src.api.jobs import TRANSCRIPTION_JOB, WARMUP_JOB, transcription_jobs, warmup_jobs
 
 router = APIRouter(tags=["Health"])
 
@@ -46,7 +53,7 @@ async def detailed_health_check():
     - Database connectivity
     - OpenAI API status
     - Memory usage
-    - Response time metrics
+    - Response time metrics (full histograms are served by /metrics)
     """
     
     # TODO: Add actual health checks for production
@@ -55,23 +62,61 @@ async def detailed_health_check():
     # - Verify file system access
     # - Monitor memory/CPU usage
     
+    # Open circuits mean the upstream is failing; requests for it are answered with 503s
+    breakers = breaker_stats()
+    availability = {
+        operation: "available" if stats["state"] == "closed" else "degraded"
+        for operation, stats in breakers.items()
+    }
+    degraded = "degraded" in availability.values()
+    total_requests, total_seconds = http_request_duration.totals()
+    question_bank = quiz_generator.question_bank
+    
     return {
-        "status": "healthy",
+        "status": "degraded" if degraded else "healthy",
         "timestamp": time.time(),
         "service": "StudyBuddy AI",
         "version": "1.0.0",
         "features": {
-            "summarization": "available",
-            "quiz_generation": "available",
-            "transcription": "available"
+            "summarization": availability[CHAT_COMPLETIONS],
+            "quiz_generation": availability[CHAT_COMPLETIONS],
+            "transcription": availability[AUDIO_TRANSCRIPTIONS]
         },
         "dependencies": {
-            "openai_api": "unknown",  # TODO: Actual connectivity test
+            "openai_api": "degraded" if degraded else "available",
             "database": "unknown"     # TODO: Actual connection test
         },
+        "circuit_breakers": breakers,
+        "caches": {
+            "summary": summary_cache.stats(),
+            "transcription": transcription_cache.stats()
+        },
+        "question_bank": question_bank.stats() if question_bank is not None else {"enabled": False},
+        "rate_limits": limiter_stats(),
+        "coalescing": {
+            "summary": summary_flights.stats(),
+            "quiz": quiz_flights.stats()
+        },
+        "hedging": {
+            "summary": summary_hedger.stats(),
+            "quiz": quiz_hedger.stats()
+        },
+        "job_queues": {
+            "transcription": {
+                "workers": transcription_jobs.concurrency,
+                "running": transcription_jobs.running,
+                "jobs": transcription_jobs.store.counts(TRANSCRIPTION_JOB)
+            },
+            "warmup": {
+                "workers": warmup_jobs.concurrency,
+                "running": warmup_jobs.running,
+                "jobs": warmup_jobs.store.counts(WARMUP_JOB)
+            }
+        },
         "metrics": {
-            "uptime_seconds": time.time(),  # TODO: Actual uptime tracking
-            "total_requests": "unknown",    # TODO: Request counter
-            "average_response_time": "unknown"  # TODO: Performance metrics
+            "uptime_seconds": round(uptime_seconds(), 3),
+            "total_requests": int(total_requests),
+            "average_response_time_ms": round(total_seconds / total_requests * 1000, 3) if total_requests else None,
+            "prometheus": "/metrics"
         }
-    }
\ No newline at end of file
+    }
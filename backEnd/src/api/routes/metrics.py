@@ -0,0 +1,116 @@
+"""
+Prometheus metrics endpoint.
+
+Serves the request, upstream and usage metrics recorded by src.ai.metrics,
+plus the cache, question-bank, rate-limiter, circuit-breaker, hedging, coalescing and job
+queue counters, which are read from their owners at scrape time.
+"""
+
+from typing import Iterable, List
+from fastapi import APIRouter
+from fastapi.responses import Response
+from src.ai.circuit_breaker import CLOSED, HALF_OPEN, OPEN, breaker_stats
+from src.ai.metrics import CONTENT_TYPE, NAMESPACE, CollectedFamily, registry
+from src.ai import quiz_generator
+from src.ai.quiz_generator import quiz_flights, quiz_hedger
+from src.ai.rate_limiter import limiter_stats
+from src.ai.summarizer import summary_cache, summary_flights, summary_hedger
+from src.ai.transcriber import transcription_cache
+from src.api import jobs
+from src.api.jobs import TRANSCRIPTION_JOB, WARMUP_JOB, transcription_jobs, warmup_jobs
+
+router = APIRouter(tags=["Health"])
+
+def _family(name: str, kind: str, documentation: str, samples) -> CollectedFamily:
+    return f"{NAMESPACE}_{name}", kind, documentation, samples
+
+def collect_component_stats() -> Iterable[CollectedFamily]:
+    """Report the stats kept by caches, limiters, breakers and job queues."""
+    families: List[CollectedFamily] = []
+
+    caches = {"summary": summary_cache.stats(), "transcription": transcription_cache.stats()}
+    families += [
+        _family("cache_hits_total", "counter", "Cache lookups answered from the cache",
+                [({"cache": name}, stats["hits"]) for name, stats in caches.items()]),
+        _family("cache_misses_total", "counter", "Cache lookups that fell through to the upstream",
+                [({"cache": name}, stats["misses"]) for name, stats in caches.items()]),
+        _family("cache_hit_ratio", "gauge", "Share of cache lookups that were hits since startup",
+                [({"cache": name}, stats["hit_ratio"]) for name, stats in caches.items()]),
+    ]
+
+    question_bank = quiz_generator.question_bank
+    bank = question_bank.stats() if question_bank is not None else {
+        "questions": 0, "full_hits": 0, "partial_hits": 0, "misses": 0, "questions_served": 0
+    }
+    families += [
+        _family("question_bank_questions", "gauge", "Quiz questions stored in the question bank",
+                [({}, bank["questions"])]),
+        _family("question_bank_lookups_total", "counter", "Quiz requests looked up in the question bank",
+                [({"outcome": outcome}, bank[key]) for outcome, key in
+                 (("full_hit", "full_hits"), ("partial_hit", "partial_hits"), ("miss", "misses"))]),
+        _family("question_bank_questions_served_total", "counter", "Quiz questions served from the question bank",
+                [({}, bank["questions_served"])]),
+    ]
+
+    limiters = limiter_stats()
+    families += [
+        _family(f"rate_limiter_{counter}_total", "counter", f"Rate limiter {counter} counter",
+                [({"model": model}, stats[counter]) for model, stats in limiters.items()])
+        for counter in ("requests", "queued", "throttled", "retries")
+    ]
+    families += [
+        _family("rate_limiter_in_flight", "gauge", "Upstream calls holding a concurrency slot",
+                [({"model": model}, stats["in_flight"]) for model, stats in limiters.items()]),
+        _family("rate_limiter_waiting", "gauge", "Calls queued for a concurrency slot",
+                [({"model": model}, stats["waiting_for_slot"]) for model, stats in limiters.items()]),
+    ]
+
+    breakers = breaker_stats()
+    families += [
+        _family("circuit_state", "gauge", "1 for the current state of each circuit breaker",
+                [({"operation": operation, "state": state}, int(stats["state"] == state))
+                 for operation, stats in breakers.items() for state in (CLOSED, OPEN, HALF_OPEN)]),
+        _family("circuit_opened_total", "counter", "Times the circuit opened",
+                [({"operation": operation}, stats["opened"]) for operation, stats in breakers.items()]),
+        _family("circuit_rejected_total", "counter", "Calls rejected while the circuit was open",
+                [({"operation": operation}, stats["rejected"]) for operation, stats in breakers.items()]),
+    ]
+
+    hedgers = {"summary": summary_hedger.stats(), "quiz": quiz_hedger.stats()}
+    families += [
+        _family(f"hedge_{counter}_total", "counter", f"Hedged request {counter.replace('_', ' ')} counter",
+                [({"operation": name}, stats[counter]) for name, stats in hedgers.items()])
+        for counter in ("calls", "hedged", "hedge_wins", "budget_exhausted")
+    ]
+
+    flights = {"summary": summary_flights.stats(), "quiz": quiz_flights.stats()}
+    families += [
+        _family("coalescing_calls_total", "counter", "Upstream calls made by request coalescing",
+                [({"operation": name}, stats["calls"]) for name, stats in flights.items()]),
+        _family("coalescing_shared_total", "counter", "Callers that shared another caller's upstream call",
+                [({"operation": name}, stats["coalesced"]) for name, stats in flights.items()]),
+    ]
+
+    # A scrape must not open the job store; before the lifespan opens it there are no jobs
+    if jobs._job_store is not None:
+        families.append(_family(
+            "transcription_jobs", "gauge", "Background transcription jobs by status",
+            [({"status": status}, count) for status, count in transcription_jobs.store.counts(TRANSCRIPTION_JOB).items()]
+        ))
+        families.append(_family(
+            "warmup_jobs", "gauge", "Cache warm-up jobs by status",
+            [({"status": status}, count) for status, count in warmup_jobs.store.counts(WARMUP_JOB).items()]
+        ))
+    return families
+
+registry.register_collector(collect_component_stats)
+
+@router.get(
+    "/metrics",
+    summary="Prometheus metrics",
+    description="Request, upstream, usage and cache metrics in the Prometheus text format.",
+    response_class=Response
+)
+async def metrics():
+    """Render every metric for a Prometheus scrape."""
+    return Response(content=registry.render(), media_type=CONTENT_TYPE)
@@ -0,0 +1,263 @@
+"""
+Study pipeline API routes for StudyBuddy AI
+
+One request takes a lecture recording all the way to study material:
+audio -> transcript -> personalized summary + practice quiz. The summary and
+quiz are generated concurrently from the transcript, and every stage is
+streamed back as a Server-Sent Event the moment it finishes, so the frontend
+no longer needs three sequential round trips.
+"""
+
+import asyncio
+import time
+import logging
+from typing import Optional, Tuple
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, status
+from pydantic import BaseModel
+from src.api.models import (
+    DifficultyLevel,
+    LearningStyle,
+    LongSummarizeResponse,
+    PipelineResult,
+    QuizGenerationResponse,
+    SummarizeResponse,
+    ErrorResponse,
+)
+from src.api.routes.quiz import to_quiz_question
+from src.api.routes.transcription import accept_audio_upload, transcribe_upload
+from src.api.errors import upstream_unavailable
+from src.api.streaming import format_sse, sse_response
+from src.api.uploads import SpooledUpload, upload_limit_route
+from src.ai.circuit_breaker import CircuitOpenError
+from src.ai.chunking import split_text
+from src.ai.long_summarizer import summarize_long_text_async
+from src.ai.quiz_generator import generate_quiz_async, MAX_INPUT_CHARS as QUIZ_MAX_INPUT_CHARS
+from src.ai.summarizer import summarize_text_cached, MAX_INPUT_CHARS as SUMMARY_MAX_INPUT_CHARS
+from src.ai.transcriber import LONG_AUDIO_MAX_FILE_SIZE
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api", tags=["Study Pipeline"], route_class=upload_limit_route(LONG_AUDIO_MAX_FILE_SIZE))
+
+# (stage name, result or None, error detail or None)
+StageOutcome = Tuple[str, Optional[BaseModel], Optional[str]]
+
+async def _summary_stage(transcript: str, learning_style: LearningStyle, max_tokens: int) -> StageOutcome:
+    """Summarize the transcript, switching to map-reduce when it is too long for one call."""
+    start_time = time.time()
+    try:
+        if len(transcript) <= SUMMARY_MAX_INPUT_CHARS:
+            summary, cached = await summarize_text_cached(
+                input_text=transcript,
+                learning_style=learning_style.value,
+                max_tokens=max_tokens
+            )
+            return "summary", SummarizeResponse(
+                summary=summary,
+                learning_style_used=learning_style,
+                original_length=len(transcript),
+                summary_length=len(summary),
+                processing_time_ms=(time.time() - start_time) * 1000,
+                cached=cached
+            ), None
+
+        result = await summarize_long_text_async(
+            input_text=transcript,
+            learning_style=learning_style.value,
+            max_tokens=max_tokens
+        )
+        return "summary", LongSummarizeResponse(
+            summary=result["summary"],
+            learning_style_used=learning_style,
+            original_length=len(transcript),
+            summary_length=len(result["summary"]),
+            processing_time_ms=(time.time() - start_time) * 1000,
+            cached=result["cached"],
+            chunk_count=result["chunk_count"],
+            reduce_levels=result["reduce_levels"],
+            api_calls=result["api_calls"]
+        ), None
+
+    except CircuitOpenError as e:
+        logger.warning(f"Pipeline summary unavailable: {e}")
+        return "summary", None, str(e)
+
+    except ValueError as e:
+        logger.warning(f"Pipeline summary rejected: {e}")
+        return "summary", None, str(e)
+
+    except Exception as e:
+        logger.error(f"Pipeline summary failed: {e}", exc_info=True)
+        return "summary", None, "Unable to generate summary. Please try again."
+
+async def _quiz_stage(
+    transcript: str,
+    num_questions: int,
+    difficulty: DifficultyLevel,
+    learning_style: LearningStyle
+) -> StageOutcome:
+    """Generate quiz questions from the transcript (its first quiz-sized section when long)."""
+    start_time = time.time()
+    try:
+        # Cut at a paragraph/sentence boundary rather than mid-word
+        quiz_text = transcript
+        if len(transcript) > QUIZ_MAX_INPUT_CHARS:
+            quiz_text = split_text(transcript, QUIZ_MAX_INPUT_CHARS)[0]
+
+        questions = await generate_quiz_async(
+            text=quiz_text,
+            num_questions=num_questions,
+            difficulty=difficulty.value,
+            learning_style=learning_style.value
+        )
+        quiz_questions = [to_quiz_question(q) for q in questions]
+        return "quiz", QuizGenerationResponse(
+            questions=quiz_questions,
+            total_questions=len(quiz_questions),
+            difficulty_used=difficulty,
+            learning_style_used=learning_style,
+            estimated_completion_time_minutes=int(num_questions * 1.5),
+            processing_time_ms=(time.time() - start_time) * 1000
+        ), None
+
+    except CircuitOpenError as e:
+        logger.warning(f"Pipeline quiz unavailable: {e}")
+        return "quiz", None, str(e)
+
+    except ValueError as e:
+        logger.warning(f"Pipeline quiz rejected: {e}")
+        return "quiz", None, str(e)
+
+    except Exception as e:
+        logger.error(f"Pipeline quiz failed: {e}", exc_info=True)
+        return "quiz", None, "Unable to generate quiz questions. Please try again."
+
+@router.post(
+    "/pipeline",
+    summary="Turn a recording into a summary and quiz",
+    description="""
+    Upload a lecture recording and receive its transcript, a personalized
+    summary and practice quiz questions in a single request, streamed as
+    Server-Sent Events (text/event-stream).
+
+    **Events (in completion order):**
+    - **transcript**: the same payload as /api/transcribe
+    - **summary**: the same payload as /api/summarize (or /api/summarize/long for long transcripts)
+    - **quiz**: the same payload as /api/quiz/generate
+    - **error**: `{"stage": ..., "detail": ...}` when the summary or quiz stage fails;
+      the other stage still completes. Recordings without speech get an error
+      for both stages instead of being summarized and quizzed
+    - **done**: completed and failed stages plus total processing time
+
+    The summary and quiz are generated concurrently once the transcript is ready.
+    Upload and transcription errors are returned as normal JSON errors with
+    status 400/413/500/503 before the stream starts.
+    """,
+    responses={
+        200: {"content": {"text/event-stream": {}}, "description": "Pipeline event stream"},
+        400: {"model": ErrorResponse, "description": "Invalid file or parameters"},
+        413: {"model": ErrorResponse, "description": "File too large"},
+        500: {"model": ErrorResponse, "description": "Transcription failed"},
+        503: {"model": ErrorResponse, "description": "AI service temporarily unavailable"},
+    }
+)
+async def run_study_pipeline(
+    file: UploadFile = File(...),
+    language: Optional[str] = Form(default=None),
+    context_prompt: Optional[str] = Form(default=None),
+    learning_style: LearningStyle = Form(default=LearningStyle.reading),
+    max_tokens: int = Form(default=300, ge=50, le=1000),
+    num_questions: int = Form(default=3, ge=1, le=10),
+    difficulty: DifficultyLevel = Form(default=DifficultyLevel.high_school)
+):
+    """Transcribe a recording, then stream its summary and quiz as each one is ready."""
+
+    start_time = time.time()
+    upload: Optional[SpooledUpload] = None
+
+    try:
+        # Transcribe before the stream opens so upload and audio errors keep their status codes
+        upload = await accept_audio_upload(file)
+        transcript = await transcribe_upload(upload, file.filename, language, context_prompt)
+
+    except HTTPException:
+        raise
+
+    except CircuitOpenError as e:
+        # The upstream is down: answer at once instead of holding the worker
+        logger.warning(f"Pipeline transcription unavailable: {e}")
+        raise upstream_unavailable(e) from e
+
+    except ValueError as e:
+        logger.warning(f"Pipeline transcription rejected: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    except RuntimeError as e:
+        logger.error(f"Pipeline transcription failed: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
+
+    except Exception as e:
+        logger.error(f"Unexpected pipeline error: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Transcription service temporarily unavailable"
+        )
+
+    finally:
+        if upload is not None:
+            upload.cleanup()
+
+    async def events():
+        yield format_sse("transcript", transcript.model_dump(mode="json"))
+
+        if not transcript.speech_detected:
+            # Nothing to study: don't pay for a summary and quiz of the no-speech notice
+            logger.info("Pipeline recording has no speech; skipping summary and quiz")
+            for stage in ("summary", "quiz"):
+                yield format_sse("error", {"stage": stage, "detail": "No speech detected in the recording"})
+            result = PipelineResult(
+                stages_completed=["transcript"],
+                stages_failed=["summary", "quiz"],
+                transcript_length=0,
+                processing_time_ms=(time.time() - start_time) * 1000
+            )
+            yield format_sse("done", result.model_dump(mode="json"))
+            return
+
+        stages = [
+            asyncio.create_task(_summary_stage(transcript.transcription, learning_style, max_tokens)),
+            asyncio.create_task(_quiz_stage(transcript.transcription, num_questions, difficulty, learning_style)),
+        ]
+        completed, failed = ["transcript"], []
+        try:
+            for next_stage in asyncio.as_completed(stages):
+                stage, result, error = await next_stage
+                if result is None:
+                    failed.append(stage)
+                    yield format_sse("error", {"stage": stage, "detail": error})
+                else:
+                    completed.append(stage)
+                    yield format_sse(stage, result.model_dump(mode="json"))
+        finally:
+            # Client went away: stop paying for stages nobody will read
+            for task in stages:
+                task.cancel()
+
+        processing_time = (time.time() - start_time) * 1000
+        logger.info(f"Pipeline finished in {processing_time:.2f}ms (failed stages: {failed or 'none'})")
+
+        result = PipelineResult(
+            stages_completed=completed,
+            stages_failed=failed,
+            transcript_length=len(transcript.transcription),
+            processing_time_ms=processing_time
+        )
+        yield format_sse("done", result.model_dump(mode="json"))
+
+    return sse_response(events())
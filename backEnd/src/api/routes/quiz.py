@@ -8,13 +8,27 @@ More complex than summarization due to structured output requirements.
 import time
 import logging
 from fastapi import APIRouter, HTTPException, status
-from src.api.models import QuizGenerationRequest, QuizGenerationResponse, QuizQuestion, ErrorResponse
-from src.ai.quiz_generator import generate_quiz
+from src.api.models import (
+    QuizGenerationRequest, QuizGenerationResponse, QuizQuestion, QuizStreamResult,
+    LongQuizRequest, LongQuizResponse, ErrorResponse
+)
+from src.api.errors import upstream_unavailable
+from src.api.streaming import format_sse, sse_response
+from src.ai.circuit_breaker import CircuitOpenError
+from src.ai.long_quiz import generate_long_quiz_async
+from src.ai.quiz_generator import generate_quiz_banked_async, stream_quiz_banked_async
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api", tags=["Quiz Generation"])
 
+def to_quiz_question(question: dict) -> QuizQuestion:
+    """Convert a generated question dict to a QuizQuestion."""
+    # Questions generated before question types existed are multiple choice
+    if "question_type" not in question:
+        question["question_type"] = "multiple_choice"
+    return QuizQuestion(**question)
+
 @router.post(
     "/quiz/generate",
     response_model=QuizGenerationResponse,
@@ -33,11 +47,18 @@ router = APIRouter(prefix="/api", tags=["Quiz Generation"])
     - **reading**: Traditional academic format, precise language
     - **kinesthetic**: Application scenarios, hands-on examples
     
+    **Question Types:** `multiple_choice`, `true_false` and `short_answer` can be
+    mixed in one quiz; they are spread evenly and generated in a single AI call.
+    
     **Educational Quality:** Questions test understanding, not just memorization.
+    
+    **Question Bank:** Questions already generated for the same content are reused
+    and only the missing ones are generated; `from_bank` reports how many were reused.
     """,
     responses={
         400: {"model": ErrorResponse, "description": "Invalid input"},
         500: {"model": ErrorResponse, "description": "Quiz generation failed"},
+        503: {"model": ErrorResponse, "description": "AI service temporarily unavailable"},
     }
 )
 async def generate_quiz_questions(request: QuizGenerationRequest):
@@ -56,15 +77,17 @@ async def generate_quiz_questions(request: QuizGenerationRequest):
             f"Quiz generation request: {len(request.text)} chars, "
             f"{request.num_questions} questions, "
             f"difficulty: {request.difficulty}, "
-            f"style: {request.learning_style}"
+            f"style: {request.learning_style}, "
+            f"types: {[t.value for t in request.question_types]}"
         )
         
-        # Call our AI quiz generation function
-        questions = generate_quiz(
+        # Reuse banked questions and generate only the missing ones
+        questions, from_bank = await generate_quiz_banked_async(
             text=request.text,
             num_questions=request.num_questions,
             difficulty=request.difficulty.value,  # Convert enum to string
-            learning_style=request.learning_style.value
+            learning_style=request.learning_style.value,
+            question_types=[t.value for t in request.question_types]
         )
         
         # Calculate metrics
@@ -74,16 +97,11 @@ async def generate_quiz_questions(request: QuizGenerationRequest):
         estimated_time = request.num_questions * 1.5
         
         logger.info(
-            f"Generated {len(questions)} questions in {processing_time:.2f}ms"
+            f"Generated {len(questions)} questions ({from_bank} from the bank) in {processing_time:.2f}ms"
         )
         
         # Convert each question dict to a QuizQuestion object
-        quiz_questions = []
-        for q in questions:
-            # Add question_type field if missing (defaulting to multiple_choice)
-            if "question_type" not in q:
-                q["question_type"] = "multiple_choice"
-            quiz_questions.append(QuizQuestion(**q))
+        quiz_questions = [to_quiz_question(q) for q in questions]
 
         # Return structured response with all the questions
         return QuizGenerationResponse(
@@ -92,9 +110,15 @@ async def generate_quiz_questions(request: QuizGenerationRequest):
             difficulty_used=request.difficulty,
             learning_style_used=request.learning_style,
             estimated_completion_time_minutes=int(estimated_time),
-            processing_time_ms=processing_time
+            processing_time_ms=processing_time,
+            from_bank=from_bank
         )
         
+    except CircuitOpenError as e:
+        # The upstream is down: answer at once instead of holding the worker
+        logger.warning(f"Quiz generation unavailable: {e}")
+        raise upstream_unavailable(e)
+        
     except ValueError as e:
         # Input validation errors
         logger.warning(f"Invalid quiz generation request: {e}")
@@ -117,4 +141,200 @@ async def generate_quiz_questions(request: QuizGenerationRequest):
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Quiz generation service temporarily unavailable."
-        )
\ No newline at end of file
+        )
+
+@router.post(
+    "/quiz/generate/stream",
+    summary="Stream adaptive quiz questions",
+    description="""
+    Streaming variant of /api/quiz/generate using Server-Sent Events (text/event-stream).
+    
+    Each question is parsed and validated as soon as it is complete in the AI
+    response and pushed to the client immediately, so students can start on the
+    first question while the rest are still being written. Questions from the
+    question bank are sent first, before any are generated.
+    
+    **Events:**
+    - **question**: `{"index": ..., "question": {...}, "from_bank": ...}` for every validated question
+    - **done**: totals, `from_bank`, adaptations used, `time_to_first_question_ms` and `processing_time_ms`
+    - **error**: `{"detail": ...}` if generation fails after streaming has started
+    
+    Validation errors and failures before the first question are returned as
+    normal JSON errors with status 400/500/503.
+    """,
+    responses={
+        200: {"content": {"text/event-stream": {}}, "description": "Quiz question event stream"},
+        400: {"model": ErrorResponse, "description": "Invalid input"},
+        500: {"model": ErrorResponse, "description": "Quiz generation failed"},
+        503: {"model": ErrorResponse, "description": "AI service temporarily unavailable"},
+    }
+)
+async def stream_quiz_questions(request: QuizGenerationRequest):
+    """Stream adaptive quiz questions one at a time as they are generated."""
+    
+    start_time = time.time()
+    
+    try:
+        logger.info(
+            f"Streaming quiz request: {len(request.text)} chars, "
+            f"{request.num_questions} questions, "
+            f"difficulty: {request.difficulty}, "
+            f"style: {request.learning_style}"
+        )
+        
+        questions = stream_quiz_banked_async(
+            text=request.text,
+            num_questions=request.num_questions,
+            difficulty=request.difficulty.value,
+            learning_style=request.learning_style.value,
+            question_types=[t.value for t in request.question_types]
+        )
+        
+        # Wait for the first question so early failures still map to proper status codes
+        question, first_from_bank = await anext(questions)
+        first_question = to_quiz_question(question)
+        
+    except CircuitOpenError as e:
+        # The upstream is down: answer at once instead of holding the worker
+        logger.warning(f"Quiz generation unavailable: {e}")
+        raise upstream_unavailable(e)
+        
+    except ValueError as e:
+        logger.warning(f"Invalid quiz generation request: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+        
+    except (RuntimeError, StopAsyncIteration) as e:
+        logger.error(f"Quiz generation processing error: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Unable to generate quiz questions. Please try again."
+        )
+        
+    except Exception as e:
+        logger.error(f"Unexpected quiz generation error: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Quiz generation service temporarily unavailable."
+        )
+    
+    time_to_first_question = (time.time() - start_time) * 1000
+    
+    async def events():
+        yield format_sse("question", {
+            "index": 0, "question": first_question.model_dump(mode="json"), "from_bank": first_from_bank
+        })
+        total, from_bank = 1, int(first_from_bank)
+        
+        try:
+            async for question, banked in questions:
+                quiz_question = to_quiz_question(question)
+                yield format_sse("question", {
+                    "index": total, "question": quiz_question.model_dump(mode="json"), "from_bank": banked
+                })
+                total += 1
+                from_bank += int(banked)
+        except Exception as e:
+            logger.error(f"Quiz stream interrupted after {total} questions: {e}")
+            yield format_sse("error", {"detail": "Unable to generate quiz questions. Please try again."})
+            return
+        
+        processing_time = (time.time() - start_time) * 1000
+        logger.info(
+            f"Streamed {total} questions in {processing_time:.2f}ms "
+            f"(first question {time_to_first_question:.2f}ms)"
+        )
+        
+        result = QuizStreamResult(
+            total_questions=total,
+            difficulty_used=request.difficulty,
+            learning_style_used=request.learning_style,
+            estimated_completion_time_minutes=int(total * 1.5),
+            time_to_first_question_ms=time_to_first_question,
+            processing_time_ms=processing_time,
+            from_bank=from_bank
+        )
+        yield format_sse("done", result.model_dump(mode="json"))
+    
+    return sse_response(events())
+
+@router.post(
+    "/quiz/generate/long",
+    response_model=LongQuizResponse,
+    summary="Generate an exam from long content",
+    description="""
+    Long-content mode for whole chapters and lecture transcripts (up to 500,000
+    characters and 50 questions).
+    
+    The content is split into sections on paragraph and sentence boundaries and
+    the questions are shared among them by how much material each section holds.
+    Every section is quizzed in parallel, so the exam takes about as long as a
+    single quiz call. Near-duplicate questions from different sections are removed.
+    """,
+    responses={
+        400: {"model": ErrorResponse, "description": "Invalid input"},
+        500: {"model": ErrorResponse, "description": "Quiz generation failed"},
+        503: {"model": ErrorResponse, "description": "AI service temporarily unavailable"},
+    }
+)
+async def generate_long_quiz(request: LongQuizRequest):
+    """Generate an exam from content too long for a single quiz call."""
+    
+    start_time = time.time()
+    
+    try:
+        logger.info(
+            f"Long quiz request: {len(request.text)} chars, "
+            f"{request.num_questions} questions, "
+            f"difficulty: {request.difficulty}, "
+            f"style: {request.learning_style}"
+        )
+        
+        result = await generate_long_quiz_async(
+            text=request.text,
+            num_questions=request.num_questions,
+            difficulty=request.difficulty.value,
+            learning_style=request.learning_style.value,
+            question_types=[t.value for t in request.question_types],
+            max_concurrency=request.max_concurrency
+        )
+        
+        processing_time = (time.time() - start_time) * 1000
+        logger.info(
+            f"Long quiz generated in {processing_time:.2f}ms "
+            f"({result['section_count']} sections, {result['duplicates_removed']} duplicates removed)"
+        )
+        
+        quiz_questions = [to_quiz_question(q) for q in result["questions"]]
+        return LongQuizResponse(
+            questions=quiz_questions,
+            total_questions=len(quiz_questions),
+            difficulty_used=request.difficulty,
+            learning_style_used=request.learning_style,
+            estimated_completion_time_minutes=int(len(quiz_questions) * 1.5),
+            processing_time_ms=processing_time,
+            from_bank=result["from_bank"],
+            section_count=result["section_count"],
+            duplicates_removed=result["duplicates_removed"]
+        )
+        
+    except CircuitOpenError as e:
+        # The upstream is down: answer at once instead of holding the worker
+        logger.warning(f"Quiz generation unavailable: {e}")
+        raise upstream_unavailable(e)
+        
+    except ValueError as e:
+        logger.warning(f"Invalid long quiz request: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+        
+    except Exception as e:
+        logger.error(f"Long quiz generation failed: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Unable to generate quiz questions. Please try again."
+        )
@@ -8,8 +8,20 @@ Routes connect the frontend to our AI summarization logic.
 import time
 import logging
 from fastapi import APIRouter, HTTPException, status
-from src.api.models import SummarizeRequest, SummarizeResponse, ErrorResponse
-from src.ai.summarizer import summarize_text
+from src.api.models import (
+    SummarizeRequest, SummarizeResponse, SummarizeStreamResult,
+    LongSummarizeRequest, LongSummarizeResponse,
+    MultiStyleSummarizeRequest, MultiStyleSummarizeResponse,
+    BatchSummarizeRequest, BatchSummarizeResponse, BatchSummaryItem, ErrorResponse
+)
+from src.api.errors import upstream_unavailable
+from src.api.streaming import format_sse, sse_response
+from src.ai.circuit_breaker import CircuitOpenError
+from src.ai.summarizer import (
+    get_cached_summary, stream_summary_async, summarize_batch_async, summarize_styles_async,
+    summarize_text_cached
+)
+from src.ai.long_summarizer import summarize_long_text_async
 
 logger = logging.getLogger(__name__)
 
@@ -34,6 +46,7 @@ router = APIRouter(prefix="/api", tags=["Summarization"])
     responses={
         400: {"model": ErrorResponse, "description": "Invalid input"},
         500: {"model": ErrorResponse, "description": "AI processing failed"},
+        503: {"model": ErrorResponse, "description": "AI service temporarily unavailable"},
     }
 )
 async def create_summary(request: SummarizeRequest):
@@ -50,8 +63,8 @@ async def create_summary(request: SummarizeRequest):
     try:
         logger.info(f"Summarization request: {len(request.text)} chars, style: {request.learning_style}")
         
-        # Call our AI summarization function
-        summary = summarize_text(
+        # Await the non-blocking AI summarization function (served from cache when possible)
+        summary, cached = await summarize_text_cached(
             input_text=request.text,
             learning_style=request.learning_style.value,  # Convert enum to string
             max_tokens=request.max_tokens
@@ -61,7 +74,7 @@ async def create_summary(request: SummarizeRequest):
         processing_time = (time.time() - start_time) * 1000  # Convert to milliseconds
         
         # Log successful processing
-        logger.info(f"Summary generated in {processing_time:.2f}ms")
+        logger.info(f"Summary generated in {processing_time:.2f}ms (cached: {cached})")
         
         # Return structured response
         return SummarizeResponse(
@@ -69,9 +82,15 @@ async def create_summary(request: SummarizeRequest):
             learning_style_used=request.learning_style,
             original_length=len(request.text),
             summary_length=len(summary),
-            processing_time_ms=processing_time
+            processing_time_ms=processing_time,
+            cached=cached
         )
         
+    except CircuitOpenError as e:
+        # The upstream is down: answer at once instead of holding the worker
+        logger.warning(f"Summarization unavailable: {e}")
+        raise upstream_unavailable(e)
+        
     except ValueError as e:
         # Input validation errors (empty text, too long, etc.)
         logger.warning(f"Invalid summarization request: {e}")
@@ -86,4 +105,327 @@ async def create_summary(request: SummarizeRequest):
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Unable to generate summary. Please try again."
-        )
\ No newline at end of file
+        )
+
+@router.post(
+    "/summarize/stream",
+    summary="Stream a personalized summary",
+    description="""
+    Streaming variant of /api/summarize using Server-Sent Events (text/event-stream).
+    
+    **Events:**
+    - **first_token**: `{"time_to_first_token_ms": ...}` as soon as the first text arrives
+    - **token**: `{"text": ...}` for every piece of the summary, in order
+    - **done**: the same metadata as /api/summarize plus `time_to_first_token_ms`
+    - **error**: `{"detail": ...}` if generation fails after streaming has started
+    
+    Validation errors and failures before the first token are returned as normal
+    JSON errors with status 400/500/503.
+    """,
+    responses={
+        200: {"content": {"text/event-stream": {}}, "description": "Summary event stream"},
+        400: {"model": ErrorResponse, "description": "Invalid input"},
+        500: {"model": ErrorResponse, "description": "AI processing failed"},
+        503: {"model": ErrorResponse, "description": "AI service temporarily unavailable"},
+    }
+)
+async def stream_summary(request: SummarizeRequest):
+    """Stream a personalized summary token by token as it is generated."""
+    
+    start_time = time.time()
+    learning_style = request.learning_style.value
+    
+    try:
+        logger.info(f"Streaming summarization request: {len(request.text)} chars, style: {request.learning_style}")
+        
+        cached_summary = get_cached_summary(request.text, learning_style, request.max_tokens)
+        if cached_summary is not None:
+            pieces = None
+            first_piece = cached_summary
+        else:
+            # Wait for the first piece so early failures still map to proper status codes
+            pieces = stream_summary_async(request.text, learning_style, request.max_tokens)
+            first_piece = await anext(pieces)
+        
+    except CircuitOpenError as e:
+        # The upstream is down: answer at once instead of holding the worker
+        logger.warning(f"Summarization unavailable: {e}")
+        raise upstream_unavailable(e)
+        
+    except ValueError as e:
+        logger.warning(f"Invalid summarization request: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+        
+    except Exception as e:
+        logger.error(f"Streaming summarization failed: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Unable to generate summary. Please try again."
+        )
+    
+    time_to_first_token = (time.time() - start_time) * 1000
+    
+    async def events():
+        parts = [first_piece]
+        yield format_sse("first_token", {"time_to_first_token_ms": time_to_first_token})
+        yield format_sse("token", {"text": first_piece})
+        
+        if pieces is not None:
+            try:
+                async for piece in pieces:
+                    parts.append(piece)
+                    yield format_sse("token", {"text": piece})
+            except Exception as e:
+                logger.error(f"Summary stream interrupted: {e}")
+                yield format_sse("error", {"detail": "Unable to generate summary. Please try again."})
+                return
+        
+        summary = "".join(parts).strip()
+        processing_time = (time.time() - start_time) * 1000
+        logger.info(
+            f"Summary streamed in {processing_time:.2f}ms "
+            f"(first token {time_to_first_token:.2f}ms, cached: {pieces is None})"
+        )
+        
+        result = SummarizeStreamResult(
+            summary=summary,
+            learning_style_used=request.learning_style,
+            original_length=len(request.text),
+            summary_length=len(summary),
+            processing_time_ms=processing_time,
+            cached=pieces is None,
+            time_to_first_token_ms=time_to_first_token
+        )
+        yield format_sse("done", result.model_dump(mode="json"))
+    
+    return sse_response(events())
+
+@router.post(
+    "/summarize/long",
+    response_model=LongSummarizeResponse,
+    summary="Summarize a long document",
+    description="""
+    Long-document mode for lecture transcripts and whole textbook chapters
+    (up to 500,000 characters).
+    
+    The document is split on paragraph and sentence boundaries, the pieces are
+    condensed in parallel, and the notes are merged level by level until they fit
+    one final learning-style adapted summary. Time grows with the depth of that
+    merge tree, not with the length of the document.
+    """,
+    responses={
+        400: {"model": ErrorResponse, "description": "Invalid input"},
+        500: {"model": ErrorResponse, "description": "AI processing failed"},
+        503: {"model": ErrorResponse, "description": "AI service temporarily unavailable"},
+    }
+)
+async def create_long_summary(request: LongSummarizeRequest):
+    """Generate a personalized summary from a document too long for a single call."""
+    
+    start_time = time.time()
+    
+    try:
+        logger.info(f"Long summarization request: {len(request.text)} chars, style: {request.learning_style}")
+        
+        result = await summarize_long_text_async(
+            input_text=request.text,
+            learning_style=request.learning_style.value,
+            max_tokens=request.max_tokens,
+            max_concurrency=request.max_concurrency
+        )
+        
+        processing_time = (time.time() - start_time) * 1000
+        logger.info(
+            f"Long summary generated in {processing_time:.2f}ms "
+            f"({result['chunk_count']} chunks, {result['reduce_levels']} reduce levels)"
+        )
+        
+        return LongSummarizeResponse(
+            summary=result["summary"],
+            learning_style_used=request.learning_style,
+            original_length=len(request.text),
+            summary_length=len(result["summary"]),
+            processing_time_ms=processing_time,
+            cached=result["cached"],
+            chunk_count=result["chunk_count"],
+            reduce_levels=result["reduce_levels"],
+            api_calls=result["api_calls"]
+        )
+        
+    except CircuitOpenError as e:
+        # The upstream is down: answer at once instead of holding the worker
+        logger.warning(f"Summarization unavailable: {e}")
+        raise upstream_unavailable(e)
+        
+    except ValueError as e:
+        logger.warning(f"Invalid long summarization request: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+        
+    except Exception as e:
+        logger.error(f"Long summarization failed: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Unable to generate summary. Please try again."
+        )
+
+@router.post(
+    "/summarize/styles",
+    response_model=MultiStyleSummarizeResponse,
+    summary="Generate summaries in several learning styles",
+    description="""
+    Generates one summary per requested learning style (all four by default)
+    so students can switch styles instantly.
+    
+    The text is condensed into style-neutral notes once, then rewritten for each
+    style concurrently. Every summary is cached under the same key as
+    /api/summarize, so later single-style requests for these styles are instant.
+    """,
+    responses={
+        400: {"model": ErrorResponse, "description": "Invalid input"},
+        500: {"model": ErrorResponse, "description": "AI processing failed"},
+        503: {"model": ErrorResponse, "description": "AI service temporarily unavailable"},
+    }
+)
+async def create_multi_style_summary(request: MultiStyleSummarizeRequest):
+    """Generate summaries of one text in every requested learning style."""
+    
+    start_time = time.time()
+    
+    try:
+        logger.info(
+            f"Multi-style summarization request: {len(request.text)} chars, "
+            f"styles: {[style.value for style in request.learning_styles]}"
+        )
+        
+        result = await summarize_styles_async(
+            input_text=request.text,
+            learning_styles=[style.value for style in request.learning_styles],
+            max_tokens=request.max_tokens
+        )
+        
+        processing_time = (time.time() - start_time) * 1000
+        logger.info(
+            f"Multi-style summary generated in {processing_time:.2f}ms "
+            f"({result['api_calls']} API calls)"
+        )
+        
+        return MultiStyleSummarizeResponse(
+            summaries=result["summaries"],
+            cached_styles=result["cached_styles"],
+            original_length=len(request.text),
+            api_calls=result["api_calls"],
+            processing_time_ms=processing_time
+        )
+        
+    except CircuitOpenError as e:
+        # The upstream is down: answer at once instead of holding the worker
+        logger.warning(f"Summarization unavailable: {e}")
+        raise upstream_unavailable(e)
+        
+    except ValueError as e:
+        logger.warning(f"Invalid multi-style summarization request: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+        
+    except Exception as e:
+        logger.error(f"Multi-style summarization failed: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Unable to generate summary. Please try again."
+        )
+
+@router.post(
+    "/summarize/batch",
+    response_model=BatchSummarizeResponse,
+    summary="Summarize a reading list",
+    description="""
+    Summarizes up to 50 texts in one request, each with its own learning style
+    and length.
+    
+    Identical items are summarized once and share the result, items are
+    generated concurrently up to `max_concurrency` at a time, and cached
+    summaries are reused. Each item reports its own success or error, so one
+    failing text never fails the batch.
+    """,
+    responses={
+        400: {"model": ErrorResponse, "description": "Invalid input"},
+        500: {"model": ErrorResponse, "description": "AI processing failed"},
+        503: {"model": ErrorResponse, "description": "AI service temporarily unavailable"},
+    }
+)
+async def create_batch_summary(request: BatchSummarizeRequest):
+    """Summarize many texts concurrently and report per-item results."""
+    
+    start_time = time.time()
+    
+    try:
+        logger.info(
+            f"Batch summarization request: {len(request.items)} items, "
+            f"concurrency: {request.max_concurrency}"
+        )
+        
+        batch = await summarize_batch_async(
+            [(item.text, item.learning_style.value, item.max_tokens) for item in request.items],
+            max_concurrency=request.max_concurrency
+        )
+        
+        results = [
+            BatchSummaryItem(
+                index=index,
+                success=outcome["error"] is None,
+                summary=outcome["summary"],
+                error=outcome["error"],
+                learning_style_used=item.learning_style,
+                original_length=len(item.text),
+                summary_length=len(outcome["summary"] or ""),
+                cached=outcome["cached"],
+                deduplicated=outcome["deduplicated"],
+                processing_time_ms=outcome["processing_time_ms"]
+            )
+            for index, (item, outcome) in enumerate(zip(request.items, batch["results"], strict=True))
+        ]
+        succeeded = sum(result.success for result in results)
+        
+        processing_time = (time.time() - start_time) * 1000
+        logger.info(
+            f"Batch summarized in {processing_time:.2f}ms "
+            f"({succeeded}/{len(results)} succeeded, {batch['api_calls']} API calls)"
+        )
+        
+        return BatchSummarizeResponse(
+            results=results,
+            total_items=len(results),
+            unique_items=batch["unique_items"],
+            succeeded=succeeded,
+            failed=len(results) - succeeded,
+            api_calls=batch["api_calls"],
+            cache_hits=batch["cache_hits"],
+            processing_time_ms=processing_time
+        )
+        
+    except CircuitOpenError as e:
+        # The upstream is down: answer at once instead of holding the worker
+        logger.warning(f"Summarization unavailable: {e}")
+        raise upstream_unavailable(e)
+        
+    except ValueError as e:
+        logger.warning(f"Invalid batch summarization request: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+        
+    except Exception as e:
+        logger.error(f"Batch summarization failed: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Unable to generate summaries. Please try again."
+        )
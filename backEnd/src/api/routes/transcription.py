@@ -5,17 +5,58 @@ Handles file upload and speech-to-text conversion for students who learn
 better through audio content like lecture recordings.
 """
 
+import asyncio
 import time
 import logging
+import uuid
 from pathlib import Path
 from typing import Optional
 from fastapi import APIRouter, UploadFile, File, HTTPException, status
-from src.api.models import TranscriptionRequest, TranscriptionResponse, ErrorResponse
-from src.ai.transcriber import transcribe_audio, SUPPORTED_FORMATS, MAX_FILE_SIZE
+from src.api.models import (
+    TranscriptionResponse,
+    TranscriptionJobResponse,
+    ErrorResponse,
+)
+from src.api.errors import upstream_unavailable
+from src.api.uploads import SpooledUpload, spool_upload, upload_limit_route
+from src.api.jobs import TRANSCRIPTION_JOB, stage_job_file, transcription_jobs
+from src.ai.circuit_breaker import CircuitOpenError
+from src.ai.transcriber import (
+    admit_audio,
+    cost_for_duration,
+    transcribe_audio_cached,
+    SUPPORTED_FORMATS,
+    MAX_FILE_SIZE,
+    LONG_AUDIO_MAX_FILE_SIZE,
+    SEGMENTABLE_FORMATS,
+    MAX_AUDIO_DURATION_SECONDS,
+    NO_SPEECH_MESSAGE,
+)
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/api", tags=["Transcription"])
+# Oversize uploads are refused from their Content-Length before the body is read
+router = APIRouter(prefix="/api", tags=["Transcription"], route_class=upload_limit_route(LONG_AUDIO_MAX_FILE_SIZE))
+
+def _upload_extension(file: UploadFile) -> str:
+    """Return the lower-cased extension of an upload, rejecting unsupported formats."""
+    if not file.filename:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No filename provided in uploaded file"
+        )
+    file_extension = Path(file.filename).suffix.lower()
+    if file_extension not in SUPPORTED_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported file format: {file_extension}. "
+                   f"Supported: {', '.join(sorted(SUPPORTED_FORMATS))}"
+        )
+    return file_extension
+
+def _max_upload_bytes(file_extension: str) -> int:
+    """Size limit for an upload: segmentable formats may exceed the Whisper limit."""
+    return LONG_AUDIO_MAX_FILE_SIZE if file_extension in SEGMENTABLE_FORMATS else MAX_FILE_SIZE
 
 @router.post(
     "/transcribe",
@@ -25,7 +66,9 @@ router = APIRouter(prefix="/api", tags=["Transcription"])
     Convert audio files to text using OpenAI's Whisper model.
     
     **Supported formats:** MP3, MP4, MPEG, MPGA, M4A, WAV, WebM
-    **File size limit:** 25MB
+    **File size limit:** 25MB (WAV recordings up to 1GB are split at pauses and
+    transcribed in parallel, so full-length lectures are supported)
+    **Duration limit:** 4 hours, checked from the file headers before transcription
     **Languages:** Auto-detected or specify language code
     
     Perfect for:
@@ -38,6 +81,7 @@ router = APIRouter(prefix="/api", tags=["Transcription"])
         400: {"model": ErrorResponse, "description": "Invalid file or parameters"},
         413: {"model": ErrorResponse, "description": "File too large"},
         500: {"model": ErrorResponse, "description": "Transcription failed"},
+        503: {"model": ErrorResponse, "description": "AI service temporarily unavailable"},
     }
 )
 async def transcribe_audio_file(
@@ -50,74 +94,17 @@ async def transcribe_audio_file(
 
     This endpoint handles the full workflow:
     1. Validate file format and size
-    2. Save temporarily for processing
+    2. Stream the upload to a spool file in chunks (size enforced on the fly)
     3. Call Whisper API for transcription
     4. Clean up temporary files
     5. Return formatted response
     """
     
-    start_time = time.time()
-    temp_file_path = None
+    upload: Optional[SpooledUpload] = None
     
     try:
-        # Validate file format
-        if not file.filename:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="No filename provided in uploaded file"
-            )
-        file_extension = Path(file.filename).suffix.lower()
-        if file_extension not in SUPPORTED_FORMATS:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Unsupported file format: {file_extension}. "
-                       f"Supported: {', '.join(sorted(SUPPORTED_FORMATS))}"
-            )
-        
-        # Read file content and validate size
-        file_content = await file.read()
-        file_size = len(file_content)
-        
-        if file_size > MAX_FILE_SIZE:
-            size_mb = file_size / (1024 * 1024)
-            raise HTTPException(
-                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-                detail=f"File too large: {size_mb:.1f}MB. Maximum: {MAX_FILE_SIZE / (1024 * 1024)}MB"
-            )
-        
-        if file_size == 0:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Empty file uploaded"
-            )
-        
-        logger.info(f"Processing audio file: {file.filename} ({file_size} bytes)")
-        
-        # Save file temporarily for Whisper API
-        import tempfile
-        with tempfile.NamedTemporaryFile(delete=False, suffix=file_extension) as temp_file:
-            temp_file.write(file_content)
-            temp_file_path = temp_file.name
-        
-        # Transcribe using our AI module
-        transcription = transcribe_audio(
-            audio_file_path=temp_file_path,
-            language=language,
-            prompt=context_prompt
-        )
-        
-        # Calculate metrics
-        processing_time = (time.time() - start_time) * 1000
-        
-        logger.info(f"Transcription completed: {len(transcription)} characters in {processing_time:.2f}ms")
-        
-        return TranscriptionResponse(
-            transcription=transcription,
-            language_detected=language,  # TODO: Actual language detection
-            confidence_score=None,  # TODO: Add confidence scoring
-            duration_seconds=None,  # TODO: Add duration calculation
-            processing_time_ms=processing_time
-        )
+        upload = await accept_audio_upload(file)
+        return await transcribe_upload(upload, file.filename, language, context_prompt)
         
     except HTTPException:
         # Re-raise HTTP exceptions as-is
@@ -130,6 +117,11 @@ async def transcribe_audio_file(
             detail="File processing error"
         )
         
+    except CircuitOpenError as e:
+        # The upstream is down: answer at once instead of holding the worker
+        logger.warning(f"Transcription unavailable: {e}")
+        raise upstream_unavailable(e)
+        
     except ValueError as e:
         # Input validation errors from transcriber
         logger.warning(f"Transcription validation error: {e}")
@@ -156,11 +148,209 @@ async def transcribe_audio_file(
         
     finally:
         # Clean up temporary file
-        if temp_file_path and Path(temp_file_path).exists():
-            try:
-                Path(temp_file_path).unlink()
-            except Exception as e:
-                logger.warning(f"Failed to clean up temp file {temp_file_path}: {e}")
+        if upload is not None:
+            upload.cleanup()
+
+async def accept_audio_upload(file: UploadFile) -> SpooledUpload:
+    """
+    Validate an audio upload and spool it to disk.
+
+    The copy is chunked and aborts as soon as it crosses the size limit for the
+    format. The caller owns the returned spool file and must call cleanup().
+
+    Raises:
+        HTTPException: 400 for a missing name or unsupported format, 413 when too large
+    """
+    file_extension = _upload_extension(file)
+    return await spool_upload(file, suffix=file_extension, max_bytes=_max_upload_bytes(file_extension))
+
+async def transcribe_upload(
+    upload: SpooledUpload,
+    filename: Optional[str],
+    language: Optional[str] = None,
+    context_prompt: Optional[str] = None
+) -> TranscriptionResponse:
+    """
+    Transcribe a spooled upload and build the API response.
+
+    Raises:
+        ValueError: Audio rejected by admission control or the transcriber
+        RuntimeError: Transcription API failures
+    """
+    start_time = time.time()
+    
+    # Admission control: read the duration from the headers before any Whisper spend
+    duration = await asyncio.to_thread(admit_audio, upload.path)
+    estimated_cost = cost_for_duration(duration) if duration is not None else None
+    
+    logger.info(
+        f"Processing audio file: {filename} ({upload.size} bytes, "
+        f"duration: {duration}s, estimated cost: ${estimated_cost})"
+    )
+    
+    # Transcribe using our AI module without blocking the event loop
+    # (repeat uploads are served from the cache using the digest taken during upload;
+    # long WAV recordings are segmented and transcribed in parallel)
+    transcription, cached = await transcribe_audio_cached(
+        audio_file_path=upload.path,
+        language=language,
+        prompt=context_prompt,
+        content_sha256=upload.sha256,
+        duration_seconds=duration
+    )
+    
+    # Calculate metrics
+    processing_time = (time.time() - start_time) * 1000
+    
+    logger.info(
+        f"Transcription completed: {len(transcription)} characters in {processing_time:.2f}ms "
+        f"(cached: {cached})"
+    )
+    
+    return TranscriptionResponse(
+        transcription=transcription or NO_SPEECH_MESSAGE,
+        speech_detected=bool(transcription),
+        language_detected=language,  # TODO: Actual language detection
+        confidence_score=None,  # TODO: Add confidence scoring
+        duration_seconds=duration,
+        estimated_cost_usd=estimated_cost,
+        cached=cached,
+        processing_time_ms=processing_time
+    )
+
+def _job_response(job: dict) -> TranscriptionJobResponse:
+    """Build the public status view of a stored job."""
+    job_id = job["id"]
+    return TranscriptionJobResponse(
+        job_id=job_id,
+        status=job["status"],
+        progress=job["progress"],
+        filename=job["payload"].get("filename"),
+        created_at=job["created_at"],
+        started_at=job["started_at"],
+        finished_at=job["finished_at"],
+        error=job["error"],
+        status_url=f"/api/transcribe/jobs/{job_id}",
+        result_url=f"/api/transcribe/jobs/{job_id}/result"
+    )
+
+def _get_job_or_404(job_id: str) -> dict:
+    job = transcription_jobs.store.get(job_id)
+    if job is None or job["kind"] != TRANSCRIPTION_JOB:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Transcription job not found: {job_id}"
+        )
+    return job
+
+@router.post(
+    "/transcribe/jobs",
+    response_model=TranscriptionJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Queue audio for background transcription",
+    description="""
+    Upload audio and return immediately with a job id instead of waiting for
+    Whisper. Poll the status URL for progress and fetch the transcription from
+    the result URL once the job completes.
+    
+    Accepts the same formats and limits as `/api/transcribe`. Jobs are stored
+    on disk and resume after a server restart.
+    """,
+    responses={
+        400: {"model": ErrorResponse, "description": "Invalid file or parameters"},
+        413: {"model": ErrorResponse, "description": "File too large"},
+    }
+)
+async def submit_transcription_job(
+    file: UploadFile = File(...),
+    language: Optional[str] = None,
+    context_prompt: Optional[str] = None
+):
+    """Validate and spool an upload, then queue it for the worker pool."""
+    upload: Optional[SpooledUpload] = None
+    
+    try:
+        upload = await accept_audio_upload(file)
+        file_extension = Path(upload.path).suffix
+        
+        # Reject over-long recordings now rather than after they wait in the queue
+        await asyncio.to_thread(admit_audio, upload.path)
+        
+        job_id = uuid.uuid4().hex
+        staged_path = await asyncio.to_thread(stage_job_file, upload.path, job_id, file_extension)
+        job = transcription_jobs.submit({
+            "file_path": staged_path,
+            "filename": file.filename,
+            "size": upload.size,
+            "sha256": upload.sha256,
+            "language": language,
+            "context_prompt": context_prompt
+        }, job_id=job_id)
+        
+        logger.info(f"Queued transcription job {job_id} for {file.filename} ({upload.size} bytes)")
+        return _job_response(job)
+        
+    except HTTPException:
+        raise
+        
+    except ValueError as e:
+        logger.warning(f"Transcription job validation error: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+        
+    except Exception as e:
+        logger.error(f"Failed to queue transcription job: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Transcription service temporarily unavailable"
+        )
+        
+    finally:
+        # No-op once the spool file has been moved into job storage
+        if upload is not None:
+            upload.cleanup()
+
+@router.get(
+    "/transcribe/jobs/{job_id}",
+    response_model=TranscriptionJobResponse,
+    summary="Get transcription job status",
+    responses={404: {"model": ErrorResponse, "description": "Unknown job"}}
+)
+async def get_transcription_job(job_id: str):
+    """Return the status and progress of a background transcription job."""
+    return _job_response(_get_job_or_404(job_id))
+
+@router.get(
+    "/transcribe/jobs/{job_id}/result",
+    response_model=TranscriptionResponse,
+    summary="Get transcription job result",
+    description="""
+    Returns the transcription of a completed job. Responds 409 while the job
+    is still queued or running; a failed job returns the error the synchronous
+    endpoint would have returned (400 for invalid audio, 500 otherwise).
+    """,
+    responses={
+        404: {"model": ErrorResponse, "description": "Unknown job"},
+        409: {"model": ErrorResponse, "description": "Job not finished yet"},
+    }
+)
+async def get_transcription_job_result(job_id: str):
+    """Return the TranscriptionResponse of a finished job."""
+    job = _get_job_or_404(job_id)
+    
+    if job["status"] == "failed":
+        raise HTTPException(
+            status_code=job["error_status"] or status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=job["error"]
+        )
+    if job["status"] != "completed":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Transcription job is {job['status']} ({job['progress']:.0%} complete)"
+        )
+    return TranscriptionResponse(**job["result"])
 
 @router.get(
     "/transcribe/formats",
@@ -172,6 +362,9 @@ async def get_supported_formats():
     return {
         "supported_formats": list(SUPPORTED_FORMATS),
         "max_file_size_mb": MAX_FILE_SIZE / (1024 * 1024),
+        "long_audio_formats": sorted(SEGMENTABLE_FORMATS),
+        "long_audio_max_file_size_mb": LONG_AUDIO_MAX_FILE_SIZE / (1024 * 1024),
+        "max_duration_minutes": MAX_AUDIO_DURATION_SECONDS / 60,
         "recommended_formats": [".mp3", ".wav", ".m4a"],
         "languages_supported": "auto-detect or specify ISO language code"
-    }
\ No newline at end of file
+    }
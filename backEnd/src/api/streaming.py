@@ -0,0 +1,26 @@
+"""
+Server-Sent Events helpers for StudyBuddy AI
+
+Streaming endpoints push results to the browser as they are produced using the
+text/event-stream format. Each event has a name and a JSON payload, so the
+frontend can consume them with EventSource or a fetch() reader.
+"""
+
+import json
+from typing import Any, AsyncIterator
+from fastapi.responses import StreamingResponse
+
+# Disable proxy buffering and caching so events reach the client immediately
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "X-Accel-Buffering": "no",
+}
+
+def format_sse(event: str, data: Any) -> str:
+    """Format one Server-Sent Event with a JSON-encoded payload."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+def sse_response(events: AsyncIterator[str]) -> StreamingResponse:
+    """Wrap an async iterator of formatted events in a streaming HTTP response."""
+    return StreamingResponse(events, media_type="text/event-stream", headers=SSE_HEADERS)
@@ -0,0 +1,130 @@
+"""
+Upload spooling helpers for StudyBuddy AI
+
+Audio uploads are copied to a temporary spool file in fixed-size chunks so a
+request never holds the whole recording in memory. Size limits are enforced
+twice: a declared Content-Length over the limit is refused before the body is
+read at all, and the chunked copy aborts as soon as it crosses the limit.
+A SHA-256 of the content is computed during the same pass, so cache lookups
+never need to read the file again.
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional, Type
+from fastapi import HTTPException, Request, UploadFile, status
+from fastapi.routing import APIRoute
+
+logger = logging.getLogger(__name__)
+
+# Size of each read from the incoming upload
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(1024 * 1024)))
+
+# Allowance for multipart boundaries and form fields on top of the file itself
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+@dataclass
+class SpooledUpload:
+    """An upload copied to a temporary file on disk."""
+
+    path: str
+    size: int
+    sha256: str
+
+    def cleanup(self) -> None:
+        """Delete the spool file, logging instead of raising on failure."""
+        try:
+            Path(self.path).unlink(missing_ok=True)
+        except OSError as e:
+            logger.warning(f"Failed to clean up temp file {self.path}: {e}")
+
+def _too_large(max_bytes: int, size: Optional[int] = None) -> HTTPException:
+    """Build the 413 error for an upload over the size limit."""
+    received = f"{size / (1024 * 1024):.1f}MB" if size is not None else "Upload exceeds limit"
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"File too large: {received}. Maximum: {max_bytes / (1024 * 1024)}MB"
+    )
+
+def reject_oversized_request(request: Request, max_bytes: int) -> None:
+    """Raise 413 when the declared Content-Length already exceeds the limit."""
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit():
+        if int(content_length) > max_bytes + MULTIPART_OVERHEAD_BYTES:
+            raise _too_large(max_bytes, int(content_length))
+
+def upload_limit_route(max_bytes: int) -> Type[APIRoute]:
+    """
+    Build an APIRoute class that checks Content-Length before the body is parsed.
+
+    FastAPI parses multipart form bodies before the endpoint function runs, so
+    the check has to happen in the route handler itself to refuse oversize
+    uploads without reading them.
+
+    Example:
+        >>> router = APIRouter(prefix="/api", route_class=upload_limit_route(MAX_FILE_SIZE))
+    """
+    class UploadLimitRoute(APIRoute):
+        def get_route_handler(self) -> Callable:
+            handler = super().get_route_handler()
+
+            async def limited_handler(request: Request):
+                if request.method in ("POST", "PUT"):
+                    reject_oversized_request(request, max_bytes)
+                return await handler(request)
+
+            return limited_handler
+
+    return UploadLimitRoute
+
+async def spool_upload(
+    file: UploadFile,
+    suffix: str,
+    max_bytes: int,
+    chunk_size: int = UPLOAD_CHUNK_SIZE
+) -> SpooledUpload:
+    """
+    Copy an upload to a temporary file in fixed-size chunks, hashing it on the way.
+
+    Args:
+        file (UploadFile): Incoming upload
+        suffix (str): File extension for the spool file (Whisper uses it to detect the format)
+        max_bytes (int): Maximum allowed size; the copy stops as soon as it is exceeded
+        chunk_size (int, optional): Bytes read per chunk
+
+    Returns:
+        SpooledUpload: Path, size and SHA-256 of the spool file; the caller must call cleanup()
+
+    Raises:
+        HTTPException: 413 when the upload exceeds max_bytes, 400 when it is empty
+    """
+    spool = tempfile.NamedTemporaryFile(delete=False, suffix=suffix)
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with spool:
+            while True:
+                chunk = await file.read(chunk_size)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise _too_large(max_bytes)
+                digest.update(chunk)
+                spool.write(chunk)
+
+        if size == 0:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Empty file uploaded"
+            )
+
+    except BaseException:
+        Path(spool.name).unlink(missing_ok=True)
+        raise
+
+    return SpooledUpload(spool.name, size, digest.hexdigest())
@@ -0,0 +1,62 @@
+"""
+Shared test fixtures.
+
+Every test starts with fresh upstream rate-limit budgets and closed circuit
+breakers, so the calls made by earlier tests never queue or block the calls
+made by later ones, and with an empty summary cache, question bank and
+memory-only transcription cache, so summaries, questions and transcripts stored
+by earlier tests are never served to later ones.
+
+Components with an injectable clock are tested against the `clock` fixture.
+"""
+
+import pytest
+from src.ai import quiz_generator
+from src.ai.circuit_breaker import reset_breakers
+from src.ai.question_bank import QuestionBank
+from src.ai.rate_limiter import reset_limiters
+from src.ai.summarizer import summary_cache
+from src.ai.transcriber import transcription_cache
+
+class FakeClock:
+    """Manually advanced time source; `step` seconds pass on every reading."""
+
+    def __init__(self, now: float = 1000.0, step: float = 0.0):
+        self.now = now
+        self.step = step
+
+    def __call__(self) -> float:
+        self.now += self.step
+        return self.now
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+@pytest.fixture(autouse=True)
+def fresh_upstream_guards():
+    reset_limiters()
+    reset_breakers()
+    yield
+    reset_limiters()
+    reset_breakers()
+
+@pytest.fixture(autouse=True)
+def empty_question_bank(tmp_path_factory, monkeypatch):
+    bank = QuestionBank(str(tmp_path_factory.mktemp("question_bank") / "question_bank.sqlite3"))
+    monkeypatch.setattr(quiz_generator, "question_bank", bank)
+    yield bank
+    bank.close()
+
+@pytest.fixture(autouse=True)
+def empty_summary_cache():
+    summary_cache.clear()
+    yield
+    summary_cache.clear()
+
+@pytest.fixture(autouse=True)
+def empty_transcription_cache(monkeypatch):
+    monkeypatch.setattr(transcription_cache, "disk", None)
+    transcription_cache.clear()
+    yield
+    transcription_cache.clear()
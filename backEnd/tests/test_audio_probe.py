@@ -0,0 +1,93 @@
+"""
+Tests for the header-only audio duration probe.
+
+Builds minimal synthetic WAV, MP3 and MP4 files in each supported layout
+(plain frames, Xing and VBRI indexes, 32- and 64-bit mvhd) and checks the
+duration read from their headers.
+"""
+
+import struct
+import wave
+import pytest
+from src.ai.audio_probe import probe_duration
+
+# MPEG-1 Layer III, 128 kbps, 44.1 kHz, stereo, no padding: 417-byte frames
+MP3_FRAME_HEADER = b"\xFF\xFB\x90\x00"
+MP3_FRAME_LENGTH = 417
+MP3_SAMPLES_PER_FRAME = 1152
+
+def _mp3_frame(payload=b""):
+    """One silent MP3 frame, optionally starting its payload with index data."""
+    body = payload.ljust(MP3_FRAME_LENGTH - 4, b"\x00")
+    return MP3_FRAME_HEADER + body
+
+def _id3_tag(size):
+    """An ID3v2 tag with a syncsafe size and `size` bytes of padding."""
+    syncsafe = bytes([(size >> 21) & 0x7F, (size >> 14) & 0x7F, (size >> 7) & 0x7F, size & 0x7F])
+    return b"ID3\x04\x00\x00" + syncsafe + b"\x00" * size
+
+def _box(box_type, payload):
+    """A 32-bit sized MP4 box."""
+    return struct.pack(">I4s", 8 + len(payload), box_type) + payload
+
+class TestProbeDuration:
+    """Test suite for container header parsing."""
+    
+    def test_wav_duration_from_data_chunk(self, tmp_path):
+        """Test RIFF fmt/data parsing."""
+        path = tmp_path / "clip.wav"
+        with wave.open(str(path), "wb") as writer:
+            writer.setnchannels(2)
+            writer.setsampwidth(2)
+            writer.setframerate(16000)
+            writer.writeframes(b"\x00" * 4 * 16000 * 3)
+        
+        assert probe_duration(str(path)) == 3.0
+    
+    def test_mp3_duration_by_frame_scan(self, tmp_path):
+        """Test the fallback frame walk for CBR files without an index, after an ID3 tag."""
+        path = tmp_path / "clip.mp3"
+        path.write_bytes(_id3_tag(300) + _mp3_frame() * 200 + b"TAG" + b"\x00" * 125)
+        
+        assert probe_duration(str(path)) == pytest.approx(200 * MP3_SAMPLES_PER_FRAME / 44100, abs=1e-3)
+    
+    def test_mp3_duration_from_xing_header(self, tmp_path):
+        """Test that the Xing frame count is used without scanning the file."""
+        xing = b"\x00" * 32 + b"Xing" + struct.pack(">II", 0x01, 5000)
+        path = tmp_path / "clip.mp3"
+        path.write_bytes(_mp3_frame(xing) + _mp3_frame() * 3)
+        
+        assert probe_duration(str(path)) == pytest.approx(5000 * MP3_SAMPLES_PER_FRAME / 44100, abs=1e-3)
+    
+    def test_mp3_duration_from_vbri_header(self, tmp_path):
+        """Test the Fraunhofer VBRI frame count."""
+        vbri = b"\x00" * 32 + b"VBRI" + struct.pack(">HHHII", 1, 0, 75, 1_000_000, 2500)
+        path = tmp_path / "clip.mpga"
+        path.write_bytes(_mp3_frame(vbri) + _mp3_frame() * 3)
+        
+        assert probe_duration(str(path)) == pytest.approx(2500 * MP3_SAMPLES_PER_FRAME / 44100, abs=1e-3)
+    
+    @pytest.mark.parametrize("version,mvhd_fields", [
+        (0, struct.pack(">IIII", 0, 0, 600, 3300)),
+        (1, struct.pack(">QQIQ", 0, 0, 600, 3300)),
+    ])
+    def test_mp4_duration_from_mvhd(self, tmp_path, version, mvhd_fields):
+        """Test 32- and 64-bit movie header atoms, with boxes before moov."""
+        mvhd = _box(b"mvhd", bytes([version, 0, 0, 0]) + mvhd_fields + b"\x00" * 80)
+        path = tmp_path / "lecture.m4a"
+        path.write_bytes(_box(b"ftyp", b"M4A \x00\x00\x00\x00") + _box(b"mdat", b"\x00" * 1000) + _box(b"moov", mvhd))
+        
+        assert probe_duration(str(path)) == 5.5
+    
+    @pytest.mark.parametrize("name,content", [
+        ("clip.mp3", b"\x00" * 2000),
+        ("clip.wav", b"RIFF\x00\x00"),
+        ("clip.m4a", _box(b"ftyp", b"M4A ")),
+        ("clip.webm", b"\x1A\x45\xDF\xA3"),
+    ])
+    def test_unknown_or_corrupt_files_return_none(self, tmp_path, name, content):
+        """Test that probing never raises on bad input."""
+        path = tmp_path / name
+        path.write_bytes(content)
+        
+        assert probe_duration(str(path)) is None
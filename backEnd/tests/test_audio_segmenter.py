@@ -0,0 +1,89 @@
+"""
+Tests for silence-aware WAV segmentation.
+
+Builds small synthetic recordings (tone bursts separated by silence) and
+checks that cuts land in the pauses, that every segment respects the byte
+budget, and that no audio is lost or duplicated.
+"""
+
+import array
+import math
+import wave
+from pathlib import Path
+import pytest
+from src.ai import audio_segmenter
+from src.ai.audio_segmenter import plan_segments, split_wav
+
+FRAMERATE = 8000
+
+def _write_wav(path, pattern):
+    """Write a mono 16-bit WAV from (seconds, is_tone) pairs and return silence spans."""
+    samples = array.array("h")
+    silences = []
+    for seconds, is_tone in pattern:
+        start = len(samples)
+        for n in range(int(seconds * FRAMERATE)):
+            samples.append(int(8000 * math.sin(2 * math.pi * 440 * n / FRAMERATE)) if is_tone else 0)
+        if not is_tone:
+            silences.append((start, len(samples)))
+    with wave.open(str(path), "wb") as writer:
+        writer.setnchannels(1)
+        writer.setsampwidth(2)
+        writer.setframerate(FRAMERATE)
+        writer.writeframes(samples.tobytes())
+    return silences
+
+class TestSilenceAwareSegmentation:
+    """Test suite for splitting long WAV recordings at pauses."""
+    
+    @pytest.fixture(autouse=True)
+    def short_search_window(self, monkeypatch):
+        """Search a few seconds before each limit so tiny test files can be split."""
+        monkeypatch.setattr(audio_segmenter, "SILENCE_SEARCH_SECONDS", 3)
+    
+    def test_cuts_land_in_silence(self, tmp_path):
+        """Test that every cut point falls inside a pause."""
+        pattern = [(4, True), (0.5, False), (3, True), (0.5, False), (4, True), (0.5, False), (3, True)]
+        silences = _write_wav(tmp_path / "lecture.wav", pattern)
+        
+        plan = plan_segments(str(tmp_path / "lecture.wav"), max_segment_bytes=44 + 2 * FRAMERATE * 6)
+        
+        assert len(plan) > 1
+        for _, cut in plan[:-1]:
+            assert any(start <= cut <= end for start, end in silences)
+    
+    def test_segments_cover_the_recording_within_budget(self, tmp_path):
+        """Test that segments are contiguous, complete and under the byte limit."""
+        _write_wav(tmp_path / "lecture.wav", [(5, True), (0.5, False)] * 4)
+        budget = 44 + 2 * FRAMERATE * 6
+        output_dir = tmp_path / "segments"
+        output_dir.mkdir()
+        
+        segments = split_wav(str(tmp_path / "lecture.wav"), str(output_dir), budget)
+        
+        with wave.open(str(tmp_path / "lecture.wav"), "rb") as source:
+            total_frames = source.getnframes()
+        frames = 0
+        for previous, following in zip(segments[:-1], segments[1:], strict=True):
+            assert previous.end_seconds == following.start_seconds
+        for segment in segments:
+            assert Path(segment.path).stat().st_size <= budget
+            with wave.open(segment.path, "rb") as reader:
+                frames += reader.getnframes()
+                assert reader.getframerate() == FRAMERATE
+        assert frames == total_frames
+        assert segments[-1].end_seconds == pytest.approx(total_frames / FRAMERATE)
+    
+    def test_short_recording_is_a_single_segment(self, tmp_path):
+        """Test that audio under the budget is not split."""
+        _write_wav(tmp_path / "short.wav", [(2, True)])
+        
+        assert plan_segments(str(tmp_path / "short.wav"), max_segment_bytes=10 * 1024 * 1024) == [(0, 2 * FRAMERATE)]
+    
+    def test_non_wav_input_raises_value_error(self, tmp_path):
+        """Test that compressed audio is rejected rather than mis-split."""
+        fake = tmp_path / "lecture.wav"
+        fake.write_bytes(b"ID3 not really a wav file")
+        
+        with pytest.raises(ValueError, match="PCM WAV"):
+            plan_segments(str(fake), max_segment_bytes=1024 * 1024)
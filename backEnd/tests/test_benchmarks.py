@@ -0,0 +1,131 @@
+"""
+Tests for the offline benchmark tooling.
+
+Covers the fake OpenAI server's compatibility with the OpenAI SDK (plain,
+streamed, quiz and transcription responses, injected errors) and the load
+driver's statistics helpers.
+"""
+
+import io
+import httpx
+import openai
+import pytest
+from benchmarks.fake_openai import FakeConfig, create_app, parse_latency
+from benchmarks.load_test import histogram_delta_summary, histogram_state, make_wav, parse_metrics, percentile
+from src.ai.quiz_generator import _build_quiz_messages, _parse_quiz_content
+
+def fake_client(**config):
+    """AsyncOpenAI client talking to an in-process fake server."""
+    app = create_app(FakeConfig(latency="fixed:0", audio_latency="fixed:0", stream_chunk_delay=0, **config))
+    transport = httpx.ASGITransport(app=app)
+    return openai.AsyncOpenAI(
+        api_key="sk-test",
+        base_url="http://fake/v1",
+        max_retries=0,
+        http_client=httpx.AsyncClient(transport=transport),
+    )
+
+class TestFakeOpenAI:
+    """Test suite for the fake OpenAI server."""
+
+    @pytest.mark.asyncio
+    async def test_chat_completion_with_usage(self):
+        """Test that a summary request gets text content and token usage."""
+        client = fake_client()
+        response = await client.chat.completions.create(
+            model="gpt-3.5-turbo",
+            messages=[{"role": "user", "content": "Summarize photosynthesis"}],
+            max_tokens=50,
+        )
+
+        assert "Photosynthesis" in response.choices[0].message.content
+        assert response.usage.completion_tokens > 0
+
+    @pytest.mark.asyncio
+    async def test_quiz_prompt_gets_valid_questions(self):
+        """Test that the quiz response passes the generator's own validation."""
+        client = fake_client()
+        messages = _build_quiz_messages("Plants make food by photosynthesis.", 4, "high_school", "reading")
+        response = await client.chat.completions.create(model="gpt-3.5-turbo", messages=messages)
+
+        assert len(_parse_quiz_content(response.choices[0].message.content)) == 4
+
+    @pytest.mark.asyncio
+    async def test_streamed_completion(self):
+        """Test that stream=true yields chunks that join into the full answer."""
+        client = fake_client()
+        stream = await client.chat.completions.create(
+            model="gpt-3.5-turbo",
+            messages=[{"role": "user", "content": "Summarize photosynthesis"}],
+            max_tokens=20,
+            stream=True,
+        )
+        parts = [chunk.choices[0].delta.content async for chunk in stream if chunk.choices[0].delta.content]
+
+        assert len(parts) > 1
+        assert "".join(parts).startswith("Photosynthesis")
+
+    @pytest.mark.asyncio
+    async def test_transcription_as_text(self):
+        """Test that Whisper-style uploads are answered in the requested format."""
+        client = fake_client()
+        text = await client.audio.transcriptions.create(
+            model="whisper-1", file=("lecture.wav", io.BytesIO(make_wav(1, 0))), response_format="text"
+        )
+
+        assert "cell biology" in text
+
+    @pytest.mark.asyncio
+    async def test_injected_rate_limit_and_errors(self):
+        """Test that injected failures surface as the SDK's rate-limit and server errors."""
+        messages = [{"role": "user", "content": "hi"}]
+        with pytest.raises(openai.RateLimitError):
+            await fake_client(rate_limit_rate=1.0).chat.completions.create(model="m", messages=messages)
+        with pytest.raises(openai.InternalServerError):
+            await fake_client(error_rate=1.0).chat.completions.create(model="m", messages=messages)
+
+    @pytest.mark.asyncio
+    async def test_requests_per_minute_budget(self):
+        """Test that calls over the per-minute budget get 429s with rate-limit headers."""
+        client = fake_client(requests_per_minute=2)
+        messages = [{"role": "user", "content": "hi"}]
+        first = await client.chat.completions.with_raw_response.create(model="m", messages=messages)
+        await client.chat.completions.create(model="m", messages=messages)
+
+        assert first.headers["x-ratelimit-remaining-requests"] == "1"
+        with pytest.raises(openai.RateLimitError):
+            await client.chat.completions.create(model="m", messages=messages)
+
+    def test_latency_specs(self):
+        """Test the latency distribution parser."""
+        assert parse_latency("fixed:0.5")(None) == 0.5
+        with pytest.raises(ValueError):
+            parse_latency("gamma:1,2")
+
+class TestLoadTestStatistics:
+    """Test suite for the load driver's result calculations."""
+
+    def test_percentile_is_nearest_rank(self):
+        """Test percentiles over a known distribution."""
+        values = [n / 100 for n in range(1, 101)]
+        assert percentile(values, 50) == 0.5
+        assert percentile(values, 99) == 0.99
+        assert percentile([], 50) is None
+
+    def test_event_loop_lag_from_two_scrapes(self):
+        """Test that lag is summarised from the histogram growth between scrapes."""
+        def scrape(fast, slow):
+            return parse_metrics(
+                f'studybuddy_event_loop_lag_seconds_bucket{{le="0.001"}} {fast}\n'
+                f'studybuddy_event_loop_lag_seconds_bucket{{le="0.1"}} {fast + slow}\n'
+                f'studybuddy_event_loop_lag_seconds_bucket{{le="+Inf"}} {fast + slow}\n'
+                f"studybuddy_event_loop_lag_seconds_sum {fast * 0.0005 + slow * 0.05}\n"
+                f"studybuddy_event_loop_lag_seconds_count {fast + slow}\n"
+            )
+
+        name = "studybuddy_event_loop_lag_seconds"
+        summary = histogram_delta_summary(histogram_state(scrape(10, 0), name), histogram_state(scrape(100, 10), name))
+
+        assert summary["samples"] == 100
+        assert summary["p99_upper_bound"] == 100.0
+        assert summary["mean"] == pytest.approx(5.45)
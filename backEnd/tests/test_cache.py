@@ -0,0 +1,140 @@
+"""
+Tests for the content-addressed result cache.
+
+Covers key normalization, LRU eviction and expiry, the persistent SQLite
+tier, and the tiered lookup/promotion logic with its hit/miss counters.
+"""
+
+import pytest
+from src.ai.cache import LRUCache, SQLiteCache, TieredCache, make_cache_key, normalize_text
+
+class TestCacheKeys:
+    """Test suite for content-addressed key generation."""
+
+    def test_whitespace_differences_share_a_key(self):
+        """Test that re-pasted text with different spacing hits the same entry."""
+        first = make_cache_key("summary", "Photosynthesis  is\nthe process.", learning_style="visual")
+        second = make_cache_key("summary", "  Photosynthesis is the process.  ", learning_style="visual")
+
+        assert first == second
+
+    @pytest.mark.parametrize("params", [
+        {"learning_style": "auditory", "max_tokens": 300},
+        {"learning_style": "visual", "max_tokens": 500},
+    ])
+    def test_parameters_change_the_key(self, params):
+        """Test that every output-shaping parameter is part of the key."""
+        base = make_cache_key("summary", "Same text", learning_style="visual", max_tokens=300)
+
+        assert make_cache_key("summary", "Same text", **params) != base
+
+    def test_namespace_prefixes_the_key(self):
+        """Test that keys from different caches never collide."""
+        assert make_cache_key("summary", "text").startswith("summary:")
+        assert make_cache_key("quiz", "text") != make_cache_key("summary", "text")
+
+    def test_normalize_text_preserves_case(self):
+        """Test that normalization only touches whitespace."""
+        assert normalize_text("  DNA\tis  Double\n") == "DNA is Double"
+
+class TestLRUCache:
+    """Test suite for the in-process LRU tier."""
+
+    def test_least_recently_used_entry_is_evicted(self):
+        """Test that the size cap evicts the coldest entry."""
+        cache = LRUCache(max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+
+    def test_entries_expire_after_ttl(self, clock):
+        """Test that stale entries are dropped on lookup."""
+        cache = LRUCache(max_entries=10, ttl_seconds=60, clock=clock)
+        cache.set("key", "value")
+
+        clock.now += 59
+        assert cache.get("key") == "value"
+
+        clock.now += 2
+        assert cache.get("key") is None
+        assert len(cache) == 0
+
+    def test_invalid_size_raises_value_error(self):
+        """Test that a zero-sized cache is rejected."""
+        with pytest.raises(ValueError, match="max_entries"):
+            LRUCache(max_entries=0)
+
+class TestSQLiteCache:
+    """Test suite for the persistent SQLite tier."""
+
+    def test_entries_survive_reopening(self, tmp_path):
+        """Test that cached values persist across process restarts."""
+        db_path = str(tmp_path / "cache.sqlite3")
+        first = SQLiteCache(db_path)
+        first.set("key", {"summary": "cached"})
+        first.close()
+
+        second = SQLiteCache(db_path)
+        assert second.get("key") == {"summary": "cached"}
+        second.close()
+
+    def test_least_recently_accessed_rows_are_evicted(self, tmp_path, clock):
+        """Test that the on-disk store stays bounded."""
+        cache = SQLiteCache(str(tmp_path / "cache.sqlite3"), max_entries=2, clock=clock)
+        cache.set("a", 1)
+        clock.now += 1
+        cache.set("b", 2)
+        clock.now += 1
+        cache.get("a")
+        clock.now += 1
+        cache.set("c", 3)
+
+        assert len(cache) == 2
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        cache.close()
+
+    def test_entries_expire_after_ttl(self, tmp_path, clock):
+        """Test that expired rows are not returned."""
+        cache = SQLiteCache(str(tmp_path / "cache.sqlite3"), ttl_seconds=10, clock=clock)
+        cache.set("key", "value")
+
+        clock.now += 11
+
+        assert cache.get("key") is None
+        cache.close()
+
+class TestTieredCache:
+    """Test suite for tiered lookups and counters."""
+
+    def test_hits_and_misses_are_counted(self):
+        """Test that stats reflect lookups."""
+        cache = TieredCache(LRUCache(), name="summary")
+        cache.get("missing")
+        cache.set("key", "value")
+        cache.get("key")
+
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_ratio"] == 0.5
+        assert stats["disk_enabled"] is False
+
+    def test_disk_hits_are_promoted_to_memory(self, tmp_path):
+        """Test that a warm disk tier refills an empty memory tier."""
+        disk = SQLiteCache(str(tmp_path / "cache.sqlite3"))
+        disk.set("key", "from disk")
+        cache = TieredCache(LRUCache(), disk)
+
+        assert cache.get("key") == "from disk"
+        assert cache.memory.get("key") == "from disk"
+        assert cache.stats()["disk_hits"] == 1
+
+        cache.get("key")
+        assert cache.stats()["memory_hits"] == 1
+        disk.close()
@@ -0,0 +1,73 @@
+"""
+Tests for boundary-aware text chunking.
+
+Verifies that chunks respect the size budget, break on paragraph and
+sentence boundaries, carry overlap between neighbours, and degrade
+gracefully on text without any natural boundaries.
+"""
+
+import pytest
+from src.ai.chunking import split_text
+
+class TestSplitText:
+    """Test suite for paragraph/sentence aware splitting."""
+    
+    def test_short_text_is_a_single_chunk(self):
+        """Test that text under the budget is returned unchanged."""
+        assert split_text("One paragraph.\n\nAnother one.", max_size=100) == [
+            "One paragraph.\n\nAnother one."
+        ]
+    
+    def test_blank_text_returns_no_chunks(self):
+        """Test that whitespace-only input produces nothing to summarize."""
+        assert split_text("  \n\n  ", max_size=100) == []
+    
+    def test_chunks_break_on_paragraph_boundaries(self):
+        """Test that whole paragraphs are kept together when they fit."""
+        paragraphs = [f"Paragraph {i} talks about topic {i}." for i in range(6)]
+        chunks = split_text("\n\n".join(paragraphs), max_size=80)
+        
+        assert all(len(chunk) <= 80 for chunk in chunks)
+        for chunk in chunks:
+            for part in chunk.split("\n\n"):
+                assert part in paragraphs
+    
+    def test_long_paragraph_breaks_on_sentences(self):
+        """Test that an oversized paragraph is cut between sentences, never inside one."""
+        sentences = [f"Sentence number {i} is here." for i in range(20)]
+        chunks = split_text(" ".join(sentences), max_size=120)
+        
+        assert len(chunks) > 1
+        assert all(len(chunk) <= 120 for chunk in chunks)
+        for chunk in chunks:
+            assert chunk.endswith(".")
+    
+    def test_overlap_repeats_trailing_sentences(self):
+        """Test that context spanning a boundary appears in both chunks."""
+        sentences = [f"Fact {i} matters." for i in range(12)]
+        chunks = split_text(" ".join(sentences), max_size=100, overlap=40)
+        
+        assert len(chunks) > 1
+        for previous, following in zip(chunks[:-1], chunks[1:], strict=True):
+            last_sentence = previous.split(". ")[-1]
+            assert last_sentence in following
+    
+    def test_text_without_boundaries_is_cut_by_words(self):
+        """Test the word-level fallback for one enormous sentence."""
+        chunks = split_text("word " * 200, max_size=50)
+        
+        assert all(len(chunk) <= 50 for chunk in chunks)
+        assert " ".join(chunks).split() == ["word"] * 200
+    
+    def test_custom_length_function(self):
+        """Test that budgets can be measured in units other than characters."""
+        text = " ".join(f"Sentence {i}." for i in range(10))
+        chunks = split_text(text, max_size=4, length_fn=lambda s: len(s.split()))
+        
+        assert all(len(chunk.split()) <= 4 for chunk in chunks)
+    
+    @pytest.mark.parametrize("max_size,overlap", [(0, 0), (100, 100), (100, -1)])
+    def test_invalid_sizes_raise_value_error(self, max_size, overlap):
+        """Test that nonsensical budgets are rejected."""
+        with pytest.raises(ValueError):
+            split_text("Some text.", max_size=max_size, overlap=overlap)
@@ -0,0 +1,162 @@
+"""
+Tests for the upstream circuit breakers.
+
+Covers opening after consecutive upstream failures, fast rejection while
+open, half-open probing, and the 503 / cache fallback seen by API clients.
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+import httpx
+import openai
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from src.ai import circuit_breaker
+from src.ai.circuit_breaker import CHAT_COMPLETIONS, CircuitBreaker, CircuitOpenError, get_breaker
+from src.ai.summarizer import summarize_text_cached
+from src.api.routes.summarization import router
+
+def connection_error():
+    return openai.APIConnectionError(request=httpx.Request("POST", "https://api.openai.com/v1/chat/completions"))
+
+def failing_sync():
+    raise connection_error()
+
+async def failing():
+    raise connection_error()
+
+async def succeeding():
+    return "ok"
+
+async def trip(breaker):
+    for _ in range(breaker.failure_threshold):
+        with pytest.raises(openai.APIConnectionError):
+            await breaker.call_async(failing)
+
+class TestCircuitBreaker:
+    """Test suite for breaker state transitions."""
+
+    @pytest.mark.asyncio
+    async def test_opens_after_consecutive_failures_and_fails_fast(self, clock):
+        """Test that an open circuit rejects calls without running them."""
+        breaker = CircuitBreaker("chat", failure_threshold=3, recovery_seconds=30, clock=clock)
+        await trip(breaker)
+        request = AsyncMock()
+
+        with pytest.raises(CircuitOpenError) as info:
+            await breaker.call_async(request)
+
+        request.assert_not_called()
+        assert info.value.retry_after == 30
+        assert breaker.stats() == {"state": "open", "consecutive_failures": 3, "opened": 1, "rejected": 1}
+
+    @pytest.mark.asyncio
+    async def test_success_resets_the_failure_streak(self):
+        """Test that only consecutive failures count towards opening."""
+        breaker = CircuitBreaker("chat", failure_threshold=2)
+        with pytest.raises(openai.APIConnectionError):
+            await breaker.call_async(failing)
+        await breaker.call_async(succeeding)
+        with pytest.raises(openai.APIConnectionError):
+            await breaker.call_async(failing)
+
+        assert breaker.state == "closed"
+
+    @pytest.mark.asyncio
+    async def test_answered_errors_do_not_open_the_circuit(self):
+        """Test that errors the upstream answered with say nothing about its health."""
+        breaker = CircuitBreaker("chat", failure_threshold=1)
+
+        async def bad_request():
+            raise ValueError("Input text cannot be empty")
+
+        with pytest.raises(ValueError):
+            await breaker.call_async(bad_request)
+        assert breaker.state == "closed"
+
+    @pytest.mark.asyncio
+    async def test_half_open_probe_success_closes_circuit(self, clock):
+        """Test that one probe is let through after the recovery time and closes the circuit."""
+        breaker = CircuitBreaker("chat", failure_threshold=1, recovery_seconds=30, clock=clock)
+        await trip(breaker)
+
+        clock.now += 30
+        assert breaker.state == "half_open"
+        assert await breaker.call_async(succeeding) == "ok"
+        assert breaker.state == "closed"
+
+    @pytest.mark.asyncio
+    async def test_failed_probe_reopens_for_another_recovery_period(self, clock):
+        """Test that a failing probe re-opens the circuit from now."""
+        breaker = CircuitBreaker("chat", failure_threshold=1, recovery_seconds=30, clock=clock)
+        await trip(breaker)
+
+        clock.now += 30
+        with pytest.raises(openai.APIConnectionError):
+            await breaker.call_async(failing)
+
+        assert breaker.state == "open"
+        clock.now += 29
+        with pytest.raises(CircuitOpenError):
+            await breaker.call_async(succeeding)
+
+    def test_only_one_probe_at_a_time(self, clock):
+        """Test that callers arriving while the probe is in flight are still rejected."""
+        breaker = CircuitBreaker("chat", failure_threshold=1, recovery_seconds=30, clock=clock)
+        with pytest.raises(openai.APIConnectionError):
+            breaker.call(failing_sync)
+        clock.now += 30
+
+        def probe():
+            with pytest.raises(CircuitOpenError):
+                breaker.call(lambda: "second")
+            return "probe"
+
+        assert breaker.call(probe) == "probe"
+        assert breaker.state == "closed"
+
+class TestCircuitOpenResponses:
+    """Test suite for how an open circuit reaches API clients."""
+
+    @pytest.fixture
+    def client(self):
+        app = FastAPI()
+        app.include_router(router)
+        return TestClient(app)
+
+    @pytest.fixture
+    def open_chat_circuit(self, monkeypatch, clock):
+        breaker = CircuitBreaker(CHAT_COMPLETIONS, failure_threshold=1, recovery_seconds=12.5, clock=clock)
+        monkeypatch.setitem(circuit_breaker._breakers, CHAT_COMPLETIONS, breaker)
+        with pytest.raises(openai.APIConnectionError):
+            breaker.call(failing_sync)
+        return breaker
+
+    def test_summarize_returns_503_with_retry_after(self, client, open_chat_circuit):
+        """Test that a cache miss fails fast with a 503 instead of the apology text."""
+        with patch("src.ai.summarizer.async_client") as mock_client:
+            mock_client.chat.completions.create = AsyncMock()
+            response = client.post("/api/summarize", json={"text": "Cells divide by mitosis."})
+
+            mock_client.chat.completions.create.assert_not_called()
+
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "13"
+
+    @pytest.mark.asyncio
+    async def test_cached_summaries_are_still_served(self):
+        """Test that results cached before the outage keep being answered."""
+        with patch("src.ai.summarizer.async_client") as mock_client:
+            mock_client.chat.completions.create = AsyncMock(
+                return_value=MagicMock(choices=[MagicMock(message=MagicMock(content="Mitosis summary"))])
+            )
+            await summarize_text_cached("Cells divide by mitosis.")
+
+        breaker = get_breaker(CHAT_COMPLETIONS)
+        breaker.failure_threshold = 1
+        with pytest.raises(openai.APIConnectionError):
+            await breaker.call_async(failing)
+
+        assert await summarize_text_cached("Cells divide by mitosis.") == ("Mitosis summary", True)
+        with pytest.raises(CircuitOpenError):
+            await summarize_text_cached("Something not cached yet.")
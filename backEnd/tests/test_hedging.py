@@ -0,0 +1,145 @@
+"""
+Tests for hedged upstream requests.
+
+Covers the percentile hedge delay, first-response-wins with loser
+cancellation, error handling when one of the two calls fails, and the
+hedge budget that keeps extra spend bounded.
+"""
+
+import asyncio
+import pytest
+from src.ai.hedging import Hedger
+
+def warmed_hedger(latency=0.01, samples=20, **kwargs):
+    """Hedger whose latency history says calls normally take `latency` seconds."""
+    hedger = Hedger("test", enabled=True, min_samples=samples, **kwargs)
+    for _ in range(samples):
+        hedger._record(latency)
+    return hedger
+
+class TestHedgeDelay:
+    """Test suite for the latency percentile."""
+
+    def test_no_hedging_before_enough_samples(self):
+        """Test that the delay is unknown until the window has min_samples calls."""
+        hedger = Hedger("test", enabled=True, min_samples=5)
+        for latency in (0.1, 0.2, 0.3, 0.4):
+            hedger._record(latency)
+        assert hedger.hedge_delay() is None
+
+    def test_delay_is_the_configured_percentile(self):
+        """Test that the hedge fires after the p-th percentile of recent latencies."""
+        hedger = Hedger("test", enabled=True, percentile=90, min_samples=10)
+        for n in range(1, 11):
+            hedger._record(n / 10)
+        assert hedger.hedge_delay() == pytest.approx(0.9)
+
+class TestHedgedCalls:
+    """Test suite for racing the original call against a hedge."""
+
+    @pytest.mark.asyncio
+    async def test_fast_call_is_never_hedged(self):
+        """Test that calls inside the normal latency range run once."""
+        hedger = warmed_hedger(latency=0.05, budget=1.0)
+        calls = 0
+
+        async def request():
+            nonlocal calls
+            calls += 1
+            return "ok"
+
+        assert await hedger.call_async(request) == "ok"
+        assert calls == 1
+        assert hedger.stats()["hedged"] == 0
+
+    @pytest.mark.asyncio
+    async def test_slow_call_is_hedged_and_loser_cancelled(self):
+        """Test that a straggler is raced by a second call and cancelled when it loses."""
+        hedger = warmed_hedger(latency=0.01, budget=1.0)
+        attempts = []
+        cancelled = []
+
+        async def request():
+            attempt = len(attempts)
+            attempts.append(attempt)
+            try:
+                await asyncio.sleep(5 if attempt == 0 else 0.01)
+            except asyncio.CancelledError:
+                cancelled.append(attempt)
+                raise
+            return f"call {attempt}"
+
+        result = await asyncio.wait_for(hedger.call_async(request), 1)
+
+        assert result == "call 1"
+        await asyncio.sleep(0)
+        assert cancelled == [0]
+        assert hedger.stats()["hedged"] == 1
+        assert hedger.stats()["hedge_wins"] == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_call_waits_for_the_other(self):
+        """Test that a failing hedge does not hide a slow but successful original."""
+        hedger = warmed_hedger(latency=0.01, budget=1.0)
+        attempts = []
+
+        async def request():
+            attempt = len(attempts)
+            attempts.append(attempt)
+            if attempt == 0:
+                await asyncio.sleep(0.05)
+                return "original"
+            raise RuntimeError("hedge failed")
+
+        assert await hedger.call_async(request) == "original"
+
+    @pytest.mark.asyncio
+    async def test_both_failing_raises_the_original_error(self):
+        """Test that when both calls fail the original call's error is raised."""
+        hedger = warmed_hedger(latency=0.01, budget=1.0)
+        attempts = []
+
+        async def request():
+            attempt = len(attempts)
+            attempts.append(attempt)
+            await asyncio.sleep(0.05 if attempt == 0 else 0)
+            raise RuntimeError(f"call {attempt} failed")
+
+        with pytest.raises(RuntimeError, match="call 0 failed"):
+            await hedger.call_async(request)
+
+    @pytest.mark.asyncio
+    async def test_budget_caps_the_hedge_rate(self):
+        """Test that at most the budgeted fraction of calls send a hedge."""
+        hedger = warmed_hedger(latency=0.001, samples=200, budget=0.25)
+
+        async def slow():
+            await asyncio.sleep(0.01)
+            return "ok"
+
+        for _ in range(8):
+            await hedger.call_async(slow)
+
+        stats = hedger.stats()
+        assert stats["calls"] == 8
+        assert stats["hedged"] == 2
+        assert stats["budget_exhausted"] == 6
+
+    @pytest.mark.asyncio
+    async def test_disabled_hedger_only_measures(self):
+        """Test that a disabled hedger never duplicates calls but still learns latencies."""
+        hedger = Hedger("test", enabled=False, min_samples=1)
+        calls = 0
+
+        async def request():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "ok"
+
+        await hedger.call_async(request)
+        await hedger.call_async(request)
+
+        assert calls == 2
+        assert hedger.stats()["hedged"] == 0
+        assert hedger.hedge_delay() is not None
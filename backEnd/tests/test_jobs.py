@@ -0,0 +1,297 @@
+"""
+Tests for the background job queue.
+
+Verifies that jobs persist across store instances (a worker restart),
+that interrupted jobs are requeued, that the worker pool caps concurrency
+and records progress, results and failures.
+"""
+
+import asyncio
+import sqlite3
+import pytest
+from src.api import jobs
+from src.api.jobs import JobStore, JobWorkerPool, QUEUED, RUNNING, COMPLETED, FAILED
+
+@pytest.fixture
+def store(tmp_path):
+    job_store = JobStore(str(tmp_path / "jobs.sqlite3"))
+    yield job_store
+    job_store.close()
+
+async def wait_for_status(store, job_id, expected, timeout=2.0):
+    """Poll the store until a job reaches the expected status."""
+    deadline = asyncio.get_running_loop().time() + timeout
+    while asyncio.get_running_loop().time() < deadline:
+        job = store.get(job_id)
+        if job["status"] == expected:
+            return job
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"Job {job_id} did not reach {expected}: {store.get(job_id)['status']}")
+
+class TestJobStore:
+    """Test suite for the SQLite job store."""
+
+    def test_jobs_survive_reopening_the_store(self, tmp_path):
+        """Test that queued jobs are still there after a restart."""
+        path = str(tmp_path / "jobs.sqlite3")
+        first = JobStore(path)
+        job = first.create("transcription", {"filename": "lecture.wav"})
+        first.close()
+
+        second = JobStore(path)
+        try:
+            reloaded = second.get(job["id"])
+            assert reloaded["status"] == QUEUED
+            assert reloaded["payload"] == {"filename": "lecture.wav"}
+        finally:
+            second.close()
+
+    def test_shared_store_is_opened_on_first_use(self, tmp_path, monkeypatch):
+        """Test that the process-wide store opens its database when used, not at import."""
+        monkeypatch.setattr(jobs, "JOB_DB", str(tmp_path / "jobs.sqlite3"))
+        monkeypatch.setattr(jobs, "_job_store", None)
+        assert not (tmp_path / "jobs.sqlite3").exists()
+
+        job = jobs.job_store.create("transcription", {"n": 1})
+        assert (tmp_path / "jobs.sqlite3").exists()
+        assert jobs.get_job_store().get(job["id"])["status"] == QUEUED
+
+        jobs.close_job_store()
+        assert jobs._job_store is None
+
+    def test_claim_is_fifo_and_exclusive(self, store):
+        """Test that jobs are claimed oldest first and only once."""
+        clock = iter(range(100))
+        store._clock = lambda: next(clock)
+        first = store.create("transcription", {"n": 1})
+        second = store.create("transcription", {"n": 2})
+
+        assert store.claim_next("transcription")["id"] == first["id"]
+        assert store.claim_next("transcription")["id"] == second["id"]
+        assert store.claim_next("transcription") is None
+        assert store.get(first["id"])["status"] == RUNNING
+
+    def test_claim_filters_by_kind(self, store):
+        """Test that a pool only sees jobs of its own kind."""
+        store.create("other", {})
+        assert store.claim_next("transcription") is None
+
+    def test_interrupted_jobs_are_requeued(self, store):
+        """Test that running jobs go back to the queue after a restart."""
+        job = store.create("transcription", {})
+        store.claim_next("transcription")
+        store.set_progress(job["id"], 0.5)
+
+        assert store.requeue_interrupted() == 1
+        requeued = store.get(job["id"])
+        assert requeued["status"] == QUEUED
+        assert requeued["progress"] == 0
+
+    def test_requeue_and_counts_can_be_limited_to_one_kind(self, store):
+        """Test that starting one pool leaves another kind's running jobs alone."""
+        transcription = store.create("transcription", {})
+        warmup = store.create("warmup", {})
+        store.claim_next("transcription")
+        store.claim_next("warmup")
+
+        assert store.requeue_interrupted("warmup") == 1
+        assert store.get(transcription["id"])["status"] == RUNNING
+        assert store.get(warmup["id"])["status"] == QUEUED
+        assert store.counts("transcription")[RUNNING] == 1
+        assert store.counts("transcription")[QUEUED] == 0
+
+    def test_processes_sharing_a_database_claim_each_job_once(self, tmp_path):
+        """Test that a second process neither claims nor requeues a job the first one is running."""
+        now = [1000.0]
+        path = str(tmp_path / "shared.sqlite3")
+        first = JobStore(path, clock=lambda: now[0], lease_seconds=60)
+        second = JobStore(path, clock=lambda: now[0], lease_seconds=60)
+        try:
+            job = first.create("transcription", {})
+            assert first.claim_next("transcription")["id"] == job["id"]
+            assert second.claim_next("transcription") is None
+            assert second.requeue_interrupted("transcription") == 0
+
+            now[0] += 45
+            assert first.renew_lease(job["id"])
+            now[0] += 45
+            assert second.requeue_interrupted("transcription") == 0
+
+            # The first process stops renewing (it crashed); the lease runs out
+            now[0] += 61
+            assert second.requeue_interrupted("transcription") == 1
+            assert second.claim_next("transcription")["id"] == job["id"]
+            assert not first.renew_lease(job["id"])
+        finally:
+            first.close()
+            second.close()
+
+    def test_worker_that_lost_its_lease_cannot_finish_the_job(self, tmp_path):
+        """Test that a stale worker's result or failure does not overwrite the new run."""
+        now = [1000.0]
+        path = str(tmp_path / "shared.sqlite3")
+        first = JobStore(path, clock=lambda: now[0], lease_seconds=60)
+        second = JobStore(path, clock=lambda: now[0], lease_seconds=60)
+        try:
+            job = first.create("transcription", {})
+            first.claim_next("transcription")
+            now[0] += 61
+            assert second.requeue_interrupted("transcription") == 1
+            second.claim_next("transcription")
+
+            assert not first.complete(job["id"], {"text": "stale"})
+            assert not first.fail(job["id"], "stale failure")
+            assert second.get(job["id"])["status"] == RUNNING
+
+            assert second.complete(job["id"], {"text": "fresh"})
+            assert not second.fail(job["id"], "too late")
+            finished = second.get(job["id"])
+            assert (finished["status"], finished["result"]) == (COMPLETED, {"text": "fresh"})
+        finally:
+            first.close()
+            second.close()
+
+    def test_purge_removes_only_old_finished_jobs(self, store):
+        """Test that retention keeps pending and recent jobs."""
+        now = [1000.0]
+        store._clock = lambda: now[0]
+        old = store.create("transcription", {})
+        pending = store.create("transcription", {})
+        store.claim_next("transcription")
+        store.complete(old["id"], {"ok": True})
+
+        now[0] = 5000.0
+        purged = store.purge_finished(older_than_seconds=3600)
+
+        assert [job["id"] for job in purged] == [old["id"]]
+        assert store.get(old["id"]) is None
+        assert store.get(pending["id"]) is not None
+
+class TestJobWorkerPool:
+    """Test suite for the asyncio worker pool."""
+
+    @pytest.mark.asyncio
+    async def test_job_completes_with_result_and_progress(self, store):
+        """Test that a processed job stores its result."""
+        progress_seen = []
+
+        async def processor(job, report_progress):
+            report_progress(0.5)
+            progress_seen.append(store.get(job["id"])["progress"])
+            return {"echo": job["payload"]["text"]}
+
+        pool = JobWorkerPool(store, "transcription", processor, concurrency=1, poll_interval=0.01)
+        await pool.start()
+        try:
+            job = pool.submit({"text": "hello"})
+            finished = await wait_for_status(store, job["id"], COMPLETED)
+        finally:
+            await pool.stop()
+
+        assert finished["result"] == {"echo": "hello"}
+        assert finished["progress"] == 1
+        assert progress_seen == [0.5]
+
+    @pytest.mark.asyncio
+    async def test_errors_are_recorded_with_http_status(self, store):
+        """Test that ValueError maps to 400 and RuntimeError to 500."""
+        async def processor(job, report_progress):
+            if job["payload"]["error"] == "value":
+                raise ValueError("Audio too long")
+            raise RuntimeError("Upstream down")
+
+        pool = JobWorkerPool(store, "transcription", processor, concurrency=1, poll_interval=0.01)
+        await pool.start()
+        try:
+            invalid = pool.submit({"error": "value"})
+            broken = pool.submit({"error": "runtime"})
+            invalid_job = await wait_for_status(store, invalid["id"], FAILED)
+            broken_job = await wait_for_status(store, broken["id"], FAILED)
+        finally:
+            await pool.stop()
+
+        assert (invalid_job["error"], invalid_job["error_status"]) == ("Audio too long", 400)
+        assert (broken_job["error"], broken_job["error_status"]) == ("Upstream down", 500)
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self, store):
+        """Test that no more than `concurrency` jobs run at once."""
+        active = 0
+        peak = 0
+
+        async def processor(job, report_progress):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.02)
+            active -= 1
+            return {}
+
+        pool = JobWorkerPool(store, "transcription", processor, concurrency=2, poll_interval=0.01)
+        await pool.start()
+        try:
+            jobs = [pool.submit({}) for _ in range(6)]
+            for job in jobs:
+                await wait_for_status(store, job["id"], COMPLETED)
+        finally:
+            await pool.stop()
+
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_restart_resumes_interrupted_job(self, store):
+        """Test that a job cut off by shutdown runs again on the next start."""
+        started = asyncio.Event()
+        calls = []
+
+        async def slow_processor(job, report_progress):
+            calls.append(job["id"])
+            started.set()
+            await asyncio.sleep(10)
+
+        pool = JobWorkerPool(store, "transcription", slow_processor, concurrency=1, poll_interval=0.01)
+        await pool.start()
+        job = pool.submit({})
+        await asyncio.wait_for(started.wait(), timeout=2)
+        await pool.stop()
+        assert store.get(job["id"])["status"] == RUNNING
+
+        async def fast_processor(job, report_progress):
+            calls.append(job["id"])
+            return {"done": True}
+
+        restarted = JobWorkerPool(store, "transcription", fast_processor, concurrency=1, poll_interval=0.01)
+        await restarted.start()
+        try:
+            finished = await wait_for_status(store, job["id"], COMPLETED)
+        finally:
+            await restarted.stop()
+
+        assert calls == [job["id"], job["id"]]
+        assert finished["result"] == {"done": True}
+
+    @pytest.mark.asyncio
+    async def test_worker_survives_database_errors(self, store, monkeypatch):
+        """Test that a failing claim is retried instead of stopping the worker."""
+        claim_next = store.claim_next
+        failures = iter([sqlite3.OperationalError("database is locked")] * 2)
+
+        def flaky_claim(kind):
+            error = next(failures, None)
+            if error is not None:
+                raise error
+            return claim_next(kind)
+
+        async def processor(job, report_progress):
+            return {"done": True}
+
+        monkeypatch.setattr(store, "claim_next", flaky_claim)
+        pool = JobWorkerPool(store, "transcription", processor, concurrency=1, poll_interval=0.01)
+        await pool.start()
+        try:
+            job = pool.submit({})
+            finished = await wait_for_status(store, job["id"], COMPLETED)
+        finally:
+            await pool.stop()
+
+        assert finished["result"] == {"done": True}
@@ -0,0 +1,68 @@
+"""
+Tests for the incremental JSON array parser.
+
+Verifies that elements are emitted as soon as they close regardless of how
+the stream is cut into pieces, that strings containing brackets and escapes
+do not confuse the scanner, and that non-array responses are rejected.
+"""
+
+import json
+import pytest
+from src.ai.json_stream import JSONArrayStreamParser
+
+def _feed_in_pieces(content, size):
+    """Feed content in fixed-size pieces and collect every emitted element."""
+    parser = JSONArrayStreamParser()
+    elements = []
+    for start in range(0, len(content), size):
+        elements.extend(parser.feed(content[start:start + size]))
+    return parser, elements
+
+class TestJSONArrayStreamParser:
+    """Test suite for streamed JSON array parsing."""
+    
+    @pytest.mark.parametrize("size", [1, 3, 17, 10000])
+    def test_elements_match_json_loads_for_any_split(self, size):
+        """Test that piece boundaries never change the parsed result."""
+        data = [
+            {"question": "Is [this] {tricky}?", "options": ["A, B", "\"quoted\""], "n": 1},
+            {"nested": {"list": [1, 2, [3]]}, "escape": "back\\\\slash"},
+            "plain string",
+            42,
+            None,
+        ]
+        parser, elements = _feed_in_pieces(json.dumps(data), size)
+        
+        assert elements == data
+        assert parser.done
+    
+    def test_object_is_emitted_when_its_brace_closes(self):
+        """Test that an object does not wait for the following comma."""
+        parser = JSONArrayStreamParser()
+        
+        assert parser.feed('[{"q": 1}') == [{"q": 1}]
+        assert parser.feed(', {"q": 2') == []
+        assert parser.feed('}]') == [{"q": 2}]
+    
+    def test_code_fence_and_trailing_text_are_ignored(self):
+        """Test that markdown wrapping around the array is skipped."""
+        _, elements = _feed_in_pieces('```json\n[{"q": 1}]\n```', 4)
+        
+        assert elements == [{"q": 1}]
+    
+    def test_unterminated_array_is_not_done(self):
+        """Test that a truncated stream can be detected by the caller."""
+        parser, elements = _feed_in_pieces('[{"q": 1}, {"q": ', 5)
+        
+        assert elements == [{"q": 1}]
+        assert parser.started and not parser.done
+    
+    def test_top_level_object_raises_value_error(self):
+        """Test that a response that is not a list is rejected immediately."""
+        with pytest.raises(ValueError, match="must be a list"):
+            JSONArrayStreamParser().feed('{"questions": []}')
+    
+    def test_malformed_element_raises_decode_error(self):
+        """Test that a broken element surfaces as a JSON error."""
+        with pytest.raises(json.JSONDecodeError):
+            JSONArrayStreamParser().feed('[{"q": oops}]')
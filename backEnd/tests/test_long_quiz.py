@@ -0,0 +1,182 @@
+"""
+Tests for long-content, section-parallel quiz generation.
+
+Covers question allocation by content weight, concurrent per-section calls,
+cross-section near-duplicate removal, the single-section shortcut and
+error mapping in the route.
+"""
+
+import asyncio
+import json
+import re
+from unittest.mock import AsyncMock, MagicMock, patch
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from src.ai.cache import text_digest
+from src.ai.long_quiz import allocate_questions, allocate_types, generate_long_quiz_async
+from src.api.routes.quiz import router
+
+SHARED_QUESTION = "What is known as the powerhouse of the cell?"
+
+def _document(paragraphs, size=1000):
+    """Build a document of distinct paragraphs of roughly `size` characters."""
+    return "\n\n".join(
+        f"Topic{i} covers enzyme{i} and pathway{i}. " + ("Cells convert glucose into usable energy. " * (size // 42))
+        for i in range(paragraphs)
+    )
+
+def _question(text, question_type="multiple_choice"):
+    if question_type == "true_false":
+        return {"question_type": question_type, "question": text, "correct_answer": True,
+                "explanation": "Stated in the section.", "difficulty": "easy"}
+    if question_type == "short_answer":
+        return {"question_type": question_type, "question": text, "correct_answer": "Glucose",
+                "explanation": "Stated in the section.", "difficulty": "medium"}
+    return {
+        "question": text,
+        "options": ["Option A", "Option B", "Option C", "Option D"],
+        "correct_answer": "A",
+        "explanation": "Stated in the section.",
+        "difficulty": "medium"
+    }
+
+class FakeQuizModel:
+    """Chat completion stand-in writing distinct questions for every section."""
+
+    def __init__(self, shared_first_question=False):
+        self.shared_first_question = shared_first_question
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.requested = []
+
+    async def create(self, **kwargs):
+        prompt = kwargs["messages"][0]["content"]
+        count = int(re.search(r"Create (\d+)", prompt).group(1))
+        mix = re.search(r"from the given text: (.*)\.", prompt).group(1)
+        types = [
+            question_type for n, question_type in re.findall(r"(\d+) (\w+)", mix) for _ in range(int(n))
+        ]
+        section = kwargs["messages"][1]["content"]
+        self.requested.append(count)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+
+        questions = []
+        for n in range(count):
+            digest = text_digest(f"{section}-{n}")
+            questions.append(_question(f"What is {digest[:12]} {digest[12:24]} {digest[24:36]}?", types[n]))
+        if self.shared_first_question:
+            questions[0] = _question(SHARED_QUESTION)
+        response = MagicMock()
+        response.choices = [MagicMock(message=MagicMock(content=json.dumps(questions)))]
+        return response
+
+class TestAllocateQuestions:
+    """Test suite for sharing questions among sections."""
+
+    def test_shares_follow_weights_and_add_up(self):
+        """Test proportional shares with the largest-remainder rounding."""
+        assert allocate_questions([10, 10, 10], 10) == [4, 3, 3]
+        assert allocate_questions([3, 1], 8) == [6, 2]
+
+    def test_per_section_cap_moves_questions_elsewhere(self):
+        """Test that a dominant section never gets more than one call can produce."""
+        assert allocate_questions([100, 1, 1], 25) == [10, 8, 7]
+
+    def test_types_are_interleaved_over_the_sections(self):
+        """Test that per-type totals are exact and every section gets a mix."""
+        shares = allocate_types({"multiple_choice": 3, "true_false": 2, "short_answer": 1}, [2, 2, 2])
+
+        assert shares == [
+            {"multiple_choice": 1, "true_false": 1},
+            {"short_answer": 1, "multiple_choice": 1},
+            {"true_false": 1, "multiple_choice": 1},
+        ]
+
+    def test_too_many_questions_for_the_content(self):
+        """Test that impossible requests are rejected before any API spend."""
+        with pytest.raises(ValueError):
+            allocate_questions([5, 5], 21)
+
+class TestGenerateLongQuiz:
+    """Test suite for section-parallel quiz generation."""
+
+    @pytest.mark.asyncio
+    async def test_long_document_is_quizzed_section_by_section_in_parallel(self):
+        """Test that a 40-question exam comes from concurrent section calls."""
+        model = FakeQuizModel()
+        with patch("src.ai.quiz_generator.async_client") as mock_client:
+            mock_client.chat.completions.create = AsyncMock(side_effect=model.create)
+
+            result = await generate_long_quiz_async(_document(30), num_questions=40, max_concurrency=8)
+
+        assert len(result["questions"]) == 40
+        assert result["section_count"] == len(model.requested) > 4
+        assert result["duplicates_removed"] == 0
+        assert all(count <= 10 for count in model.requested)
+        assert model.max_in_flight > 1
+
+    @pytest.mark.asyncio
+    async def test_question_type_mix_holds_across_small_sections(self):
+        """Test that a three-type exam over many one- and two-question sections keeps its mix."""
+        model = FakeQuizModel()
+        with patch("src.ai.quiz_generator.async_client") as mock_client:
+            mock_client.chat.completions.create = AsyncMock(side_effect=model.create)
+
+            result = await generate_long_quiz_async(
+                _document(30), num_questions=40,
+                question_types=["multiple_choice", "true_false", "short_answer"]
+            )
+
+        types = [q.get("question_type", "multiple_choice") for q in result["questions"]]
+        assert len(types) == 40
+        assert (types.count("multiple_choice"), types.count("true_false"), types.count("short_answer")) == (14, 13, 13)
+
+    @pytest.mark.asyncio
+    async def test_near_duplicates_across_sections_are_replaced(self):
+        """Test that a question repeated by every section is kept once and made up from surplus."""
+        model = FakeQuizModel(shared_first_question=True)
+        with patch("src.ai.quiz_generator.async_client") as mock_client:
+            mock_client.chat.completions.create = AsyncMock(side_effect=model.create)
+
+            result = await generate_long_quiz_async(_document(30), num_questions=20)
+
+        texts = [q["question"] for q in result["questions"]]
+        assert len(texts) == 20
+        assert texts.count(SHARED_QUESTION) == 1
+        assert result["duplicates_removed"] == result["section_count"] - 1
+
+    @pytest.mark.asyncio
+    async def test_short_document_is_one_regular_quiz_call(self):
+        """Test that content fitting one call asks for exactly the requested questions."""
+        model = FakeQuizModel()
+        with patch("src.ai.quiz_generator.async_client") as mock_client:
+            mock_client.chat.completions.create = AsyncMock(side_effect=model.create)
+
+            result = await generate_long_quiz_async(_document(2), num_questions=5)
+
+        assert model.requested == [5]
+        assert result["section_count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_section_failure_raises_runtime_error(self):
+        """Test that upstream failures surface as RuntimeError."""
+        with patch("src.ai.quiz_generator.async_client") as mock_client:
+            mock_client.chat.completions.create = AsyncMock(side_effect=Exception("boom"))
+
+            with pytest.raises(RuntimeError):
+                await generate_long_quiz_async(_document(30), num_questions=20)
+
+    def test_route_rejects_more_questions_than_the_content_supports(self):
+        """Test that a short text asked for a long exam gets a 400."""
+        app = FastAPI()
+        app.include_router(router)
+
+        response = TestClient(app).post(
+            "/api/quiz/generate/long", json={"text": _document(1, size=200), "num_questions": 30}
+        )
+
+        assert response.status_code == 400
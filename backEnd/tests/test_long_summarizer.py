@@ -0,0 +1,167 @@
+"""
+Tests for long-document map-reduce summarization.
+
+Covers the single-call shortcut for short documents, the concurrent map
+pass, hierarchical reduction, the concurrency limit, caching of the final
+result, and error mapping.
+"""
+
+import asyncio
+import pytest
+from unittest.mock import patch, MagicMock, AsyncMock
+from src.ai import long_summarizer
+from src.ai.long_summarizer import summarize_long_text_async
+from src.ai.summarizer import summary_cache
+from src.ai.tokens import count_tokens
+
+def _response(content):
+    """Build a chat completion mock with the given content."""
+    response = MagicMock()
+    response.choices = [MagicMock(message=MagicMock(content=content))]
+    return response
+
+def _document(paragraphs, size=500):
+    """Build a document of distinct paragraphs of roughly `size` characters."""
+    return "\n\n".join(
+        f"Paragraph {i}. " + ("The mitochondria produces energy for the cell. " * (size // 48))
+        for i in range(paragraphs)
+    )
+
+class TestSummarizeLongText:
+    """Test suite for map-reduce summarization of long documents."""
+    
+    @pytest.fixture
+    def mock_async_client(self):
+        """Async client mock returning short notes for every call."""
+        with patch("src.ai.long_summarizer.async_client") as mock_client:
+            mock_client.chat.completions.create = AsyncMock(return_value=_response("Short notes."))
+            yield mock_client
+    
+    @pytest.mark.asyncio
+    async def test_short_document_uses_a_single_call(self, mock_async_client):
+        """Test that documents under the single-call limit skip map-reduce."""
+        result = await summarize_long_text_async("Photosynthesis converts light into energy.")
+        
+        assert result["chunk_count"] == 1
+        assert result["reduce_levels"] == 0
+        assert result["api_calls"] == 1
+        assert result["summary"] == "Short notes."
+    
+    @pytest.mark.asyncio
+    async def test_long_document_is_mapped_then_summarized(self, mock_async_client):
+        """Test that every chunk is condensed before the final styled pass."""
+        result = await summarize_long_text_async(_document(60), learning_style="visual")
+        
+        calls = mock_async_client.chat.completions.create.call_args_list
+        assert result["chunk_count"] > 1
+        assert result["api_calls"] == result["chunk_count"] + 1
+        assert calls[0][1]["messages"][0]["content"] == long_summarizer.MAP_SYSTEM_PROMPT
+        assert "visual" in calls[-1][1]["messages"][0]["content"].lower()
+    
+    @pytest.mark.asyncio
+    async def test_large_notes_trigger_hierarchical_reduce(self, mock_async_client, monkeypatch):
+        """Test that notes too large for one call are reduced level by level."""
+        monkeypatch.setattr(long_summarizer, "MAX_INPUT_CHARS", 2000)
+        monkeypatch.setattr(long_summarizer, "CHUNK_TOKENS", 250)
+        monkeypatch.setattr(long_summarizer, "CHUNK_OVERLAP_TOKENS", 0)
+        
+        async def create(**kwargs):
+            if kwargs["messages"][0]["content"] == long_summarizer.MAP_SYSTEM_PROMPT:
+                return _response("n" * 300)
+            return _response("Merged notes.")
+        mock_async_client.chat.completions.create = AsyncMock(side_effect=create)
+        
+        result = await summarize_long_text_async(_document(20))
+        
+        assert result["reduce_levels"] == 1
+        assert result["api_calls"] > result["chunk_count"] + 1
+    
+    @pytest.mark.asyncio
+    async def test_notes_are_reduced_until_they_fit_the_final_token_budget(self, mock_async_client, monkeypatch):
+        """Test that reduction is driven by tokens, not by the character limit."""
+        monkeypatch.setattr(long_summarizer, "CHUNK_TOKENS", 250)
+        monkeypatch.setattr(long_summarizer, "CHUNK_OVERLAP_TOKENS", 0)
+        
+        async def create(**kwargs):
+            if kwargs["messages"][0]["content"] == long_summarizer.MAP_SYSTEM_PROMPT:
+                return _response("n" * 300)
+            return _response("Merged notes.")
+        mock_async_client.chat.completions.create = AsyncMock(side_effect=create)
+        
+        result = await summarize_long_text_async(_document(60))
+        
+        # The map notes are well under MAX_INPUT_CHARS but far over 250 tokens
+        assert result["chunk_count"] * 300 < long_summarizer.MAX_INPUT_CHARS
+        assert result["reduce_levels"] >= 1
+        final_input = mock_async_client.chat.completions.create.call_args_list[-1][1]["messages"][1]["content"]
+        final_notes = final_input.removeprefix("Summarize this text for studying:\n\n")
+        assert count_tokens(final_notes, long_summarizer.SUMMARY_MODEL) <= 250
+    
+    @pytest.mark.asyncio
+    async def test_chunks_are_sized_in_tokens(self, mock_async_client, monkeypatch):
+        """Test that every map input fits the configured token budget."""
+        monkeypatch.setattr(long_summarizer, "CHUNK_TOKENS", 300)
+        monkeypatch.setattr(long_summarizer, "CHUNK_OVERLAP_TOKENS", 0)
+        
+        await summarize_long_text_async(_document(60))
+        
+        map_inputs = [
+            call[1]["messages"][1]["content"]
+            for call in mock_async_client.chat.completions.create.call_args_list
+            if call[1]["messages"][0]["content"] == long_summarizer.MAP_SYSTEM_PROMPT
+        ]
+        assert len(map_inputs) > 1
+        assert all(count_tokens(chunk, long_summarizer.SUMMARY_MODEL) <= 300 for chunk in map_inputs)
+    
+    @pytest.mark.asyncio
+    async def test_concurrency_limit_is_respected(self, mock_async_client):
+        """Test that no more than max_concurrency calls are in flight."""
+        in_flight = 0
+        peak = 0
+        
+        async def create(**kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return _response("Notes.")
+        mock_async_client.chat.completions.create = AsyncMock(side_effect=create)
+        
+        result = await summarize_long_text_async(_document(60), max_concurrency=3)
+        
+        assert result["chunk_count"] > 3
+        assert peak == 3
+    
+    @pytest.mark.asyncio
+    async def test_repeat_document_is_served_from_cache(self, mock_async_client):
+        """Test that a finished document summary is cached as a whole."""
+        document = _document(60)
+        first = await summarize_long_text_async(document)
+        calls = mock_async_client.chat.completions.create.call_count
+        second = await summarize_long_text_async(document)
+        
+        assert (first["cached"], second["cached"]) == (False, True)
+        assert second["summary"] == first["summary"]
+        assert mock_async_client.chat.completions.create.call_count == calls
+    
+    @pytest.mark.asyncio
+    async def test_chunk_failure_raises_runtime_error(self, mock_async_client):
+        """Test that a failed chunk call surfaces as a user-friendly error."""
+        mock_async_client.chat.completions.create = AsyncMock(side_effect=Exception("API down"))
+        
+        with pytest.raises(RuntimeError, match="Unable to summarize"):
+            await summarize_long_text_async(_document(60))
+        assert len(summary_cache.memory) == 0
+    
+    @pytest.mark.asyncio
+    async def test_oversized_document_raises_value_error(self):
+        """Test that the long-document ceiling is enforced."""
+        with pytest.raises(ValueError, match="too long"):
+            await summarize_long_text_async("x" * (long_summarizer.LONG_MAX_INPUT_CHARS + 1))
+    
+    @pytest.mark.asyncio
+    async def test_empty_document_raises_value_error(self):
+        """Test that blank input is rejected before any API call."""
+        with pytest.raises(ValueError, match="empty"):
+            await summarize_long_text_async("   ")
@@ -0,0 +1,156 @@
+"""
+Tests for the metrics subsystem.
+
+Covers the counter/gauge/histogram primitives and their text exposition,
+lock-free per-thread recording, upstream attempt measurement, and the
+/metrics endpoint.
+"""
+
+import threading
+from unittest.mock import MagicMock
+import httpx
+import openai
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from src.ai.metrics import Registry, measure_upstream, measure_upstream_async, tokens_used, upstream_errors
+from src.api import jobs
+from src.api.jobs import JobStore
+from src.api.routes.metrics import router
+
+class TestPrimitives:
+    """Test suite for metric families and the text format."""
+
+    def test_counter_renders_help_type_and_labels(self):
+        """Test that a labelled counter is exposed with escaped label values."""
+        registry = Registry()
+        requests = registry.counter("app_requests_total", "Requests served", ("route",))
+        requests.labels('/say "hi"').inc()
+        requests.labels('/say "hi"').inc(2)
+
+        assert registry.render() == (
+            "# HELP app_requests_total Requests served\n"
+            "# TYPE app_requests_total counter\n"
+            'app_requests_total{route="/say \\"hi\\""} 3\n'
+        )
+
+    def test_counter_rejects_decrements(self):
+        """Test that counters can only go up."""
+        with pytest.raises(ValueError):
+            Registry().counter("app_total", "Total").inc(-1)
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Test that each bucket counts every observation at or below its bound."""
+        registry = Registry()
+        latency = registry.histogram("app_seconds", "Latency", buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            latency.observe(value)
+
+        lines = registry.render().splitlines()
+
+        assert 'app_seconds_bucket{le="0.1"} 2' in lines
+        assert 'app_seconds_bucket{le="1"} 3' in lines
+        assert 'app_seconds_bucket{le="+Inf"} 4' in lines
+        assert "app_seconds_sum 3.65" in lines
+        assert "app_seconds_count 4" in lines
+
+    def test_updates_from_many_threads_are_all_counted(self):
+        """Test that per-thread cells add up to the exact total without locking."""
+        counter = Registry().counter("app_total", "Total")
+        gauge = Registry().gauge("app_in_flight", "In flight")
+
+        def work():
+            for _ in range(10000):
+                counter.inc()
+                gauge.inc()
+                gauge.dec()
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert counter.samples() == [({}, 80000)]
+        assert gauge.samples() == [({}, 0)]
+
+    def test_broken_collector_does_not_break_the_scrape(self):
+        """Test that a failing collector is skipped and the other metrics still render."""
+        registry = Registry()
+        registry.counter("app_total", "Total").inc()
+
+        def broken():
+            raise RuntimeError("stats unavailable")
+
+        registry.register_collector(broken)
+        registry.register_collector(lambda: [("app_queue", "gauge", "Queue depth", [({}, 4)])])
+
+        rendered = registry.render()
+        assert "app_total 1" in rendered
+        assert "app_queue 4" in rendered
+
+class TestUpstreamMeasurement:
+    """Test suite for timing upstream attempts."""
+
+    def test_usage_tokens_are_counted(self):
+        """Test that prompt and completion tokens from the response usage are recorded."""
+        prompt = tokens_used.labels("test-model", "prompt")
+        completion = tokens_used.labels("test-model", "completion")
+        before = prompt.value(), completion.value()
+        response = MagicMock(usage=MagicMock(prompt_tokens=120, completion_tokens=30))
+
+        assert measure_upstream("chat.completions", "test-model", lambda: response) is response
+        assert (prompt.value() - before[0], completion.value() - before[1]) == (120, 30)
+
+    @pytest.mark.asyncio
+    async def test_errors_are_counted_by_type(self):
+        """Test that failed attempts increment the error counter for their exception type."""
+        errors = upstream_errors.labels("chat.completions", "test-model", "APIConnectionError")
+        before = errors.value()
+
+        async def failing():
+            raise openai.APIConnectionError(request=httpx.Request("POST", "https://api.openai.com"))
+
+        with pytest.raises(openai.APIConnectionError):
+            await measure_upstream_async("chat.completions", "test-model", failing)
+        assert errors.value() - before == 1
+
+class TestMetricsEndpoint:
+    """Test suite for the /metrics route."""
+
+    @pytest.fixture(autouse=True)
+    def isolated_job_store(self, tmp_path, monkeypatch):
+        """Keep scrapes away from the process-wide default job database."""
+        monkeypatch.setattr(jobs, "JOB_DB", str(tmp_path / "jobs.sqlite3"))
+        monkeypatch.setattr(jobs, "_job_store", None)
+
+    def test_serves_text_format_with_component_stats(self):
+        """Test that a scrape includes cache, breaker and limiter-backed families."""
+        app = FastAPI()
+        app.include_router(router)
+
+        response = TestClient(app).get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        assert 'studybuddy_cache_hit_ratio{cache="summary"}' in response.text
+        assert 'studybuddy_circuit_state{operation="chat.completions",state="closed"} 1' in response.text
+        assert "# TYPE studybuddy_upstream_request_duration_seconds histogram" in response.text
+
+    def test_job_queues_are_reported_only_once_the_store_is_open(self, tmp_path, monkeypatch):
+        """Test that a scrape never opens the job store itself."""
+        app = FastAPI()
+        app.include_router(router)
+
+        response = TestClient(app).get("/metrics")
+        assert "studybuddy_transcription_jobs" not in response.text
+        assert not (tmp_path / "jobs.sqlite3").exists()
+
+        store = JobStore(str(tmp_path / "open.sqlite3"))
+        monkeypatch.setattr(jobs, "_job_store", store)
+        try:
+            store.create(jobs.TRANSCRIPTION_JOB, {})
+            response = TestClient(app).get("/metrics")
+        finally:
+            store.close()
+        assert 'studybuddy_transcription_jobs{status="queued"} 1' in response.text
@@ -0,0 +1,88 @@
+"""
+Tests for the shared OpenAI client registry.
+
+Verifies that clients are created once per process with pooled connections,
+that configuration errors surface clearly, and that shutdown releases them.
+"""
+
+import asyncio
+import pytest
+from unittest.mock import MagicMock
+from src.ai import openai_client
+from src.ai.openai_client import (
+    LazyClient,
+    close_clients,
+    get_async_openai_client,
+    get_openai_client,
+    init_clients,
+)
+
+class TestOpenAIClientRegistry:
+    """Test suite for process-wide OpenAI client management."""
+
+    @pytest.fixture(autouse=True)
+    def reset_registry(self, monkeypatch):
+        """Start every test with an empty registry and a fake API key."""
+        monkeypatch.setenv("OPENAI_API_KEY", "sk-test-key")
+        monkeypatch.setattr(openai_client, "_sync_client", None)
+        monkeypatch.setattr(openai_client, "_async_client", None)
+        yield
+        asyncio.run(close_clients())
+
+    def test_sync_client_is_reused_across_calls(self):
+        """Test that repeated lookups return the same pooled client."""
+        first = get_openai_client()
+        second = get_openai_client()
+
+        assert first is second
+
+    def test_async_client_is_reused_across_calls(self):
+        """Test that the async client is also a process-wide singleton."""
+        first = get_async_openai_client()
+        second = get_async_openai_client()
+
+        assert first is second
+
+    def test_missing_api_key_raises_value_error(self, monkeypatch):
+        """Test that a missing API key fails fast with a clear message."""
+        monkeypatch.delenv("OPENAI_API_KEY")
+
+        with pytest.raises(ValueError, match="OPENAI_API_KEY"):
+            get_openai_client()
+
+    def test_init_clients_without_api_key_does_not_raise(self, monkeypatch):
+        """Test that startup still succeeds when the key is not configured."""
+        monkeypatch.delenv("OPENAI_API_KEY")
+
+        init_clients()
+
+        assert openai_client._sync_client is None
+
+    def test_close_clients_releases_registry(self):
+        """Test that shutdown closes clients so the next lookup builds new ones."""
+        first = get_openai_client()
+        asyncio.run(close_clients())
+
+        assert openai_client._sync_client is None
+        assert get_openai_client() is not first
+
+    def test_pool_limits_follow_configuration(self, monkeypatch):
+        """Test that connection pool limits come from module configuration."""
+        monkeypatch.setattr(openai_client, "MAX_CONNECTIONS", 7)
+        monkeypatch.setattr(openai_client, "MAX_KEEPALIVE_CONNECTIONS", 3)
+
+        limits = openai_client._connection_limits()
+
+        assert limits.max_connections == 7
+        assert limits.max_keepalive_connections == 3
+
+    def test_lazy_client_resolves_factory_on_attribute_access(self):
+        """Test that the proxy defers to the factory at call time."""
+        factory = MagicMock()
+        proxy = LazyClient(factory)
+
+        factory.assert_not_called()
+        proxy.chat.completions.create(model="gpt-3.5-turbo")
+
+        factory.assert_called_once()
+        factory.return_value.chat.completions.create.assert_called_once_with(model="gpt-3.5-turbo")
@@ -0,0 +1,152 @@
+"""
+Tests for the study pipeline endpoint.
+
+Verifies that the transcript, summary and quiz stream back as separate
+events, that the summary and quiz stages run concurrently, and that one
+failing stage does not take the other down.
+"""
+
+import asyncio
+import json
+import time
+from unittest.mock import AsyncMock, patch
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from src.api.models import TranscriptionResponse
+from src.api.routes import pipeline
+from src.api.routes.pipeline import router
+
+TRANSCRIPT = "Photosynthesis converts light energy into chemical energy stored in glucose. " * 3
+
+QUESTION = {
+    "question": "What does photosynthesis produce?",
+    "options": ["A) Glucose", "B) Salt", "C) Iron", "D) Sand"],
+    "correct_answer": "A",
+    "explanation": "Glucose stores the captured energy.",
+    "difficulty": "high_school"
+}
+
+def parse_events(body: str):
+    """Split an SSE body into (event, data) pairs."""
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(router)
+    return TestClient(app)
+
+@pytest.fixture
+def transcribed():
+    response = TranscriptionResponse(transcription=TRANSCRIPT, processing_time_ms=5.0)
+    with patch.object(pipeline, "transcribe_upload", AsyncMock(return_value=response)) as mock:
+        yield mock
+
+def post_audio(client, **form):
+    return client.post(
+        "/api/pipeline",
+        files={"file": ("lecture.mp3", b"ID3fake-audio", "audio/mpeg")},
+        data=form
+    )
+
+class TestStudyPipeline:
+    """Test suite for the audio -> summary + quiz pipeline."""
+
+    def test_streams_every_stage(self, client, transcribed):
+        """Test that each stage arrives as its own event, followed by done."""
+        with patch.object(pipeline, "summarize_text_cached", AsyncMock(return_value=("Plants make sugar.", False))), \
+             patch.object(pipeline, "generate_quiz_async", AsyncMock(return_value=[dict(QUESTION)])):
+            response = post_audio(client, learning_style="visual", num_questions="1")
+
+        assert response.status_code == 200
+        events = parse_events(response.text)
+        names = [name for name, _ in events]
+        assert names[0] == "transcript"
+        assert sorted(names[1:3]) == ["quiz", "summary"]
+        assert names[-1] == "done"
+
+        payloads = dict(events)
+        assert payloads["summary"]["summary"] == "Plants make sugar."
+        assert payloads["summary"]["learning_style_used"] == "visual"
+        assert payloads["quiz"]["questions"][0]["question_type"] == "multiple_choice"
+        assert payloads["done"]["stages_failed"] == []
+
+    def test_summary_and_quiz_run_concurrently(self, client, transcribed):
+        """Test that the two generation stages overlap instead of running back to back."""
+        async def slow_summary(**kwargs):
+            await asyncio.sleep(0.2)
+            return "Plants make sugar.", False
+
+        async def slow_quiz(**kwargs):
+            await asyncio.sleep(0.2)
+            return [dict(QUESTION)]
+
+        with patch.object(pipeline, "summarize_text_cached", slow_summary), \
+             patch.object(pipeline, "generate_quiz_async", slow_quiz):
+            start = time.perf_counter()
+            response = post_audio(client)
+            elapsed = time.perf_counter() - start
+
+        assert response.status_code == 200
+        assert elapsed < 0.35
+
+    def test_failed_stage_reports_error_and_others_finish(self, client, transcribed):
+        """Test that a quiz failure becomes an error event while the summary is still sent."""
+        with patch.object(pipeline, "summarize_text_cached", AsyncMock(return_value=("Plants make sugar.", False))), \
+             patch.object(pipeline, "generate_quiz_async", AsyncMock(side_effect=RuntimeError("boom"))):
+            response = post_audio(client)
+
+        payloads = dict(parse_events(response.text))
+        assert payloads["error"] == {
+            "stage": "quiz",
+            "detail": "Unable to generate quiz questions. Please try again."
+        }
+        assert payloads["summary"]["summary"] == "Plants make sugar."
+        assert payloads["done"]["stages_failed"] == ["quiz"]
+
+    def test_recording_without_speech_skips_summary_and_quiz(self, client):
+        """Test that silence is reported instead of summarizing and quizzing the no-speech notice."""
+        summarize = AsyncMock()
+        quiz = AsyncMock()
+        with patch("src.api.routes.transcription.transcribe_audio_cached", AsyncMock(return_value=("", False))), \
+             patch.object(pipeline, "summarize_text_cached", summarize), \
+             patch.object(pipeline, "generate_quiz_async", quiz):
+            response = post_audio(client)
+
+        events = parse_events(response.text)
+        assert [name for name, _ in events] == ["transcript", "error", "error", "done"]
+        transcript = events[0][1]
+        assert transcript["speech_detected"] is False
+        assert transcript["transcription"] == "No speech detected in the audio file."
+        assert events[-1][1]["stages_failed"] == ["summary", "quiz"]
+        summarize.assert_not_called()
+        quiz.assert_not_called()
+
+    def test_transcription_error_is_a_normal_http_error(self, client):
+        """Test that failures before the stream starts keep their status code."""
+        with patch.object(pipeline, "transcribe_upload", AsyncMock(side_effect=ValueError("Audio too long: 300 minutes"))):
+            response = post_audio(client)
+
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Audio too long: 300 minutes"
+
+    def test_long_transcript_uses_map_reduce_summary(self, client):
+        """Test that transcripts over the single-call limit go through the long summarizer."""
+        long_text = "Cells divide by mitosis. " * 1000
+        response_model = TranscriptionResponse(transcription=long_text, processing_time_ms=5.0)
+        long_result = {"summary": "Mitosis.", "cached": False, "chunk_count": 4, "reduce_levels": 1, "api_calls": 5}
+        quiz = AsyncMock(return_value=[dict(QUESTION)])
+
+        with patch.object(pipeline, "transcribe_upload", AsyncMock(return_value=response_model)), \
+             patch.object(pipeline, "summarize_long_text_async", AsyncMock(return_value=long_result)), \
+             patch.object(pipeline, "generate_quiz_async", quiz):
+            response = post_audio(client)
+
+        payloads = dict(parse_events(response.text))
+        assert payloads["summary"]["chunk_count"] == 4
+        assert len(quiz.call_args.kwargs["text"]) <= pipeline.QUIZ_MAX_INPUT_CHARS
@@ -0,0 +1,302 @@
+"""
+Tests for the persistent question bank.
+
+Covers storage and reuse by source content, reuse of related questions by
+concept keywords, eviction, and quiz generation topping up only the
+questions the bank could not provide.
+"""
+
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from src.ai.question_bank import QuestionBank, concept_keywords, new_questions
+from src.ai import quiz_generator
+from src.ai.quiz_generator import generate_quiz_banked_async, stream_quiz_banked_async
+from src.api.routes.quiz import router
+
+SOURCE = (
+    "Photosynthesis converts sunlight into chemical energy. Chlorophyll in the "
+    "chloroplasts absorbs light, and the plant releases oxygen as glucose is made."
+)
+
+def make_question(n, text="What in the chloroplasts absorbs light for photosynthesis?"):
+    return {
+        "question": f"{text} ({n})",
+        "options": ["Light", "Water", "Soil", "Heat"],
+        "correct_answer": "A",
+        "explanation": "Chlorophyll absorbs light energy.",
+        "difficulty": "medium"
+    }
+
+def completion(questions):
+    response = MagicMock()
+    response.choices = [MagicMock(message=MagicMock(content=json.dumps(questions)))]
+    return response
+
+class FakeStream:
+    """Minimal stand-in for the SDK's async chat completion stream."""
+
+    def __init__(self, questions):
+        content = json.dumps(questions)
+        self.pieces = [content[i:i + 40] for i in range(0, len(content), 40)]
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return None
+
+    async def __aiter__(self):
+        for piece in self.pieces:
+            yield MagicMock(choices=[MagicMock(delta=MagicMock(content=piece))])
+
+class TestQuestionBank:
+    """Test suite for the SQLite question store."""
+
+    @pytest.fixture
+    def bank(self, tmp_path, clock):
+        clock.step = 1
+        bank = QuestionBank(str(tmp_path / "bank.sqlite3"), clock=clock)
+        yield bank
+        bank.close()
+
+    def test_questions_are_reused_for_the_same_content(self, bank):
+        """Test exact-content reuse, keyed by difficulty and learning style."""
+        assert bank.add(SOURCE, "high_school", "reading", [make_question(1), make_question(2)]) == 2
+
+        assert len(bank.take(SOURCE, "high_school", "reading", 5)) == 2
+        assert bank.take(SOURCE, "college", "reading", 5) == []
+        assert bank.take(SOURCE, "high_school", "visual", 5) == []
+        stats = bank.stats()
+        assert (stats["partial_hits"], stats["misses"], stats["questions_served"]) == (1, 2, 2)
+
+    def test_duplicate_questions_are_stored_once(self, bank):
+        """Test that the same wording for the same content is not stored twice."""
+        bank.add(SOURCE, "high_school", "reading", [make_question(1)])
+
+        assert bank.add(SOURCE, "high_school", "reading", [make_question(1), make_question(2)]) == 1
+        assert bank.stats()["questions"] == 2
+
+    def test_questions_are_served_by_type(self, bank):
+        """Test that a true/false request is never served multiple-choice questions."""
+        statement = dict(make_question(9), question_type="true_false", options=["True", "False"], correct_answer="True")
+        bank.add(SOURCE, "high_school", "reading", [make_question(1), statement])
+
+        served = bank.take(SOURCE, "high_school", "reading", 5, question_type="true_false")
+
+        assert [q["question"] for q in served] == [statement["question"]]
+
+    def test_least_served_questions_come_first(self, bank):
+        """Test that repeat requests rotate through the banked questions."""
+        bank.add(SOURCE, "high_school", "reading", [make_question(n) for n in range(4)])
+
+        first = bank.take(SOURCE, "high_school", "reading", 2)
+        second = bank.take(SOURCE, "high_school", "reading", 2)
+
+        assert {q["question"] for q in first}.isdisjoint(q["question"] for q in second)
+
+    def test_related_content_reuses_questions_covering_its_concepts(self, bank):
+        """Test that questions move to edited content only when all their concepts are present."""
+        bank.add(SOURCE, "high_school", "reading", [make_question(1)])
+        edited = SOURCE + " Plants store glucose as starch."
+
+        assert len(bank.take(edited, "high_school", "reading", 1)) == 1
+        assert bank.take(edited, "high_school", "reading", 1, related=False) == []
+        assert bank.take("Mitosis divides one nucleus into two identical nuclei.", "high_school", "reading", 1) == []
+
+    def test_least_recently_used_questions_are_evicted(self, tmp_path, clock):
+        """Test that the bank stays within its size cap."""
+        clock.step = 1
+        bank = QuestionBank(str(tmp_path / "small.sqlite3"), max_questions=2, clock=clock)
+        bank.add("first source text", "high_school", "reading", [make_question(1)])
+        bank.add("second source text", "high_school", "reading", [make_question(2)])
+        bank.take("first source text", "high_school", "reading", 1, related=False)
+        bank.add("third source text", "high_school", "reading", [make_question(3)])
+
+        assert bank.stats()["questions"] == 2
+        assert bank.take("second source text", "high_school", "reading", 1, related=False) == []
+        assert len(bank.take("first source text", "high_school", "reading", 1, related=False)) == 1
+
+    def test_concept_keywords_skip_stopwords(self):
+        """Test that keywords are content words, most frequent first."""
+        assert concept_keywords("Which process makes glucose? Glucose comes from photosynthesis.") == [
+            "glucose", "process", "comes", "photosynthesis"
+        ]
+
+    def test_new_questions_drops_repeats(self):
+        """Test that generated questions already in the bank are dropped."""
+        banked = [make_question(1)]
+        generated = [make_question(1), make_question(2), make_question(2)]
+
+        assert new_questions(banked, generated) == [make_question(2)]
+
+class TestBankedQuizGeneration:
+    """Test suite for quiz generation served from and stored into the bank."""
+
+    @pytest.mark.asyncio
+    async def test_repeat_request_is_served_without_api_call(self):
+        """Test that a quiz for content already seen costs nothing the second time."""
+        with patch("src.ai.quiz_generator.async_client") as mock_client:
+            mock_client.chat.completions.create = AsyncMock(
+                return_value=completion([make_question(1), make_question(2)])
+            )
+
+            first, first_banked = await generate_quiz_banked_async(SOURCE, num_questions=2)
+            second, second_banked = await generate_quiz_banked_async(SOURCE, num_questions=2)
+
+            assert mock_client.chat.completions.create.call_count == 1
+            assert (first_banked, second_banked) == (0, 2)
+            assert {q["question"] for q in second} == {q["question"] for q in first}
+
+    def test_unavailable_bank_is_disabled_instead_of_failing(self, tmp_path, monkeypatch):
+        """Test that a bank that cannot be opened, or is switched off, is skipped."""
+        blocker = tmp_path / "not_a_directory"
+        blocker.write_text("")
+        monkeypatch.setattr(quiz_generator, "QUESTION_BANK_DB", str(blocker / "bank.sqlite3"))
+        assert quiz_generator._open_question_bank() is None
+
+        monkeypatch.setattr(quiz_generator, "QUESTION_BANK_DB", str(tmp_path / "bank.sqlite3"))
+        monkeypatch.setattr(quiz_generator, "QUESTION_BANK_ENABLED", False)
+        assert quiz_generator._open_question_bank() is None
+        assert not (tmp_path / "bank.sqlite3").exists()
+
+    def test_bank_is_opened_at_startup_and_closed_at_shutdown(self, tmp_path, monkeypatch):
+        """Test that the bank file is created by init_question_bank, not by importing."""
+        monkeypatch.setattr(quiz_generator, "QUESTION_BANK_DB", str(tmp_path / "bank.sqlite3"))
+        monkeypatch.setattr(quiz_generator, "question_bank", None)
+
+        quiz_generator.init_question_bank()
+        assert isinstance(quiz_generator.question_bank, QuestionBank)
+        assert (tmp_path / "bank.sqlite3").exists()
+
+        quiz_generator.close_question_bank()
+        assert quiz_generator.question_bank is None
+
+    @pytest.mark.asyncio
+    async def test_quizzes_are_generated_without_a_bank(self, monkeypatch):
+        """Test that banked generation falls back to plain generation."""
+        monkeypatch.setattr(quiz_generator, "question_bank", None)
+        with patch("src.ai.quiz_generator.async_client") as mock_client:
+            mock_client.chat.completions.create = AsyncMock(
+                return_value=completion([make_question(1), make_question(2)])
+            )
+
+            questions, from_bank = await generate_quiz_banked_async(SOURCE, num_questions=2)
+
+        assert (len(questions), from_bank) == (2, 0)
+
+    @pytest.mark.asyncio
+    async def test_only_missing_questions_are_generated(self, empty_question_bank):
+        """Test that a partial hit tops up the rest and tells the model what to avoid."""
+        empty_question_bank.add(SOURCE, "high_school", "reading", [make_question(1)])
+        with patch("src.ai.quiz_generator.async_client") as mock_client:
+            mock_client.chat.completions.create = AsyncMock(
+                return_value=completion([make_question(2), make_question(3)])
+            )
+
+            questions, from_bank = await generate_quiz_banked_async(SOURCE, num_questions=3)
+
+            kwargs = mock_client.chat.completions.create.call_args.kwargs
+            assert "Create 2 " in kwargs["messages"][0]["content"]
+            assert make_question(1)["question"] in kwargs["messages"][1]["content"]
+            assert from_bank == 1
+            assert [q["question"] for q in questions] == [make_question(n)["question"] for n in (1, 2, 3)]
+            assert empty_question_bank.stats()["questions"] == 3
+
+    @pytest.mark.asyncio
+    async def test_mixed_type_quiz_counts_as_one_lookup(self, empty_question_bank):
+        """Test that a quiz mixing question types records one bank hit, not one per type."""
+        statement = dict(make_question(9), question_type="true_false", correct_answer=True)
+        empty_question_bank.add(SOURCE, "high_school", "reading", [make_question(1), statement])
+
+        _, from_bank = await generate_quiz_banked_async(
+            SOURCE, num_questions=2, question_types={"multiple_choice": 1, "true_false": 1}
+        )
+
+        stats = empty_question_bank.stats()
+        assert from_bank == 2
+        assert (stats["full_hits"], stats["partial_hits"], stats["misses"]) == (1, 0, 0)
+
+    @pytest.mark.asyncio
+    async def test_top_up_repeating_a_banked_question_is_asked_again(self, empty_question_bank):
+        """Test that a generated repeat is replaced by a retry for the shortfall."""
+        empty_question_bank.add(SOURCE, "high_school", "reading", [make_question(1)])
+        with patch("src.ai.quiz_generator.async_client") as mock_client:
+            mock_client.chat.completions.create = AsyncMock(side_effect=[
+                completion([make_question(1), make_question(2)]),
+                completion([make_question(3)]),
+            ])
+
+            questions, from_bank = await generate_quiz_banked_async(SOURCE, num_questions=3)
+
+            retry = mock_client.chat.completions.create.call_args_list[1].kwargs
+            assert "Create 1 " in retry["messages"][0]["content"]
+            assert make_question(2)["question"] in retry["messages"][1]["content"]
+        assert from_bank == 1
+        assert [q["question"] for q in questions] == [make_question(n)["question"] for n in (1, 2, 3)]
+
+    @pytest.mark.asyncio
+    async def test_top_up_gives_up_after_the_retries(self, empty_question_bank):
+        """Test that a model that keeps repeating itself yields a short quiz instead of looping."""
+        empty_question_bank.add(SOURCE, "high_school", "reading", [make_question(1)])
+        with patch("src.ai.quiz_generator.async_client") as mock_client:
+            mock_client.chat.completions.create = AsyncMock(return_value=completion([make_question(1)]))
+
+            questions, _ = await generate_quiz_banked_async(SOURCE, num_questions=2)
+
+            assert mock_client.chat.completions.create.call_count == 3
+        assert len(questions) == 1
+
+    @pytest.mark.asyncio
+    async def test_stream_sends_banked_questions_first(self, empty_question_bank):
+        """Test that banked questions are yielded before the generated ones."""
+        empty_question_bank.add(SOURCE, "high_school", "reading", [make_question(1)])
+        with patch("src.ai.quiz_generator.async_client") as mock_client:
+            mock_client.chat.completions.create = AsyncMock(side_effect=RuntimeError("offline"))
+
+            stream = stream_quiz_banked_async(SOURCE, num_questions=2)
+            question, from_bank = await anext(stream)
+
+            assert from_bank is True
+            assert question["question"] == make_question(1)["question"]
+            mock_client.chat.completions.create.assert_not_called()
+            with pytest.raises(RuntimeError):
+                await anext(stream)
+
+    @pytest.mark.asyncio
+    async def test_stream_skips_repeats_and_asks_again_for_the_shortfall(self, empty_question_bank):
+        """Test that a streamed question is never yielded twice and repeats are topped up."""
+        empty_question_bank.add(SOURCE, "high_school", "reading", [make_question(1)])
+        with patch("src.ai.quiz_generator.async_client") as mock_client:
+            mock_client.chat.completions.create = AsyncMock(side_effect=[
+                FakeStream([make_question(2), make_question(2)]),
+                FakeStream([make_question(3)]),
+            ])
+
+            streamed = [item async for item in stream_quiz_banked_async(SOURCE, num_questions=3)]
+
+            retry = mock_client.chat.completions.create.call_args_list[1].kwargs
+            assert "Create 1 " in retry["messages"][0]["content"]
+            assert make_question(2)["question"] in retry["messages"][1]["content"]
+        assert [(q["question"], from_bank) for q, from_bank in streamed] == [
+            (make_question(1)["question"], True),
+            (make_question(2)["question"], False),
+            (make_question(3)["question"], False),
+        ]
+
+    def test_route_reports_questions_from_bank(self, empty_question_bank):
+        """Test that the quiz endpoint reports how many questions were reused."""
+        empty_question_bank.add(SOURCE, "high_school", "reading", [make_question(1), make_question(2)])
+        app = FastAPI()
+        app.include_router(router)
+
+        with patch("src.ai.quiz_generator.async_client") as mock_client:
+            mock_client.chat.completions.create = AsyncMock()
+            response = TestClient(app).post("/api/quiz/generate", json={"text": SOURCE, "num_questions": 2})
+
+            mock_client.chat.completions.create.assert_not_called()
+        assert response.status_code == 200
+        assert response.json()["from_bank"] == 2
+        assert response.json()["total_questions"] == 2
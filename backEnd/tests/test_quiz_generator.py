@@ -5,10 +5,31 @@ Tests the core business logic of adaptive quiz generation with
 learning style personalization and difficulty adjustment.
 """
 
+import asyncio
 import pytest
 import json
-from unittest.mock import patch, MagicMock
-from src.ai.quiz_generator import generate_quiz
+from unittest.mock import patch, MagicMock, AsyncMock
+from src.ai.quiz_generator import generate_quiz, generate_quiz_async, question_type_counts, stream_quiz_async
+
+class FakeStream:
+    """Minimal stand-in for the SDK's async chat completion stream."""
+    
+    def __init__(self, pieces):
+        self.pieces = pieces
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        return None
+    
+    async def __aiter__(self):
+        for piece in self.pieces:
+            yield MagicMock(choices=[MagicMock(delta=MagicMock(content=piece))])
+
+def _split_into_pieces(content, size=7):
+    """Cut a completion into small stream deltas, as the API does."""
+    return [content[i:i + size] for i in range(0, len(content), size)]
 
 class TestGenerateQuiz:
     """Test suite for adaptive quiz generation."""
@@ -151,7 +172,7 @@ class TestGenerateQuiz:
             ]
             mock_client.chat.completions.create.return_value = mock_response
             
-            with pytest.raises(ValueError, match="must have exactly 4 options"):
+            with pytest.raises(RuntimeError, match=r"missing fields: \['explanation'\]"):
                 generate_quiz("Sample text")
     
     def test_api_error_raises_runtime_error(self):
@@ -178,4 +199,271 @@ class TestGenerateQuiz:
             
             assert isinstance(result, list)
             assert len(result) == 1
-            assert result[0]["question"] == "test"
\ No newline at end of file
+            assert result[0]["question"] == "test"
+    
+    @pytest.mark.asyncio
+    async def test_async_generate_quiz_returns_questions(self, sample_quiz_response):
+        """Test that the async variant awaits the shared async client."""
+        with patch("src.ai.quiz_generator.async_client") as mock_client:
+            mock_response = MagicMock()
+            mock_response.choices = [
+                MagicMock(message=MagicMock(content=json.dumps(sample_quiz_response)))
+            ]
+            mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
+            
+            result = await generate_quiz_async("Sample educational text", num_questions=2)
+            
+            assert len(result) == 2
+            assert result[1]["correct_answer"] == "C"
+    
+    @pytest.mark.asyncio
+    async def test_async_malformed_json_raises_runtime_error(self):
+        """Test that the async variant reports malformed output like the sync one."""
+        with patch("src.ai.quiz_generator.async_client") as mock_client:
+            mock_response = MagicMock()
+            mock_response.choices = [
+                MagicMock(message=MagicMock(content="This is not valid JSON"))
+            ]
+            mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
+            
+            with pytest.raises(RuntimeError, match="Failed to generate properly formatted quiz"):
+                await generate_quiz_async("Sample text")
+    
+    @pytest.mark.asyncio
+    async def test_completion_budget_scales_with_question_count(self, sample_quiz_response):
+        """Test that large quizzes get enough output tokens not to be cut off."""
+        with patch("src.ai.quiz_generator.async_client") as mock_client:
+            mock_response = MagicMock()
+            mock_response.choices = [
+                MagicMock(message=MagicMock(content=json.dumps(sample_quiz_response)))
+            ]
+            mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
+            
+            await generate_quiz_async("Sample educational text", num_questions=2)
+            await generate_quiz_async("Sample educational text", num_questions=10)
+            
+            small, large = [call[1]["max_tokens"] for call in mock_client.chat.completions.create.call_args_list]
+            assert small == 1500
+            assert large > 10 * 150
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_requests_share_one_call(self, sample_quiz_response):
+        """Test that a class requesting the same quiz at once costs a single API call."""
+        async def create(**kwargs):
+            await asyncio.sleep(0.01)
+            mock_response = MagicMock()
+            mock_response.choices = [
+                MagicMock(message=MagicMock(content=json.dumps(sample_quiz_response)))
+            ]
+            return mock_response
+        
+        with patch("src.ai.quiz_generator.async_client") as mock_client:
+            mock_client.chat.completions.create = AsyncMock(side_effect=create)
+            
+            results = await asyncio.gather(*(
+                generate_quiz_async("Shared chapter text", num_questions=2) for _ in range(30)
+            ))
+            
+            assert mock_client.chat.completions.create.call_count == 1
+            assert all(result == sample_quiz_response for result in results)
+            # Each student gets their own question objects
+            assert results[0][0] is not results[1][0]
+
+class TestStreamQuiz:
+    """Test suite for incremental, streaming quiz generation."""
+    
+    @pytest.fixture
+    def sample_questions(self):
+        """Two valid questions in the expected format."""
+        return [
+            {
+                "question": "What drives the water cycle?",
+                "options": ["The sun", "The moon", "Wind", "Gravity"],
+                "correct_answer": "A",
+                "explanation": "Solar energy evaporates water.",
+                "difficulty": "easy"
+            },
+            {
+                "question": "What forms clouds?",
+                "options": ["Evaporation", "Condensation", "Runoff", "Melting"],
+                "correct_answer": "B",
+                "explanation": "Water vapor condenses into droplets.",
+                "difficulty": "medium"
+            }
+        ]
+    
+    @pytest.mark.asyncio
+    async def test_questions_are_yielded_as_they_complete(self, sample_questions):
+        """Test that the first question is available before the stream has finished."""
+        content = "```json\n" + json.dumps(sample_questions) + "\n```"
+        pieces = _split_into_pieces(content)
+        consumed = []
+        
+        class TrackingStream(FakeStream):
+            async def __aiter__(self):
+                async for chunk in super().__aiter__():
+                    consumed.append(chunk)
+                    yield chunk
+        
+        with patch("src.ai.quiz_generator.async_client") as mock_client:
+            mock_client.chat.completions.create = AsyncMock(return_value=TrackingStream(pieces))
+            
+            stream = stream_quiz_async("Sample educational content about the water cycle")
+            first = await anext(stream)
+            
+            assert first == sample_questions[0]
+            assert len(consumed) < len(pieces)
+            assert [q async for q in stream] == [sample_questions[1]]
+            assert mock_client.chat.completions.create.call_args[1]["stream"] is True
+    
+    @pytest.mark.asyncio
+    async def test_invalid_question_raises_runtime_error_after_valid_ones(self, sample_questions):
+        """Test that per-question validation runs on each object as it closes."""
+        broken = dict(sample_questions[1], options=["Only", "Two"])
+        content = json.dumps([sample_questions[0], broken])
+        
+        with patch("src.ai.quiz_generator.async_client") as mock_client:
+            mock_client.chat.completions.create = AsyncMock(return_value=FakeStream(_split_into_pieces(content)))
+            
+            received = []
+            with pytest.raises(RuntimeError, match="exactly 4 options"):
+                async for question in stream_quiz_async("Sample educational content"):
+                    received.append(question)
+            
+            assert received == [sample_questions[0]]
+    
+    @pytest.mark.asyncio
+    async def test_truncated_stream_raises_runtime_error(self, sample_questions):
+        """Test that a completion cut off mid-array is reported as a failure."""
+        content = json.dumps(sample_questions)[:-40]
+        
+        with patch("src.ai.quiz_generator.async_client") as mock_client:
+            mock_client.chat.completions.create = AsyncMock(return_value=FakeStream(_split_into_pieces(content)))
+            
+            with pytest.raises(RuntimeError, match="ended before"):
+                async for _ in stream_quiz_async("Sample educational content"):
+                    pass
+    
+    @pytest.mark.asyncio
+    async def test_malformed_json_raises_runtime_error(self):
+        """Test that a broken question object maps to the formatting error."""
+        with patch("src.ai.quiz_generator.async_client") as mock_client:
+            mock_client.chat.completions.create = AsyncMock(return_value=FakeStream(['[{"question": oops}]']))
+            
+            with pytest.raises(RuntimeError, match="properly formatted"):
+                async for _ in stream_quiz_async("Sample educational content"):
+                    pass
+    
+    @pytest.mark.asyncio
+    async def test_invalid_input_raises_value_error_before_streaming(self):
+        """Test that validation runs before any API call."""
+        with patch("src.ai.quiz_generator.async_client") as mock_client:
+            with pytest.raises(ValueError, match="between 1 and 10"):
+                await anext(stream_quiz_async("Sample educational content", num_questions=0))
+            
+            mock_client.chat.completions.create.assert_not_called()
+
+class TestQuestionTypes:
+    """Test suite for true/false, short-answer and mixed-type quizzes."""
+    
+    @pytest.fixture
+    def mixed_questions(self):
+        """One question of every type, as the model writes them."""
+        return [
+            {
+                "question_type": "multiple_choice",
+                "question": "What drives the water cycle?",
+                "options": ["The sun", "The moon", "Wind", "Gravity"],
+                "correct_answer": "A",
+                "explanation": "Solar energy evaporates water.",
+                "difficulty": "easy"
+            },
+            {
+                "question_type": "true_false",
+                "question": "Condensation turns liquid water into vapor.",
+                "correct_answer": False,
+                "explanation": "Condensation turns vapor into liquid.",
+                "difficulty": "easy"
+            },
+            {
+                "question_type": "short_answer",
+                "question": "What is rain, snow or hail called?",
+                "correct_answer": "Precipitation",
+                "explanation": "All water falling from clouds is precipitation.",
+                "difficulty": "medium"
+            }
+        ]
+    
+    def test_counts_are_spread_evenly_in_type_order(self):
+        """Test how a quiz length is shared among the requested types."""
+        assert question_type_counts(5, ["true_false", "multiple_choice"]) == {"multiple_choice": 2, "true_false": 3}
+        assert question_type_counts(3, {"short_answer": 3}) == {"short_answer": 3}
+        
+        with pytest.raises(ValueError, match="Unsupported"):
+            question_type_counts(2, ["essay"])
+        with pytest.raises(ValueError, match="add up"):
+            question_type_counts(3, {"true_false": 2})
+    
+    @pytest.mark.asyncio
+    async def test_mixed_types_come_back_from_one_call(self, mixed_questions):
+        """Test that every type is requested, parsed and normalized in a single round trip."""
+        with patch("src.ai.quiz_generator.async_client") as mock_client:
+            mock_response = MagicMock()
+            mock_response.choices = [MagicMock(message=MagicMock(content=json.dumps(mixed_questions)))]
+            mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
+            
+            questions = await generate_quiz_async(
+                "Sample educational text", num_questions=3,
+                question_types=["multiple_choice", "true_false", "short_answer"]
+            )
+            
+            assert mock_client.chat.completions.create.call_count == 1
+            system_prompt = mock_client.chat.completions.create.call_args[1]["messages"][0]["content"]
+            assert "1 multiple_choice, 1 true_false, 1 short_answer" in system_prompt
+            assert [q["question_type"] for q in questions] == ["multiple_choice", "true_false", "short_answer"]
+            assert questions[1]["options"] == ["True", "False"]
+            assert questions[1]["correct_answer"] == "False"
+            assert questions[2]["options"] == []
+    
+    @pytest.mark.asyncio
+    async def test_true_false_quiz_reserves_fewer_completion_tokens(self, mixed_questions):
+        """Test that the compact true/false schema shrinks the completion budget."""
+        with patch("src.ai.quiz_generator.async_client") as mock_client:
+            mock_response = MagicMock()
+            mock_response.choices = [MagicMock(message=MagicMock(content=json.dumps(mixed_questions[1:2])))]
+            mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
+            
+            await generate_quiz_async("Sample educational text", num_questions=10, question_types=["true_false"])
+            
+            kwargs = mock_client.chat.completions.create.call_args[1]
+            assert kwargs["max_tokens"] < 1000
+            assert '"options"' not in kwargs["messages"][0]["content"]
+    
+    @pytest.mark.asyncio
+    async def test_unrequested_type_raises_runtime_error(self, mixed_questions):
+        """Test that questions of a type nobody asked for are rejected."""
+        with patch("src.ai.quiz_generator.async_client") as mock_client:
+            mock_response = MagicMock()
+            mock_response.choices = [MagicMock(message=MagicMock(content=json.dumps(mixed_questions)))]
+            mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
+            
+            with pytest.raises(RuntimeError, match="unexpected question_type"):
+                await generate_quiz_async("Sample educational text", num_questions=3)
+    
+    @pytest.mark.asyncio
+    async def test_true_false_answer_must_be_true_or_false(self, mixed_questions):
+        """Test validation of streamed true/false answers."""
+        invalid = dict(mixed_questions[1], correct_answer="maybe")
+        content = json.dumps([mixed_questions[1], invalid])
+        
+        with patch("src.ai.quiz_generator.async_client") as mock_client:
+            mock_client.chat.completions.create = AsyncMock(return_value=FakeStream(_split_into_pieces(content)))
+            received = []
+            
+            with pytest.raises(RuntimeError, match="true or false"):
+                async for question in stream_quiz_async(
+                    "Sample educational text", num_questions=2, question_types=["true_false"]
+                ):
+                    received.append(question)
+            
+            assert [q["correct_answer"] for q in received] == ["False"]
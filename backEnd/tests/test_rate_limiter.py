@@ -0,0 +1,223 @@
+"""
+Tests for the adaptive upstream rate limiter.
+
+Covers budget pacing and fair queueing, adaptation to rate-limit headers,
+the concurrency cap and jittered retries of transient failures.
+"""
+
+import asyncio
+import random
+import httpx
+import openai
+import pytest
+from src.ai import rate_limiter
+from src.ai.rate_limiter import RateLimiter, RateLimitQueueFull, parse_duration
+
+def rate_limit_error(headers=None, code=None):
+    """Build the 429 error the SDK raises."""
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    response = httpx.Response(429, request=request, headers=headers or {})
+    body = {"code": code} if code else None
+    return openai.RateLimitError("Rate limit reached", response=response, body=body)
+
+@pytest.fixture
+def fast_backoff(monkeypatch):
+    monkeypatch.setattr(rate_limiter, "BACKOFF_BASE_SECONDS", 0.001)
+
+class TestBudgets:
+    """Test suite for request/token pacing."""
+
+    def test_parse_duration_formats(self):
+        """Test that reset headers in every OpenAI format are understood."""
+        assert parse_duration("20ms") == pytest.approx(0.02)
+        assert parse_duration("6m0s") == 360
+        assert parse_duration("1h2m3.5s") == 3723.5
+        assert parse_duration("2") == 2
+        assert parse_duration("soon") is None
+
+    def test_callers_queue_in_arrival_order(self, clock):
+        """Test that an exhausted budget schedules callers one after another instead of failing."""
+        limiter = RateLimiter("test", requests_per_minute=60, tokens_per_minute=None, clock=clock)
+        burst = int(60 * rate_limiter.BURST_SECONDS / 60)
+
+        waits = [limiter._reserve(0) for _ in range(burst + 3)]
+
+        assert waits[:burst] == [0] * burst
+        assert waits[burst:] == [1.0, 2.0, 3.0]
+
+    def test_token_budget_paces_large_requests(self, clock):
+        """Test that the tokens/minute budget delays requests even when request budget is free."""
+        limiter = RateLimiter("test", requests_per_minute=6000, tokens_per_minute=6000, clock=clock)
+
+        assert limiter._reserve(1000) == 0
+        assert limiter._reserve(500) == pytest.approx(5.0)
+
+        clock.now += 5.0
+        assert limiter._reserve(100) == pytest.approx(1.0)
+
+    def test_overlong_queue_fails_without_spending_budget(self, clock):
+        """Test that a caller refused for queue length does not push back later callers."""
+        limiter = RateLimiter("test", requests_per_minute=60, tokens_per_minute=None, max_queue_seconds=1.5, clock=clock)
+        for _ in range(11):
+            limiter._reserve(0)
+
+        with pytest.raises(RateLimitQueueFull):
+            limiter._reserve(0)
+        clock.now += 1.0
+        assert limiter._reserve(0) == pytest.approx(1.0)
+
+    @pytest.mark.asyncio
+    async def test_caller_cancelled_while_queued_gives_its_budget_back(self, clock):
+        """Test that a hedge or disconnect cancelled during the queue wait does not delay later callers."""
+        limiter = RateLimiter("test", requests_per_minute=60, tokens_per_minute=600, clock=clock)
+        for _ in range(int(60 * rate_limiter.BURST_SECONDS / 60)):
+            limiter._reserve(0)
+
+        queued = asyncio.create_task(limiter.call_async(lambda: asyncio.sleep(0), tokens=50))
+        await asyncio.sleep(0)
+        queued.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await queued
+
+        assert limiter._reserve(0) == pytest.approx(1.0)
+        assert limiter._tokens.level == pytest.approx(limiter._tokens.capacity)
+
+    def test_headers_adapt_limit_and_remaining(self, clock):
+        """Test that the account's real limit and remaining budget replace local guesses."""
+        limiter = RateLimiter("test", requests_per_minute=3500, tokens_per_minute=None, clock=clock)
+
+        limiter.observe_headers({
+            "x-ratelimit-limit-requests": "60",
+            "x-ratelimit-remaining-requests": "0",
+        })
+
+        assert limiter.stats()["requests_per_minute"] == 60
+        assert limiter._reserve(0) == pytest.approx(1.0)
+
+    def test_response_hook_reaches_active_limiter(self):
+        """Test that the HTTP hook only feeds headers to the limiter making the call."""
+        limiter = RateLimiter("test", requests_per_minute=3500, tokens_per_minute=None)
+        response = httpx.Response(200, headers={"x-ratelimit-limit-requests": "500"})
+
+        rate_limiter.observe_response(response)
+        assert limiter.stats()["requests_per_minute"] == 3500
+
+        limiter.call(lambda: rate_limiter.observe_response(response))
+        assert limiter.stats()["requests_per_minute"] == 500
+
+class TestRetries:
+    """Test suite for retry and backoff behavior."""
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_is_retried_then_succeeds(self, fast_backoff):
+        """Test that 429s are retried with backoff instead of surfacing to the caller."""
+        limiter = RateLimiter("test", rng=random.Random(0))
+        attempts = []
+
+        async def request():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise rate_limit_error({"retry-after-ms": "1"})
+            return "ok"
+
+        assert await limiter.call_async(request) == "ok"
+        assert len(attempts) == 3
+        assert limiter.stats()["retries"] == 2
+        assert limiter.stats()["throttled"] == 2
+
+    @pytest.mark.asyncio
+    async def test_retries_are_bounded(self, fast_backoff):
+        """Test that the last error is raised once retries run out."""
+        limiter = RateLimiter("test", max_retries=2)
+        attempts = []
+
+        async def request():
+            attempts.append(1)
+            raise rate_limit_error({"retry-after-ms": "1"})
+
+        with pytest.raises(openai.RateLimitError):
+            await limiter.call_async(request)
+        assert len(attempts) == 3
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("error", [
+        ValueError("bad input"),
+        Exception("API down"),
+        rate_limit_error(code="insufficient_quota"),
+    ])
+    async def test_permanent_errors_are_not_retried(self, error):
+        """Test that errors waiting cannot fix are raised on the first attempt."""
+        limiter = RateLimiter("test")
+        attempts = []
+
+        async def request():
+            attempts.append(1)
+            raise error
+
+        with pytest.raises(type(error)):
+            await limiter.call_async(request)
+        assert len(attempts) == 1
+
+    def test_sync_call_retries(self, fast_backoff):
+        """Test that worker-thread callers get the same retry policy."""
+        limiter = RateLimiter("test")
+        attempts = []
+
+        def request():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise rate_limit_error({"retry-after-ms": "1"})
+            return "ok"
+
+        assert limiter.call(request) == "ok"
+        assert len(attempts) == 2
+
+class TestConcurrency:
+    """Test suite for the in-flight cap."""
+
+    @pytest.mark.asyncio
+    async def test_in_flight_requests_are_capped_and_served_fifo(self):
+        """Test that extra callers wait for a slot and get one in arrival order."""
+        limiter = RateLimiter("test", max_concurrency=2)
+        active = 0
+        peak = 0
+        started = []
+
+        async def request(n):
+            nonlocal active, peak
+            started.append(n)
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return n
+
+        results = await asyncio.gather(*(limiter.call_async(lambda n=n: request(n)) for n in range(6)))
+
+        assert results == list(range(6))
+        assert peak == 2
+        assert started == list(range(6))
+        assert limiter.stats()["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_leak_a_slot(self):
+        """Test that a caller cancelled while queued leaves the slot for the next one."""
+        limiter = RateLimiter("test", max_concurrency=1)
+        release = asyncio.Event()
+
+        async def hold():
+            await release.wait()
+            return "held"
+
+        holder = asyncio.create_task(limiter.call_async(hold))
+        await asyncio.sleep(0)
+        cancelled = asyncio.create_task(limiter.call_async(hold))
+        waiting = asyncio.create_task(limiter.call_async(lambda: asyncio.sleep(0, result="next")))
+        await asyncio.sleep(0)
+
+        cancelled.cancel()
+        release.set()
+
+        assert await holder == "held"
+        assert await asyncio.wait_for(waiting, 1) == "next"
+        assert limiter.stats()["in_flight"] == 0
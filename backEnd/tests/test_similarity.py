@@ -0,0 +1,51 @@
+"""
+Tests for MinHash near-duplicate detection.
+
+Covers shingling of normalized text, signature agreement as an estimate of
+Jaccard similarity, and the near-duplicate filter.
+"""
+
+import pytest
+from src.ai.similarity import MinHasher, NearDuplicateFilter, shingles
+
+class TestShingles:
+    """Test suite for character shingling."""
+
+    def test_case_and_punctuation_are_ignored(self):
+        """Test that formatting differences give identical shingle sets."""
+        assert shingles("What is ATP?") == shingles("what  is atp")
+
+    def test_short_and_empty_texts(self):
+        """Test that texts shorter than a shingle are still comparable."""
+        assert shingles("DNA") == {"dna"}
+        assert shingles("?!") == set()
+
+class TestMinHash:
+    """Test suite for MinHash signatures and the duplicate filter."""
+
+    def test_similarity_estimates_jaccard(self):
+        """Test that signature agreement tracks the true shingle overlap."""
+        hasher = MinHasher(num_permutations=256)
+        first = "What is the primary role of chlorophyll in photosynthesis?"
+        second = "What role does chlorophyll play in photosynthesis?"
+        a, b = shingles(first), shingles(second)
+
+        estimate = hasher.similarity(hasher.signature(first), hasher.signature(second))
+
+        assert estimate == pytest.approx(len(a & b) / len(a | b), abs=0.1)
+        assert hasher.similarity(hasher.signature(first), hasher.signature(first)) == 1.0
+
+    def test_filter_rejects_rewordings_but_keeps_distinct_questions(self):
+        """Test that only near-duplicates of accepted questions are rejected."""
+        seen = NearDuplicateFilter(threshold=0.6)
+
+        assert seen.add("What is the function of mitochondria?")
+        assert not seen.add("What is the function of the mitochondria?")
+        assert seen.add("Which organelle produces most of the cell's ATP?")
+        assert seen.is_duplicate("what is the function of mitochondria")
+        assert len(seen) == 2
+
+    def test_invalid_threshold_is_rejected(self):
+        """Test that thresholds outside (0, 1] raise ValueError."""
+        with pytest.raises(ValueError):
+            NearDuplicateFilter(threshold=0)
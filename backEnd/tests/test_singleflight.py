@@ -0,0 +1,145 @@
+"""
+Tests for in-flight request coalescing.
+
+Verifies that concurrent identical calls share one execution on both the
+async and the threaded path, that errors reach every caller, and that a
+caller going away does not cancel the call others are waiting on.
+"""
+
+import asyncio
+import threading
+import time
+import pytest
+from src.ai.singleflight import SingleFlight
+
+class TestSingleFlightAsync:
+    """Test suite for coroutine callers."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_calls_share_one_execution(self):
+        """Test that callers with the same key all receive one shared result."""
+        flights = SingleFlight("test")
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "summary"
+
+        results = await asyncio.gather(*(flights.do_async("key", fetch) for _ in range(30)))
+
+        assert results == ["summary"] * 30
+        assert calls == 1
+        assert flights.stats() == {"calls": 1, "coalesced": 29, "in_flight": 0}
+
+    @pytest.mark.asyncio
+    async def test_different_keys_and_later_calls_run_separately(self):
+        """Test that only concurrent calls with the same key are shared."""
+        flights = SingleFlight("test")
+        calls = []
+
+        async def fetch(key):
+            calls.append(key)
+            await asyncio.sleep(0)
+            return key
+
+        assert await asyncio.gather(flights.do_async("a", lambda: fetch("a")), flights.do_async("b", lambda: fetch("b"))) == ["a", "b"]
+        assert await flights.do_async("a", lambda: fetch("a")) == "a"
+        assert calls == ["a", "b", "a"]
+
+    @pytest.mark.asyncio
+    async def test_errors_reach_every_caller(self):
+        """Test that a failed shared call raises in each waiting caller."""
+        flights = SingleFlight("test")
+
+        async def fetch():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("upstream down")
+
+        results = await asyncio.gather(*(flights.do_async("key", fetch) for _ in range(3)), return_exceptions=True)
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_shared_call(self):
+        """Test that the first caller disconnecting leaves the call running for the rest."""
+        flights = SingleFlight("test")
+        release = asyncio.Event()
+
+        async def fetch():
+            await release.wait()
+            return "done"
+
+        first = asyncio.create_task(flights.do_async("key", fetch))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(flights.do_async("key", fetch))
+        await asyncio.sleep(0)
+
+        first.cancel()
+        release.set()
+
+        assert await second == "done"
+        with pytest.raises(asyncio.CancelledError):
+            await first
+
+class TestSingleFlightSync:
+    """Test suite for thread callers."""
+
+    def test_threads_share_one_execution(self):
+        """Test that blocking callers wait for the leader's result."""
+        flights = SingleFlight("test")
+        started = threading.Event()
+        release = threading.Event()
+        calls = 0
+        results = []
+
+        def fetch():
+            nonlocal calls
+            calls += 1
+            started.set()
+            release.wait(1)
+            return "quiz"
+
+        leader = threading.Thread(target=lambda: results.append(flights.do("key", fetch)))
+        leader.start()
+        started.wait(1)
+        followers = [threading.Thread(target=lambda: results.append(flights.do("key", fetch))) for _ in range(5)]
+        for thread in followers:
+            thread.start()
+        while flights.stats()["coalesced"] < 5:
+            time.sleep(0.001)
+        release.set()
+        for thread in [leader, *followers]:
+            thread.join(1)
+
+        assert results == ["quiz"] * 6
+        assert calls == 1
+
+    def test_leader_error_is_raised_in_followers(self):
+        """Test that followers see the leader's exception."""
+        flights = SingleFlight("test")
+        release = threading.Event()
+        errors = []
+
+        def fetch():
+            release.wait(1)
+            raise ValueError("bad")
+
+        def run():
+            try:
+                flights.do("key", fetch)
+            except ValueError as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=run) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        while flights.stats()["coalesced"] < 2:
+            time.sleep(0.001)
+        release.set()
+        for thread in threads:
+            thread.join(1)
+
+        assert len(errors) == 3
+        assert flights.stats()["in_flight"] == 0
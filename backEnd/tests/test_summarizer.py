@@ -5,9 +5,39 @@ Tests cover the core business logic of learning style adaptation,
 which is StudyBuddy AI's key differentiator.
 """
 
+import asyncio
 import pytest
-from unittest.mock import patch, MagicMock
-from src.ai.summarizer import summarize_text
+from unittest.mock import patch, MagicMock, AsyncMock
+from src.ai.summarizer import (
+    get_cached_summary,
+    stream_summary_async,
+    summarize_batch_async,
+    summarize_styles_async,
+    summarize_text,
+    summarize_text_async,
+    summarize_text_cached,
+    summary_cache,
+)
+
+class FakeStream:
+    """Minimal stand-in for the SDK's async chat completion stream."""
+    
+    def __init__(self, pieces, error=None):
+        self.pieces = pieces
+        self.error = error
+        self.closed = False
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        self.closed = True
+    
+    async def __aiter__(self):
+        for piece in self.pieces:
+            yield MagicMock(choices=[MagicMock(delta=MagicMock(content=piece))])
+        if self.error:
+            raise self.error
 
 class TestSummarizeText:
     """Test suite for text summarization with learning style adaptation."""
@@ -105,4 +135,352 @@ class TestSummarizeText:
             summarize_text("Sample text", max_tokens=150)
             
             call_args = mock_client.chat.completions.create.call_args
-            assert call_args[1]['max_tokens'] == 150
\ No newline at end of file
+            assert call_args[1]['max_tokens'] == 150
+    
+    @pytest.mark.asyncio
+    async def test_async_summary_uses_async_client(self):
+        """Test that the async variant awaits the shared async client."""
+        with patch("src.ai.summarizer.async_client") as mock_client:
+            mock_response = MagicMock()
+            mock_response.choices = [
+                MagicMock(message=MagicMock(content="  Async summary  "))
+            ]
+            mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
+            
+            result = await summarize_text_async("Sample text", learning_style="visual", max_tokens=200)
+            
+            assert result == "Async summary"
+            call_args = mock_client.chat.completions.create.call_args
+            assert call_args[1]['max_tokens'] == 200
+            assert "bullet points" in call_args[1]['messages'][0]['content'].lower()
+    
+    @pytest.mark.asyncio
+    async def test_async_api_error_returns_user_friendly_fallback(self):
+        """Test that the async variant degrades gracefully like the sync one."""
+        with patch("src.ai.summarizer.async_client") as mock_client:
+            mock_client.chat.completions.create = AsyncMock(side_effect=Exception("API rate limit"))
+            
+            result = await summarize_text_async("Sample text")
+            
+            assert "trouble" in result.lower()
+            assert "API rate limit" not in result
+    
+    @pytest.mark.asyncio
+    async def test_async_empty_input_raises_value_error(self):
+        """Test that the async variant validates input before calling the API."""
+        with pytest.raises(ValueError, match="Input text cannot be empty"):
+            await summarize_text_async("   ")
+
+class TestSummarizeTextCached:
+    """Test suite for the content-addressed summary cache path."""
+    
+    @pytest.fixture
+    def mock_async_client(self):
+        """Async client mock returning a fixed summary."""
+        with patch("src.ai.summarizer.async_client") as mock_client:
+            mock_response = MagicMock()
+            mock_response.choices = [
+                MagicMock(message=MagicMock(content="Cached summary"))
+            ]
+            mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
+            yield mock_client
+    
+    @pytest.mark.asyncio
+    async def test_repeat_request_is_served_from_cache(self, mock_async_client):
+        """Test that the second identical request skips the API."""
+        first, first_cached = await summarize_text_cached("The French Revolution began in 1789.")
+        second, second_cached = await summarize_text_cached("The French  Revolution began in 1789.\n")
+        
+        assert first == second == "Cached summary"
+        assert (first_cached, second_cached) == (False, True)
+        assert mock_async_client.chat.completions.create.call_count == 1
+        assert summary_cache.stats()["hits"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_different_learning_style_is_a_cache_miss(self, mock_async_client):
+        """Test that style is part of the cache key."""
+        await summarize_text_cached("Sample text", learning_style="visual")
+        _, cached = await summarize_text_cached("Sample text", learning_style="auditory")
+        
+        assert cached is False
+        assert mock_async_client.chat.completions.create.call_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_requests_share_one_call(self):
+        """Test that simultaneous cache misses for the same text wait on one API call."""
+        async def create(**kwargs):
+            await asyncio.sleep(0.01)
+            return MagicMock(choices=[MagicMock(message=MagicMock(content="Shared summary"))])
+        
+        with patch("src.ai.summarizer.async_client") as mock_client:
+            mock_client.chat.completions.create = AsyncMock(side_effect=create)
+            
+            results = await asyncio.gather(*(
+                summarize_text_cached("The water cycle moves water between sea, air and land.")
+                for _ in range(30)
+            ))
+            
+            assert mock_client.chat.completions.create.call_count == 1
+            assert {summary for summary, _ in results} == {"Shared summary"}
+    
+    @pytest.mark.asyncio
+    async def test_fallback_message_is_not_cached(self):
+        """Test that API failures are retried rather than served from cache."""
+        with patch("src.ai.summarizer.async_client") as mock_client:
+            mock_client.chat.completions.create = AsyncMock(side_effect=Exception("API down"))
+            
+            summary, cached = await summarize_text_cached("Sample text")
+            
+            assert "trouble" in summary.lower()
+            assert cached is False
+            assert len(summary_cache.memory) == 0
+    
+    @pytest.mark.asyncio
+    async def test_sync_and_async_paths_share_the_cache(self, mock_async_client):
+        """Test that summarize_text() serves and fills the same cache entries as the async path."""
+        await summarize_text_cached("The French Revolution began in 1789.")
+        
+        with patch("src.ai.summarizer.client") as mock_client:
+            assert summarize_text("The French Revolution began in 1789.") == "Cached summary"
+            mock_client.chat.completions.create.assert_not_called()
+            
+            mock_client.chat.completions.create.return_value = MagicMock(
+                choices=[MagicMock(message=MagicMock(content="Sync summary"))]
+            )
+            summarize_text("Sample text", learning_style="visual")
+        
+        assert await summarize_text_cached("Sample text", learning_style="visual") == ("Sync summary", True)
+        assert mock_async_client.chat.completions.create.call_count == 1
+
+class TestStreamSummary:
+    """Test suite for the token-streaming summarization path."""
+    
+    @pytest.mark.asyncio
+    async def test_pieces_are_yielded_in_order(self):
+        """Test that streamed deltas are forwarded as they arrive."""
+        with patch("src.ai.summarizer.async_client") as mock_client:
+            mock_client.chat.completions.create = AsyncMock(
+                return_value=FakeStream(["Photo", None, "synthesis ", "summary"])
+            )
+            
+            pieces = [piece async for piece in stream_summary_async("Photosynthesis text", "visual")]
+            
+            assert pieces == ["Photo", "synthesis ", "summary"]
+            assert mock_client.chat.completions.create.call_args[1]["stream"] is True
+    
+    @pytest.mark.asyncio
+    async def test_completed_stream_is_cached(self):
+        """Test that a finished stream fills the summary cache."""
+        with patch("src.ai.summarizer.async_client") as mock_client:
+            mock_client.chat.completions.create = AsyncMock(return_value=FakeStream(["Full ", "summary"]))
+            
+            async for _ in stream_summary_async("Sample text", "reading", 300):
+                pass
+            
+            assert get_cached_summary("Sample text", "reading", 300) == "Full summary"
+    
+    @pytest.mark.asyncio
+    async def test_clamped_stream_is_cached_under_the_requested_length(self):
+        """Test that a reduced completion budget does not change the cache key."""
+        with patch("src.ai.summarizer.async_client") as mock_client, \
+                patch("src.ai.summarizer.completion_budget", return_value=120):
+            mock_client.chat.completions.create = AsyncMock(return_value=FakeStream(["Short summary"]))
+            
+            async for _ in stream_summary_async("Sample text", "reading", 300):
+                pass
+            
+            assert mock_client.chat.completions.create.call_args[1]["max_tokens"] == 120
+            assert get_cached_summary("Sample text", "reading", 300) == "Short summary"
+    
+    @pytest.mark.asyncio
+    async def test_interrupted_stream_raises_runtime_error_and_is_not_cached(self):
+        """Test that mid-stream failures surface and partial text is never cached."""
+        with patch("src.ai.summarizer.async_client") as mock_client:
+            stream = FakeStream(["Partial"], error=Exception("connection reset"))
+            mock_client.chat.completions.create = AsyncMock(return_value=stream)
+            
+            with pytest.raises(RuntimeError, match="Unable to generate summary"):
+                async for _ in stream_summary_async("Sample text"):
+                    pass
+            
+            assert stream.closed
+            assert get_cached_summary("Sample text") is None
+    
+    @pytest.mark.asyncio
+    async def test_empty_stream_raises_runtime_error(self):
+        """Test that a stream without any content is treated as a failure."""
+        with patch("src.ai.summarizer.async_client") as mock_client:
+            mock_client.chat.completions.create = AsyncMock(return_value=FakeStream([]))
+            
+            with pytest.raises(RuntimeError, match="Empty response"):
+                async for _ in stream_summary_async("Sample text"):
+                    pass
+    
+    @pytest.mark.asyncio
+    async def test_empty_input_raises_value_error_before_streaming(self):
+        """Test that validation runs before any API call."""
+        with patch("src.ai.summarizer.async_client") as mock_client:
+            with pytest.raises(ValueError, match="empty"):
+                await anext(stream_summary_async(""))
+            
+            mock_client.chat.completions.create.assert_not_called()
+
+class TestSummarizeBatch:
+    """Test suite for concurrent batch summarization."""
+    
+    @staticmethod
+    def completion(content):
+        return MagicMock(choices=[MagicMock(message=MagicMock(content=content))])
+    
+    @pytest.mark.asyncio
+    async def test_duplicates_are_summarized_once(self):
+        """Test that identical items share one API call and keep their positions."""
+        with patch("src.ai.summarizer.async_client") as mock_client:
+            mock_client.chat.completions.create = AsyncMock(return_value=self.completion("Shared summary"))
+            
+            batch = await summarize_batch_async([
+                ("The water cycle moves water.", "reading", 300),
+                ("Plate tectonics shape continents.", "reading", 300),
+                ("The water  cycle moves water.", "reading", 300),
+            ])
+        
+        assert batch["unique_items"] == 2
+        assert batch["api_calls"] == 2
+        assert [r["deduplicated"] for r in batch["results"]] == [False, False, True]
+        assert batch["results"][2]["summary"] == "Shared summary"
+    
+    @pytest.mark.asyncio
+    async def test_failed_item_does_not_sink_the_batch(self):
+        """Test that one API failure is reported per item while the rest succeed."""
+        async def create(**kwargs):
+            if "Broken" in kwargs["messages"][1]["content"]:
+                raise Exception("API down")
+            return self.completion("Fine summary")
+        
+        with patch("src.ai.summarizer.async_client") as mock_client:
+            mock_client.chat.completions.create = create
+            
+            batch = await summarize_batch_async([
+                ("Broken chapter text", "reading", 300),
+                ("Healthy chapter text", "visual", 300),
+            ])
+        
+        broken, healthy = batch["results"]
+        assert broken["summary"] is None
+        assert broken["error"] == "Unable to generate summary. Please try again."
+        assert healthy["summary"] == "Fine summary"
+        assert healthy["error"] is None
+        assert len(summary_cache.memory) == 1
+    
+    @pytest.mark.asyncio
+    async def test_concurrency_limit_is_respected(self):
+        """Test that no more than max_concurrency calls are in flight."""
+        active = 0
+        peak = 0
+        
+        async def create(**kwargs):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return self.completion("Summary")
+        
+        with patch("src.ai.summarizer.async_client") as mock_client:
+            mock_client.chat.completions.create = create
+            
+            batch = await summarize_batch_async(
+                [(f"Chapter {n} text", "reading", 300) for n in range(10)],
+                max_concurrency=3
+            )
+        
+        assert peak == 3
+        assert batch["api_calls"] == 10
+    
+    @pytest.mark.asyncio
+    async def test_cached_items_skip_the_api(self):
+        """Test that previously summarized texts are served from the cache."""
+        with patch("src.ai.summarizer.async_client") as mock_client:
+            mock_client.chat.completions.create = AsyncMock(return_value=self.completion("Summary"))
+            await summarize_text_cached("Known chapter text")
+            
+            batch = await summarize_batch_async([("Known chapter text", "reading", 300)])
+        
+        assert batch["cache_hits"] == 1
+        assert batch["api_calls"] == 0
+        assert batch["results"][0]["cached"] is True
+
+class TestSummarizeStyles:
+    """Test suite for multi-style fan-out from one shared extraction pass."""
+    
+    @staticmethod
+    def fake_create(calls):
+        """Completion stub that records prompts and answers by the system prompt."""
+        async def create(**kwargs):
+            system_prompt = kwargs["messages"][0]["content"]
+            calls.append(kwargs["messages"])
+            content = "NOTES" if "Extract the key facts" in system_prompt else "Style summary"
+            return MagicMock(choices=[MagicMock(message=MagicMock(content=content))])
+        return create
+    
+    @pytest.mark.asyncio
+    async def test_one_extraction_feeds_every_style(self):
+        """Test that all styles are rewritten from a single shared notes pass."""
+        calls = []
+        styles = ["visual", "auditory", "reading", "kinesthetic"]
+        with patch("src.ai.summarizer.async_client") as mock_client:
+            mock_client.chat.completions.create = self.fake_create(calls)
+            
+            result = await summarize_styles_async("Mitochondria produce ATP for the cell.", styles)
+        
+        assert list(result["summaries"]) == styles
+        assert result["api_calls"] == 5
+        rewrites = [messages for messages in calls if "NOTES" in messages[1]["content"]]
+        assert len(rewrites) == 4
+    
+    @pytest.mark.asyncio
+    async def test_styles_are_cached_for_single_style_requests(self):
+        """Test that switching style afterwards is served from the cache."""
+        with patch("src.ai.summarizer.async_client") as mock_client:
+            mock_client.chat.completions.create = self.fake_create([])
+            result = await summarize_styles_async("Mitochondria produce ATP.", ["visual", "auditory"])
+            
+            summary, cached = await summarize_text_cached("Mitochondria produce ATP.", learning_style="auditory")
+        
+        assert cached is True
+        assert summary == result["summaries"]["auditory"]
+    
+    @pytest.mark.asyncio
+    async def test_single_missing_style_skips_extraction(self):
+        """Test that one missing style is summarized directly without the notes pass."""
+        calls = []
+        with patch("src.ai.summarizer.async_client") as mock_client:
+            mock_client.chat.completions.create = self.fake_create(calls)
+            await summarize_text_cached("Mitochondria produce ATP.", learning_style="visual")
+            calls.clear()
+            
+            result = await summarize_styles_async("Mitochondria produce ATP.", ["visual", "reading"])
+        
+        assert result["cached_styles"] == ["visual"]
+        assert result["api_calls"] == 1
+        assert "NOTES" not in calls[0][1]["content"]
+    
+    @pytest.mark.asyncio
+    async def test_failure_raises_but_keeps_finished_styles(self):
+        """Test that a failed rewrite raises while successful styles stay cached."""
+        async def create(**kwargs):
+            system_prompt = kwargs["messages"][0]["content"]
+            if "Extract" in system_prompt:
+                return MagicMock(choices=[MagicMock(message=MagicMock(content="NOTES"))])
+            if "read aloud" in system_prompt:
+                raise Exception("API down")
+            return MagicMock(choices=[MagicMock(message=MagicMock(content="Visual summary"))])
+        
+        with patch("src.ai.summarizer.async_client") as mock_client:
+            mock_client.chat.completions.create = create
+            
+            with pytest.raises(RuntimeError, match="Unable to generate summary"):
+                await summarize_styles_async("Mitochondria produce ATP.", ["visual", "auditory"])
+        
+        assert get_cached_summary("Mitochondria produce ATP.", "visual") == "Visual summary"
+        assert get_cached_summary("Mitochondria produce ATP.", "auditory") is None
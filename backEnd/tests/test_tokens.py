@@ -0,0 +1,95 @@
+"""
+Tests for local token counting and budgeting.
+
+Covers the offline estimator, message framing overhead, completion budgets
+that shrink to fit the context window, and chunk input budgets.
+"""
+
+import pytest
+from src.ai import tokens
+from src.ai.tokens import (
+    completion_budget,
+    count_message_tokens,
+    count_tokens,
+    context_window,
+    input_budget,
+)
+
+MODEL = "gpt-3.5-turbo"
+
+@pytest.fixture
+def estimator(monkeypatch):
+    """Force the offline estimator even when tiktoken is installed."""
+    monkeypatch.setattr(tokens, "tiktoken", None)
+    tokens._encoding.cache_clear()
+    yield
+    tokens._encoding.cache_clear()
+
+class TestCountTokens:
+    """Test suite for text and message token counts."""
+
+    def test_empty_text_has_no_tokens(self):
+        """Test that empty input costs nothing."""
+        assert count_tokens("", MODEL) == 0
+
+    def test_estimator_counts_words_and_punctuation(self, estimator):
+        """Test that common words cost one token and punctuation is counted."""
+        assert count_tokens("The cell has a wall.", MODEL) == 6
+
+    def test_estimator_splits_long_words_and_numbers(self, estimator):
+        """Test that long words and digit runs cost several tokens."""
+        assert count_tokens("photosynthesis", MODEL) == 3
+        assert count_tokens("1789", MODEL) == 2
+
+    def test_estimator_is_not_below_roughly_four_chars_per_token(self, estimator):
+        """Test that prose is never estimated cheaper than the usual BPE ratio."""
+        prose = "Mitochondria are membrane-bound organelles that generate most of the chemical energy. " * 20
+        assert count_tokens(prose, MODEL) >= len(prose) / 5
+
+    def test_estimator_does_not_undercount_cjk_text(self, estimator):
+        """Test that each CJK character is charged two tokens and accented letters one."""
+        text = "光合作用将光能转化为化学能。"
+        assert count_tokens(text, MODEL) == 2 * len(text)
+        assert count_tokens("é", MODEL) == 1
+
+    def test_message_framing_is_included(self):
+        """Test that each chat message adds its framing overhead."""
+        messages = [{"role": "system", "content": "Be brief."}, {"role": "user", "content": "Hi"}]
+        content_only = sum(count_tokens(m["content"], MODEL) for m in messages)
+        assert count_message_tokens(messages, MODEL) > content_only + 2 * tokens.MESSAGE_OVERHEAD_TOKENS
+
+class TestBudgets:
+    """Test suite for context-window budgeting."""
+
+    def test_unknown_models_use_the_conservative_window(self):
+        """Test that unlisted models fall back to the default window."""
+        assert context_window("made-up-model") == tokens.DEFAULT_CONTEXT_WINDOW
+        assert context_window(MODEL) == 16385
+
+    def test_small_prompt_keeps_requested_budget(self):
+        """Test that max_tokens passes through when it fits."""
+        messages = [{"role": "user", "content": "Summarize the water cycle."}]
+        assert completion_budget(messages, 300, MODEL) == 300
+
+    def test_large_prompt_shrinks_budget_to_fit(self, estimator):
+        """Test that the completion is reduced so prompt + completion fits exactly."""
+        messages = [{"role": "user", "content": "word " * 3500}]
+        budget = completion_budget(messages, 1000, "made-up-model")
+        prompt = count_message_tokens(messages, "made-up-model")
+
+        assert budget < 1000
+        assert prompt + budget + tokens.CONTEXT_SAFETY_MARGIN == tokens.DEFAULT_CONTEXT_WINDOW
+
+    def test_prompt_filling_the_window_raises_value_error(self, estimator):
+        """Test that a prompt with no room left for a reply is rejected before sending."""
+        messages = [{"role": "user", "content": "word " * 5000}]
+        with pytest.raises(ValueError, match="context window"):
+            completion_budget(messages, 300, "made-up-model")
+
+    def test_input_budget_leaves_room_for_prompt_and_reply(self):
+        """Test that chunk budgets subtract the system prompt and completion."""
+        system_prompt = "Extract key facts as notes."
+        budget = input_budget(system_prompt, 400, MODEL)
+        messages = [{"role": "system", "content": system_prompt}, {"role": "user", "content": ""}]
+
+        assert budget == context_window(MODEL) - count_message_tokens(messages, MODEL) - 400 - tokens.CONTEXT_SAFETY_MARGIN
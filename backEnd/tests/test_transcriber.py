@@ -5,12 +5,26 @@ Tests file validation, API integration, and error handling
 for the speech-to-text feature of StudyBuddy AI.
 """
 
+import asyncio
 import pytest
 import tempfile
 import os
+import wave
 from pathlib import Path
-from unittest.mock import patch, MagicMock
-from src.ai.transcriber import transcribe_audio, SUPPORTED_FORMATS, MAX_FILE_SIZE
+from unittest.mock import patch, AsyncMock
+from src.ai import audio_segmenter, transcriber
+from src.ai.cache import LRUCache, SQLiteCache, TieredCache
+from src.ai.transcriber import (
+    transcribe_audio,
+    transcribe_audio_async,
+    transcribe_long_audio_async,
+    transcribe_audio_cached,
+    file_digest,
+    admit_audio,
+    estimate_transcription_cost,
+    get_audio_duration,
+    MAX_FILE_SIZE,
+)
 
 class TestTranscribeAudio:
     """Test suite for audio transcription functionality."""
@@ -75,7 +89,7 @@ class TestTranscribeAudio:
         with patch("src.ai.transcriber.client") as mock_client:
             mock_client.audio.transcriptions.create.return_value = "Physics content"
             
-            result = transcribe_audio(valid_audio_file, prompt=custom_prompt)
+            transcribe_audio(valid_audio_file, prompt=custom_prompt)
             
             call_args = mock_client.audio.transcriptions.create.call_args
             assert call_args[1]["prompt"] == custom_prompt
@@ -170,3 +184,241 @@ class TestTranscribeAudio:
                     assert result == "test"
             finally:
                 os.unlink(temp_file.name)
+    
+    @pytest.mark.asyncio
+    async def test_async_transcribe_uses_async_client(self, valid_audio_file):
+        """Test that the async variant awaits the shared async client."""
+        with patch("src.ai.transcriber.async_client") as mock_client:
+            mock_client.audio.transcriptions.create = AsyncMock(return_value=" Async transcription ")
+            
+            result = await transcribe_audio_async(valid_audio_file, language="en")
+            
+            assert result == "Async transcription"
+            call_args = mock_client.audio.transcriptions.create.call_args
+            assert call_args[1]["model"] == "whisper-1"
+            assert call_args[1]["language"] == "en"
+            assert call_args[1]["file"].name == valid_audio_file
+    
+    @pytest.mark.asyncio
+    async def test_async_api_errors_return_user_friendly_messages(self, valid_audio_file):
+        """Test that the async variant translates API errors like the sync one."""
+        with patch("src.ai.transcriber.async_client") as mock_client:
+            mock_client.audio.transcriptions.create = AsyncMock(side_effect=Exception("rate limit exceeded"))
+            
+            with pytest.raises(RuntimeError, match="service is busy"):
+                await transcribe_audio_async(valid_audio_file)
+
+class TestTranscribeLongAudio:
+    """Test suite for segmented transcription of recordings over the upload limit."""
+    
+    @pytest.fixture(autouse=True)
+    def small_limits(self, monkeypatch):
+        """Shrink limits so a few seconds of audio counts as a long recording."""
+        monkeypatch.setattr(transcriber, "MAX_FILE_SIZE", 40_000)
+        monkeypatch.setattr(transcriber, "SEGMENT_MAX_BYTES", 32_044)
+        monkeypatch.setattr(audio_segmenter, "SILENCE_SEARCH_SECONDS", 0.5)
+    
+    @pytest.fixture
+    def long_wav_file(self, tmp_path):
+        """Ten seconds of silent 8kHz 16-bit mono audio (160KB, five segments)."""
+        path = tmp_path / "lecture.wav"
+        with wave.open(str(path), "wb") as writer:
+            writer.setnchannels(1)
+            writer.setsampwidth(2)
+            writer.setframerate(8000)
+            writer.writeframes(b"\x00\x00" * 80_000)
+        return str(path)
+    
+    @pytest.mark.asyncio
+    async def test_segments_are_transcribed_concurrently_and_stitched_in_order(self, long_wav_file):
+        """Test that segment calls overlap in time and the text keeps playback order."""
+        in_flight = 0
+        peak = 0
+        
+        async def create(file, **kwargs):
+            nonlocal in_flight, peak
+            index = int(Path(file.name).stem.split("_")[1])
+            in_flight += 1
+            peak = max(peak, in_flight)
+            # Later segments finish first to prove results are reordered
+            await asyncio.sleep(0.05 - index * 0.01)
+            in_flight -= 1
+            return f" part {index} "
+        
+        with patch("src.ai.transcriber.async_client") as mock_client:
+            mock_client.audio.transcriptions.create = AsyncMock(side_effect=create)
+            
+            result = await transcribe_long_audio_async(long_wav_file, language="en", max_concurrency=3)
+        
+        indexes = [int(word) for word in result.split()[1::2]]
+        assert len(indexes) > 3
+        assert indexes == list(range(len(indexes)))
+        assert peak == 3
+    
+    @pytest.mark.asyncio
+    async def test_previous_tail_is_used_as_prompt_when_available(self, long_wav_file):
+        """Test continuity prompting when segments run one after another."""
+        with patch("src.ai.transcriber.async_client") as mock_client:
+            mock_client.audio.transcriptions.create = AsyncMock(
+                side_effect=lambda file, **kwargs: f"words from {Path(file.name).stem}"
+            )
+            
+            await transcribe_long_audio_async(long_wav_file, prompt="Biology lecture", max_concurrency=1)
+        
+        prompts = [call[1]["prompt"] for call in mock_client.audio.transcriptions.create.call_args_list]
+        assert prompts[0] == "Biology lecture"
+        assert prompts[1] == "Biology lecture words from segment_0000"
+    
+    @pytest.mark.asyncio
+    async def test_small_file_uses_single_call(self, tmp_path):
+        """Test that files under the limit skip segmentation."""
+        small_mp3 = tmp_path / "clip.mp3"
+        small_mp3.write_bytes(b"fake audio content for testing")
+        
+        with patch("src.ai.transcriber.async_client") as mock_client:
+            mock_client.audio.transcriptions.create = AsyncMock(return_value="Short clip")
+            
+            assert await transcribe_long_audio_async(str(small_mp3)) == "Short clip"
+            mock_client.audio.transcriptions.create.assert_called_once()
+    
+    @pytest.mark.asyncio
+    async def test_silence_returns_empty_transcription(self, tmp_path):
+        """Test that no speech is an empty result callers can detect, not a notice to summarize."""
+        small_mp3 = tmp_path / "silence.mp3"
+        small_mp3.write_bytes(b"fake audio content for testing")
+        
+        with patch("src.ai.transcriber.async_client") as mock_client:
+            mock_client.audio.transcriptions.create = AsyncMock(return_value="  ")
+            
+            assert await transcribe_long_audio_async(str(small_mp3)) == ""
+    
+    @pytest.mark.asyncio
+    async def test_segment_failure_raises_user_friendly_error(self, long_wav_file):
+        """Test that one failed segment fails the whole transcription."""
+        with patch("src.ai.transcriber.async_client") as mock_client:
+            mock_client.audio.transcriptions.create = AsyncMock(side_effect=Exception("rate limit exceeded"))
+            
+            with pytest.raises(RuntimeError, match="service is busy"):
+                await transcribe_long_audio_async(long_wav_file)
+    
+    @pytest.mark.asyncio
+    async def test_large_compressed_file_raises_value_error(self, tmp_path):
+        """Test that only WAV recordings can exceed the single-call limit."""
+        large_mp3 = tmp_path / "lecture.mp3"
+        large_mp3.write_bytes(b"x" * 50_000)
+        
+        with pytest.raises(ValueError, match="must be WAV"):
+            await transcribe_long_audio_async(str(large_mp3))
+
+class TestDurationAndCost:
+    """Test suite for duration probing, cost estimates and admission control."""
+    
+    @pytest.fixture
+    def one_minute_wav(self, tmp_path):
+        """Sixty seconds of 8kHz 8-bit mono silence."""
+        path = tmp_path / "minute.wav"
+        with wave.open(str(path), "wb") as writer:
+            writer.setnchannels(1)
+            writer.setsampwidth(1)
+            writer.setframerate(8000)
+            writer.writeframes(b"\x80" * 8000 * 60)
+        return str(path)
+    
+    def test_duration_and_cost_for_known_length(self, one_minute_wav):
+        """Test that a one-minute recording costs one minute of Whisper."""
+        assert get_audio_duration(one_minute_wav) == 60.0
+        assert estimate_transcription_cost(one_minute_wav) == 0.006
+    
+    def test_unknown_duration_costs_nothing(self, tmp_path):
+        """Test the fallback when the container cannot be probed."""
+        webm = tmp_path / "clip.webm"
+        webm.write_bytes(b"\x1A\x45\xDF\xA3")
+        
+        assert estimate_transcription_cost(str(webm)) == 0.0
+    
+    def test_admission_rejects_recordings_over_the_limit(self, one_minute_wav, monkeypatch):
+        """Test that over-long recordings are refused before any API call."""
+        monkeypatch.setattr(transcriber, "MAX_AUDIO_DURATION_SECONDS", 30)
+        
+        with pytest.raises(ValueError, match="Audio too long"):
+            admit_audio(one_minute_wav)
+    
+    def test_admission_returns_duration(self, one_minute_wav):
+        """Test that admitted recordings report their duration."""
+        assert admit_audio(one_minute_wav) == 60.0
+
+class TestTranscriptionCacheLifecycle:
+    """Test suite for opening and closing the transcription disk tier."""
+    
+    def test_disk_tier_is_opened_at_startup_and_closed_at_shutdown(self, tmp_path, monkeypatch):
+        """Test that the disk tier is created by init_transcription_cache, not by importing."""
+        cache = TieredCache(LRUCache(max_entries=2), name="transcription")
+        monkeypatch.setattr(transcriber, "transcription_cache", cache)
+        monkeypatch.setattr(transcriber, "TRANSCRIPTION_CACHE_DB", str(tmp_path / "transcriptions.sqlite3"))
+        
+        transcriber.init_transcription_cache()
+        assert isinstance(cache.disk, SQLiteCache)
+        assert (tmp_path / "transcriptions.sqlite3").exists()
+        
+        transcriber.close_transcription_cache()
+        assert cache.disk is None
+
+class TestTranscribeAudioCached:
+    """Test suite for the content-fingerprint transcription cache."""
+    
+    @pytest.fixture(autouse=True)
+    def isolated_cache(self, tmp_path, monkeypatch):
+        """Give every test its own memory and disk tiers."""
+        disk = SQLiteCache(str(tmp_path / "transcriptions.sqlite3"), max_entries=2)
+        cache = TieredCache(LRUCache(max_entries=2), disk, name="transcription")
+        monkeypatch.setattr(transcriber, "transcription_cache", cache)
+        yield cache
+        disk.close()
+    
+    @pytest.fixture
+    def recording(self, tmp_path):
+        """A small fake recording."""
+        path = tmp_path / "lecture.mp3"
+        path.write_bytes(b"fake lecture audio")
+        return str(path)
+    
+    @pytest.mark.asyncio
+    async def test_repeat_upload_is_served_from_cache(self, recording, tmp_path):
+        """Test that identical bytes under another name skip the API."""
+        copy = tmp_path / "copy_of_lecture.mp3"
+        copy.write_bytes(Path(recording).read_bytes())
+        
+        with patch("src.ai.transcriber.async_client") as mock_client:
+            mock_client.audio.transcriptions.create = AsyncMock(return_value="Lecture text")
+            
+            first = await transcribe_audio_cached(recording, language="en")
+            second = await transcribe_audio_cached(str(copy), language="en", content_sha256=file_digest(recording))
+            
+            assert first == ("Lecture text", False)
+            assert second == ("Lecture text", True)
+            mock_client.audio.transcriptions.create.assert_called_once()
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("params", [{"language": "es"}, {"prompt": "Chemistry lab"}])
+    async def test_language_and_prompt_are_part_of_the_key(self, recording, params):
+        """Test that a different language or prompt is a cache miss."""
+        with patch("src.ai.transcriber.async_client") as mock_client:
+            mock_client.audio.transcriptions.create = AsyncMock(return_value="Lecture text")
+            
+            await transcribe_audio_cached(recording, language="en")
+            _, cached = await transcribe_audio_cached(recording, **{"language": "en", **params})
+            
+            assert cached is False
+            assert mock_client.audio.transcriptions.create.call_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_failures_are_not_cached(self, recording, isolated_cache):
+        """Test that API errors are retried on the next upload."""
+        with patch("src.ai.transcriber.async_client") as mock_client:
+            mock_client.audio.transcriptions.create = AsyncMock(side_effect=Exception("rate limit exceeded"))
+            
+            with pytest.raises(RuntimeError):
+                await transcribe_audio_cached(recording)
+            
+            assert len(isolated_cache.memory) == 0
+            assert len(isolated_cache.disk) == 0
@@ -0,0 +1,68 @@
+"""
+Tests for chunked upload spooling.
+
+Verifies that uploads are copied to disk intact and fingerprinted in the
+same pass, that the size limit aborts the copy as soon as it is crossed, and
+that spool files never leak.
+"""
+
+import hashlib
+import io
+from pathlib import Path
+import pytest
+from fastapi import HTTPException, UploadFile
+from src.api.uploads import spool_upload
+
+class CountingReader(io.BytesIO):
+    """In-memory upload body that records how many bytes were read."""
+    
+    def __init__(self, data):
+        super().__init__(data)
+        self.bytes_read = 0
+    
+    def read(self, size=-1):
+        chunk = super().read(size)
+        self.bytes_read += len(chunk)
+        return chunk
+
+class TestSpoolUpload:
+    """Test suite for streaming uploads to a spool file."""
+    
+    @pytest.mark.asyncio
+    async def test_upload_is_copied_in_chunks(self):
+        """Test that the spool file holds the exact upload content."""
+        data = bytes(range(256)) * 100
+        upload = await spool_upload(UploadFile(CountingReader(data), filename="a.mp3"), ".mp3", 1_000_000, chunk_size=1000)
+        
+        try:
+            assert upload.size == len(data)
+            assert upload.path.endswith(".mp3")
+            assert Path(upload.path).read_bytes() == data
+            assert upload.sha256 == hashlib.sha256(data).hexdigest()
+        finally:
+            upload.cleanup()
+        assert not Path(upload.path).exists()
+    
+    @pytest.mark.asyncio
+    async def test_oversize_upload_is_aborted_at_the_limit(self, tmp_path, monkeypatch):
+        """Test that reading stops as soon as the limit is crossed and nothing is left behind."""
+        monkeypatch.setattr("tempfile.tempdir", str(tmp_path))
+        reader = CountingReader(b"x" * 100_000)
+        
+        with pytest.raises(HTTPException) as exc_info:
+            await spool_upload(UploadFile(reader, filename="a.mp3"), ".mp3", 10_000, chunk_size=1000)
+        
+        assert exc_info.value.status_code == 413
+        assert reader.bytes_read <= 11_000
+        assert list(tmp_path.iterdir()) == []
+    
+    @pytest.mark.asyncio
+    async def test_empty_upload_is_rejected(self, tmp_path, monkeypatch):
+        """Test that empty uploads return 400 and leave no spool file."""
+        monkeypatch.setattr("tempfile.tempdir", str(tmp_path))
+        
+        with pytest.raises(HTTPException) as exc_info:
+            await spool_upload(UploadFile(io.BytesIO(b""), filename="a.mp3"), ".mp3", 10_000)
+        
+        assert exc_info.value.status_code == 400
+        assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,307 @@
+"""
+Tests for cache warm-up of known course material.
+
+Covers manifest validation, the off-peak window, the spend budget, warm-up
+filling the summary cache and question bank (and refunding work already
+cached), and the admin endpoint that queues warm-up jobs.
+"""
+
+import itertools
+import json
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from src.ai import quiz_generator, transcriber
+from src.ai.question_bank import QuestionBank
+from src.ai.summarizer import summary_cache, summary_cache_key
+from src.ai.warmup import (
+    LEARNING_STYLES,
+    SpendBudget,
+    WarmupItem,
+    WarmupOptions,
+    main,
+    off_peak_window,
+    parse_manifest,
+    run_warmup,
+)
+from src.api.jobs import WARMUP_JOB, JobStore, JobWorkerPool, process_warmup_job
+from src.api.routes import admin
+
+SOURCE = (
+    "Photosynthesis converts sunlight into chemical energy. Chlorophyll in the "
+    "chloroplasts absorbs light, and the plant releases oxygen as glucose is made."
+)
+
+def completion(content):
+    response = MagicMock()
+    response.choices = [MagicMock(message=MagicMock(content=content))]
+    return response
+
+def quiz_completions():
+    """Completion factory returning ten new questions per call."""
+    counter = itertools.count()
+
+    async def create(**kwargs):
+        batch = next(counter)
+        return completion(json.dumps([
+            {
+                "question": f"Which statement about photosynthesis is true ({batch}-{n})?",
+                "options": ["Light", "Water", "Soil", "Heat"],
+                "correct_answer": "A",
+                "explanation": "Chlorophyll absorbs light energy.",
+                "difficulty": "medium"
+            }
+            for n in range(10)
+        ]))
+    return create
+
+class TestManifest:
+    """Test suite for manifest validation."""
+
+    def test_text_files_are_read_relative_to_the_manifest(self, tmp_path):
+        """Test inline text, text files, recordings and default options."""
+        (tmp_path / "chapter.txt").write_text("Chapter four covers mitosis.", encoding="utf-8")
+        items, options = parse_manifest({"items": [
+            {"name": "Reading", "text": SOURCE},
+            {"name": "Chapter", "path": "chapter.txt"},
+            {"name": "Lecture", "audio": "lecture.wav", "language": "en"},
+        ]}, str(tmp_path))
+
+        assert [item.text for item in items[:2]] == [SOURCE, "Chapter four covers mitosis."]
+        assert items[2].audio_path == str((tmp_path / "lecture.wav").resolve())
+        assert options.learning_styles == LEARNING_STYLES
+        assert len(options.difficulties) == 3
+
+    def test_paths_outside_the_content_directory_are_rejected(self, tmp_path):
+        """Test that manifest paths cannot escape their base directory."""
+        with pytest.raises(ValueError, match="outside"):
+            parse_manifest({"items": [{"path": "../secrets.txt"}]}, str(tmp_path))
+        with pytest.raises(ValueError, match="not allowed"):
+            parse_manifest({"items": [{"path": "chapter.txt"}]})
+
+    def test_invalid_manifests_are_rejected(self):
+        """Test empty manifests, ambiguous or non-string items and unknown options."""
+        with pytest.raises(ValueError):
+            parse_manifest({"items": []})
+        with pytest.raises(ValueError, match="exactly one"):
+            parse_manifest({"items": [{"text": SOURCE, "audio": "lecture.wav"}]})
+        with pytest.raises(ValueError, match="unknown values"):
+            parse_manifest({"items": [{"text": SOURCE}], "learning_styles": ["musical"]})
+        with pytest.raises(ValueError, match="must be a string"):
+            parse_manifest({"items": [{"path": ["notes.txt"]}]}, base_dir=".")
+
+class TestOffPeakWindow:
+    """Test suite for the daily off-peak window."""
+
+    def test_window_later_today(self):
+        start, end = off_peak_window("01:00-05:00", datetime(2026, 10, 16, 0, 30))
+        assert (start, end) == (datetime(2026, 10, 16, 1), datetime(2026, 10, 16, 5))
+
+    def test_window_already_open(self):
+        start, end = off_peak_window("01:00-05:00", datetime(2026, 10, 16, 2))
+        assert (start, end) == (datetime(2026, 10, 16, 1), datetime(2026, 10, 16, 5))
+
+    def test_window_crossing_midnight(self):
+        """Test that a window open since last night is the current one."""
+        assert off_peak_window("22:00-06:00", datetime(2026, 10, 16, 3)) == (
+            datetime(2026, 10, 15, 22), datetime(2026, 10, 16, 6)
+        )
+        assert off_peak_window("22:00-06:00", datetime(2026, 10, 16, 12)) == (
+            datetime(2026, 10, 16, 22), datetime(2026, 10, 17, 6)
+        )
+
+    def test_malformed_window_raises_value_error(self):
+        with pytest.raises(ValueError):
+            off_peak_window("1am-5am", datetime(2026, 10, 16))
+
+class TestSpendBudget:
+    """Test suite for budget reservations."""
+
+    def test_reservations_stop_at_the_limit_and_refunds_free_room(self):
+        budget = SpendBudget(1.0)
+
+        assert budget.reserve(0.6)
+        assert not budget.reserve(0.6)
+        budget.refund(0.5)
+        assert budget.reserve(0.6)
+        assert budget.stats()["estimated_spend_usd"] == 0.7
+
+class TestRunWarmup:
+    """Test suite for warm-up runs."""
+
+    @pytest.mark.asyncio
+    async def test_summaries_are_cached_for_every_style(self):
+        """Test that every style is cached under the key /api/summarize uses."""
+        options = WarmupOptions(difficulties=())
+        with patch("src.ai.summarizer.async_client") as mock_client:
+            mock_client.chat.completions.create = AsyncMock(return_value=completion("Warm summary"))
+
+            first = await run_warmup([WarmupItem("Reading", text=SOURCE)], options)
+            calls = mock_client.chat.completions.create.call_count
+            second = await run_warmup([WarmupItem("Reading", text=SOURCE)], options)
+
+            assert mock_client.chat.completions.create.call_count == calls
+        for style in LEARNING_STYLES:
+            assert summary_cache.get(summary_cache_key(SOURCE, style, 300)) is not None
+        assert first["totals"]["summaries_warmed"] == len(LEARNING_STYLES)
+        assert second["totals"]["summaries_cached"] == len(LEARNING_STYLES)
+        assert second["estimated_spend_usd"] == 0
+
+    @pytest.mark.asyncio
+    async def test_quizzes_are_banked_for_every_difficulty(self, empty_question_bank):
+        """Test that a second run is served from the bank and refunded."""
+        options = WarmupOptions(learning_styles=())
+        with patch("src.ai.quiz_generator.async_client") as mock_client:
+            mock_client.chat.completions.create = AsyncMock(side_effect=quiz_completions())
+
+            first = await run_warmup([WarmupItem("Reading", text=SOURCE)], options)
+            second = await run_warmup([WarmupItem("Reading", text=SOURCE)], options)
+
+            assert mock_client.chat.completions.create.call_count == 3
+        assert empty_question_bank.stats()["questions"] == 30
+        assert first["totals"]["quizzes_warmed"] == 3
+        assert first["estimated_spend_usd"] > 0
+        assert second["totals"]["quizzes_cached"] == 3
+        assert second["estimated_spend_usd"] == 0
+
+    @pytest.mark.asyncio
+    async def test_work_over_budget_is_skipped(self):
+        """Test that no call is made once the budget cannot cover it."""
+        with patch("src.ai.summarizer.async_client") as summary_client, \
+                patch("src.ai.quiz_generator.async_client") as quiz_client:
+            summary_client.chat.completions.create = AsyncMock()
+            quiz_client.chat.completions.create = AsyncMock()
+
+            report = await run_warmup([WarmupItem("Reading", text=SOURCE)], budget_usd=0.0001)
+
+            summary_client.chat.completions.create.assert_not_called()
+            quiz_client.chat.completions.create.assert_not_called()
+        assert report["totals"]["skipped_budget"] == len(LEARNING_STYLES) + 3
+        assert report["items"][0]["skipped"]
+
+    @pytest.mark.asyncio
+    async def test_no_work_starts_after_the_window_closes(self):
+        """Test that a deadline in the past skips every task."""
+        with patch("src.ai.summarizer.async_client") as mock_client:
+            mock_client.chat.completions.create = AsyncMock()
+
+            report = await run_warmup([WarmupItem("Reading", text=SOURCE)], deadline=0.0)
+
+            mock_client.chat.completions.create.assert_not_called()
+        assert report["totals"]["skipped_window"] == len(LEARNING_STYLES) + 3
+        assert report["estimated_spend_usd"] == 0
+
+    @pytest.mark.asyncio
+    async def test_failures_are_reported_without_stopping_the_run(self):
+        """Test that a failed summary still lets the quizzes run."""
+        options = WarmupOptions(difficulties=("college",))
+        with patch("src.ai.summarizer.async_client") as summary_client, \
+                patch("src.ai.quiz_generator.async_client") as quiz_client:
+            summary_client.chat.completions.create = AsyncMock(side_effect=RuntimeError("offline"))
+            quiz_client.chat.completions.create = AsyncMock(side_effect=quiz_completions())
+
+            report = await run_warmup([WarmupItem("Reading", text=SOURCE)], options)
+
+        assert report["totals"]["failed"] == 1
+        assert report["totals"]["quizzes_warmed"] == 1
+        assert report["items"][0]["errors"]
+
+class TestCommandLine:
+    """Test suite for the warm-up command line."""
+
+    def test_cli_fills_the_question_bank_on_disk(self, tmp_path, monkeypatch):
+        """Test that the CLI opens the bank itself and leaves the questions in it."""
+        bank_path = tmp_path / "question_bank.sqlite3"
+        monkeypatch.setattr(quiz_generator, "QUESTION_BANK_DB", str(bank_path))
+        monkeypatch.setattr(quiz_generator, "question_bank", None)
+        monkeypatch.setattr(transcriber, "TRANSCRIPTION_CACHE_DB", str(tmp_path / "transcriptions.sqlite3"))
+        manifest = tmp_path / "manifest.json"
+        manifest.write_text(json.dumps({
+            "items": [{"text": SOURCE}], "learning_styles": ["visual"], "difficulties": ["college"]
+        }))
+        with patch("src.ai.summarizer.async_client") as summary_client, \
+                patch("src.ai.quiz_generator.async_client") as quiz_client:
+            summary_client.chat.completions.create = AsyncMock(return_value=completion("Warm summary"))
+            quiz_client.chat.completions.create = AsyncMock(side_effect=quiz_completions())
+
+            assert main([str(manifest)]) == 0
+
+        assert quiz_generator.question_bank is None
+        bank = QuestionBank(str(bank_path))
+        try:
+            assert bank.stats()["questions"] == 10
+        finally:
+            bank.close()
+
+class TestWarmupJobs:
+    """Test suite for the admin endpoint and warm-up job processing."""
+
+    @pytest.fixture
+    def pool(self, tmp_path, monkeypatch):
+        store = JobStore(str(tmp_path / "jobs.sqlite3"))
+        pool = JobWorkerPool(store=store, kind=WARMUP_JOB, processor=process_warmup_job, concurrency=1)
+        monkeypatch.setattr(admin, "warmup_jobs", pool)
+        yield pool
+        store.close()
+
+    @pytest.fixture
+    def client(self, pool):
+        app = FastAPI()
+        app.include_router(admin.router)
+        return TestClient(app)
+
+    def test_admin_endpoints_require_the_token(self, client, monkeypatch):
+        """Test that warm-up is disabled without a token and refused with a wrong one."""
+        body = {"manifest": {"items": [{"text": SOURCE}]}}
+        monkeypatch.delenv("ADMIN_API_TOKEN", raising=False)
+        assert client.post("/api/admin/warmup", json=body).status_code == 403
+
+        monkeypatch.setenv("ADMIN_API_TOKEN", "secret")
+        assert client.post("/api/admin/warmup", json=body, headers={"X-Admin-Token": "guess"}).status_code == 401
+
+    def test_warmup_is_queued_and_reported(self, client, pool, monkeypatch):
+        """Test that a valid manifest is queued and its job can be polled."""
+        monkeypatch.setenv("ADMIN_API_TOKEN", "secret")
+        headers = {"X-Admin-Token": "secret"}
+        body = {"manifest": {"items": [{"text": SOURCE}]}, "budget_usd": 2, "window": "01:00-05:00"}
+
+        response = client.post("/api/admin/warmup", json=body, headers=headers)
+
+        assert response.status_code == 202
+        job = pool.store.get(response.json()["job_id"])
+        assert job["kind"] == WARMUP_JOB
+        assert job["payload"]["window"] == "01:00-05:00"
+        status = client.get(response.json()["status_url"], headers=headers)
+        assert status.json()["status"] == "queued"
+        assert client.get("/api/admin/warmup/unknown", headers=headers).status_code == 404
+
+    def test_invalid_manifest_returns_400(self, client, monkeypatch):
+        """Test that file entries are refused when no content directory is configured."""
+        monkeypatch.setenv("ADMIN_API_TOKEN", "secret")
+        monkeypatch.setattr(admin, "WARMUP_CONTENT_DIR", None)
+        body = {"manifest": {"items": [{"path": "chapter.txt"}]}}
+
+        response = client.post("/api/admin/warmup", json=body, headers={"X-Admin-Token": "secret"})
+
+        assert response.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_job_runs_the_manifest(self):
+        """Test that the job processor warms the queued manifest and reports progress."""
+        progress = []
+        job = {"id": "job-1", "payload": {
+            "manifest": {"items": [{"text": SOURCE}], "learning_styles": ["visual"], "difficulties": ["college"]},
+            "base_dir": None, "budget_usd": 1.0, "window": None,
+        }}
+        with patch("src.ai.summarizer.async_client") as summary_client, \
+                patch("src.ai.quiz_generator.async_client") as quiz_client:
+            summary_client.chat.completions.create = AsyncMock(return_value=completion("Warm summary"))
+            quiz_client.chat.completions.create = AsyncMock(side_effect=quiz_completions())
+
+            report = await process_warmup_job(job, progress.append)
+
+        assert report["totals"]["summaries_warmed"] == 1
+        assert report["totals"]["quizzes_warmed"] == 1
+        assert progress == [1.0]
@@ -72,6 +72,73 @@ export const studyBuddyAPI = {
       },
     });
     return response.data;
+  },
+
+  // Audio -> transcript -> summary + quiz in one request.
+  // Results arrive as Server-Sent Events; onEvent(name, data) is called for
+  // 'transcript', 'summary', 'quiz', 'error' and finally 'done'.
+  runStudyPipeline: async (audioFile, options = {}, onEvent = () => {}) => {
+    const {
+      language = null,
+      contextPrompt = null,
+      learningStyle = 'reading',
+      maxTokens = 300,
+      numQuestions = 3,
+      difficulty = 'high_school'
+    } = options;
+
+    const formData = new FormData();
+    formData.append('file', audioFile);
+    formData.append('learning_style', learningStyle);
+    formData.append('max_tokens', maxTokens);
+    formData.append('num_questions', numQuestions);
+    formData.append('difficulty', difficulty);
+    if (language) {
+      formData.append('language', language);
+    }
+    if (contextPrompt) {
+      formData.append('context_prompt', contextPrompt);
+    }
+
+    // axios cannot read a streamed body in the browser, so use fetch here
+    const response = await fetch(`${API_BASE_URL}/api/pipeline`, {
+      method: 'POST',
+      body: formData
+    });
+    if (!response.ok) {
+      const error = await response.json().catch(() => ({}));
+      throw new Error(error.detail || `Pipeline failed with status ${response.status}`);
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    const results = {};
+    let buffer = '';
+
+    while (true) {
+      const { value, done } = await reader.read();
+      if (done) {
+        break;
+      }
+      buffer += decoder.decode(value, { stream: true });
+
+      // Events are separated by a blank line
+      let boundary;
+      while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+        const rawEvent = buffer.slice(0, boundary);
+        buffer = buffer.slice(boundary + 2);
+
+        const name = rawEvent.match(/^event: (.*)$/m)?.[1];
+        const data = rawEvent.match(/^data: (.*)$/m)?.[1];
+        if (!name || data === undefined) {
+          continue;
+        }
+        const payload = JSON.parse(data);
+        results[name] = payload;
+        onEvent(name, payload);
+      }
+    }
+    return results;
   }
 };
 